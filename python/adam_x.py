@@ -5,24 +5,25 @@ Adam-X: Your Terminal Coding AI Assistant
 A terminal-based AI coding assistant that helps with programming tasks.
 """
 
+import time
+
+_IMPORT_START = time.perf_counter()
+
 import os
 import sys
-import re
-import random
-import time
 import json
-import argparse
-from typing import List, Dict, Any, Optional, Tuple
-
-# Try to import readline (not available on Windows by default)
-try:
-    import readline
-except ImportError:
-    # On Windows, we can use pyreadline3 as an alternative
-    try:
-        import pyreadline3
-    except ImportError:
-        pass
+import threading
+import contextlib
+import contextvars
+import itertools
+from io import StringIO
+from typing import List, Dict, Any, AsyncIterator, Iterable, Iterator, Optional, Tuple
+
+# asyncio, readline, the backend and the snippet library (sqlite3) are
+# imported on first use so that --help and one-shot commands start quickly.
+from adam_x_cache import CACHEABLE_ACTIONS, ResponseCache, make_key
+from adam_x_commands import COMMANDS, NO_ARGUMENT, OPTIONAL_ARGUMENT, Command, InputRequired
+from adam_x_store import ConfigStore
 
 # ASCII art for Adam-X logo
 LOGO = """
@@ -35,46 +36,241 @@ LOGO = """
 Your Terminal Coding AI Agent - v1.0.0
 """
 
+LANGUAGES = {
+    "python": {"ext": ".py", "comment": "# "},
+    "javascript": {"ext": ".js", "comment": "// "},
+    "typescript": {"ext": ".ts", "comment": "// "},
+    "java": {"ext": ".java", "comment": "// "},
+    "c": {"ext": ".c", "comment": "// "},
+    "cpp": {"ext": ".cpp", "comment": "// "},
+    "rust": {"ext": ".rs", "comment": "// "},
+    "go": {"ext": ".go", "comment": "// "},
+    "ruby": {"ext": ".rb", "comment": "# "},
+    "php": {"ext": ".php", "comment": "// "},
+    "shell": {"ext": ".sh", "comment": "# "},
+}
+
+# Actions sent with excerpts of related project files
+CONTEXT_ACTIONS = frozenset({"explain", "optimize", "debug", "generate"})
+
+# Actions whose input may be an @path[:start-end] file reference
+REFERENCE_ACTIONS = frozenset({"explain", "optimize", "debug"})
+
+# Actions that "<action> project" runs over every file of the current project
+SWEEP_ACTIONS = frozenset({"debug", "optimize"})
+
+# Largest script (in bytes) that 'profile' passes on to optimize
+MAX_PROFILE_SOURCE = 1024 * 1024
+
+# Marks lazily initialized attributes that have not been created yet
+_UNSET = object()
+
+def _init_readline() -> Any:
+    """Import readline for line editing in the REPL; return it or None."""
+    try:
+        import readline
+        return readline
+    except ImportError:
+        # On Windows, we can use pyreadline3 as an alternative
+        try:
+            import pyreadline3
+            return pyreadline3
+        except ImportError:
+            return None
+
 class AdamX:
+    # Shared by all instances; see LANGUAGES
+    languages = LANGUAGES
+
     def __init__(self, config_path: str = "~/.adam-x/config.json", show_welcome: bool = True):
         """Initialize the Adam-X AI Agent."""
         self.config_path = os.path.expanduser(config_path)
-        self.config = self._load_config()
-        self.history = []
-        self.languages = {
-            "python": {"ext": ".py", "comment": "# "},
-            "javascript": {"ext": ".js", "comment": "// "},
-            "typescript": {"ext": ".ts", "comment": "// "},
-            "java": {"ext": ".java", "comment": "// "},
-            "c": {"ext": ".c", "comment": "// "},
-            "cpp": {"ext": ".cpp", "comment": "// "},
-            "rust": {"ext": ".rs", "comment": "// "},
-            "go": {"ext": ".go", "comment": "// "},
-            "ruby": {"ext": ".rb", "comment": "# "},
-            "php": {"ext": ".php", "comment": "// "},
-            "shell": {"ext": ".sh", "comment": "# "},
-        }
-        self.current_project = self.config.get("last_project", None)
+        self.store = ConfigStore(self.config_path)
+        # The config, backend, cache and snippet library are created on
+        # first use (see the properties below)
+        self._config = None
+        self._current_project = _UNSET
+        self._backend = _UNSET
+        self._cache = _UNSET
+        self._snippets = _UNSET
+        self._jobs = _UNSET
+        self._analyzer = _UNSET
+        self._stats = _UNSET
+        self._tracer = _UNSET
+        self._history = _UNSET
+        self._scaffolder = _UNSET
+        self._stats_written = 0.0
+        self._indexes: Dict[str, Any] = {}
+        self._search_indexes: Dict[str, Any] = {}
+        self._context_builders: Dict[str, Any] = {}
+        self._index_threads: Dict[str, threading.Thread] = {}
+        self._watcher: Any = None
+        # Tab completion, set up by run()
+        self.completer: Any = None
+        self._init_lock = threading.RLock()
+        self._request_state = threading.local()
+        # Set to an adam_x_replay.SessionRecorder to record the REPL session
+        self.recorder: Any = None
 
         if show_welcome:
             print(LOGO)
             print(f"Hello! I'm Adam-X, your coding companion.")
             print(f"Type 'help' to see available commands or 'exit' to quit.")
 
+    @property
+    def config(self) -> Dict[str, Any]:
+        """The configuration, loaded on first use."""
+        if self._config is None:
+            with self._init_lock:
+                if self._config is None:
+                    self._config = self._load_config()
+        return self._config
+
+    @config.setter
+    def config(self, value: Dict[str, Any]) -> None:
+        self._config = value
+
+    @property
+    def current_project(self) -> Optional[str]:
+        """Name of the current project, initially the last one used."""
+        if self._current_project is _UNSET:
+            self._current_project = self.config.get("last_project", None)
+        return self._current_project
+
+    @current_project.setter
+    def current_project(self, value: Optional[str]) -> None:
+        self._current_project = value
+
+    @property
+    def backend(self) -> Any:
+        """The model backend, created on first use."""
+        if self._backend is _UNSET:
+            with self._init_lock:
+                if self._backend is _UNSET:
+                    from adam_x_backend import create_backend
+                    self._backend = create_backend(self.config.get("backend"))
+        return self._backend
+
+    @backend.setter
+    def backend(self, value: Any) -> None:
+        self._backend = value
+
+    @property
+    def cache(self) -> Optional[ResponseCache]:
+        """The response cache (None if disabled), created on first use."""
+        if self._cache is _UNSET:
+            with self._init_lock:
+                if self._cache is _UNSET:
+                    self._cache = self._create_cache()
+        return self._cache
+
+    @cache.setter
+    def cache(self, value: Optional[ResponseCache]) -> None:
+        self._cache = value
+
+    @property
+    def snippets(self) -> Any:
+        """The snippet library, opened on first use."""
+        if self._snippets is _UNSET:
+            with self._init_lock:
+                if self._snippets is _UNSET:
+                    self._snippets = self._open_snippets()
+        return self._snippets
+
+    @property
+    def jobs(self) -> Any:
+        """The background job manager, created on first use."""
+        if self._jobs is _UNSET:
+            with self._init_lock:
+                if self._jobs is _UNSET:
+                    from adam_x_jobs import JobManager
+                    self._jobs = JobManager()
+        return self._jobs
+
+    @property
+    def analyzer(self) -> Any:
+        """The Python performance analyzer used by optimize, created on first use."""
+        if self._analyzer is _UNSET:
+            with self._init_lock:
+                if self._analyzer is _UNSET:
+                    from adam_x_analyzer import Analyzer
+                    self._analyzer = Analyzer()
+        return self._analyzer
+
+    @property
+    def stats(self) -> Any:
+        """Latency, cache and traffic statistics per command, created on first use."""
+        if self._stats is _UNSET:
+            with self._init_lock:
+                if self._stats is _UNSET:
+                    from adam_x_stats import Stats
+                    self._stats = Stats()
+        return self._stats
+
+    @property
+    def tracer(self) -> Any:
+        """The tracer for request spans, set up from the ``trace`` config section on first use."""
+        if self._tracer is _UNSET:
+            with self._init_lock:
+                if self._tracer is _UNSET:
+                    from adam_x_trace import Tracer, create_exporter
+                    try:
+                        exporter = create_exporter(self.config.get("trace"),
+                                                   os.path.dirname(self.config_path))
+                    except ValueError as e:
+                        print(f"Error: {str(e)}. Tracing is off.")
+                        exporter = None
+                    self._tracer = Tracer(exporter)
+        return self._tracer
+
+    @property
+    def history(self) -> Any:
+        """The command history, opened from the ``history`` config section on first use."""
+        if self._history is _UNSET:
+            with self._init_lock:
+                if self._history is _UNSET:
+                    self._history = self._open_history()
+        return self._history
+
+    @property
+    def scaffolder(self) -> Any:
+        """Compiled file templates for every language, created on first use."""
+        if self._scaffolder is _UNSET:
+            with self._init_lock:
+                if self._scaffolder is _UNSET:
+                    from adam_x_scaffold import Scaffolder
+                    self._scaffolder = Scaffolder(self.languages)
+        return self._scaffolder
+
+    def _open_history(self) -> Any:
+        """Open the history file, or keep the history in memory if it is disabled."""
+        from adam_x_history import HistoryStore
+        settings = self.config.get("history", {})
+        path = None
+        if settings.get("enabled", True):
+            path = os.path.join(os.path.dirname(self.config_path),
+                                os.path.expanduser(settings.get("path", "history.bin")))
+        try:
+            return HistoryStore(path, max_entries=settings.get("max_entries", 10000),
+                                max_bytes=settings.get("max_bytes", 1024 * 1024))
+        except (OSError, ValueError) as e:
+            print(f"Error opening history: {str(e)}. History is kept in memory.")
+            return HistoryStore(None)
+
     def _load_config(self) -> Dict[str, Any]:
         """Load configuration from file or create default if not exists."""
         os.makedirs(os.path.dirname(self.config_path), exist_ok=True)
 
-        if os.path.exists(self.config_path):
-            try:
-                with open(self.config_path, 'r') as f:
-                    return json.load(f)
-            except json.JSONDecodeError:
-                print(f"Error reading config file. Using defaults.")
-                return self._create_default_config()
-        else:
+        try:
+            config = self.store.load()
+        except json.JSONDecodeError:
+            print(f"Error reading config file. Using defaults.")
             return self._create_default_config()
 
+        if config is None:
+            return self._create_default_config()
+        return config
+
     def _create_default_config(self) -> Dict[str, Any]:
         """Create and save default configuration."""
         config = {
@@ -82,7 +278,6 @@ class AdamX:
             "theme": "dark",
             "projects": {},
             "last_project": None,
-            "snippets": {},
             "preferences": {
                 "indent": 4,
                 "max_line_length": 88,
@@ -90,80 +285,208 @@ class AdamX:
             }
         }
 
-        with open(self.config_path, 'w') as f:
-            json.dump(config, f, indent=2)
-
+        self.store.replace(config)
         return config
 
+    def reload_config_if_changed(self) -> bool:
+        """Reload the config if another process changed it on disk."""
+        if self._config is None or not self.store.changed_on_disk():
+            # Not loaded yet (it will be read fresh on first use) or unchanged
+            return False
+
+        old_backend = self.config.get("backend")
+        old_cache = self.config.get("cache")
+        old_trace = self.config.get("trace")
+        self.config = self._load_config()
+        self.current_project = self.config.get("last_project", None)
+
+        # Keep warm backend and cache objects unless their settings changed
+        if self.config.get("backend") != old_backend:
+            self._backend = _UNSET
+        if self.config.get("cache") != old_cache:
+            self._cache = _UNSET
+        if self.config.get("trace") != old_trace and self._tracer is not _UNSET:
+            self._tracer.close()
+            self._tracer = _UNSET
+        if self.completer is not None:
+            self.completer.invalidate("projects")
+        return True
+
+    def _create_cache(self) -> Optional[ResponseCache]:
+        """Create the response cache from the ``cache`` config section."""
+        settings = self.config.get("cache", {})
+        if not settings.get("enabled", True):
+            return None
+        return ResponseCache(
+            directory=os.path.join(os.path.dirname(self.config_path), "cache"),
+            memory_entries=settings.get("memory_entries", 256),
+            max_disk_bytes=settings.get("max_disk_bytes", 64 * 1024 * 1024),
+            ttl=settings.get("ttl", 7 * 24 * 3600),
+        )
+
+    def _open_snippets(self) -> Any:
+        """Open the snippet library, migrating snippets kept in the config."""
+        from adam_x_snippets import SnippetStore
+        snippets = SnippetStore(os.path.join(os.path.dirname(self.config_path), "snippets.db"))
+        legacy = self.config.get("snippets")
+        if legacy:
+            snippets.import_dict(legacy)
+        if "snippets" in self.config:
+            self.store.delete(["snippets"])
+        return snippets
+
     def save_config(self) -> None:
         """Save current configuration to file."""
-        with open(self.config_path, 'w') as f:
-            json.dump(self.config, f, indent=2)
+        self.store.replace(self.config)
+
+    def _update_config(self, path: List[str], value: Any) -> None:
+        """Change one config entry through the journal instead of a full save."""
+        self.store.set(path, value)
 
     def run(self) -> None:
         """Main loop for the Adam-X agent."""
+        readline = _init_readline()
+        if readline is not None:
+            self._load_readline_history(readline)
+            self._install_completer(readline)
         while True:
             try:
+                self.report_finished_jobs()
                 cmd = input("\n> ").strip()
-                self.history.append(cmd)
+                self._add_history(cmd, readline)
 
                 if cmd.lower() == "exit" or cmd.lower() == "quit":
+                    self.close_jobs()
+                    self.stop_watching()
+                    self.export_stats(force=True)
+                    if self._tracer is not _UNSET:
+                        self.tracer.close()
+                    if self.recorder is not None:
+                        self.recorder.close()
+                    if self._history is not _UNSET:
+                        self.history.close()
+                    self.store.flush()
                     print("Goodbye! Happy coding!")
                     break
 
-                self.process_command(cmd)
+                if self.recorder is not None:
+                    with self.recorder.capture(cmd):
+                        self.process_command(cmd)
+                else:
+                    self.process_command(cmd)
 
             except KeyboardInterrupt:
                 print("\nUse 'exit' to quit Adam-X.")
             except Exception as e:
                 print(f"Error: {str(e)}")
 
+    def _load_readline_history(self, readline: Any) -> None:
+        """Give readline the newest distinct commands for the arrow keys and Ctrl-R."""
+        limit = self.config.get("history", {}).get("readline_entries", 1000)
+        try:
+            readline.clear_history()
+            for command in reversed(self.history.recent(limit)):
+                readline.add_history(command)
+        except AttributeError:
+            # pyreadline3 lacks some of these
+            pass
+
+    def _install_completer(self, readline: Any) -> None:
+        """Complete commands, snippets, projects and files on Tab."""
+        from adam_x_complete import Completer
+        completer = Completer(self, self.config.get("completion", {}).get("max_matches", 200))
+        try:
+            completer.install(readline)
+        except AttributeError:
+            # pyreadline3 lacks some of these
+            return
+        self.completer = completer
+        # Build the tries now so that the first Tab is as fast as the rest
+        threading.Thread(target=completer.preload, name="adam-x-complete", daemon=True).start()
+
+    def _add_history(self, cmd: str, readline: Any) -> None:
+        """Record a REPL command, keeping readline's own history bounded."""
+        if not cmd:
+            return
+        self.history.append(cmd)
+        if readline is None:
+            return
+        limit = self.config.get("history", {}).get("readline_entries", 1000)
+        try:
+            while readline.get_current_history_length() > limit:
+                readline.remove_history_item(0)
+        except AttributeError:
+            pass
+
     def process_command(self, cmd: str) -> None:
         """Process user commands."""
-        cmd_lower = cmd.lower()
-
-        # Basic commands
-        if cmd_lower == "help":
-            self.show_help()
-        elif cmd_lower.startswith("create "):
-            self.create_file(cmd[7:].strip())
-        elif cmd_lower.startswith("explain "):
-            self.explain_code(cmd[8:].strip())
-        elif cmd_lower.startswith("optimize "):
-            self.optimize_code(cmd[9:].strip())
-        elif cmd_lower.startswith("search "):
-            self.search_documentation(cmd[7:].strip())
-        elif cmd_lower.startswith("debug "):
-            self.debug_code(cmd[6:].strip())
-        elif cmd_lower == "projects":
-            self.list_projects()
-        elif cmd_lower.startswith("project "):
-            self.switch_project(cmd[8:].strip())
-        elif cmd_lower.startswith("snippet "):
-            parts = cmd[8:].strip().split(" ", 1)
-            if len(parts) >= 2:
-                self.save_snippet(parts[0], parts[1])
-            else:
-                print("Usage: snippet <name> <code>")
-        elif cmd_lower.startswith("use "):
-            self.use_snippet(cmd[4:].strip())
-        else:
-            self.generate_code(cmd)
+        cmd = cmd.strip()
+        request = self._background_request(cmd)
+        if request is not None:
+            self.start_job(request)
+            return
+
+        try:
+            with self.tracer.span("command") as span:
+                command, argument = self._resolve(cmd)
+                with self._dispatching(command.name if command else "generate", span):
+                    if command is None:
+                        self.generate_code(cmd)
+                    else:
+                        command.run(self, argument)
+        finally:
+            self.export_stats()
+
+    def ask(self, prompt: str) -> str:
+        """Read an answer for an interactive command from the user.
+
+        Raises InputRequired when the command runs without a user to ask,
+        as in the engine, batch mode and the daemon.
+        """
+        if not getattr(self._request_state, "interactive", True):
+            raise InputRequired(f"Cannot ask \"{prompt.strip()}\" outside the interactive REPL")
+        return input(prompt)
+
+    def _background_request(self, cmd: str) -> Optional[str]:
+        """Return the request of ``<model request> &``, or None for any other line.
+
+        Only a natural-language request or a command answered by the
+        backend, with an argument, runs in the background. Where the ``&``
+        fits the command's argument (``snippet name sleep 10 &``) it stays
+        part of it; commands taking no argument go to ``start_job`` to be
+        refused.
+        """
+        if len(cmd) < 3 or not cmd.endswith("&") or not cmd[-2].isspace():
+            return None
+        request = cmd[:-1].rstrip()
+        command, argument = COMMANDS.resolve(request)
+        if command is None:
+            # A command word whose argument is missing is not a generation request
+            return None if COMMANDS.get(request.partition(" ")[0]) else request
+        if command.action and argument:
+            return request
+        return request if COMMANDS.resolve(cmd)[0] is None else None
+
+    def _resolve(self, cmd: str) -> Tuple[Optional[Command], str]:
+        """Resolve a command line to its command and argument."""
+        with self.tracer.span("parse"):
+            return COMMANDS.resolve(cmd)
+
+    @contextlib.contextmanager
+    def _dispatching(self, name: str, span: Any) -> Any:
+        """Measure and trace running the command ``name`` under the root ``span``."""
+        span.set("command", name)
+        with self.stats.measure(name), self.tracer.span("dispatch"):
+            yield
 
     def show_help(self) -> None:
         """Display help information."""
         print("\nAdam-X Commands:")
-        print("  help               - Show this help message")
-        print("  create <filename>  - Create a new file")
-        print("  explain <code>     - Explain what code does")
-        print("  optimize <code>    - Suggest optimizations for code")
-        print("  search <query>     - Search documentation")
-        print("  debug <code>       - Debug code and suggest fixes")
-        print("  projects           - List your projects")
-        print("  project <name>     - Switch to or create a project")
-        print("  snippet <name> <code> - Save a code snippet")
-        print("  use <name>         - Use a saved snippet")
-        print("  exit               - Quit Adam-X")
+        commands = COMMANDS.commands()
+        width = max(len(command.usage) for command in commands)
+        for command in commands:
+            print(f"  {command.usage:<{width}} - {command.description}")
+        print(f"  {'exit':<{width}} - Quit Adam-X")
         print("\nYou can also just describe what you want to do in natural language.")
 
     def create_file(self, filename: str) -> None:
@@ -172,38 +495,85 @@ class AdamX:
             print("Please specify a filename.")
             return
 
-        # Determine language from extension
-        ext = os.path.splitext(filename)[1]
-        language = None
+        language = (self.scaffolder.language_for(filename)
+                    or self.config["preferences"]["preferred_language"])
+        try:
+            content = self.scaffolder.render(filename, language, self._template_values())
+            # One file written in place, as before; the temporary file and
+            # rename of scaffold's atomic writes would cost more than the write
+            with open(filename, 'w', encoding="utf-8") as f:
+                f.write(content)
+            print(f"Created file: {filename}")
+        except Exception as e:
+            print(f"Error creating file: {str(e)}")
 
-        for lang, info in self.languages.items():
-            if info["ext"] == ext:
-                language = lang
-                break
+    def _template_values(self) -> Dict[str, str]:
+        """Return the variables every template can use."""
+        return {"author": self.config.get("user_name", ""),
+                "date": time.strftime('%Y-%m-%d %H:%M:%S')}
 
-        if not language:
-            language = self.config["preferences"]["preferred_language"]
+    def scaffold_command(self, argument: str) -> None:
+        """Handle 'scaffold [--dry-run] [--force] [--into DIR] <spec> [name=value ...]'.
 
-        # Create file with template
+        Generates the files of a JSON or YAML spec (see adam_x_scaffold)
+        under DIR, by default the working directory. Existing files with
+        other content are only replaced with --force; --dry-run shows the
+        changes as a diff and writes nothing.
+        """
+        import shlex
+        from adam_x_scaffold import diff, load_spec, write
+        usage = f"Usage: {COMMANDS.get('scaffold').usage}"
+        dry_run = force = False
+        root = "."
         try:
-            with open(filename, 'w') as f:
-                comment = self.languages.get(language, {"comment": "# "})["comment"]
-                f.write(f"{comment}Created by Adam-X on {time.strftime('%Y-%m-%d %H:%M:%S')}\n")
-                f.write(f"{comment}Author: {self.config['user_name']}\n\n")
-
-                # Add language-specific template
-                if language == "python":
-                    f.write('"""Main module."""\n\n')
-                    f.write('def main():\n    """Main function."""\n    print("Hello, World!")\n\n')
-                    f.write('if __name__ == "__main__":\n    main()\n')
-                elif language in ["javascript", "typescript"]:
-                    f.write('/**\n * Main module\n */\n\n')
-                    f.write('function main() {\n    console.log("Hello, World!");\n}\n\n')
-                    f.write('main();\n')
+            words = shlex.split(argument)
+            while words and words[0] in ("--dry-run", "--force", "--into"):
+                option = words.pop(0)
+                if option == "--dry-run":
+                    dry_run = True
+                elif option == "--force":
+                    force = True
+                else:
+                    root = words.pop(0)
+        except (ValueError, IndexError):
+            print(usage)
+            return
+        if not words or any("=" not in word for word in words[1:]):
+            print(usage)
+            return
 
-            print(f"Created file: {filename}")
-        except Exception as e:
-            print(f"Error creating file: {str(e)}")
+        values = self._template_values()
+        values.update(word.split("=", 1) for word in words[1:])
+        try:
+            files = self.scaffolder.plan(load_spec(words[0]), values)
+        except OSError as e:
+            print(f"Error reading spec: {str(e)}")
+            return
+        except ValueError as e:
+            print(f"Error: {str(e)}")
+            return
+        root = os.path.expanduser(root)
+
+        if dry_run:
+            counts = {"new": 0, "changed": 0, "unchanged": 0}
+            for path, status, text in diff(root, files):
+                counts[status] += 1
+                if text:
+                    print(text, end="")
+            print(f"Would create {counts['new']} file(s), "
+                  f"{'replace' if force else 'skip'} {counts['changed']} changed, "
+                  f"leave {counts['unchanged']} unchanged.")
+            return
+
+        result = write(root, files, overwrite=force)
+        for path, error in result["failed"]:
+            print(f"Error writing {path}: {error}")
+        print(f"Created {len(result['created'])} file(s), updated {len(result['updated'])}, "
+              f"{len(result['unchanged'])} unchanged in {result['seconds'] * 1000:.1f} ms.")
+        if result["skipped"]:
+            print(f"Skipped {len(result['skipped'])} existing file(s) with other content "
+                  f"(use --force to replace them): {', '.join(result['skipped'][:5])}"
+                  f"{' ...' if len(result['skipped']) > 5 else ''}")
 
     def explain_code(self, code: str) -> None:
         """Explain what the given code does."""
@@ -212,25 +582,39 @@ class AdamX:
             return
 
         print("\nCode Explanation:")
-        print("This code appears to " + self._simulate_ai_response("explain", code))
+        from adam_x_refs import is_reference
+        prefix = "" if is_reference(code) else "This code appears to "
+        self._stream_ai_response("explain", code, prefix=prefix)
 
-    def optimize_code(self, code: str) -> None:
-        """Suggest optimizations for the given code."""
+    def optimize_code(self, code: str, profile: Any = None) -> None:
+        """Suggest optimizations for the given code.
+
+        With a ``profile`` (an ``adam_x_profile.ProfileResult``), findings on
+        the measured hot spots come first.
+        """
         if not code:
             print("Please provide code to optimize.")
             return
 
         print("\nOptimization Suggestions:")
-        print(self._simulate_ai_response("optimize", code))
+        self._stream_ai_response("optimize", code, profile=profile)
 
     def search_documentation(self, query: str) -> None:
-        """Search documentation for the given query."""
+        """Search documentation for the given query.
+
+        Searches the current project's source and docs locally; without a
+        project, the question goes to the backend.
+        """
         if not query:
             print("Please provide a search query.")
             return
 
+        if self.project_index() is not None:
+            self._search_project(query)
+            return
+
         print(f"\nSearch results for '{query}':")
-        print(self._simulate_ai_response("search", query))
+        self._stream_ai_response("search", query)
 
     def debug_code(self, code: str) -> None:
         """Debug code and suggest fixes."""
@@ -239,7 +623,25 @@ class AdamX:
             return
 
         print("\nDebugging Results:")
-        print(self._simulate_ai_response("debug", code))
+        self._stream_ai_response("debug", code)
+
+    def _search_project(self, query: str, limit: int = 10) -> None:
+        """Print the best BM25 matches for a query in the current project."""
+        if self._ready_index() is None:
+            return
+        search = self.search_index()
+        results = search.search(query, limit)
+        if not results:
+            print(f"No matches for '{query}' in project {self.current_project}.")
+            return
+
+        print(f"\nSearch results for '{query}' in {self.current_project}:")
+        for path, score in results:
+            line, text = search.snippet(path, query)
+            location = f"{path}:{line}" if line else path
+            print(f"  {location}  ({score:.2f})")
+            if text:
+                print(f"      {text}")
 
     def list_projects(self) -> None:
         """List all projects."""
@@ -264,12 +666,12 @@ class AdamX:
 
         if name in projects:
             self.current_project = name
-            self.config["last_project"] = name
-            self.save_config()
+            self._update_config(["last_project"], name)
             print(f"Switched to project: {name}")
+            self._start_indexing(name)
         else:
             # Create new project
-            path = input(f"Enter path for new project '{name}': ").strip()
+            path = self.ask(f"Enter path for new project '{name}': ").strip()
             if not path:
                 path = os.path.join(os.getcwd(), name)
 
@@ -280,12 +682,192 @@ class AdamX:
                     print(f"Error creating directory: {str(e)}")
                     return
 
-            projects[name] = path
             self.current_project = name
-            self.config["projects"] = projects
-            self.config["last_project"] = name
-            self.save_config()
+            self._update_config(["projects", name], path)
+            self._update_config(["last_project"], name)
+            if self.completer is not None:
+                self.completer.add("projects", [name])
             print(f"Created and switched to project: {name}")
+            self._start_indexing(name)
+
+    def project_index(self, name: Optional[str] = None) -> Any:
+        """Return the file index of a project (default: the current one), or None."""
+        name = name or self.current_project
+        root = self.config.get("projects", {}).get(name) if name else None
+        if root is None:
+            return None
+
+        with self._init_lock:
+            index = self._indexes.get(name)
+            if index is None or index.root != os.path.abspath(root):
+                import hashlib
+                from adam_x_index import ProjectIndex
+                directory = os.path.join(os.path.dirname(self.config_path), "indexes")
+                os.makedirs(directory, exist_ok=True)
+                digest = hashlib.sha1(os.path.abspath(root).encode("utf-8")).hexdigest()[:16]
+                index = ProjectIndex(root, os.path.join(directory, f"{digest}.db"), self.languages)
+                self._indexes[name] = index
+                self._search_indexes.pop(name, None)
+        return index
+
+    def search_index(self, name: Optional[str] = None) -> Any:
+        """Return the full-text index of a project (default: the current one), or None."""
+        name = name or self.current_project
+        index = self.project_index(name)
+        if index is None:
+            return None
+
+        with self._init_lock:
+            search = self._search_indexes.get(name)
+            if search is None:
+                from adam_x_search import SearchIndex
+                search = SearchIndex(index.root, index.path[:-len(".db")] + ".search.db")
+                self._search_indexes[name] = search
+        return search
+
+    def _start_indexing(self, name: str) -> None:
+        """Watch a project and bring its indexes up to date in a background thread."""
+        self.stop_watching()
+        if self.project_index(name) is None:
+            return
+        thread = threading.Thread(target=self._watch_and_index, args=(name,),
+                                  name=f"adam-x-index-{name}", daemon=True)
+        self._index_threads[name] = thread
+        thread.start()
+
+    def _watch_and_index(self, name: str) -> None:
+        # Start watching first so that nothing changed during the scan is missed
+        try:
+            self._start_watching(name)
+        except Exception as e:
+            print(f"Error watching project: {str(e)}")
+        self._update_index(name)
+
+    def _start_watching(self, name: str) -> None:
+        """Feed file changes in a project into its indexes, per the ``watch`` config section."""
+        settings = self.config.get("watch", {})
+        if not settings.get("enabled", True):
+            return
+
+        from adam_x_watch import UpdateQueue, create_watcher
+        queue = UpdateQueue(lambda paths: self._apply_changes(name, paths),
+                            debounce=settings.get("debounce", 0.2),
+                            max_delay=settings.get("max_delay", 2.0))
+        try:
+            watcher = create_watcher(self.project_index(name).root, queue,
+                                     backend=settings.get("backend", "auto"),
+                                     poll_interval=settings.get("poll_interval", 2.0))
+        except Exception:
+            queue.stop()
+            raise
+        with self._init_lock:
+            previous, self._watcher = self._watcher, watcher
+        if previous is not None:
+            previous.stop()
+            previous.queue.stop()
+
+    def stop_watching(self) -> None:
+        """Stop the file watcher of the current project, if any."""
+        with self._init_lock:
+            watcher, self._watcher = self._watcher, None
+        if watcher is not None:
+            watcher.stop()
+            watcher.queue.stop()
+
+    def _apply_changes(self, name: str, paths: Optional[List[str]]) -> None:
+        """Apply a batch of changed paths (None: re-examine everything) to a project's indexes."""
+        if paths is None:
+            self._update_index(name)
+            return
+        changes = self.project_index(name).update(paths)
+        if self.completer is not None:
+            self.completer.update_files(name, changes)
+        search = self.search_index(name)
+        search.update_files([(path, digest) for path, digest, language in changes["updated"]
+                             if search.wants(path, language)], changes["deleted"])
+
+    def _update_index(self, name: str) -> None:
+        """Update a project's file index, then its full-text index from it."""
+        try:
+            index = self.project_index(name)
+            changes = index.update()
+            if self.completer is not None:
+                self.completer.update_files(name, changes)
+            search = self.search_index(name)
+            search.update((path, digest) for path, digest, language in index.files()
+                          if search.wants(path, language))
+        except Exception as e:
+            print(f"Error indexing project: {str(e)}")
+
+    def _ready_index(self) -> Any:
+        """Return the current project's index once it is up to date, or None."""
+        index = self.project_index()
+        if index is None:
+            print("No current project. Switch to one with 'project <name>'.")
+            return None
+
+        thread = self._index_threads.get(self.current_project)
+        if thread is not None and thread.is_alive():
+            print("Indexing project files...")
+            thread.join()
+        elif index.last_update is None:
+            # First use this session; catch up with changes made since the last one
+            self._update_index(self.current_project)
+        return index
+
+    def show_status(self) -> None:
+        """Show the current project's index and file watcher status."""
+        print("\nAdam-X Status:")
+        print(f"  Project:        {self.current_project or '(none)'}")
+        index = self.project_index()
+        if index is not None:
+            thread = self._index_threads.get(self.current_project)
+            if thread is not None and thread.is_alive():
+                print("  Index:          building...")
+            else:
+                stats = index.stats()
+                print(f"  Index:          {stats['files']} files, {stats['symbols']} symbols, "
+                      f"{len(self.search_index())} searchable")
+
+        watcher = self._watcher
+        if watcher is None:
+            print("  Watcher:        off")
+        else:
+            stats = watcher.stats()
+            print(f"  Watcher:        {stats['kind']}"
+                  + (f" ({stats['watched_dirs']} directories)" if "watched_dirs" in stats else ""))
+            print(f"  Watcher CPU:    {stats['cpu_seconds']:.3f}s ({stats['cpu_percent']:.2f}%), "
+                  f"index updates {stats['update_cpu_seconds']:.3f}s")
+            print(f"  Events:         {stats['events']} in {stats['batches']} batches, "
+                  f"{stats['pending']} pending")
+            print(f"  Event lag:      last {stats['last_lag'] * 1000:.0f} ms, "
+                  f"mean {stats['mean_lag'] * 1000:.0f} ms, max {stats['max_lag'] * 1000:.0f} ms")
+            if stats["errors"]:
+                print(f"  Update errors:  {stats['errors']}")
+
+        if self._jobs is not _UNSET:
+            print(f"  Jobs running:   {len(self.jobs.running())}")
+
+    def find_command(self, name: str) -> None:
+        """Find files and symbols in the current project by name."""
+        index = self._ready_index()
+        if index is None:
+            return
+
+        files = index.find_files(name)
+        symbols = index.find_symbols(name)
+        if not files and not symbols:
+            print(f"Nothing named '{name}' in project {self.current_project}.")
+            return
+
+        if files:
+            print("\nFiles:")
+            for path in files:
+                print(f"  {path}")
+        if symbols:
+            print("\nSymbols:")
+            for symbol, kind, path, line in symbols:
+                print(f"  {symbol} ({kind}) {path}:{line}")
 
     def save_snippet(self, name: str, code: str) -> None:
         """Save a code snippet."""
@@ -293,10 +875,9 @@ class AdamX:
             print("Please provide both a name and code.")
             return
 
-        snippets = self.config.get("snippets", {})
-        snippets[name] = code
-        self.config["snippets"] = snippets
-        self.save_config()
+        self.snippets.put(name, code)
+        if self.completer is not None:
+            self.completer.add("snippets", [name])
         print(f"Saved snippet: {name}")
 
     def use_snippet(self, name: str) -> None:
@@ -305,13 +886,250 @@ class AdamX:
             print("Please specify a snippet name.")
             return
 
-        snippets = self.config.get("snippets", {})
-
-        if name in snippets:
+        code = self.snippets.get(name)
+        if code is not None:
             print(f"\nSnippet '{name}':")
-            print(snippets[name])
+            print(code)
+            return
+
+        print(f"Snippet '{name}' not found.")
+        suggestions = self.snippets.names(prefix=name, limit=5)
+        for match in self.snippets.fuzzy(name):
+            if match not in suggestions:
+                suggestions.append(match)
+        if suggestions:
+            print("Did you mean: " + ", ".join(suggestions[:5]) + "?")
+
+    def list_snippets(self, query: str = "") -> None:
+        """List saved snippets, or search their names and code."""
+        if not query:
+            names = self.snippets.names(limit=50)
+            if not names:
+                print("No snippets saved. Save one with 'snippet <name> <code>'.")
+                return
+            total = len(self.snippets)
+            print(f"\nYour Snippets ({total}):")
+            for name in names:
+                print(f"- {name}")
+            if total > len(names):
+                print(f"... and {total - len(names)} more. Use 'snippets <text>' to search.")
+            return
+
+        results = self.snippets.search(query)
+        if not results:
+            print(f"No snippets match '{query}'.")
+            return
+        print(f"\nSnippets matching '{query}':")
+        for name, excerpt in results:
+            print(f"- {name}: {' '.join(excerpt.split())}")
+
+    def snippet_command(self, argument: str) -> None:
+        """Handle 'snippet <name> <code>'."""
+        parts = argument.split(" ", 1)
+        if len(parts) >= 2:
+            self.save_snippet(parts[0], parts[1])
+        else:
+            print("Usage: snippet <name> <code>")
+
+    def cache_command(self, argument: str) -> None:
+        """Handle 'cache' and 'cache clear'."""
+        if not argument:
+            self.show_cache_stats()
+        elif argument.lower() == "clear":
+            self.clear_cache()
+        else:
+            print("Usage: cache [clear]")
+
+    def show_cache_stats(self) -> None:
+        """Display response cache hit/miss counters."""
+        if self.cache is None:
+            print("Response cache is disabled.")
+            return
+
+        stats = self.cache.stats()
+        print("\nResponse Cache:")
+        print(f"  Memory hits: {stats['memory_hits']}")
+        print(f"  Disk hits:   {stats['disk_hits']}")
+        print(f"  Misses:      {stats['misses']}")
+        print(f"  Hit rate:    {stats['hit_rate']:.1%}")
+        print(f"  Entries:     {stats['memory_entries']} in memory, "
+              f"{stats['disk_entries']} on disk ({stats['disk_bytes']} bytes)")
+
+    def stats_command(self, argument: str) -> None:
+        """Handle 'stats', 'stats reset' and 'stats export <path>'."""
+        action, _, path = argument.partition(" ")
+        if not argument:
+            print()
+            print(self.stats.format())
+        elif action.lower() == "reset":
+            self.stats.reset()
+            print("Statistics reset.")
+        elif action.lower() == "export" and path.strip():
+            try:
+                self.stats.write_textfile(path.strip())
+                print(f"Statistics written to {path.strip()}")
+            except OSError as e:
+                print(f"Error writing statistics: {str(e)}")
         else:
-            print(f"Snippet '{name}' not found.")
+            print("Usage: stats [reset|export <path>]")
+
+    def history_command(self, argument: str = "") -> None:
+        """Handle 'history', 'history clear' and 'history <text>'."""
+        if argument == "clear":
+            self.history.clear()
+            print("History cleared.")
+        elif argument:
+            ranked = self.history.ranked(argument)
+            if not ranked:
+                print(f"No commands in history match '{argument}'.")
+                return
+            print(f"\nCommands matching '{argument}', by frequency and recency:")
+            for command, uses, _ in ranked:
+                print(f"  {uses:>5}  {command}")
+        else:
+            entries = list(itertools.islice(self.history.entries(), 20))
+            if not entries:
+                print("No commands in history.")
+                return
+            print(f"\nRecent commands ({len(self.history)} in history):")
+            for entry in reversed(entries):
+                when = time.strftime('%Y-%m-%d %H:%M', time.localtime(entry.time))
+                print(f"  {when}  {entry.command}")
+
+    def export_stats(self, force: bool = False) -> None:
+        """Write the Prometheus textfile set in the ``stats`` config section, if any.
+
+        Written at most once per ``textfile_interval`` seconds unless ``force``.
+        """
+        if self._stats is _UNSET:
+            return
+        settings = self.config.get("stats", {})
+        path = settings.get("textfile")
+        if not path:
+            return
+        now = time.monotonic()
+        if not force and now - self._stats_written < settings.get("textfile_interval", 15):
+            return
+        self._stats_written = now
+        try:
+            self.stats.write_textfile(path)
+        except OSError as e:
+            print(f"Error writing statistics: {str(e)}")
+
+    def clear_cache(self) -> None:
+        """Remove all cached responses."""
+        if self.cache is not None:
+            self.cache.clear()
+        print("Response cache cleared.")
+
+    def start_job(self, cmd: str) -> None:
+        """Run a model request in the background."""
+        command, argument = COMMANDS.resolve(cmd)
+        known = command or COMMANDS.get(cmd.partition(" ")[0])
+        if not cmd or (known is not None and known.action and (command is None or not argument)):
+            print(f"Usage: {known.usage if known else '<request>'} &")
+            return
+        request = self._backend_request(command, argument, cmd)
+        if request is None:
+            print("Only model requests (explain, optimize, search, debug and code "
+                  "generation) can run in the background.")
+            return
+
+        async def collect(job: Any) -> None:
+            with self.tracer.span("command", job=job.id) as span:
+                with self._dispatching(command.name if command else "generate", span):
+                    async for chunk in self._response_chunks(*request):
+                        job.chunks.append(chunk)
+
+        job = self.jobs.submit(cmd, collect)
+        print(f"[{job.id}] {cmd}")
+
+    def list_jobs(self) -> None:
+        """List background jobs."""
+        if self._jobs is _UNSET or not self.jobs.jobs():
+            print("No background jobs.")
+            return
+
+        print("\nBackground jobs:")
+        for job in self.jobs.jobs():
+            print(f"  [{job.id}] {job.status:<9} {job.elapsed:6.1f}s "
+                  f"{len(job.output):>6} chars  {job.command}")
+
+    def wait_command(self, argument: str) -> None:
+        """Wait for one background job (or all of them) and show the results."""
+        if argument:
+            job = self._find_job(argument)
+            if job is None:
+                return
+            jobs = [job]
+        else:
+            jobs = self.jobs.jobs() if self._jobs is not _UNSET else []
+            if not jobs:
+                print("No background jobs.")
+                return
+
+        for job in jobs:
+            try:
+                self.jobs.wait(job)
+            except KeyboardInterrupt:
+                print(f"\nStopped waiting; job [{job.id}] is still running.")
+                return
+            self._show_job(job)
+
+    def cancel_job(self, argument: str) -> None:
+        """Cancel a background job, or all of them with 'cancel all'."""
+        if argument == "all":
+            jobs = self.jobs.running() if self._jobs is not _UNSET else []
+            for job in jobs:
+                self.jobs.cancel(job.id)
+            print(f"Cancelled {len(jobs)} job(s).")
+            return
+
+        job = self._find_job(argument)
+        if job is None:
+            return
+        if self.jobs.cancel(job.id):
+            print(f"Cancelled job [{job.id}].")
+        else:
+            print(f"Job [{job.id}] has already finished.")
+
+    def report_finished_jobs(self) -> None:
+        """Announce background jobs that finished since the last prompt."""
+        if self._jobs is _UNSET:
+            return
+        for job in self.jobs.unreported():
+            hint = f" (use 'wait {job.id}' to see the result)" if job.status == "done" else ""
+            print(f"[{job.id}] {job.status.capitalize()}: {job.command}{hint}")
+            if job.status == "cancelled":
+                self.jobs.discard(job)
+
+    def close_jobs(self) -> None:
+        """Cancel running background jobs and stop their event loop."""
+        if self._jobs is _UNSET:
+            return
+        running = self.jobs.running()
+        if running:
+            print(f"Cancelling {len(running)} running job(s).")
+        self.jobs.close()
+
+    def _find_job(self, argument: str) -> Any:
+        job = None
+        if argument.lstrip("%").isdigit() and self._jobs is not _UNSET:
+            job = self.jobs.get(int(argument.lstrip("%")))
+        if job is None:
+            print(f"No job '{argument}'. Use 'jobs' to list background jobs.")
+        return job
+
+    def _show_job(self, job: Any) -> None:
+        print(f"\n[{job.id}] {job.command}")
+        if job.status == "failed":
+            print(f"Backend error: {str(job.error)}")
+        elif job.status == "cancelled":
+            print("Cancelled.")
+        else:
+            print(job.output)
+        job.reported = True
+        self.jobs.discard(job)
 
     def generate_code(self, description: str) -> None:
         """Generate code based on natural language description."""
@@ -319,189 +1137,705 @@ class AdamX:
             return
 
         print("\nGenerating code based on your description...")
-        print(self._simulate_ai_response("generate", description))
+        self._stream_ai_response("generate", description)
 
-    def _simulate_ai_response(self, action: str, input_text: str) -> str:
-        """Simulate AI responses based on the action and input."""
-        # In a real implementation, this would call an actual AI model
-        # This is a simplified simulation for demonstration
-
-        time.sleep(0.5)  # Simulate thinking time
-
-        if action == "explain":
-            return (
-                "processes data by iterating through a collection, "
-                "applying transformations, and returning the results. "
-                "It uses standard control flow patterns and seems to handle "
-                "edge cases appropriately."
-            )
-        elif action == "optimize":
-            return (
-                "1. Consider using list comprehension instead of the explicit for loop\n"
-                "2. The nested conditional statements could be simplified\n"
-                "3. There's a potential memory leak in the resource handling\n"
-                "4. For large inputs, consider processing in batches"
-            )
-        elif action == "search":
-            return (
-                "Found several relevant documentation pages:\n"
-                "- Official API reference for the requested function\n"
-                "- Community tutorial with practical examples\n"
-                "- Stack Overflow thread addressing common issues"
-            )
-        elif action == "debug":
-            return (
-                "I found a few potential issues:\n"
-                "1. Missing variable initialization on line 3\n"
-                "2. Potential off-by-one error in the loop condition\n"
-                "3. Exception handling is too broad, consider catching specific exceptions\n"
-                "4. The function might return None implicitly in some cases"
-            )
-        elif action == "generate":
-            lang = self.config["preferences"]["preferred_language"]
-            if "python" in input_text.lower() or lang == "python":
-                return (
-                    "```python\n"
-                    "def process_data(items):\n"
-                    "    \"\"\"\n"
-                    "    Process a collection of items and return transformed results.\n"
-                    "    \n"
-                    "    Args:\n"
-                    "        items: Iterable of items to process\n"
-                    "        \n"
-                    "    Returns:\n"
-                    "        List of processed items\n"
-                    "    \"\"\"\n"
-                    "    results = []\n"
-                    "    for item in items:\n"
-                    "        if not item:\n"
-                    "            continue\n"
-                    "            \n"
-                    "        # Transform the item based on its properties\n"
-                    "        processed = transform_item(item)\n"
-                    "        results.append(processed)\n"
-                    "        \n"
-                    "    return results\n"
-                    "\n"
-                    "def transform_item(item):\n"
-                    "    \"\"\"\n"
-                    "    Apply transformations to a single item.\n"
-                    "    \"\"\"\n"
-                    "    # Example transformation\n"
-                    "    if isinstance(item, dict):\n"
-                    "        return {k: v.upper() if isinstance(v, str) else v \n"
-                    "                for k, v in item.items()}\n"
-                    "    elif isinstance(item, str):\n"
-                    "        return item.upper()\n"
-                    "    else:\n"
-                    "        return item\n"
-                    "```"
+    def _backend_request(self, command: Optional[Command], argument: str,
+                         cmd: str) -> Optional[Tuple[str, str]]:
+        """Return the (action, input) a command sends to the backend, if any."""
+        if command is None:
+            return "generate", cmd
+        if command.action == "search" and self.project_index() is not None:
+            # Answered by the local project search
+            return None
+        if command.action:
+            return command.action, argument
+        return None
+
+    def _cache_key(self, action: str, input_text: str, context: str = "") -> Optional[str]:
+        """Return the response cache key for a request, if it is cacheable."""
+        if self.cache is None or action not in CACHEABLE_ACTIONS:
+            return None
+        lang = self.config["preferences"]["preferred_language"]
+        return make_key(action, input_text, lang, self.backend.model_id, context)
+
+    def context_builder(self) -> Any:
+        """Return the context builder for the current project, or None.
+
+        Configured by the ``context`` config section; disabled there or
+        without a current project.
+        """
+        settings = self.config.get("context", {})
+        index = self.project_index()
+        if index is None or not settings.get("enabled", True):
+            return None
+
+        with self._init_lock:
+            builder = self._context_builders.get(self.current_project)
+            if builder is None or builder.index is not index:
+                from adam_x_context import ContextBuilder
+                builder = ContextBuilder(
+                    index, self.search_index(),
+                    max_tokens=settings.get("max_tokens", 2000),
+                    max_bytes=settings.get("max_bytes", 16 * 1024),
+                    max_files=settings.get("max_files", 8),
                 )
+                self._context_builders[self.current_project] = builder
+        return builder
+
+    def _request_context(self, action: str, input_text: str, exclude: Optional[str] = None) -> str:
+        """Return the project context to send with a request ("" if none)."""
+        if action not in CONTEXT_ACTIONS:
+            return ""
+        builder = self.context_builder()
+        if builder is None:
+            return ""
+        with self.tracer.span("context") as span:
+            context = builder.render(input_text, self.config["preferences"]["preferred_language"],
+                                     exclude)
+            span.set("bytes", len(context))
+        return context
+
+    def show_context(self, text: str) -> None:
+        """Show the project context that would be sent with a request."""
+        builder = self.context_builder()
+        if builder is None:
+            print("No project context: switch to a project with 'project <name>'.")
+            return
+
+        chunks = builder.build(text, self.config["preferences"]["preferred_language"])
+        if not chunks:
+            print("No related project files found.")
+            return
+
+        print("\nContext for this request:")
+        for chunk in chunks:
+            print(f"  {chunk.path}:{chunk.start}-{chunk.end}  ~{chunk.tokens} tokens  "
+                  f"(score {chunk.score:.2f})")
+        stats = builder.last_stats
+        print(f"\n  {stats['tokens']}/{builder.max_tokens} tokens, "
+              f"{stats['bytes']}/{builder.max_bytes} bytes from {stats['files']} of "
+              f"{stats['candidates']} candidate files ({stats['ms']:.1f} ms)")
+
+    def profile_command(self, argument: str) -> None:
+        """Handle 'profile [--memory] [--timeout SECONDS] <script> [args]'.
+
+        Runs the script under the profiler, shows where it spent its time,
+        and then optimizes it with the hot spots ranked first. Defaults come
+        from the ``profile`` config section.
+        """
+        import shlex
+        usage = "Usage: profile [--memory] [--timeout SECONDS] <script> [args]"
+        settings = self.config.get("profile", {})
+        memory = settings.get("memory", False)
+        timeout = settings.get("timeout", 60)
+        try:
+            words = shlex.split(argument)
+            while words and words[0] in ("--memory", "--timeout"):
+                option = words.pop(0)
+                if option == "--memory":
+                    memory = True
+                else:
+                    timeout = float(words.pop(0))
+        except (ValueError, IndexError):
+            print(usage)
+            return
+        if not words:
+            print(usage)
+            return
+
+        # Scripts are found in the working directory, or else the current project
+        script = os.path.abspath(os.path.expanduser(words[0]))
+        index = self.project_index()
+        if not os.path.isfile(script) and index is not None:
+            script = os.path.join(index.root, os.path.expanduser(words[0]))
+        if not os.path.isfile(script):
+            print(f"Script not found: {words[0]}")
+            return
+
+        from adam_x_profile import run_profile
+        print(f"Profiling {words[0]} (timeout {timeout:g}s)...")
+        try:
+            result = run_profile(script, words[1:], memory=memory, timeout=timeout)
+        except OSError as e:
+            print(f"Error running profiler: {str(e)}")
+            return
+        print(result.summary())
+
+        try:
+            # Leave very large scripts to the summary alone
+            if os.path.getsize(script) > MAX_PROFILE_SOURCE:
+                return
+            with open(script, encoding="utf-8", errors="replace") as f:
+                source = f.read()
+        except OSError:
+            return
+        self.optimize_code(source, profile=result)
+
+    async def _response_chunks(self, action: str, input_text: str,
+                               profile: Any = None) -> AsyncIterator[str]:
+        """Yield the response for a request.
+
+        An ``@path[:start-end]`` input to explain, optimize or debug is
+        analyzed chunk by chunk, and ``project`` to debug or optimize
+        sweeps the current project; anything else is one backend request.
+        """
+        if action in SWEEP_ACTIONS and input_text.strip() == "project":
+            async for chunk in self._sweep_chunks(action):
+                yield chunk
+            return
+        if action in REFERENCE_ACTIONS and input_text.lstrip().startswith("@"):
+            from adam_x_refs import is_reference
+            if is_reference(input_text):
+                async for chunk in self._reference_chunks(action, input_text):
+                    yield chunk
+                return
+        async for chunk in self._backend_chunks(action, input_text, profile=profile):
+            yield chunk
+
+    async def _sweep_chunks(self, action: str) -> AsyncIterator[str]:
+        """Run an action over every source file of the current project and yield the report.
+
+        Per-file results stream as they complete; the full report, in path
+        order, is also saved under ``reports/`` in the config directory.
+        """
+        import asyncio
+        from adam_x_sweep import Sweep
+
+        name = self.current_project
+        index = self.project_index()
+        if index is None:
+            yield "No current project. Switch to one with 'project <name>'."
+            return
+
+        # Pick up files changed since the last sweep (the index re-reads only
+        # files whose size or mtime changed)
+        thread = self._index_threads.get(name)
+        if thread is not None and thread.is_alive():
+            await asyncio.get_running_loop().run_in_executor(None, thread.join)
+        await asyncio.get_running_loop().run_in_executor(None, self._update_index, name)
+
+        files = [(path, digest, language) for path, digest, language in index.files()
+                 if language is not None]
+        if not files:
+            yield f"No source files in project {name}."
+            return
+
+        settings = self.config.get("sweep", {})
+        sweep = Sweep(index.root, files, action, self.backend, self.cache,
+                      workers=settings.get("workers"))
+        yield f"Running {action} over {len(files)} files in {name}...\n"
+        async for path, result in sweep.run():
+            yield f"\n## {path}\n{result.rstrip()}\n"
+
+        title = f"{action.capitalize()} report: {name}"
+        directory = os.path.join(os.path.dirname(self.config_path), "reports")
+        report_path = os.path.join(directory, f"{name}-{action}.md")
+        try:
+            os.makedirs(directory, exist_ok=True)
+            with open(report_path, 'w') as f:
+                f.write(sweep.report(title))
+            saved = f"Report saved to {report_path}"
+        except OSError as e:
+            saved = f"Error saving report: {str(e)}"
+        yield f"\n{sweep.summary()}\n{saved}"
+
+    async def _reference_chunks(self, action: str, input_text: str) -> AsyncIterator[str]:
+        """Yield the responses for each chunk of a referenced file, under a header per chunk."""
+        from adam_x_index import extension_map
+        from adam_x_refs import iter_chunks, language_for, parse_reference, resolve_path
+        try:
+            reference = parse_reference(input_text)
+        except ValueError as e:
+            yield str(e)
+            return
+
+        # Paths are relative to the current project, or else the working directory
+        index = self.project_index()
+        base = index.root if index is not None else os.getcwd()
+        path = resolve_path(reference, base)
+        relative = os.path.relpath(path, base).replace(os.sep, "/")
+        exclude = relative if index is not None else None
+        language = language_for(path, extension_map(self.languages))
+
+        chunks = iter_chunks(path, reference.start, reference.end, language)
+        first = True
+        while True:
+            try:
+                start, end, text = next(chunks)
+            except StopIteration:
+                break
+            except OSError as e:
+                yield f"Cannot read {reference.path}: {e.strerror or e}"
+                return
+            separator = "" if first else "\n\n"
+            first = False
+            yield f"{separator}--- {relative}:{start}-{end} ---\n"
+            async for chunk in self._backend_chunks(action, text, exclude, language):
+                yield chunk
+        if first:
+            yield f"No lines to analyze in {reference}."
+
+    async def _backend_chunks(self, action: str, input_text: str, exclude: Optional[str] = None,
+                              language: Optional[str] = None,
+                              profile: Any = None) -> AsyncIterator[str]:
+        """Yield the backend's response to one request, serving it from the cache if possible.
+
+        ``optimize`` on Python source (``language``, default the preferred
+        language) also runs the local analyzer: its findings, ranked by the
+        hot lines of ``profile`` if given, go to the backend as context and
+        follow its answer. The backend gets the profile summary as context.
+        """
+        from adam_x_stats import note_cache, timed_stream
+        lang = self.config["preferences"]["preferred_language"]
+        findings = None
+        if action == "optimize" and (language or lang) == "python":
+            with self.tracer.span("analyze", bytes=len(input_text)):
+                findings = self.analyzer.report(input_text, profile.hot_lines() if profile else None)
+
+        context = self._request_context(action, input_text, exclude)
+        if profile is not None:
+            context = "\n\n".join(part for part in (profile.summary(), context) if part)
+        if findings is not None:
+            context = "\n\n".join(part for part in (f"Static analysis:\n{findings}", context) if part)
+        key = self._cache_key(action, input_text, context)
+        self._request_state.cache_status = "bypass"
+        cached = None
+        if key is not None:
+            with self.tracer.span("cache") as span:
+                cached = self.cache.get(key)
+                span.set("hit", cached is not None)
+            note_cache(cached is not None)
+            if cached is not None:
+                self._request_state.cache_status = "hit"
+                yield cached
             else:
-                return (
-                    "```javascript\n"
-                    "/**\n"
-                    " * Process a collection of items and return transformed results.\n"
-                    " * @param {Array} items - Items to process\n"
-                    " * @returns {Array} - Processed items\n"
-                    " */\n"
-                    "function processData(items) {\n"
-                    "    const results = [];\n"
-                    "    \n"
-                    "    for (const item of items) {\n"
-                    "        if (!item) {\n"
-                    "            continue;\n"
-                    "        }\n"
-                    "        \n"
-                    "        // Transform the item based on its properties\n"
-                    "        const processed = transformItem(item);\n"
-                    "        results.push(processed);\n"
-                    "    }\n"
-                    "    \n"
-                    "    return results;\n"
-                    "}\n"
-                    "\n"
-                    "/**\n"
-                    " * Apply transformations to a single item.\n"
-                    " * @param {any} item - Item to transform\n"
-                    " * @returns {any} - Transformed item\n"
-                    " */\n"
-                    "function transformItem(item) {\n"
-                    "    // Example transformation\n"
-                    "    if (typeof item === 'object' && item !== null) {\n"
-                    "        const result = {};\n"
-                    "        for (const [key, value] of Object.entries(item)) {\n"
-                    "            result[key] = typeof value === 'string' ? value.toUpperCase() : value;\n"
-                    "        }\n"
-                    "        return result;\n"
-                    "    } else if (typeof item === 'string') {\n"
-                    "        return item.toUpperCase();\n"
-                    "    } else {\n"
-                    "        return item;\n"
-                    "    }\n"
-                    "}\n"
-                    "```"
-                )
+                self._request_state.cache_status = "miss"
+
+        if cached is None:
+            chunks = []
+            with self.tracer.span("backend", action=action, model=self.backend.model_id) as span:
+                stream = self.backend.stream(action, input_text, lang, context)
+                async for chunk in timed_stream(stream, input_text + context):
+                    chunks.append(chunk)
+                    yield chunk
+                span.set("chunks", len(chunks))
+            if key is not None:
+                self.cache.put(key, "".join(chunks))
+
+        if findings is not None:
+            yield f"\n\n{findings}"
+
+    @property
+    def last_cache_status(self) -> str:
+        """Cache outcome ("hit", "miss" or "bypass") of this thread's last request."""
+        return getattr(self._request_state, "cache_status", "bypass")
+
+    def _simulate_ai_response(self, action: str, input_text: str) -> str:
+        """Return the backend's complete response for the action and input."""
+
+        async def collect() -> str:
+            return "".join([chunk async for chunk in self._response_chunks(action, input_text)])
+
+        import asyncio
+        with self.tracer.span("request", action=action):
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                return asyncio.run(collect())
+            # Called from inside an event loop, where asyncio.run refuses to
+            # start another; wait for the job loop's thread instead
+            return self.jobs.run_coroutine(collect()).result()
+
+    def _stream_ai_response(self, action: str, input_text: str, prefix: str = "",
+                            profile: Any = None) -> str:
+        """Print the backend's response as it streams in and return it."""
+        from adam_x_stats import current_request
+        request = current_request()
+
+        async def consume() -> str:
+            # This runs on the job loop's thread, in a copy of the caller's
+            # context, so the measured request and open span carry over
+            chunks = []
+            with self.tracer.span("render", action=action) as span:
+                sys.stdout.write(prefix)
+                sys.stdout.flush()
+                async for chunk in self._response_chunks(action, input_text, profile):
+                    chunks.append(chunk)
+                    sys.stdout.write(chunk)
+                    sys.stdout.flush()
+                sys.stdout.write("\n")
+                span.set("chunks", len(chunks))
+            return "".join(chunks)
+
+        import asyncio
+        from adam_x_backend import BackendError
+        # Run on the job loop so that Ctrl-C only cancels this request
+        future = self.jobs.run_coroutine(consume())
+        try:
+            return future.result()
+        except KeyboardInterrupt:
+            future.cancel()
+            print("\nRequest cancelled.")
+            return ""
+        except (BackendError, OSError, asyncio.TimeoutError) as e:
+            if request is not None:
+                request.failed = True
+            print(f"\nBackend error: {str(e)}")
+            return ""
+
+# Built-in commands, in the order they are listed by 'help'
+for _command in (
+    Command("help", "show_help", "help", "Show this help message",
+            args=NO_ARGUMENT, result="Help displayed"),
+    Command("create", "create_file", "create <filename>", "Create a new file",
+            result="Created file: {}"),
+    Command("scaffold", "scaffold_command", "scaffold [--dry-run] [--force] [--into DIR] <spec> [name=value ...]",
+            "Generate the files of a JSON/YAML spec"),
+    Command("explain", "explain_code", "explain <code|@file[:start-end]>",
+            "Explain what code does", action="explain"),
+    Command("optimize", "optimize_code", "optimize <code|@file[:start-end]|project>",
+            "Suggest optimizations for code", action="optimize"),
+    Command("search", "search_documentation", "search <query>", "Search documentation",
+            action="search"),
+    Command("debug", "debug_code", "debug <code|@file[:start-end]|project>",
+            "Debug code and suggest fixes", action="debug"),
+    Command("projects", "list_projects", "projects", "List your projects", args=NO_ARGUMENT),
+    Command("project", "switch_project", "project <name>", "Switch to or create a project",
+            interactive=True),
+    Command("snippet", "snippet_command", "snippet <name> <code>", "Save a code snippet"),
+    Command("use", "use_snippet", "use <name>", "Use a saved snippet"),
+    Command("snippets", "list_snippets", "snippets [text]",
+            "List snippets or search their names and code", args=OPTIONAL_ARGUMENT),
+    Command("cache", "cache_command", "cache [clear]",
+            "Show response cache statistics or clear it", args=OPTIONAL_ARGUMENT),
+    Command("stats", "stats_command", "stats [reset|export <path>]",
+            "Show per-command latency, cache and backend statistics", args=OPTIONAL_ARGUMENT),
+    Command("history", "history_command", "history [clear|text]",
+            "Show recent commands, clear them, or rank the ones containing text",
+            args=OPTIONAL_ARGUMENT),
+    Command("find", "find_command", "find <name>",
+            "Find files and symbols in the current project"),
+    Command("context", "show_context", "context <request>",
+            "Show the project context that would be sent with a request"),
+    Command("profile", "profile_command", "profile [--memory] [--timeout SECONDS] <script> [args]",
+            "Profile a Python script and suggest optimizations for its hot spots"),
+    Command("status", "show_status", "status",
+            "Show project index and file watcher status", args=NO_ARGUMENT),
+    Command("jobs", "list_jobs", "jobs", "List background jobs (end a request with & to start one)",
+            args=NO_ARGUMENT),
+    Command("wait", "wait_command", "wait [job]", "Wait for background jobs and show their results",
+            args=OPTIONAL_ARGUMENT),
+    Command("cancel", "cancel_job", "cancel <job|all>", "Cancel a background job"),
+):
+    COMMANDS.register(_command)
+
+# The buffer that the command running in the current context prints to
+_captured_output: contextvars.ContextVar = contextvars.ContextVar("adam_x_output", default=None)
+_capture_lock = threading.Lock()
+_capture_count = 0
+
+
+class _ContextStdout:
+    """Stands in for sys.stdout while engines capture command output.
+
+    Writes go to the capture buffer of the current context (a thread, or
+    a task started from it), so commands running side by side on a batch
+    pool never see each other's output. Everything else reaches the
+    stream that was sys.stdout before.
+    """
+
+    def __init__(self, stream: Any):
+        self.stream = stream
+
+    def _target(self) -> Any:
+        buffer = _captured_output.get()
+        return self.stream if buffer is None else buffer
+
+    def write(self, text: str) -> int:
+        return self._target().write(text)
+
+    def flush(self) -> None:
+        self._target().flush()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.stream, name)
+
+
+@contextlib.contextmanager
+def _capture_stdout() -> Iterator[StringIO]:
+    """Collect what the current context prints, leaving other threads' output alone."""
+    global _capture_count
+    with _capture_lock:
+        if not isinstance(sys.stdout, _ContextStdout):
+            sys.stdout = _ContextStdout(sys.stdout)
+        proxy = sys.stdout
+        _capture_count += 1
+    buffer = StringIO()
+    token = _captured_output.set(buffer)
+    try:
+        yield buffer
+    finally:
+        _captured_output.reset(token)
+        with _capture_lock:
+            _capture_count -= 1
+            if not _capture_count and sys.stdout is proxy:
+                sys.stdout = proxy.stream
+
+
+class AdamXEngine:
+    """Reusable, thread-safe session for the module-level API.
+
+    Builds a single AdamX instance, so the config directory is created and
+    the config file read only once. The file is re-read when its mtime or
+    size changes; the backend and response cache stay warm otherwise.
+    """
+
+    def __init__(self, config_path: str = "~/.adam-x/config.json"):
+        self.adam_x = AdamX(config_path, show_welcome=False)
+        self._lock = threading.RLock()
+        # Held while a local command runs; separate so that a slow one does
+        # not hold up config refreshes for backend requests
+        self._local_lock = threading.RLock()
+        # Engines are long-lived, so load the config up front
+        self.adam_x.config
+
+    def _refresh(self) -> None:
+        with self._lock:
+            self.adam_x.reload_config_if_changed()
+
+    def process_command(self, cmd: str) -> str:
+        """Process a command and return the result."""
+        self._refresh()
+        return self._dispatch(cmd)
+
+    def process_commands(self, commands: Iterable[str]) -> List[str]:
+        """Process many commands, checking the config only once."""
+        self._refresh()
+        return [self._dispatch(cmd) for cmd in commands]
+
+    async def astream_command(self, cmd: str) -> AsyncIterator[str]:
+        """Process a command, yielding its output as it becomes available.
+
+        Backend actions stream their response chunks; local commands run
+        on the event loop's default executor and yield the text they would
+        have printed.
+        """
+        self._refresh()
+        adam_x = self.adam_x
+        with adam_x.tracer.span("command") as span:
+            command, argument = adam_x._resolve(cmd)
+            with adam_x._dispatching(command.name if command else "generate", span):
+                request = adam_x._backend_request(command, argument, cmd)
+                if request is None:
+                    # Local commands block (profile runs a script, find waits
+                    # for the index), so keep them off the caller's event loop
+                    import asyncio
+                    context = contextvars.copy_context()
+                    yield await asyncio.get_running_loop().run_in_executor(
+                        None, context.run, self._run_local, command, argument)
+                    return
+
+                async for chunk in adam_x._response_chunks(*request):
+                    yield chunk
+
+    def execute(self, cmd: str) -> Dict[str, Any]:
+        """Run a command and return its result, latency and cache status."""
+        start = time.perf_counter()
+        self._refresh()
+        adam_x = self.adam_x
+        with adam_x.tracer.span("command") as span:
+            command, argument = adam_x._resolve(cmd)
+            with adam_x._dispatching(command.name if command else "generate", span):
+                request = adam_x._backend_request(command, argument, cmd)
+                if request is None:
+                    result = self._run_local(command, argument)
+                    cache_status = "bypass"
+                else:
+                    result = adam_x._simulate_ai_response(*request)
+                    cache_status = adam_x.last_cache_status
+        return {
+            "command": cmd,
+            "result": result,
+            "latency_ms": round((time.perf_counter() - start) * 1000, 3),
+            "cache": cache_status,
+        }
+
+    def _run_local(self, command: Command, argument: str) -> str:
+        """Run a command that prints its output and return that output."""
+        with self._local_lock, _capture_stdout() as buffer, self._no_prompts():
+            command.run(self.adam_x, argument)
+        return buffer.getvalue()
+
+    @contextlib.contextmanager
+    def _no_prompts(self) -> Iterator[None]:
+        """Make AdamX.ask raise instead of reading the caller's stdin."""
+        state = self.adam_x._request_state
+        previous = getattr(state, "interactive", True)
+        state.interactive = False
+        try:
+            yield
+        finally:
+            state.interactive = previous
+
+    def _dispatch(self, cmd: str) -> str:
+        adam_x = self.adam_x
+        with adam_x.tracer.span("command") as span:
+            command, argument = adam_x._resolve(cmd)
+            with adam_x._dispatching(command.name if command else "generate", span):
+                request = adam_x._backend_request(command, argument, cmd)
+                if request is not None:
+                    return adam_x._simulate_ai_response(*request)
+                if command.result is None:
+                    return self._run_local(command, argument)
+                with self._local_lock, self._no_prompts():
+                    command.run(adam_x, argument)
+                return command.result.format(argument)
+
+    def _respond(self, action: str, input_text: str) -> str:
+        self._refresh()
+        with self.adam_x.tracer.span("command") as span:
+            with self.adam_x._dispatching(action, span):
+                return self.adam_x._simulate_ai_response(action, input_text)
+
+    def generate_code(self, description: str) -> str:
+        """Generate code based on a description."""
+        return self._respond("generate", description)
+
+    def explain_code(self, code: str) -> str:
+        """Explain what code does."""
+        return self._respond("explain", code)
+
+    def optimize_code(self, code: str) -> str:
+        """Suggest optimizations for code."""
+        return self._respond("optimize", code)
+
+    def debug_code(self, code: str) -> str:
+        """Debug code and suggest fixes."""
+        return self._respond("debug", code)
+
+
+_default_engine: Optional[AdamXEngine] = None
+_default_engine_lock = threading.Lock()
+
+def get_engine() -> AdamXEngine:
+    """Return the shared engine used by the module-level functions."""
+    global _default_engine
+    if _default_engine is None:
+        with _default_engine_lock:
+            if _default_engine is None:
+                _default_engine = AdamXEngine()
+    return _default_engine
 
 # Export functions for testing
 def process_command(cmd: str) -> str:
     """Process a command and return the result."""
-    adam_x = AdamX(show_welcome=False)
-    if cmd == "help":
-        adam_x.show_help()
-        return "Help displayed"
-    elif cmd.startswith("create "):
-        filename = cmd[7:].strip()
-        adam_x.create_file(filename)
-        return f"Created file: {filename}"
-    elif cmd.startswith("explain "):
-        code = cmd[8:].strip()
-        return adam_x._simulate_ai_response("explain", code)
-    elif cmd.startswith("optimize "):
-        code = cmd[9:].strip()
-        return adam_x._simulate_ai_response("optimize", code)
-    elif cmd.startswith("debug "):
-        code = cmd[6:].strip()
-        return adam_x._simulate_ai_response("debug", code)
-    else:
-        return adam_x._simulate_ai_response("generate", cmd)
+    return get_engine().process_command(cmd)
+
+def process_commands(commands: Iterable[str]) -> List[str]:
+    """Process several commands and return their results in order."""
+    return get_engine().process_commands(commands)
 
 def generate_code(description: str) -> str:
     """Generate code based on a description."""
-    adam_x = AdamX(show_welcome=False)
-    return adam_x._simulate_ai_response("generate", description)
+    return get_engine().generate_code(description)
 
 def explain_code(code: str) -> str:
     """Explain what code does."""
-    adam_x = AdamX(show_welcome=False)
-    return adam_x._simulate_ai_response("explain", code)
+    return get_engine().explain_code(code)
 
 def optimize_code(code: str) -> str:
     """Suggest optimizations for code."""
-    adam_x = AdamX(show_welcome=False)
-    return adam_x._simulate_ai_response("optimize", code)
+    return get_engine().optimize_code(code)
 
 def debug_code(code: str) -> str:
     """Debug code and suggest fixes."""
-    adam_x = AdamX(show_welcome=False)
-    return adam_x._simulate_ai_response("debug", code)
+    return get_engine().debug_code(code)
+
+def profile_startup(config_path: str, parse_seconds: float) -> None:
+    """Print how long each startup phase takes, forcing lazy ones to run."""
+    phases = [("import adam_x", _IMPORT_END - _IMPORT_START, None),
+              ("parse arguments", parse_seconds, None)]
+    adam_x = None
+
+    def timed(name: str, func: Any) -> None:
+        modules = len(sys.modules)
+        start = time.perf_counter()
+        func()
+        phases.append((name, time.perf_counter() - start, len(sys.modules) - modules))
+
+    def construct() -> None:
+        nonlocal adam_x
+        adam_x = AdamX(config_path, show_welcome=False)
+
+    timed("AdamX.__init__", construct)
+    timed("load config (lazy)", lambda: adam_x.config)
+    timed("backend (lazy)", lambda: adam_x.backend)
+    timed("response cache (lazy)", lambda: adam_x.cache)
+    timed("snippet library (lazy)", lambda: adam_x.snippets)
+    timed("readline (REPL only)", _init_readline)
+
+    print("\nAdam-X startup profile:")
+    print(f"  {'phase':<26} {'ms':>9}  new modules")
+    for name, seconds, modules in phases:
+        count = "" if modules is None else str(modules)
+        print(f"  {name:<26} {seconds * 1000:>9.2f}  {count}")
+    total = sum(seconds for _, seconds, _ in phases)
+    print(f"  {'total':<26} {total * 1000:>9.2f}")
+    print("\nLazy phases only run when a command needs them. "
+          "Use 'python -X importtime' for a per-module import breakdown.")
 
 def main():
     """Main entry point for Adam-X."""
+    parse_start = time.perf_counter()
+    import argparse
     parser = argparse.ArgumentParser(description="Adam-X: Your Terminal Coding AI Agent")
     parser.add_argument('--config', type=str, help='Path to configuration file')
     parser.add_argument('--no-welcome', action='store_true', help='Disable welcome message')
+    parser.add_argument('--serve', action='store_true',
+                        help='Run as a daemon serving adam-x-client over a Unix socket')
+    parser.add_argument('--socket', type=str, help='Socket path for --serve')
+    parser.add_argument('--batch', type=str, metavar='FILE',
+                        help="Run one command per line from FILE ('-' for stdin) and print JSON lines")
+    parser.add_argument('--workers', type=int, default=4,
+                        help='Number of concurrent workers for --batch')
+    parser.add_argument('--profile-startup', action='store_true',
+                        help='Report how long each startup phase takes and exit')
+    parser.add_argument('--record', type=str, metavar='FILE',
+                        help='Append each command of this session to a trace file for adam-x-replay')
     args = parser.parse_args()
+    parse_seconds = time.perf_counter() - parse_start
 
     config_path = args.config if args.config else "~/.adam-x/config.json"
     show_welcome = not args.no_welcome
 
+    if args.profile_startup:
+        profile_startup(config_path, parse_seconds)
+        return
+
+    if args.serve:
+        from adam_x_daemon import DEFAULT_SOCKET_PATH, serve
+        serve(args.socket or DEFAULT_SOCKET_PATH, config_path)
+        return
+
+    if args.batch:
+        from adam_x_batch import run_batch_file
+        sys.exit(run_batch_file(AdamXEngine(config_path), args.batch, workers=args.workers))
+
     try:
         adam_x = AdamX(config_path, show_welcome=show_welcome)
+        if args.record:
+            from adam_x_replay import SessionRecorder
+            try:
+                adam_x.recorder = SessionRecorder(args.record)
+            except OSError as e:
+                print(f"Error opening trace file: {str(e)}", file=sys.stderr)
+                sys.exit(2)
         adam_x.run()
     except KeyboardInterrupt:
         print("\nGoodbye! Happy coding!")
         sys.exit(0)
 
+_IMPORT_END = time.perf_counter()
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,599 @@
+#!/usr/bin/env python3
+"""
+Adam-X performance analyzer
+---------------------------
+Static checks for common Python performance anti-patterns, used by
+``optimize`` for Python input. Each finding has a line number and a
+suggested rewrite. Parsed trees and findings are cached by source hash, so
+optimizing the same code again costs a dictionary lookup.
+"""
+
+import ast
+import copy
+import hashlib
+import threading
+from collections import OrderedDict, defaultdict
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+# Calls and literals whose result is a list
+_LIST_BUILDERS = frozenset({"list", "sorted"})
+_LIST_METHODS = frozenset({"split", "splitlines", "readlines"})
+# List methods that change the list in place
+_MUTATING_METHODS = frozenset({"append", "extend", "insert", "remove", "pop", "clear",
+                               "sort", "reverse"})
+
+# Decorators that memoize a function
+_MEMOIZERS = frozenset({"lru_cache", "cache", "memoize", "cached"})
+
+
+class Finding:
+    """One potential performance problem in analyzed source."""
+
+    def __init__(self, line: int, kind: str, message: str, suggestion: str,
+                 end_line: Optional[int] = None):
+        self.line = line
+        # Last line of the flagged statement, loop or function
+        self.end_line = end_line or line
+        self.kind = kind
+        self.message = message
+        self.suggestion = suggestion
+
+    def __repr__(self) -> str:
+        return f"Finding({self.line}, {self.kind!r})"
+
+
+def _constant(node: ast.AST) -> Any:
+    """Return the value of a literal node, or a sentinel for anything else."""
+    if isinstance(node, ast.Constant):
+        return node.value
+    # Python 3.7 parses literals into Num and Str nodes
+    if type(node).__name__ == "Num":
+        return node.n
+    if type(node).__name__ == "Str":
+        return node.s
+    return _constant
+
+
+def _index(node: ast.Subscript) -> ast.AST:
+    """Return the index expression of a subscript (unwrapping ast.Index before 3.9)."""
+    index = node.slice
+    return index.value if type(index).__name__ == "Index" else index
+
+
+def _dotted(node: ast.AST) -> Optional[str]:
+    """Return ``a.b.c`` for a chain of attribute lookups on a name, else None."""
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name) or not parts:
+        return None
+    parts.append(node.id)
+    return ".".join(reversed(parts))
+
+
+def _unparse(node: ast.AST) -> Optional[str]:
+    unparse = getattr(ast, "unparse", None)
+    return unparse(node) if unparse is not None else None
+
+
+def _is_string(node: ast.AST) -> bool:
+    if isinstance(node, ast.JoinedStr) or isinstance(_constant(node), str):
+        return True
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name):
+        return node.func.id in ("str", "repr", "format", "chr")
+    if isinstance(node, ast.BinOp) and isinstance(node.op, (ast.Add, ast.Mod)):
+        return _is_string(node.left) or _is_string(node.right)
+    return False
+
+
+class _Scope:
+    """Names known to hold lists, strings and NumPy arrays in one function."""
+
+    def __init__(self):
+        self.lists: Set[str] = set()
+        self.strings: Set[str] = set()
+        self.arrays: Set[str] = set()
+
+
+class _Loop:
+    """Attribute lookups and assignments seen directly in one loop body."""
+
+    def __init__(self, node: ast.AST, nested: bool):
+        self.node = node
+        self.nested = nested
+        self.lookups: Dict[str, int] = defaultdict(int)
+        self.stored: Set[str] = set()
+        self.reported: Set[str] = set()
+        # Names changed anywhere in the body, nested loops included
+        self.mutated: Set[str] = set()
+        # `in` tests against lists, reported once the whole body is seen
+        self.members: List[Tuple[ast.AST, str]] = []
+
+
+class _Detector(ast.NodeVisitor):
+
+    def __init__(self, numpy_names: Set[str]):
+        self.numpy_names = numpy_names
+        self.findings: List[Finding] = []
+        self.scopes: List[_Scope] = [_Scope()]
+        self.loops: List[_Loop] = []
+
+    def _add(self, node: ast.AST, kind: str, message: str, suggestion: str) -> None:
+        self.findings.append(Finding(getattr(node, "lineno", 0), kind, message, suggestion,
+                                     getattr(node, "end_lineno", None)))
+
+    # Scopes
+
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+        self._check_recursion(node)
+        loops, self.loops = self.loops, []
+        self.scopes.append(_Scope())
+        self.generic_visit(node)
+        self.scopes.pop()
+        self.loops = loops
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_Lambda(self, node: ast.Lambda) -> None:
+        loops, self.loops = self.loops, []
+        self.generic_visit(node)
+        self.loops = loops
+
+    # Loops
+
+    def _visit_loop(self, node: ast.AST, header: List[ast.AST], body: List[ast.AST]) -> None:
+        for child in header:
+            self.visit(child)
+        loop = _Loop(node, nested=bool(self.loops))
+        self.loops.append(loop)
+        for child in body:
+            self.visit(child)
+        self.loops.pop()
+        self._check_lookups(loop)
+        self._check_members(loop)
+
+    def visit_For(self, node: ast.For) -> None:
+        self._check_numpy_loop(node)
+        self._visit_loop(node, [node.iter], [node.target] + node.body)
+        for child in node.orelse:
+            self.visit(child)
+
+    visit_AsyncFor = visit_For
+
+    def visit_While(self, node: ast.While) -> None:
+        self._visit_loop(node, [], [node.test] + node.body)
+        for child in node.orelse:
+            self.visit(child)
+
+    def _visit_comprehension(self, node: ast.AST, elements: List[ast.AST]) -> None:
+        first = node.generators[0]
+        self.visit(first.iter)
+        loop = _Loop(node, nested=bool(self.loops))
+        self.loops.append(loop)
+        for index, generator in enumerate(node.generators):
+            self.visit(generator.target)
+            if index:
+                self.visit(generator.iter)
+            for condition in generator.ifs:
+                self.visit(condition)
+        for element in elements:
+            self.visit(element)
+        self.loops.pop()
+        self._check_members(loop)
+
+    def visit_ListComp(self, node: ast.ListComp) -> None:
+        self._visit_comprehension(node, [node.elt])
+
+    visit_SetComp = visit_ListComp
+    visit_GeneratorExp = visit_ListComp
+
+    def visit_DictComp(self, node: ast.DictComp) -> None:
+        self._visit_comprehension(node, [node.key, node.value])
+
+    # Assignments: track what names hold and what a loop changes
+
+    def visit_Assign(self, node: ast.Assign) -> None:
+        self.visit(node.value)
+        for target in node.targets:
+            self.visit(target)
+            if isinstance(target, ast.Name):
+                if (self.loops and isinstance(node.value, ast.BinOp)
+                        and isinstance(node.value.op, ast.Add)
+                        and isinstance(node.value.left, ast.Name)
+                        and node.value.left.id == target.id):
+                    self._check_concat(node, target.id, node.value.right)
+                else:
+                    self._record(target.id, node.value)
+
+    def visit_AnnAssign(self, node: ast.AnnAssign) -> None:
+        if node.value is not None:
+            self.visit(node.value)
+            if isinstance(node.target, ast.Name):
+                self._record(node.target.id, node.value)
+        self.visit(node.target)
+
+    def visit_AugAssign(self, node: ast.AugAssign) -> None:
+        self.visit(node.value)
+        self.visit(node.target)
+        if self.loops and isinstance(node.op, ast.Add) and isinstance(node.target, ast.Name):
+            self._check_concat(node, node.target.id, node.value)
+        if self.loops:
+            chain = _dotted(node.target)
+            if chain:
+                self.loops[-1].stored.add(chain)
+
+    def _record(self, name: str, value: ast.AST) -> None:
+        scope = self.scopes[-1]
+        for names in (scope.lists, scope.strings, scope.arrays):
+            names.discard(name)
+        if self._is_list(value):
+            scope.lists.add(name)
+        elif _is_string(value):
+            scope.strings.add(name)
+        elif self._is_array(value):
+            scope.arrays.add(name)
+
+    def _is_list(self, node: ast.AST) -> bool:
+        if isinstance(node, (ast.List, ast.ListComp)):
+            return True
+        if isinstance(node, ast.Call):
+            if isinstance(node.func, ast.Name):
+                return node.func.id in _LIST_BUILDERS
+            if isinstance(node.func, ast.Attribute):
+                return node.func.attr in _LIST_METHODS
+        return False
+
+    def _is_array(self, node: ast.AST) -> bool:
+        if isinstance(node, ast.Call):
+            chain = _dotted(node.func)
+            return chain is not None and chain.split(".")[0] in self.numpy_names
+        return False
+
+    def _mutate(self, name: str) -> None:
+        for loop in self.loops:
+            loop.mutated.add(name)
+
+    def visit_Name(self, node: ast.Name) -> None:
+        if self.loops and not isinstance(node.ctx, ast.Load):
+            self.loops[-1].stored.add(node.id)
+            self._mutate(node.id)
+
+    def visit_Subscript(self, node: ast.Subscript) -> None:
+        self.generic_visit(node)
+        if self.loops and not isinstance(node.ctx, ast.Load) and isinstance(node.value, ast.Name):
+            self._mutate(node.value.id)
+
+    def visit_Attribute(self, node: ast.Attribute) -> None:
+        chain = _dotted(node)
+        if chain is None:
+            self.generic_visit(node)
+            return
+        if self.loops:
+            if isinstance(node.ctx, ast.Load):
+                self.loops[-1].lookups[chain] += 1
+            else:
+                self.loops[-1].stored.add(chain)
+
+    # Checks
+
+    def visit_Compare(self, node: ast.Compare) -> None:
+        self.generic_visit(node)
+        if not self.loops:
+            return
+        for op, comparator in zip(node.ops, node.comparators):
+            if (isinstance(op, (ast.In, ast.NotIn)) and isinstance(comparator, ast.Name)
+                    and comparator.id in self.scopes[-1].lists):
+                self.loops[-1].members.append((node, comparator.id))
+
+    def _check_members(self, loop: _Loop) -> None:
+        for node, name in loop.members:
+            # A set built before the loop would miss what the loop adds
+            if name in loop.mutated:
+                continue
+            self._add(node, "membership-in-loop",
+                      f"`in {name}` scans the list `{name}` on every loop iteration, "
+                      f"which is quadratic overall.",
+                      f"Build a set once before the loop (`{name}_set = set({name})`) "
+                      f"and test `in {name}_set`.")
+
+    def _check_concat(self, node: ast.AST, name: str, value: ast.AST) -> None:
+        loop = self.loops[-1]
+        if name in loop.reported:
+            return
+        if name in self.scopes[-1].strings or _is_string(value):
+            loop.reported.add(name)
+            self._add(node, "string-concat-in-loop",
+                      f"`{name} += ...` builds a new string on every iteration, "
+                      f"copying everything built so far.",
+                      f"Collect the pieces in a list (`parts.append(...)`) and join them "
+                      f"once after the loop: `{name} = \"\".join(parts)`.")
+
+    def visit_Call(self, node: ast.Call) -> None:
+        self.generic_visit(node)
+        if not isinstance(node.func, ast.Attribute):
+            return
+        if (self.loops and node.func.attr in _MUTATING_METHODS
+                and isinstance(node.func.value, ast.Name)):
+            self._mutate(node.func.value.id)
+        if not node.args:
+            return
+        target = _unparse(node.func.value) or _dotted(node.func.value) or "items"
+        where = " inside a loop" if self.loops else ""
+        if node.func.attr == "pop" and len(node.args) == 1 and _constant(node.args[0]) == 0:
+            self._add(node, "list-pop-front",
+                      f"`{target}.pop(0)`{where} shifts every remaining element of the list.",
+                      f"Use `collections.deque` for `{target}` and call `{target}.popleft()`.")
+        elif node.func.attr == "insert" and len(node.args) == 2 and _constant(node.args[0]) == 0:
+            self._add(node, "list-insert-front",
+                      f"`{target}.insert(0, ...)`{where} shifts every element of the list.",
+                      f"Use `collections.deque` for `{target}` and call `{target}.appendleft(...)`.")
+
+    def _check_lookups(self, loop: _Loop) -> None:
+        threshold = 2 if loop.nested else 3
+        repeated = []
+        for chain, count in loop.lookups.items():
+            root = chain.split(".")[0]
+            if count < threshold or root in loop.stored or root in self.numpy_names:
+                continue
+            if any(chain == stored or chain.startswith(stored + ".") or stored.startswith(chain + ".")
+                   for stored in loop.stored):
+                continue
+            repeated.append((count, chain))
+        if not repeated:
+            return
+        repeated.sort(key=lambda item: (-item[0], item[1]))
+        described = ", ".join(f"`{chain}` ({count}x)" for count, chain in repeated[:3])
+        hoisted = "; ".join(f"{chain.rsplit('.', 1)[1]} = {chain}" for _, chain in repeated[:3])
+        self._add(loop.node, "attribute-lookup-in-loop",
+                  f"{'Nested loop' if loop.nested else 'Loop'} repeats attribute lookups "
+                  f"on every iteration: {described}.",
+                  f"Bind them to locals before the loop (`{hoisted}`) and use those inside it.")
+
+    def _check_recursion(self, node: ast.FunctionDef) -> None:
+        calls = [call for call in _own_nodes(node) if isinstance(call, ast.Call)
+                 and (isinstance(call.func, ast.Name) and call.func.id == node.name
+                      or isinstance(call.func, ast.Attribute) and call.func.attr == node.name
+                      and isinstance(call.func.value, ast.Name) and call.func.value.id in ("self", "cls"))]
+        if not calls:
+            return
+        memoized = any(_decorator_name(d) in _MEMOIZERS for d in node.decorator_list)
+
+        if len(calls) > 1 and not memoized:
+            self._add(node, "exponential-recursion",
+                      f"`{node.name}` calls itself {len(calls)} times per call, so the same "
+                      f"arguments are recomputed exponentially often.",
+                      f"Memoize it with `@functools.lru_cache(maxsize=None)`, or compute it "
+                      f"bottom-up in a loop.")
+        elif any(_decrements(argument) for call in calls for argument in call.args):
+            if "factorial" in node.name.lower():
+                rewrite = ("Use `math.factorial(n)`, or a loop: `result = 1` then "
+                           "`for i in range(2, n + 1): result *= i`.")
+            else:
+                rewrite = "Rewrite it as a loop, or keep an explicit stack of pending work."
+            self._add(node, "unbounded-recursion",
+                      f"`{node.name}` recurses once per decrement of its argument, so large "
+                      f"inputs exceed the recursion limit (1000 by default) and every level "
+                      f"pays for a Python call.",
+                      rewrite)
+
+    def _check_numpy_loop(self, node: ast.For) -> None:
+        """Flag index loops over NumPy arrays that a whole-array expression could replace."""
+        if not self.numpy_names or not isinstance(node.target, ast.Name):
+            return
+        if not (isinstance(node.iter, ast.Call) and isinstance(node.iter.func, ast.Name)
+                and node.iter.func.id == "range"):
+            return
+        index = node.target.id
+        subscripted = set()
+        for child in ast.walk(node):
+            if (isinstance(child, ast.Subscript) and isinstance(child.value, ast.Name)
+                    and isinstance(_index(child), ast.Name) and _index(child).id == index):
+                subscripted.add(child.value.id)
+        sized = any(_is_length(arg) for arg in node.iter.args)
+        if not subscripted or not (subscripted & self.scopes[-1].arrays or sized):
+            return
+
+        rewrite = _vectorize(node, index, self.numpy_names)
+        if rewrite is None:
+            rewrite = ("Replace the loop with whole-array operations (arithmetic on the "
+                       "arrays, `np.where`, `np.cumsum`, boolean masks).")
+        else:
+            rewrite = f"Replace the loop with whole-array operations: `{rewrite}`."
+        names = ", ".join(f"`{name}`" for name in sorted(subscripted))
+        self._add(node, "numpy-loop",
+                  f"Element-by-element Python loop over NumPy array(s) {names}.",
+                  rewrite)
+
+
+def _own_nodes(node: ast.AST):
+    """Walk a function body without descending into nested functions or classes."""
+    stack = list(ast.iter_child_nodes(node))
+    while stack:
+        child = stack.pop()
+        if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef, ast.Lambda)):
+            continue
+        yield child
+        stack.extend(ast.iter_child_nodes(child))
+
+
+def _decrements(node: ast.AST) -> bool:
+    """Return True for ``n - 1``-style arguments (something minus a positive constant)."""
+    if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Sub):
+        value = _constant(node.right)
+        return isinstance(value, int) and value > 0
+    return False
+
+
+def _decorator_name(node: ast.AST) -> str:
+    """Return the last name of a decorator: ``lru_cache`` for ``@functools.lru_cache(1)``."""
+    if isinstance(node, ast.Call):
+        node = node.func
+    return (_dotted(node) or getattr(node, "id", "")).split(".")[-1]
+
+
+def _is_length(node: ast.AST) -> bool:
+    """Return True for ``len(x)`` and ``x.shape[...]``."""
+    if isinstance(node, ast.Call):
+        return isinstance(node.func, ast.Name) and node.func.id == "len"
+    return (isinstance(node, ast.Subscript) and isinstance(node.value, ast.Attribute)
+            and node.value.attr == "shape")
+
+
+class _Unindex(ast.NodeTransformer):
+    """Replace ``name[i]`` with ``name`` for the loop index ``i``."""
+
+    def __init__(self, index: str):
+        self.index = index
+        self.leftover = False
+
+    def visit_Subscript(self, node: ast.Subscript) -> ast.AST:
+        target = _index(node)
+        if isinstance(node.value, ast.Name) and isinstance(target, ast.Name) and target.id == self.index:
+            return ast.copy_location(ast.Name(id=node.value.id, ctx=ast.Load()), node)
+        return self.generic_visit(node)
+
+    def visit_Name(self, node: ast.Name) -> ast.AST:
+        if node.id == self.index:
+            self.leftover = True
+        return node
+
+
+def _vectorize(node: ast.For, index: str, numpy_names: Set[str]) -> Optional[str]:
+    """Return the whole-array form of a simple element-wise loop, or None."""
+    if node.orelse or not hasattr(ast, "unparse"):
+        return None
+    np_name = "np" if "np" in numpy_names else sorted(numpy_names)[0]
+    statements = []
+    for statement in node.body:
+        transformer = _Unindex(index)
+        if isinstance(statement, ast.Assign) and len(statement.targets) == 1:
+            target = statement.targets[0]
+            if not (isinstance(target, ast.Subscript) and isinstance(target.value, ast.Name)
+                    and isinstance(_index(target), ast.Name) and _index(target).id == index):
+                return None
+            value = transformer.visit(copy.deepcopy(statement.value))
+            statements.append(f"{target.value.id}[:] = {ast.unparse(value)}")
+        elif (isinstance(statement, ast.AugAssign) and isinstance(statement.target, ast.Name)
+              and isinstance(statement.op, (ast.Add, ast.Mult))):
+            value = transformer.visit(copy.deepcopy(statement.value))
+            reducer = "sum" if isinstance(statement.op, ast.Add) else "prod"
+            op = "+" if isinstance(statement.op, ast.Add) else "*"
+            statements.append(f"{statement.target.id} {op}= {np_name}.{reducer}({ast.unparse(value)})")
+        else:
+            return None
+        if transformer.leftover:
+            return None
+    return "; ".join(statements) if statements else None
+
+
+def _numpy_names(tree: ast.AST) -> Set[str]:
+    """Return the names NumPy is imported as (``np`` if used without an import)."""
+    names = set()
+    uses_np = False
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                if alias.name == "numpy":
+                    names.add(alias.asname or "numpy")
+        elif isinstance(node, ast.Name) and node.id == "np":
+            uses_np = True
+    if uses_np and not names:
+        # A fragment from a larger file whose imports are not included
+        names.add("np")
+    return names
+
+
+class Analyzer:
+    """Finds performance anti-patterns in Python source, caching by source hash."""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._trees: "OrderedDict[str, Optional[ast.Module]]" = OrderedDict()
+        self._findings: "OrderedDict[str, List[Finding]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.parses = 0
+        self.hits = 0
+
+    @staticmethod
+    def _digest(source: str) -> str:
+        return hashlib.sha256(source.encode("utf-8", errors="surrogatepass")).hexdigest()
+
+    def _remember(self, table: "OrderedDict[str, Any]", key: str, value: Any) -> None:
+        with self._lock:
+            table[key] = value
+            while len(table) > self.max_entries:
+                table.popitem(last=False)
+
+    def parse(self, source: str) -> Optional[ast.Module]:
+        """Return the parsed tree of source, or None if it is not valid Python."""
+        digest = self._digest(source)
+        with self._lock:
+            if digest in self._trees:
+                self._trees.move_to_end(digest)
+                return self._trees[digest]
+        try:
+            tree = ast.parse(source)
+        except (SyntaxError, ValueError):
+            tree = None
+        self.parses += 1
+        self._remember(self._trees, digest, tree)
+        return tree
+
+    def analyze(self, source: str) -> Optional[List[Finding]]:
+        """Return the findings for source, ordered by line, or None if it does not parse."""
+        digest = self._digest(source)
+        with self._lock:
+            findings = self._findings.get(digest)
+            if findings is not None:
+                self._findings.move_to_end(digest)
+                self.hits += 1
+                return findings
+        tree = self.parse(source)
+        if tree is None:
+            return None
+        detector = _Detector(_numpy_names(tree))
+        detector.visit(tree)
+        findings = sorted(detector.findings, key=lambda finding: (finding.line, finding.kind))
+        self._remember(self._findings, digest, findings)
+        return findings
+
+    def report(self, source: str, hot_lines: Optional[Dict[int, float]] = None,
+               first_line: int = 1) -> Optional[str]:
+        """Return the findings for source as text, or None if it does not parse.
+
+        ``hot_lines`` maps line numbers to their share of profiled time;
+        findings covering hot lines are listed first, with their share.
+        ``first_line`` is the line of the file that source starts at, for
+        reporting on part of a file.
+        """
+        findings = self.analyze(source)
+        if findings is None:
+            return None
+        if first_line != 1:
+            # Findings are cached and shared, so shift copies
+            offset = first_line - 1
+            findings = [Finding(finding.line + offset, finding.kind, finding.message,
+                                finding.suggestion, finding.end_line + offset)
+                        for finding in findings]
+        return format_findings(findings, hot_lines)
+
+
+def format_findings(findings: List[Finding], hot_lines: Optional[Dict[int, float]] = None) -> str:
+    """Format findings as a numbered list, hottest first if profile data is given."""
+    if not findings:
+        return "No performance anti-patterns found."
+    heat = {}
+    if hot_lines:
+        for finding in findings:
+            heat[id(finding)] = sum(share for line, share in hot_lines.items()
+                                    if finding.line <= line <= finding.end_line)
+        findings = sorted(findings, key=lambda finding: -heat[id(finding)])
+    noun = "issue" if len(findings) == 1 else "issues"
+    lines = [f"Found {len(findings)} potential performance {noun}:"]
+    for number, finding in enumerate(findings, 1):
+        share = heat.get(id(finding))
+        measured = f" ({share:.0%} of profiled time)" if share else ""
+        lines.append(f"\n{number}. Line {finding.line}{measured}: {finding.message}")
+        lines.append(f"   Suggested rewrite: {finding.suggestion}")
+    return "\n".join(lines)
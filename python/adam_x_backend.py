@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Adam-X model backends
+---------------------
+Pluggable, streaming backends used by AdamX to answer explain/optimize/
+debug/search/generate requests. A local HTTP stand-in for the model endpoint
+lives in ``adam_x_standin``.
+"""
+
+import asyncio
+import codecs
+import json
+from typing import Any, AsyncIterator, Dict, Optional
+from urllib.parse import urlsplit
+
+
+class BackendError(Exception):
+    """Raised when a backend cannot produce a response."""
+
+
+class Backend:
+    """Base class for model backends.
+
+    Subclasses implement ``stream`` as an async generator yielding text
+    chunks as soon as they are available. ``context`` holds excerpts of
+    related project files chosen by the context builder ("" if none).
+    """
+
+    model_id = "base"
+
+    async def stream(self, action: str, input_text: str,
+                     language: str = "python", context: str = "") -> AsyncIterator[str]:
+        """Yield the response for ``action`` chunk by chunk."""
+        raise NotImplementedError
+        yield ""  # pragma: no cover - makes this an async generator
+
+    async def complete(self, action: str, input_text: str,
+                       language: str = "python", context: str = "") -> str:
+        """Collect the whole streamed response into one string."""
+        chunks = []
+        async for chunk in self.stream(action, input_text, language, context):
+            chunks.append(chunk)
+        return "".join(chunks)
+
+
+class SimulatedBackend(Backend):
+    """Offline backend returning canned responses token by token."""
+
+    model_id = "simulated"
+
+    def __init__(self, token_delay: float = 0.0):
+        self.token_delay = token_delay
+
+    def respond(self, action: str, input_text: str, language: str = "python") -> str:
+        """Return the full canned response for an action."""
+        if action == "explain":
+            return (
+                "processes data by iterating through a collection, "
+                "applying transformations, and returning the results. "
+                "It uses standard control flow patterns and seems to handle "
+                "edge cases appropriately."
+            )
+        elif action == "optimize":
+            return (
+                "1. Consider using list comprehension instead of the explicit for loop\n"
+                "2. The nested conditional statements could be simplified\n"
+                "3. There's a potential memory leak in the resource handling\n"
+                "4. For large inputs, consider processing in batches"
+            )
+        elif action == "search":
+            return (
+                "Found several relevant documentation pages:\n"
+                "- Official API reference for the requested function\n"
+                "- Community tutorial with practical examples\n"
+                "- Stack Overflow thread addressing common issues"
+            )
+        elif action == "debug":
+            return (
+                "I found a few potential issues:\n"
+                "1. Missing variable initialization on line 3\n"
+                "2. Potential off-by-one error in the loop condition\n"
+                "3. Exception handling is too broad, consider catching specific exceptions\n"
+                "4. The function might return None implicitly in some cases"
+            )
+        elif action == "generate":
+            if "python" in input_text.lower() or language == "python":
+                return (
+                    "```python\n"
+                    "def process_data(items):\n"
+                    "    \"\"\"\n"
+                    "    Process a collection of items and return transformed results.\n"
+                    "    \n"
+                    "    Args:\n"
+                    "        items: Iterable of items to process\n"
+                    "        \n"
+                    "    Returns:\n"
+                    "        List of processed items\n"
+                    "    \"\"\"\n"
+                    "    results = []\n"
+                    "    for item in items:\n"
+                    "        if not item:\n"
+                    "            continue\n"
+                    "            \n"
+                    "        # Transform the item based on its properties\n"
+                    "        processed = transform_item(item)\n"
+                    "        results.append(processed)\n"
+                    "        \n"
+                    "    return results\n"
+                    "\n"
+                    "def transform_item(item):\n"
+                    "    \"\"\"\n"
+                    "    Apply transformations to a single item.\n"
+                    "    \"\"\"\n"
+                    "    # Example transformation\n"
+                    "    if isinstance(item, dict):\n"
+                    "        return {k: v.upper() if isinstance(v, str) else v \n"
+                    "                for k, v in item.items()}\n"
+                    "    elif isinstance(item, str):\n"
+                    "        return item.upper()\n"
+                    "    else:\n"
+                    "        return item\n"
+                    "```"
+                )
+            else:
+                return (
+                    "```javascript\n"
+                    "/**\n"
+                    " * Process a collection of items and return transformed results.\n"
+                    " * @param {Array} items - Items to process\n"
+                    " * @returns {Array} - Processed items\n"
+                    " */\n"
+                    "function processData(items) {\n"
+                    "    const results = [];\n"
+                    "    \n"
+                    "    for (const item of items) {\n"
+                    "        if (!item) {\n"
+                    "            continue;\n"
+                    "        }\n"
+                    "        \n"
+                    "        // Transform the item based on its properties\n"
+                    "        const processed = transformItem(item);\n"
+                    "        results.push(processed);\n"
+                    "    }\n"
+                    "    \n"
+                    "    return results;\n"
+                    "}\n"
+                    "\n"
+                    "/**\n"
+                    " * Apply transformations to a single item.\n"
+                    " * @param {any} item - Item to transform\n"
+                    " * @returns {any} - Transformed item\n"
+                    " */\n"
+                    "function transformItem(item) {\n"
+                    "    // Example transformation\n"
+                    "    if (typeof item === 'object' && item !== null) {\n"
+                    "        const result = {};\n"
+                    "        for (const [key, value] of Object.entries(item)) {\n"
+                    "            result[key] = typeof value === 'string' ? value.toUpperCase() : value;\n"
+                    "        }\n"
+                    "        return result;\n"
+                    "    } else if (typeof item === 'string') {\n"
+                    "        return item.toUpperCase();\n"
+                    "    } else {\n"
+                    "        return item;\n"
+                    "    }\n"
+                    "}\n"
+                    "```"
+                )
+        return ""
+
+    async def stream(self, action: str, input_text: str,
+                     language: str = "python", context: str = "") -> AsyncIterator[str]:
+        """Yield the canned response one whitespace-delimited token at a time."""
+        for token in split_tokens(self.respond(action, input_text, language)):
+            if self.token_delay:
+                await asyncio.sleep(self.token_delay)
+            yield token
+
+
+class HTTPBackend(Backend):
+    """Streaming client for an HTTP model endpoint.
+
+    Sends a JSON request body and yields the chunks of a chunked
+    (``Transfer-Encoding: chunked``) response as they arrive.
+    """
+
+    def __init__(self, url: str, model: str = "default", timeout: float = 60.0):
+        parts = urlsplit(url)
+        if parts.scheme != "http":
+            raise BackendError(f"Unsupported backend URL: {url}")
+        self.url = url
+        self.host = parts.hostname or "127.0.0.1"
+        self.port = parts.port or 80
+        self.path = parts.path or "/"
+        self.model = model
+        self.model_id = f"http:{model}"
+        self.timeout = timeout
+
+    async def stream(self, action: str, input_text: str,
+                     language: str = "python", context: str = "") -> AsyncIterator[str]:
+        """Yield response chunks from the HTTP endpoint as they arrive."""
+        body = json.dumps({
+            "action": action,
+            "input": input_text,
+            "language": language,
+            "context": context,
+            "model": self.model,
+        }).encode("utf-8")
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port), self.timeout)
+        try:
+            writer.write(
+                f"POST {self.path} HTTP/1.1\r\n"
+                f"Host: {self.host}:{self.port}\r\n"
+                "Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                "Connection: close\r\n\r\n".encode("latin-1") + body
+            )
+            await writer.drain()
+
+            status_line = await self._readline(reader)
+            parts = status_line.split(" ", 2)
+            if len(parts) < 2 or not parts[1].isdigit():
+                raise BackendError(f"Malformed response: {status_line!r}")
+            status = int(parts[1])
+
+            headers = {}
+            while True:
+                line = await self._readline(reader)
+                if not line:
+                    break
+                key, _, value = line.partition(":")
+                headers[key.strip().lower()] = value.strip()
+
+            if status != 200:
+                raise BackendError(f"Backend returned HTTP {status}")
+
+            # A character may be split across chunks
+            decoder = codecs.getincrementaldecoder("utf-8")()
+            try:
+                if headers.get("transfer-encoding", "").lower() == "chunked":
+                    while True:
+                        size_line = await self._readline(reader)
+                        try:
+                            size = int(size_line.split(";", 1)[0], 16)
+                        except ValueError:
+                            raise BackendError(f"Malformed chunk size: {size_line!r}")
+                        if size == 0:
+                            break
+                        data = await asyncio.wait_for(reader.readexactly(size + 2), self.timeout)
+                        text = decoder.decode(data[:-2])
+                        if text:
+                            yield text
+                else:
+                    length = headers.get("content-length")
+                    if length is not None:
+                        if not length.isdigit():
+                            raise BackendError(f"Malformed Content-Length: {length!r}")
+                        data = await asyncio.wait_for(reader.readexactly(int(length)), self.timeout)
+                    else:
+                        data = await asyncio.wait_for(reader.read(), self.timeout)
+                    if data:
+                        yield decoder.decode(data)
+                decoder.decode(b"", final=True)
+            except UnicodeDecodeError as e:
+                raise BackendError(f"Invalid UTF-8 in response: {str(e)}")
+            except asyncio.IncompleteReadError:
+                raise BackendError("Connection closed by backend")
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+
+    async def _readline(self, reader: asyncio.StreamReader) -> str:
+        """Read one CRLF-terminated header line."""
+        line = await asyncio.wait_for(reader.readline(), self.timeout)
+        if not line:
+            raise BackendError("Connection closed by backend")
+        return line.decode("latin-1").rstrip("\r\n")
+
+
+def split_tokens(text: str):
+    """Split text into tokens that keep their trailing whitespace."""
+    start = 0
+    length = len(text)
+    while start < length:
+        end = start
+        while end < length and not text[end].isspace():
+            end += 1
+        while end < length and text[end].isspace():
+            end += 1
+        yield text[start:end]
+        start = end
+
+
+def create_backend(settings: Optional[Dict[str, Any]] = None) -> Backend:
+    """Build a backend from the ``backend`` section of the config."""
+    settings = settings or {}
+    kind = settings.get("type", "simulated")
+
+    if kind == "simulated":
+        return SimulatedBackend(token_delay=settings.get("token_delay", 0.0))
+    elif kind == "http":
+        if not settings.get("url"):
+            raise BackendError("The http backend requires a 'url' setting.")
+        return HTTPBackend(
+            settings["url"],
+            model=settings.get("model", "default"),
+            timeout=settings.get("timeout", 60.0),
+        )
+    raise BackendError(f"Unknown backend type: {kind}")
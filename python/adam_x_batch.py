@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Adam-X batch mode
+-----------------
+Runs commands read one per line on a bounded worker pool and writes one
+JSON object per command, in input order, for ``adam-x-py --batch``.
+"""
+
+import json
+import sys
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, TextIO
+
+from adam_x import AdamXEngine
+
+
+def iter_commands(lines: Iterable[str]) -> Iterator[str]:
+    """Yield non-empty lines, skipping ``#`` comments."""
+    for line in lines:
+        cmd = line.strip()
+        if cmd and not cmd.startswith("#"):
+            yield cmd
+
+
+def _execute(engine: AdamXEngine, cmd: str) -> Dict[str, Any]:
+    try:
+        return engine.execute(cmd)
+    except Exception as e:
+        return {"command": cmd, "error": str(e)}
+
+
+def run_batch(engine: AdamXEngine, commands: Iterable[str], out: TextIO,
+              workers: int = 4) -> int:
+    """Run commands concurrently and write JSON lines in input order.
+
+    At most ``workers * 4`` commands are in flight, so arbitrarily long
+    inputs are processed in constant memory. Returns the number of
+    commands that failed.
+    """
+    workers = max(1, workers)
+    failures = 0
+    pending = deque()
+
+    def emit(record: Dict[str, Any]) -> None:
+        nonlocal failures
+        if "error" in record:
+            failures += 1
+        out.write(json.dumps(record) + "\n")
+        out.flush()
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for cmd in commands:
+            pending.append(pool.submit(_execute, engine, cmd))
+            if len(pending) >= workers * 4:
+                emit(pending.popleft().result())
+        while pending:
+            emit(pending.popleft().result())
+
+    return failures
+
+
+def run_batch_file(engine: AdamXEngine, path: str, workers: int = 4,
+                   out: TextIO = None) -> int:
+    """Run the commands in ``path`` (``-`` for stdin); return an exit code."""
+    out = out or sys.stdout
+    if path == "-":
+        failures = run_batch(engine, iter_commands(sys.stdin), out, workers)
+    else:
+        try:
+            with open(path, 'r') as f:
+                failures = run_batch(engine, iter_commands(f), out, workers)
+        except OSError as e:
+            print(f"Error reading batch file: {str(e)}", file=sys.stderr)
+            return 2
+    return 1 if failures else 0
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Adam-X response cache
+---------------------
+Two-tier (memory LRU + on-disk) cache for backend responses, keyed on the
+action, the normalized input, the preferred language and the backend model.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+# Actions whose responses depend only on their input and can be cached
+CACHEABLE_ACTIONS = frozenset({"explain", "optimize", "debug", "generate"})
+
+
+def normalize_input(text: str) -> str:
+    """Normalize line endings and surrounding/trailing whitespace."""
+    lines = text.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    return "\n".join(line.rstrip() for line in lines).strip("\n")
+
+
+def make_key(action: str, input_text: str, language: str, model_id: str,
+             context: str = "") -> str:
+    """Build a cache key for a request, including the project context sent with it."""
+    parts = [action, normalize_input(input_text), language, model_id]
+    if context:
+        parts.append(hashlib.sha256(context.encode("utf-8")).hexdigest())
+    payload = json.dumps(parts)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Thread-safe LRU cache with a TTL- and size-bounded disk tier.
+
+    The memory tier holds up to ``memory_entries`` responses. The disk tier
+    stores one file per entry under ``directory``; entries older than
+    ``ttl`` seconds are ignored, and the least recently used files are
+    removed once the tier grows past ``max_disk_bytes``.
+    """
+
+    def __init__(self, directory: Optional[str] = None, memory_entries: int = 256,
+                 max_disk_bytes: int = 64 * 1024 * 1024, ttl: float = 7 * 24 * 3600):
+        self.directory = directory
+        self.memory_entries = memory_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.ttl = ttl
+        self._memory: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._disk_index: Optional[Dict[str, Tuple[float, int]]] = None
+        self._disk_bytes = 0
+        self._lock = threading.RLock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for ``key`` or None."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if now - entry[0] <= self.ttl:
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    return entry[1]
+                del self._memory[key]
+
+            value = self._disk_get(key, now)
+            if value is not None:
+                self.disk_hits += 1
+                return value
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, value: str) -> None:
+        """Store a response in both tiers."""
+        now = time.time()
+        with self._lock:
+            self._memory_put(key, now, value)
+            self._disk_put(key, now, value)
+
+    def clear(self) -> None:
+        """Drop every entry from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            for key in list(self._load_disk_index()):
+                self._disk_remove(key)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and tier sizes."""
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "disk_entries": len(self._disk_index or {}),
+                "disk_bytes": self._disk_bytes,
+            }
+
+    def _memory_put(self, key: str, created: float, value: str) -> None:
+        self._memory[key] = (created, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + ".json")
+
+    def _load_disk_index(self) -> Dict[str, Tuple[float, int]]:
+        """Scan the cache directory once and remember entry sizes."""
+        if self._disk_index is not None:
+            return self._disk_index
+
+        self._disk_index = {}
+        self._disk_bytes = 0
+        if not self.directory or not os.path.isdir(self.directory):
+            return self._disk_index
+
+        for shard in os.scandir(self.directory):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if not entry.name.endswith(".json"):
+                    continue
+                stat = entry.stat()
+                self._disk_index[entry.name[:-5]] = (stat.st_mtime, stat.st_size)
+                self._disk_bytes += stat.st_size
+        return self._disk_index
+
+    def _disk_get(self, key: str, now: float) -> Optional[str]:
+        if not self.directory:
+            return None
+        index = self._load_disk_index()
+        if key not in index:
+            return None
+
+        try:
+            with open(self._path(key), 'r') as f:
+                data = json.load(f)
+            created, value = data["created"], data["value"]
+            expired = now - created > self.ttl
+        except (OSError, ValueError, KeyError, TypeError):
+            # Unreadable, truncated or from another format: a miss
+            self._disk_remove(key)
+            return None
+
+        if expired:
+            self._disk_remove(key)
+            return None
+
+        # Touch the file so eviction sees it as recently used
+        try:
+            os.utime(self._path(key), (now, now))
+        except OSError:
+            pass
+        index[key] = (now, index[key][1])
+        self._memory_put(key, created, value)
+        return value
+
+    def _disk_put(self, key: str, created: float, value: str) -> None:
+        if not self.directory:
+            return
+        index = self._load_disk_index()
+        path = self._path(key)
+        data = json.dumps({"created": created, "value": value}).encode("utf-8")
+
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            return
+
+        if key in index:
+            self._disk_bytes -= index[key][1]
+        index[key] = (created, len(data))
+        self._disk_bytes += len(data)
+        self._evict()
+
+    def _disk_remove(self, key: str) -> None:
+        index = self._load_disk_index()
+        entry = index.pop(key, None)
+        if entry is not None:
+            self._disk_bytes -= entry[1]
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def _evict(self) -> None:
+        """Remove least recently used files until the tier fits its budget."""
+        if self._disk_bytes <= self.max_disk_bytes:
+            return
+        target = self.max_disk_bytes * 0.9
+        for key, _ in sorted(self._disk_index.items(), key=lambda item: item[1][0]):
+            if self._disk_bytes <= target:
+                break
+            self._disk_remove(key)
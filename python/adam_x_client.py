@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Adam-X thin client
+------------------
+Forwards one command to a running ``adam-x-py --serve`` daemon and streams
+the response to stdout. Deliberately imports only the standard library
+modules it needs so that each invocation starts as fast as possible.
+"""
+
+import json
+import os
+import socket
+import sys
+
+# typing is only needed by type checkers; skipping it keeps startup fast
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Iterator, List, Optional
+
+DEFAULT_SOCKET_PATH = os.path.join("~", ".adam-x", "daemon.sock")
+
+
+class DaemonUnavailable(Exception):
+    """Raised when no daemon is listening on the socket."""
+
+
+def _request(message: dict, socket_path: str) -> "Iterator[dict]":
+    """Send a request and yield the decoded response lines."""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        try:
+            sock.connect(os.path.expanduser(socket_path))
+        except (FileNotFoundError, ConnectionRefusedError) as e:
+            raise DaemonUnavailable(str(e)) from e
+        sock.sendall(json.dumps(message).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as stream:
+            for line in stream:
+                yield json.loads(line)
+    finally:
+        sock.close()
+
+
+def stream_command(cmd: str, socket_path: str = DEFAULT_SOCKET_PATH) -> "Iterator[str]":
+    """Yield the output chunks of a command run by the daemon."""
+    for message in _request({"command": cmd}, socket_path):
+        if "chunk" in message:
+            yield message["chunk"]
+        elif "error" in message:
+            raise RuntimeError(message["error"])
+        elif message.get("done"):
+            return
+
+
+def send_command(cmd: str, socket_path: str = DEFAULT_SOCKET_PATH) -> str:
+    """Run a command on the daemon and return its complete output."""
+    return "".join(stream_command(cmd, socket_path))
+
+
+def ping(socket_path: str = DEFAULT_SOCKET_PATH) -> bool:
+    """Return True if a daemon answers on the socket."""
+    try:
+        return any(m.get("done") for m in _request({"op": "ping"}, socket_path))
+    except (DaemonUnavailable, OSError):
+        return False
+
+
+def shutdown(socket_path: str = DEFAULT_SOCKET_PATH) -> None:
+    """Ask the daemon to exit."""
+    for _ in _request({"op": "shutdown"}, socket_path):
+        pass
+
+
+def main(argv: "Optional[List[str]]" = None) -> int:
+    """Entry point for ``adam-x-client``."""
+    args = sys.argv[1:] if argv is None else argv
+    socket_path = os.environ.get("ADAM_X_SOCKET", DEFAULT_SOCKET_PATH)
+    if args[:1] == ["--socket"] and len(args) >= 2:
+        socket_path, args = args[1], args[2:]
+
+    if not args or args[0] in ("-h", "--help"):
+        print("Usage: adam-x-client [--socket PATH] <command...>")
+        print("       adam-x-client --stop")
+        return 0 if args else 2
+
+    try:
+        if args == ["--stop"]:
+            shutdown(socket_path)
+            return 0
+        for chunk in stream_command(" ".join(args), socket_path):
+            sys.stdout.write(chunk)
+            sys.stdout.flush()
+    except DaemonUnavailable:
+        print("Adam-X daemon is not running. Start it with 'adam-x-py --serve'.", file=sys.stderr)
+        return 2
+    except RuntimeError as e:
+        print(f"Error: {str(e)}", file=sys.stderr)
+        return 1
+
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
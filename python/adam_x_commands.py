@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Adam-X command registry
+-----------------------
+Table-driven dispatch shared by the interactive REPL and the module-level
+API. Commands are looked up by their first word in a dict, so dispatch
+cost does not depend on how many commands exist.
+
+Third-party packages add commands through the ``adam_x.commands`` entry
+point group; the entry point name is the command word and the object it
+points to is either a ``Command`` or a callable ``handler(adam_x, argument)``.
+Plugins are neither listed nor imported until a command word that is not
+built in is first used.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+PLUGIN_GROUP = "adam_x.commands"
+
+# Argument modes
+NO_ARGUMENT = "none"
+REQUIRED_ARGUMENT = "required"
+OPTIONAL_ARGUMENT = "optional"
+
+
+class InputRequired(Exception):
+    """Raised when a command needs an answer typed at the REPL but runs elsewhere."""
+
+
+class Command:
+    """A command word and how to run it.
+
+    ``handler`` is either the name of an AdamX method or a callable taking
+    the AdamX instance (and the argument, unless ``args`` is ``"none"``).
+    Commands with an ``action`` are answered by the backend; the module
+    API returns the response text for them. For other commands the module
+    API returns ``result`` formatted with the argument, or the text the
+    handler printed when ``result`` is None. ``interactive`` commands may
+    prompt for input (through ``AdamX.ask``); outside the REPL they raise
+    ``InputRequired`` instead.
+    """
+
+    def __init__(self, name: str, handler: Union[str, Callable[..., Any]],
+                 usage: str = "", description: str = "", args: str = REQUIRED_ARGUMENT,
+                 action: Optional[str] = None, result: Optional[str] = None,
+                 interactive: bool = False):
+        self.name = name
+        self.handler = handler
+        self.usage = usage or name
+        self.description = description
+        self.args = args
+        self.action = action
+        self.result = result
+        self.interactive = interactive
+
+    def accepts(self, argument: str) -> bool:
+        """Return True if the argument fits this command's argument mode."""
+        if self.args == NO_ARGUMENT:
+            return not argument
+        if self.args == REQUIRED_ARGUMENT:
+            return bool(argument)
+        return True
+
+    def run(self, adam_x: Any, argument: str) -> Any:
+        """Invoke the handler on an AdamX instance."""
+        handler = self.handler
+        if isinstance(handler, str):
+            method = getattr(adam_x, handler)
+            return method() if self.args == NO_ARGUMENT else method(argument)
+        return handler(adam_x) if self.args == NO_ARGUMENT else handler(adam_x, argument)
+
+
+class CommandRegistry:
+    """Maps command words to ``Command`` objects."""
+
+    def __init__(self, plugin_group: Optional[str] = PLUGIN_GROUP):
+        self._commands: Dict[str, Command] = {}
+        self._plugin_group = plugin_group
+        self._plugins: Optional[Dict[str, Any]] = None
+
+    def register(self, command: Command) -> Command:
+        """Add or replace a command."""
+        self._commands[command.name.lower()] = command
+        return command
+
+    def command(self, name: str, **kwargs: Any) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+        """Decorator registering a function as the handler of ``name``."""
+        def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+            self.register(Command(name, func, **kwargs))
+            return func
+        return decorator
+
+    def get(self, name: str) -> Optional[Command]:
+        """Return the command for a word, loading a plugin if needed."""
+        name = name.lower()
+        command = self._commands.get(name)
+        if command is None and name:
+            command = self._load_plugin(name)
+        return command
+
+    def resolve(self, cmd: str) -> Tuple[Optional[Command], str]:
+        """Split a command line into its command and argument.
+
+        Returns ``(None, cmd)`` when the line is not a known command (or its
+        argument does not fit), in which case it is a generation request.
+        """
+        word, _, argument = cmd.strip().partition(" ")
+        argument = argument.strip()
+        command = self.get(word)
+        if command is None or not command.accepts(argument):
+            return None, cmd
+        return command, argument
+
+    def commands(self) -> List[Command]:
+        """Return the registered commands in registration order."""
+        return list(self._commands.values())
+
+    def names(self) -> List[str]:
+        """Return every command word, including plugins that have not been loaded."""
+        return list(self._commands) + [name for name in self._plugin_entry_points()
+                                       if name not in self._commands]
+
+    def _plugin_entry_points(self) -> Dict[str, Any]:
+        """Read (but do not import) the plugin entry points, once."""
+        if self._plugins is None:
+            self._plugins = {}
+            if self._plugin_group:
+                try:
+                    from importlib.metadata import entry_points
+                except ImportError:  # Python < 3.8
+                    return self._plugins
+                eps = entry_points()
+                if hasattr(eps, "select"):
+                    group = eps.select(group=self._plugin_group)
+                else:
+                    group = eps.get(self._plugin_group, [])
+                for ep in group:
+                    self._plugins.setdefault(ep.name.lower(), ep)
+        return self._plugins
+
+    def _load_plugin(self, name: str) -> Optional[Command]:
+        ep = self._plugin_entry_points().pop(name, None)
+        if ep is None:
+            return None
+        try:
+            target = ep.load()
+        except Exception as e:
+            print(f"Error loading command plugin '{name}': {str(e)}")
+            return None
+        if isinstance(target, Command):
+            command = target
+        else:
+            command = Command(name, target, usage=f"{name} <args>",
+                              args=OPTIONAL_ARGUMENT)
+        return self.register(command)
+
+
+COMMANDS = CommandRegistry()
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Adam-X tab completion
+---------------------
+Completes command words, subcommands, snippet names, project names and
+project file paths in the REPL. Each source is loaded once into a radix
+trie, so a completion walks only the characters typed so far and the
+matches it returns, however many names there are. The tries are updated in
+place when snippets are saved, projects created and files change, rather
+than rebuilt.
+"""
+
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# Most completions offered at once
+MAX_MATCHES = 200
+
+# Fixed words accepted after a command
+SUBCOMMANDS = {
+    "cache": ["clear"],
+    "cancel": ["all"],
+    "debug": ["project"],
+    "history": ["clear"],
+    "optimize": ["project"],
+    "scaffold": ["--dry-run", "--force", "--into"],
+    "stats": ["export", "reset"],
+}
+
+# Command whose first argument is completed from a source
+ARGUMENTS = {
+    "create": "files",
+    "find": "files",
+    "profile": "files",
+    "project": "projects",
+    "scaffold": "files",
+    "snippet": "snippets",
+    "use": "snippets",
+}
+
+# Commands taking @file references
+REFERENCES = ("debug", "explain", "optimize")
+
+
+class _Node:
+    __slots__ = ("label", "children", "terminal")
+
+    def __init__(self, label: str, terminal: bool = False):
+        self.label = label
+        self.children: Optional[Dict[str, "_Node"]] = None
+        self.terminal = terminal
+
+
+class Trie:
+    """A set of strings in a radix trie, with sorted prefix completion.
+
+    Edges carry whole substrings, so there is one node per branch point
+    rather than per character.
+    """
+
+    def __init__(self, words: Iterable[str] = ()):
+        self._root = _Node("")
+        self._size = 0
+        for word in words:
+            self.add(word)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, word: str) -> bool:
+        found = self._find(word)
+        return found is not None and found[1] == word and found[0].terminal
+
+    def add(self, word: str) -> bool:
+        """Add a word; return False if it was already present."""
+        node, i = self._root, 0
+        while i < len(word):
+            child = node.children.get(word[i]) if node.children else None
+            if child is None:
+                if node.children is None:
+                    node.children = {}
+                node.children[word[i]] = _Node(word[i:], True)
+                self._size += 1
+                return True
+            label = child.label
+            common = 1
+            limit = min(len(label), len(word) - i)
+            while common < limit and label[common] == word[i + common]:
+                common += 1
+            if common < len(label):
+                # Split the edge where the word leaves it
+                middle = _Node(label[:common])
+                child.label = label[common:]
+                middle.children = {child.label[0]: child}
+                node.children[word[i]] = middle
+                child = middle
+            node, i = child, i + common
+        if node.terminal or node is self._root:
+            return False
+        node.terminal = True
+        self._size += 1
+        return True
+
+    def discard(self, word: str) -> bool:
+        """Remove a word; return False if it was not present."""
+        parent, node, i = None, self._root, 0
+        while i < len(word):
+            child = node.children.get(word[i]) if node.children else None
+            if child is None or not word.startswith(child.label, i):
+                return False
+            parent, node, i = node, child, i + len(child.label)
+        if not node.terminal or parent is None:
+            return False
+        node.terminal = False
+        self._size -= 1
+
+        if not node.children:
+            del parent.children[node.label[0]]
+            if parent is not self._root and not parent.terminal and len(parent.children) == 1:
+                self._merge(parent)
+        elif len(node.children) == 1:
+            self._merge(node)
+        return True
+
+    @staticmethod
+    def _merge(node: _Node) -> None:
+        """Fold a node's only child into it."""
+        (child,) = node.children.values()
+        node.label += child.label
+        node.children = child.children
+        node.terminal = child.terminal
+
+    def _find(self, prefix: str) -> Optional[Tuple[_Node, str]]:
+        """Return the node where ``prefix`` ends (or the edge it ends inside
+        leads to) and the string spelled down to that node."""
+        node, i = self._root, 0
+        while i < len(prefix):
+            child = node.children.get(prefix[i]) if node.children else None
+            if child is None:
+                return None
+            label = child.label
+            if prefix.startswith(label, i):
+                node, i = child, i + len(label)
+            elif label.startswith(prefix[i:]):
+                return child, prefix[:i] + label
+            else:
+                return None
+        return node, prefix
+
+    def complete(self, prefix: str, limit: Optional[int] = None,
+                 stop: Optional[str] = None) -> List[str]:
+        """Return the words starting with ``prefix`` in sorted order.
+
+        With ``stop``, each match is cut after the first ``stop`` following
+        the prefix and duplicates are dropped, so ``stop="/"`` completes a
+        path one directory at a time.
+        """
+        found = self._find(prefix)
+        if found is None:
+            return []
+        node, spelled = found
+        if stop is not None:
+            cut = spelled.find(stop, len(prefix))
+            if cut >= 0:
+                return [spelled[:cut + 1]]
+
+        matches: List[str] = []
+        stack: List[Tuple[str, Optional[_Node]]] = [(spelled, node)]
+        while stack and (limit is None or len(matches) < limit):
+            spelled, node = stack.pop()
+            if node is None or node.terminal:
+                matches.append(spelled)
+            if node is None or not node.children:
+                continue
+            for key in sorted(node.children, reverse=True):
+                child = node.children[key]
+                word = spelled + child.label
+                cut = word.find(stop, len(spelled)) if stop is not None else -1
+                stack.append((word[:cut + 1], None) if cut >= 0 else (word, child))
+        return matches
+
+
+class Completer:
+    """Completes REPL input from tries of commands, snippets, projects and files.
+
+    The tries are built the first time they are needed and then kept
+    current through ``add``/``discard``/``update_files``; ``invalidate``
+    drops one to be rebuilt. ``install`` hooks the completer into readline.
+    """
+
+    def __init__(self, adam_x: Any, limit: int = MAX_MATCHES):
+        self.adam_x = adam_x
+        self.limit = limit
+        self._lock = threading.RLock()
+        self._tries: Dict[str, Trie] = {}
+        self._loaders: Dict[str, Callable[[], Iterable[str]]] = {
+            "commands": self._command_names,
+            "projects": lambda: self.adam_x.config.get("projects", {}),
+            "snippets": lambda: self.adam_x.snippets.names(),
+        }
+        self._readline: Any = None
+        self._matches: List[str] = []
+
+    def _command_names(self) -> List[str]:
+        from adam_x_commands import COMMANDS
+        return COMMANDS.names() + ["exit", "quit"]
+
+    def _project_files(self, name: str) -> List[str]:
+        index = self.adam_x.project_index(name)
+        return [path for path, _, _ in index.files()] if index is not None else []
+
+    def trie(self, kind: str) -> Trie:
+        """Return the trie of a source, building it on first use.
+
+        ``kind`` is ``commands``, ``projects``, ``snippets`` or
+        ``files:<project>``.
+        """
+        with self._lock:
+            trie = self._tries.get(kind)
+            if trie is None:
+                if kind.startswith("files:"):
+                    words = self._project_files(kind[len("files:"):])
+                else:
+                    words = self._loaders[kind]()
+                trie = self._tries[kind] = Trie(words)
+            return trie
+
+    def add(self, kind: str, words: Iterable[str]) -> None:
+        """Add words to a source, if its trie has been built."""
+        with self._lock:
+            trie = self._tries.get(kind)
+            if trie is not None:
+                for word in words:
+                    trie.add(word)
+
+    def discard(self, kind: str, words: Iterable[str]) -> None:
+        """Remove words from a source, if its trie has been built."""
+        with self._lock:
+            trie = self._tries.get(kind)
+            if trie is not None:
+                for word in words:
+                    trie.discard(word)
+
+    def update_files(self, project: str, changes: Dict[str, Any]) -> None:
+        """Apply a ``ProjectIndex.update`` result to the project's file trie."""
+        self.add(f"files:{project}", (path for path, _, _ in changes["updated"]))
+        self.discard(f"files:{project}", changes["deleted"])
+
+    def preload(self) -> None:
+        """Build the command, project and snippet tries ahead of the first Tab."""
+        for kind in self._loaders:
+            try:
+                self.trie(kind)
+            except Exception:
+                # Built again on first use, where the error is swallowed too
+                pass
+
+    def invalidate(self, kind: str) -> None:
+        """Drop a source's trie; it is rebuilt on next use."""
+        with self._lock:
+            self._tries.pop(kind, None)
+
+    def candidates(self, line: str) -> List[str]:
+        """Return the completions of the last word of ``line`` (the text before the cursor)."""
+        line = line.lstrip()
+        command, space, rest = line.partition(" ")
+        if not space:
+            return self.trie("commands").complete(command.lower(), self.limit)
+
+        command = command.lower()
+        words = rest.split(" ")
+        text = words[-1]
+        first = len(words) == 1
+        if text.startswith("@") and command in REFERENCES:
+            return ["@" + path for path in self._files(text[1:])]
+        kind = ARGUMENTS.get(command)
+        takes_options = command in ("profile", "scaffold")
+        if kind == "files" and (first or takes_options) and not text.startswith("-"):
+            return self._files(text)
+        if first and kind is not None and kind != "files":
+            return self.trie(kind).complete(text, self.limit)
+        if first and command in SUBCOMMANDS:
+            return [word for word in SUBCOMMANDS[command] if word.startswith(text)]
+        return []
+
+    def _files(self, prefix: str) -> List[str]:
+        project = self.adam_x.current_project
+        if project is None:
+            return []
+        return self.trie(f"files:{project}").complete(prefix, self.limit, stop="/")
+
+    def complete(self, text: str, state: int) -> Optional[str]:
+        """The readline completer: return the ``state``-th completion of ``text``."""
+        if state == 0:
+            try:
+                line = self._readline.get_line_buffer()[:self._readline.get_endidx()]
+                self._matches = self.candidates(line)
+            except Exception:
+                # Errors inside a readline callback are silently swallowed;
+                # offer nothing rather than stale matches
+                self._matches = []
+        return self._matches[state] if state < len(self._matches) else None
+
+    def install(self, readline: Any) -> None:
+        """Make this readline's completer; words are split at whitespace only."""
+        self._readline = readline
+        readline.set_completer(self.complete)
+        readline.set_completer_delims(" \t\n")
+        if "libedit" in (getattr(readline, "__doc__", None) or ""):
+            readline.parse_and_bind("bind ^I rl_complete")
+        else:
+            readline.parse_and_bind("tab: complete")
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Adam-X request context
+----------------------
+Chooses the parts of the current project most related to a request and
+packs them into a token and byte budget. Files are ranked by the symbols
+and file names the request mentions, by its imports, by local search
+relevance and by the import graph around the best matches. Token counts
+are estimated once per file content hash, so only changed files are
+re-measured.
+"""
+
+import math
+import os
+import posixpath
+import re
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+_IDENTIFIER = re.compile(r"[A-Za-z_][A-Za-z0-9_]{2,}")
+_TOKEN = re.compile(r"\w+|[^\w\s]")
+
+_IMPORT_PATTERNS = {
+    "python": r"^[ \t]*(?:from[ \t]+(\.*[\w.]*)[ \t]+import|import[ \t]+([\w.]+))",
+    "javascript": r"(?:\bfrom[ \t]*|\bimport[ \t]*\(?[ \t]*|\brequire\([ \t]*)['\"]([^'\"]+)['\"]",
+    "typescript": r"(?:\bfrom[ \t]*|\bimport[ \t]*\(?[ \t]*|\brequire\([ \t]*)['\"]([^'\"]+)['\"]",
+    "c": r"^[ \t]*#[ \t]*include[ \t]*\"([^\"]+)\"",
+    "cpp": r"^[ \t]*#[ \t]*include[ \t]*\"([^\"]+)\"",
+    "rust": r"^[ \t]*(?:pub[ \t]+)?(?:mod[ \t]+(\w+)|use[ \t]+crate::(\w+))",
+    "ruby": r"^[ \t]*require_relative[ \t]+['\"]([^'\"]+)['\"]",
+    "php": r"^[ \t]*(?:require|include)(?:_once)?[ \t(]*['\"]([^'\"]+)['\"]",
+}
+_IMPORT_RES = {lang: re.compile(pattern, re.MULTILINE) for lang, pattern in _IMPORT_PATTERNS.items()}
+
+_JS_SUFFIXES = ("", ".js", ".ts", ".jsx", ".tsx", ".mjs", "/index.js", "/index.ts")
+
+# Words too common in code to say anything about which file is meant
+_STOPWORDS = frozenset({
+    "the", "and", "for", "this", "that", "with", "from", "import", "return", "def",
+    "class", "self", "none", "true", "false", "not", "function", "const", "let", "var",
+    "print", "int", "str", "list", "dict", "len", "range", "what", "does", "code",
+})
+
+# Lines of a file shown when none of its symbols was asked about
+HEAD_LINES = 40
+MAX_CHUNK_LINES = 200
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the model token count of text.
+
+    Words are counted as one token per four characters and punctuation as
+    one token each, which tracks BPE tokenizers closely enough for budgeting.
+    """
+    return sum((len(token) + 3) // 4 for token in _TOKEN.findall(text))
+
+
+def find_imports(text: str, language: Optional[str]) -> List[str]:
+    """Return the module specifiers imported by source text."""
+    regex = _IMPORT_RES.get(language)
+    if regex is None:
+        return []
+    return [group for match in regex.finditer(text) for group in match.groups() if group]
+
+
+class Chunk:
+    """Lines ``start``-``end`` (1-based, inclusive) of a project file."""
+
+    def __init__(self, path: str, start: int, end: int, text: str, tokens: int, score: float):
+        self.path = path
+        self.start = start
+        self.end = end
+        self.text = text
+        self.tokens = tokens
+        self.score = score
+
+    def render(self) -> str:
+        return f"### {self.path}:{self.start}-{self.end}\n{self.text.rstrip()}\n"
+
+
+class ContextBuilder:
+    """Ranks project files for a request and packs chunks into a budget."""
+
+    def __init__(self, index: Any, search: Any = None, max_tokens: int = 2000,
+                 max_bytes: int = 16 * 1024, max_files: int = 8, cache_entries: int = 4096):
+        self.index = index
+        self.search = search
+        self.max_tokens = max_tokens
+        self.max_bytes = max_bytes
+        self.max_files = max_files
+        self.cache_entries = cache_entries
+        # content hash -> (tokens per byte, imported module specifiers)
+        self._file_info: "OrderedDict[str, Tuple[float, List[str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.measured = 0
+        self.last_stats: Dict[str, Any] = {}
+
+    def _info(self, path: str, digest: str, language: Optional[str],
+              text: Optional[str] = None) -> Tuple[float, List[str]]:
+        """Return the cached token density and imports of a file version."""
+        with self._lock:
+            info = self._file_info.get(digest)
+            if info is not None:
+                self._file_info.move_to_end(digest)
+                return info
+        if text is None:
+            text = self._read(path)
+        size = max(len(text.encode("utf-8")), 1)
+        info = (estimate_tokens(text) / size, find_imports(text, language))
+        with self._lock:
+            self._file_info[digest] = info
+            self.measured += 1
+            while len(self._file_info) > self.cache_entries:
+                self._file_info.popitem(last=False)
+        return info
+
+    def _read(self, path: str) -> str:
+        try:
+            with open(os.path.join(self.index.root, path), 'r', errors="replace") as f:
+                return f.read()
+        except OSError:
+            return ""
+
+    def _resolve(self, spec: str, importer: Optional[str], language: Optional[str]) -> List[str]:
+        """Map an import specifier to project paths."""
+        base = posixpath.dirname(importer) if importer else ""
+        candidates = []
+        if language == "python":
+            dots = len(spec) - len(spec.lstrip("."))
+            module = spec[dots:].replace(".", "/")
+            if dots:
+                package = base
+                for _ in range(dots - 1):
+                    package = posixpath.dirname(package)
+                stem = posixpath.join(package, module) if module else package
+                candidates = [stem + ".py", posixpath.join(stem, "__init__.py")]
+            elif module:
+                for found in self.index.find_files(module + ".py", limit=3):
+                    candidates.append(found)
+                candidates.append(posixpath.join(module, "__init__.py"))
+        elif language in ("javascript", "typescript"):
+            if spec.startswith("."):
+                stem = posixpath.normpath(posixpath.join(base, spec))
+                candidates = [stem + suffix for suffix in _JS_SUFFIXES]
+        elif language == "rust":
+            candidates = [posixpath.join(base, spec + ".rs"), posixpath.join(base, spec, "mod.rs")]
+            candidates += self.index.find_files(spec + ".rs", limit=2)
+        else:
+            candidates = [posixpath.normpath(posixpath.join(base, spec))]
+            candidates += self.index.find_files(spec, limit=2)
+        return [path for path in dict.fromkeys(candidates) if self.index.file(path) is not None]
+
+    def rank(self, text: str, language: Optional[str] = None,
+             exclude: Optional[str] = None) -> List[Tuple[str, float, Set[int]]]:
+        """Return ``(path, score, anchor lines)`` of related files, best first.
+
+        ``exclude`` names a file the request already contains.
+        """
+        scores: Dict[str, float] = defaultdict(float)
+        anchors: Dict[str, Set[int]] = defaultdict(set)
+        identifiers = list(dict.fromkeys(
+            word for word in _IDENTIFIER.findall(text) if word.lower() not in _STOPWORDS))[:64]
+
+        for word in identifiers:
+            # Definitions of the symbols the request names
+            definitions = self.index.find_symbols(word, limit=10, prefix=False)
+            for _, _, path, line in definitions:
+                scores[path] += 3.0 / len(definitions)
+                anchors[path].add(line)
+            # Files named after them
+            for path in self.index.find_files(word, limit=10):
+                if posixpath.splitext(posixpath.basename(path))[0].lower() == word.lower():
+                    scores[path] += 2.0
+
+        for spec in find_imports(text, language):
+            for path in self._resolve(spec, None, language):
+                scores[path] += 3.0
+
+        if self.search is not None:
+            results = self.search.search(text, limit=5)
+            if results:
+                top = results[0][1] or 1.0
+                for path, score in results:
+                    scores[path] += score / top
+
+        # Files imported by the strongest matches are likely relevant too
+        seeds = sorted(scores.items(), key=lambda item: -item[1])[:5]
+        for path, score in seeds:
+            entry = self.index.file(path)
+            if entry is None:
+                continue
+            _, imports = self._info(path, entry["hash"], entry["language"])
+            for spec in imports:
+                for imported in self._resolve(spec, path, entry["language"]):
+                    if imported != path:
+                        scores[imported] += min(1.0, 0.5 * score)
+
+        scores.pop(exclude, None)
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return [(path, score, anchors.get(path, set())) for path, score in ranked]
+
+    def _chunks(self, path: str, score: float, anchors: Set[int]) -> List[Chunk]:
+        """Cut the anchored definitions (or the head) of a file into chunks."""
+        entry = self.index.file(path)
+        if entry is None:
+            return []
+        text = self._read(path)
+        density, _ = self._info(path, entry["hash"], entry["language"], text)
+        lines = text.splitlines(keepends=True)
+        if not lines:
+            return []
+
+        spans = []
+        if anchors:
+            starts = sorted({line for _, _, line in self.index.symbols_in(path)})
+            for anchor in sorted(anchors):
+                if anchor > len(lines):
+                    continue
+                indent = _indent(lines[anchor - 1])
+                end = len(lines)
+                for start in starts:
+                    if start > anchor and _indent(lines[start - 1]) <= indent:
+                        end = start - 1
+                        break
+                while end > anchor and not lines[end - 1].strip():
+                    end -= 1
+                spans.append((anchor, min(end, anchor + MAX_CHUNK_LINES - 1)))
+        else:
+            spans.append((1, min(len(lines), HEAD_LINES)))
+
+        chunks = []
+        for start, end in spans:
+            body = "".join(lines[start - 1:end])
+            tokens = math.ceil(len(body.encode("utf-8")) * density)
+            chunks.append(Chunk(path, start, end, body, tokens, score))
+        return chunks
+
+    def build(self, text: str, language: Optional[str] = None,
+              exclude: Optional[str] = None) -> List[Chunk]:
+        """Return the chunks to send with a request, within the budget."""
+        start = time.perf_counter()
+        ranked = self.rank(text, language, exclude)
+        tokens_left = self.max_tokens
+        bytes_left = self.max_bytes
+        chosen: List[Chunk] = []
+        files = set()
+        for path, score, anchors in ranked:
+            if len(files) >= self.max_files or tokens_left <= 0:
+                break
+            for chunk in self._chunks(path, score, anchors):
+                size = len(chunk.text.encode("utf-8"))
+                if chunk.tokens > tokens_left or size > bytes_left:
+                    chunk = _trim(chunk, tokens_left, bytes_left)
+                    if chunk is None:
+                        continue
+                    size = len(chunk.text.encode("utf-8"))
+                chosen.append(chunk)
+                files.add(path)
+                tokens_left -= chunk.tokens
+                bytes_left -= size
+
+        self.last_stats = {
+            "candidates": len(ranked),
+            "files": len(files),
+            "chunks": len(chosen),
+            "tokens": self.max_tokens - tokens_left,
+            "bytes": self.max_bytes - bytes_left,
+            "ms": round((time.perf_counter() - start) * 1000, 3),
+        }
+        return chosen
+
+    def render(self, text: str, language: Optional[str] = None,
+               exclude: Optional[str] = None) -> str:
+        """Return the context for a request as one text block ("" if none)."""
+        return "\n".join(chunk.render() for chunk in self.build(text, language, exclude))
+
+
+def _indent(line: str) -> int:
+    return len(line) - len(line.lstrip(" \t"))
+
+
+def _trim(chunk: Chunk, tokens: int, size: int) -> Optional[Chunk]:
+    """Cut a chunk down to whole lines fitting the remaining budget, or None."""
+    if tokens < 32 or size < 128:
+        return None
+    density = chunk.tokens / max(len(chunk.text.encode("utf-8")), 1)
+    limit = min(size, int(tokens / density) if density else size)
+    kept = []
+    used = 0
+    for line in chunk.text.splitlines(keepends=True):
+        length = len(line.encode("utf-8"))
+        if used + length > limit:
+            break
+        kept.append(line)
+        used += length
+    if not kept:
+        return None
+    body = "".join(kept)
+    return Chunk(chunk.path, chunk.start, chunk.start + len(kept) - 1, body,
+                 math.ceil(used * density), chunk.score)
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Adam-X daemon
+-------------
+Long-running server that keeps an AdamXEngine warm (config, response cache,
+backend) and answers commands from ``adam_x_client`` over a Unix domain
+socket.
+
+Protocol: the client sends one JSON object per line, either
+``{"command": "<cmd>"}`` or ``{"op": "ping" | "shutdown"}``. For a command
+the server answers with ``{"chunk": "<text>"}`` lines as output becomes
+available, followed by ``{"done": true}`` or ``{"error": "<message>"}``.
+"""
+
+import asyncio
+import json
+import os
+import socket
+import sys
+import threading
+from typing import Any, Dict, Optional
+
+from adam_x import AdamXEngine
+from adam_x_client import DEFAULT_SOCKET_PATH
+
+
+class AdamXDaemon:
+    """Serve an AdamXEngine over a Unix domain socket."""
+
+    def __init__(self, engine: AdamXEngine, socket_path: str = DEFAULT_SOCKET_PATH):
+        self.engine = engine
+        self.socket_path = os.path.expanduser(socket_path)
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._stopped: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.ready = threading.Event()
+
+    async def serve_forever(self) -> None:
+        """Listen on the socket until a shutdown request arrives."""
+        self._loop = asyncio.get_running_loop()
+        self._stopped = asyncio.Event()
+        self._remove_stale_socket()
+        os.makedirs(os.path.dirname(self.socket_path) or ".", exist_ok=True)
+
+        self._server = await asyncio.start_unix_server(self._handle, path=self.socket_path)
+        os.chmod(self.socket_path, 0o600)
+        self.ready.set()
+        try:
+            await self._stopped.wait()
+        finally:
+            self._server.close()
+            await self._server.wait_closed()
+            try:
+                os.remove(self.socket_path)
+            except OSError:
+                pass
+
+    def run(self) -> None:
+        """Run the daemon in the current thread."""
+        asyncio.run(self.serve_forever())
+
+    def stop(self) -> None:
+        """Ask a running daemon to shut down; safe to call from any thread."""
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._stopped.set)
+
+    def _remove_stale_socket(self) -> None:
+        """Delete a socket file left behind by a daemon that is gone."""
+        if not os.path.exists(self.socket_path):
+            return
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.socket_path)
+        except OSError:
+            os.remove(self.socket_path)
+        else:
+            raise RuntimeError(f"An Adam-X daemon is already listening on {self.socket_path}")
+        finally:
+            probe.close()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            line = await reader.readline()
+            if not line:
+                return
+            try:
+                request = json.loads(line)
+            except json.JSONDecodeError:
+                await self._send(writer, {"error": "Invalid request"})
+                return
+
+            op = request.get("op")
+            if op == "ping":
+                await self._send(writer, {"done": True})
+            elif op == "shutdown":
+                await self._send(writer, {"done": True})
+                self._stopped.set()
+            elif isinstance(request.get("command"), str):
+                await self._run_command(writer, request["command"].strip())
+            else:
+                await self._send(writer, {"error": "Invalid request"})
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+
+    async def _run_command(self, writer: asyncio.StreamWriter, cmd: str) -> None:
+        try:
+            async for chunk in self.engine.astream_command(cmd):
+                await self._send(writer, {"chunk": chunk})
+        except ConnectionError:
+            raise
+        except Exception as e:
+            await self._send(writer, {"error": str(e)})
+            return
+        await self._send(writer, {"done": True})
+
+    async def _send(self, writer: asyncio.StreamWriter, message: Dict[str, Any]) -> None:
+        writer.write(json.dumps(message).encode("utf-8") + b"\n")
+        await writer.drain()
+
+
+def serve(socket_path: str = DEFAULT_SOCKET_PATH,
+          config_path: str = "~/.adam-x/config.json") -> None:
+    """Start a daemon with a fresh engine and block until it shuts down."""
+    daemon = AdamXDaemon(AdamXEngine(config_path), socket_path)
+    print(f"Adam-X daemon listening on {daemon.socket_path}")
+    # Commands answer clients only; one reading the terminal would hang
+    sys.stdin = open(os.devnull)
+    try:
+        daemon.run()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Adam-X command history
+----------------------
+A bounded ring buffer of REPL commands in a memory-mapped file. The file
+has a fixed size, so a session that runs for weeks uses the same memory
+and disk as one that runs for minutes: when the buffer is full, the oldest
+commands are overwritten.
+
+Each record is ``0xFF``, the time in eight bytes from ``0x80-0xBF``, the
+command in UTF-8 and ``0xFE``. Neither marker byte occurs in UTF-8 and
+the time bytes cannot start a UTF-8 character, so a substring search can
+run over the raw buffer with ``mmap.rfind`` and never matches across
+records or inside a timestamp; the record around a match is found with
+another ``rfind`` for ``0xFF``.
+"""
+
+import mmap
+import os
+import struct
+import threading
+import time
+from collections import namedtuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+MAGIC = b"AXHIST1\0"
+# magic, capacity, head, tail, wrap, count
+_HEADER = struct.Struct("<8sQQQQQ")
+HEADER_SIZE = 64
+
+_START = b"\xff"
+_END = b"\xfe"
+_TIME_BYTES = 8
+
+# A command's frequency is weighted by how long ago it was last used
+_RECENCY_WEIGHTS = ((3600, 4.0), (24 * 3600, 2.0), (7 * 24 * 3600, 0.5))
+_OLD_WEIGHT = 0.25
+
+HistoryEntry = namedtuple("HistoryEntry", ["time", "command"])
+
+
+def _encode(command: str, when: float, limit: int) -> bytes:
+    """Return the record for ``command``, truncated to ``limit`` bytes of UTF-8."""
+    payload = command.encode("utf-8", "replace")
+    if len(payload) > limit:
+        payload = payload[:limit].decode("utf-8", "ignore").encode("utf-8")
+    ms = int(when * 1000)
+    stamp = bytes(0x80 | ((ms >> (6 * i)) & 0x3F) for i in reversed(range(_TIME_BYTES)))
+    return _START + stamp + payload + _END
+
+
+def _decode(record: bytes) -> HistoryEntry:
+    ms = 0
+    for byte in record[1:1 + _TIME_BYTES]:
+        ms = (ms << 6) | (byte & 0x3F)
+    return HistoryEntry(ms / 1000, record[1 + _TIME_BYTES:-1].decode("utf-8", "replace"))
+
+
+class HistoryStore:
+    """Ring buffer of commands, newest last.
+
+    ``max_bytes`` is the size of the buffer and ``max_entries`` the most
+    commands kept; whichever is reached first evicts the oldest command.
+    With ``path=None`` the buffer is anonymous memory and nothing persists.
+    A file created with a different ``max_bytes`` is rewritten at the new
+    size, keeping the newest commands that fit.
+    """
+
+    def __init__(self, path: Optional[str], max_entries: int = 10000,
+                 max_bytes: int = 1024 * 1024):
+        if max_bytes < 1024:
+            raise ValueError("History needs at least 1024 bytes")
+        self.path = os.path.expanduser(path) if path else None
+        self.max_entries = max(1, max_entries)
+        self.capacity = max_bytes
+        # Longer commands are truncated so that one never evicts everything
+        self.max_command_bytes = min(4096, max_bytes // 8)
+        self._lock = threading.Lock()
+        self._file: Any = None
+        self._frequency: Optional[Dict[str, List[float]]] = None
+        self._mm = self._open()
+
+    def _open(self) -> mmap.mmap:
+        size = HEADER_SIZE + self.capacity
+        if self.path is None:
+            mm = mmap.mmap(-1, size)
+            _HEADER.pack_into(mm, 0, MAGIC, self.capacity, 0, 0, 0, 0)
+            return mm
+
+        kept: List[HistoryEntry] = []
+        if os.path.exists(self.path):
+            self._file = open(self.path, 'r+b')
+            existing = os.fstat(self._file.fileno()).st_size
+            if existing >= HEADER_SIZE:
+                mm = mmap.mmap(self._file.fileno(), existing)
+                magic, capacity = _HEADER.unpack_from(mm, 0)[:2]
+                if magic == MAGIC and capacity == self.capacity and existing == size:
+                    return mm
+                if magic == MAGIC and existing == HEADER_SIZE + capacity:
+                    # Resized: carry over the newest commands
+                    self._mm, self.capacity = mm, capacity
+                    kept = list(self.entries())
+                    self.capacity = size - HEADER_SIZE
+                mm.close()
+            self._file.close()
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(_HEADER.pack(MAGIC, self.capacity, 0, 0, 0, 0))
+            f.truncate(size)
+        os.replace(tmp_path, self.path)
+        self._file = open(self.path, 'r+b')
+        self._mm = mmap.mmap(self._file.fileno(), size)
+        budget = self.capacity
+        for i, entry in enumerate(kept[:self.max_entries]):
+            budget -= len(_encode(entry.command, entry.time, self.max_command_bytes))
+            if budget < 0:
+                kept = kept[:i]
+                break
+        for entry in reversed(kept[:self.max_entries]):
+            self._append(entry.command, entry.time)
+        return self._mm
+
+    def _header(self) -> Tuple[int, int, int, int]:
+        """Return ``(head, tail, wrap, count)``."""
+        return _HEADER.unpack_from(self._mm, 0)[2:]
+
+    def _segments(self, head: int, tail: int, wrap: int, count: int) -> List[Tuple[int, int]]:
+        """Return the ``(start, end)`` data offsets holding records, oldest first."""
+        if not count:
+            return []
+        if tail < head:
+            return [(tail, head)]
+        return [(tail, wrap), (0, head)]
+
+    def __len__(self) -> int:
+        return self._header()[3]
+
+    def append(self, command: str, when: Optional[float] = None) -> None:
+        """Add a command as the newest entry, evicting the oldest as needed."""
+        if not command:
+            return
+        with self._lock:
+            if self._file is not None and fcntl is not None:
+                # Another REPL may be appending to the same file
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+            try:
+                self._append(command, time.time() if when is None else when)
+            finally:
+                if self._file is not None and fcntl is not None:
+                    fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+
+    def _append(self, command: str, when: float) -> None:
+        mm = self._mm
+        record = _encode(command, when, self.max_command_bytes)
+        size = len(record)
+        head, tail, wrap, count = self._header()
+
+        def evict():
+            nonlocal head, tail, count
+            end = mm.find(_END, HEADER_SIZE + tail) + 1 - HEADER_SIZE
+            if self._frequency is not None:
+                self._forget(_decode(mm[HEADER_SIZE + tail:HEADER_SIZE + end]).command)
+            tail, count = end, count - 1
+            if not count:
+                head = tail = 0
+            elif tail >= head and tail == wrap:
+                tail = 0
+
+        while count >= self.max_entries:
+            evict()
+        if head + size > self.capacity:
+            # Drop the records after head, then continue at the start
+            while count and tail >= head:
+                evict()
+            if count:
+                wrap, head = head, 0
+        while count and head <= tail < head + size:
+            evict()
+        # Evictions are recorded before the record is written over them
+        _HEADER.pack_into(mm, 0, MAGIC, self.capacity, head, tail, wrap, count)
+
+        mm[HEADER_SIZE + head:HEADER_SIZE + head + size] = record
+        _HEADER.pack_into(mm, 0, MAGIC, self.capacity, head + size, tail, wrap, count + 1)
+        if self._frequency is not None:
+            # Keyed by the stored text, which evictions and _count see
+            stats = self._frequency.setdefault(_decode(record).command, [0, 0.0])
+            stats[0] += 1
+            stats[1] = max(stats[1], when)
+
+    def _forget(self, command: str) -> None:
+        stats = self._frequency.get(command)
+        if stats is not None:
+            stats[0] -= 1
+            if stats[0] <= 0:
+                del self._frequency[command]
+
+    def entries(self) -> Iterator[HistoryEntry]:
+        """Yield the entries, newest first."""
+        return self.search("")
+
+    def search(self, text: str) -> Iterator[HistoryEntry]:
+        """Yield the entries containing ``text``, newest first.
+
+        Like a reverse incremental search, each step continues from the
+        previous match, so the newest matches come back without reading the
+        rest of the buffer.
+        """
+        mm = self._mm
+        needle = text.encode("utf-8", "replace") or _END
+        for start, end in reversed(self._segments(*self._header())):
+            start += HEADER_SIZE
+            end += HEADER_SIZE
+            while end > start:
+                found = mm.rfind(needle, start, end)
+                if found < 0:
+                    break
+                begin = mm.rfind(_START, start, found)
+                stop = mm.find(_END, found, end) + 1
+                yield _decode(mm[begin:stop])
+                end = begin
+
+    def _count(self) -> Dict[str, List[float]]:
+        """Return ``{command: [uses, last used]}`` over the whole buffer."""
+        frequency: Dict[str, List[float]] = {}
+        for start, end in reversed(self._segments(*self._header())):
+            # Whole segments split at once; the time is decoded only for
+            # the newest use of each command
+            records = self._mm[HEADER_SIZE + start:HEADER_SIZE + end].split(_START)
+            for record in reversed(records):
+                if not record:
+                    continue
+                command = record[_TIME_BYTES:-1]
+                stats = frequency.get(command)
+                if stats is None:
+                    frequency[command] = [1, _decode(_START + record).time]
+                else:
+                    stats[0] += 1
+        return {command.decode("utf-8", "replace"): stats
+                for command, stats in frequency.items()}
+
+    def recent(self, limit: int, unique: bool = True) -> List[str]:
+        """Return up to ``limit`` of the newest commands, newest first."""
+        commands: List[str] = []
+        seen = set()
+        for entry in self.entries():
+            if len(commands) >= limit:
+                break
+            if unique:
+                if entry.command in seen:
+                    continue
+                seen.add(entry.command)
+            commands.append(entry.command)
+        return commands
+
+    def ranked(self, text: str = "", limit: int = 20,
+               now: Optional[float] = None) -> List[Tuple[str, int, float]]:
+        """Return ``(command, uses, last_used)`` for commands containing ``text``.
+
+        Commands are ranked by how often they were used, weighted by how
+        recently: within the hour counts 4x, within the day 2x, within the
+        week 0.5x and older 0.25x.
+        """
+        with self._lock:
+            if self._frequency is None:
+                self._frequency = self._count()
+            candidates = [(command, int(uses), last)
+                          for command, (uses, last) in self._frequency.items()
+                          if text in command]
+        now = time.time() if now is None else now
+
+        def score(candidate):
+            _, uses, last = candidate
+            age = now - last
+            weight = next((w for limit_age, w in _RECENCY_WEIGHTS if age < limit_age), _OLD_WEIGHT)
+            return (uses * weight, last)
+
+        candidates.sort(key=score, reverse=True)
+        return candidates[:limit]
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            _HEADER.pack_into(self._mm, 0, MAGIC, self.capacity, 0, 0, 0, 0)
+            if self._frequency is not None:
+                self._frequency.clear()
+
+    def flush(self) -> None:
+        if self._file is not None:
+            self._mm.flush()
+
+    def close(self) -> None:
+        """Write the buffer to disk and unmap it."""
+        with self._lock:
+            if self._mm.closed:
+                return
+            self.flush()
+            self._mm.close()
+            if self._file is not None:
+                self._file.close()
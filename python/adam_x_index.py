@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+"""
+Adam-X project file index
+-------------------------
+Persistent per-project index of file paths, sizes, mtimes, content hashes,
+languages and symbol names, stored in SQLite. The first build reads every
+file in parallel; later updates only stat the tree and re-read files whose
+size or mtime changed, and only re-parse those whose content hash changed.
+File and symbol lookups are indexed queries, so they do not walk the tree.
+"""
+
+import concurrent.futures
+import hashlib
+import multiprocessing
+import os
+import re
+import sqlite3
+import stat
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    name TEXT NOT NULL COLLATE NOCASE,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    hash TEXT NOT NULL,
+    language TEXT
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS files_name ON files(name);
+CREATE TABLE IF NOT EXISTS symbols (
+    name TEXT NOT NULL COLLATE NOCASE,
+    kind TEXT NOT NULL,
+    path TEXT NOT NULL,
+    line INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS symbols_name ON symbols(name);
+CREATE INDEX IF NOT EXISTS symbols_path ON symbols(path);
+"""
+
+# Directories that never hold project sources
+IGNORED_DIRS = frozenset({
+    ".git", ".hg", ".svn", "__pycache__", "node_modules", ".venv", "venv",
+    ".tox", ".mypy_cache", ".pytest_cache", ".idea", ".vscode",
+})
+
+# Files larger than this are hashed but not parsed for symbols
+MAX_SYMBOL_BYTES = 1024 * 1024
+
+# Below this many files to read, a process pool costs more than it saves
+_PROCESS_POOL_THRESHOLD = 512
+_BATCH_SIZE = 256
+
+_SYMBOL_PATTERNS = {
+    "python": r"^[ \t]*(?:async[ \t]+)?(def|class)[ \t]+([A-Za-z_]\w*)",
+    "javascript": r"^[ \t]*(?:export[ \t]+)?(?:default[ \t]+)?(?:async[ \t]+)?"
+                  r"(function\*?|class|const|let|var)[ \t]+([A-Za-z_$][\w$]*)",
+    "typescript": r"^[ \t]*(?:export[ \t]+)?(?:default[ \t]+)?(?:abstract[ \t]+)?(?:async[ \t]+)?"
+                  r"(function\*?|class|interface|type|enum|const|let)[ \t]+([A-Za-z_$][\w$]*)",
+    "java": r"^[ \t]*(?:(?:public|private|protected|static|final|abstract)[ \t]+)*"
+            r"(class|interface|enum|record)[ \t]+([A-Za-z_]\w*)",
+    "c": r"^(struct|enum|union|#define)[ \t]+([A-Za-z_]\w*)",
+    "cpp": r"^[ \t]*(class|struct|namespace|enum|#define)[ \t]+([A-Za-z_]\w*)",
+    "rust": r"^[ \t]*(?:pub(?:\([^)]*\))?[ \t]+)?(?:async[ \t]+)?"
+            r"(fn|struct|enum|trait|mod|type|const)[ \t]+([A-Za-z_]\w*)",
+    "go": r"^(func|type)[ \t]+(?:\([^)]*\)[ \t]*)?([A-Za-z_]\w*)",
+    "ruby": r"^[ \t]*(def|class|module)[ \t]+(?:self\.)?([A-Za-z_]\w*[?!]?)",
+    "php": r"^[ \t]*(?:(?:public|private|protected|static|abstract|final)[ \t]+)*"
+           r"(function|class|interface|trait)[ \t]+([A-Za-z_]\w*)",
+    "shell": r"^[ \t]*(?:(function)[ \t]+([A-Za-z_][\w-]*)|()([A-Za-z_][\w-]*)[ \t]*\(\))",
+}
+_SYMBOL_RES = {lang: re.compile(pattern, re.MULTILINE) for lang, pattern in _SYMBOL_PATTERNS.items()}
+
+
+def extension_map(languages: Dict[str, Dict[str, str]]) -> Dict[str, str]:
+    """Build an ``{".ext": language}`` lookup from the AdamX language table."""
+    return {info["ext"]: lang for lang, info in languages.items()}
+
+
+def extract_symbols(text: str, language: Optional[str]) -> List[Tuple[str, str, int]]:
+    """Return ``(name, kind, line)`` for the definitions found in source text."""
+    regex = _SYMBOL_RES.get(language)
+    if regex is None:
+        return []
+    symbols = []
+    line = 1
+    last = 0
+    for match in regex.finditer(text):
+        line += text.count("\n", last, match.start())
+        last = match.start()
+        groups = [g for g in match.groups() if g]
+        if len(groups) == 2:
+            kind, name = groups
+        else:
+            kind, name = "function", groups[0]
+        symbols.append((name, kind.lstrip("#"), line))
+    return symbols
+
+
+def _scan_batch(root: str, items: List[Tuple[str, Optional[str], Optional[str]]]) -> List[Tuple]:
+    """Hash files and, if their content changed, extract their symbols.
+
+    ``items`` holds ``(path, language, known_hash)``. Returns
+    ``(path, hash, symbols)`` where ``symbols`` is None when the hash
+    matches ``known_hash`` (or the file vanished and ``hash`` is None).
+    Runs in worker processes, so it must stay a picklable module function.
+    """
+    results = []
+    for path, language, known_hash in items:
+        try:
+            with open(os.path.join(root, path), 'rb') as f:
+                data = f.read()
+        except OSError:
+            results.append((path, None, None))
+            continue
+        digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+        if digest == known_hash:
+            results.append((path, digest, None))
+            continue
+        symbols: List[Tuple[str, str, int]] = []
+        if language in _SYMBOL_RES and len(data) <= MAX_SYMBOL_BYTES and b"\0" not in data[:8192]:
+            symbols = extract_symbols(data.decode("utf-8", errors="replace"), language)
+        results.append((path, digest, symbols))
+    return results
+
+
+def walk_tree(root: str, rel_dir: str = "") -> Dict[str, Tuple[int, int]]:
+    """Stat a directory tree, skipping ``IGNORED_DIRS``.
+
+    Returns ``{path relative to root: (size, mtime_ns)}`` for the regular
+    files below ``root/rel_dir``; symlinks are not followed.
+    """
+    found = {}
+    stack = [rel_dir]
+    while stack:
+        rel_dir = stack.pop()
+        try:
+            entries = os.scandir(os.path.join(root, rel_dir))
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in IGNORED_DIRS:
+                            stack.append(rel)
+                    elif entry.is_file(follow_symlinks=False):
+                        st = entry.stat(follow_symlinks=False)
+                        found[rel] = (st.st_size, st.st_mtime_ns)
+                except OSError:
+                    continue
+    return found
+
+
+def _batches(items: List[Any], size: int) -> Iterable[List[Any]]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+class ProjectIndex:
+    """File and symbol index for one project directory."""
+
+    def __init__(self, root: str, path: str, languages: Dict[str, Dict[str, str]],
+                 workers: Optional[int] = None):
+        self.root = os.path.abspath(root)
+        self.path = path
+        self.workers = workers or os.cpu_count() or 1
+        self._extensions = extension_map(languages)
+        self._lock = threading.RLock()
+        self._update_lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'root'").fetchone()
+        if row is not None and row[0] != self.root:
+            # The project moved; its old entries are meaningless
+            self._conn.executescript("DELETE FROM files; DELETE FROM symbols;")
+        self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('root', ?)", (self.root,))
+        self._conn.commit()
+        self.last_update: Optional[Dict[str, Any]] = None
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+
+    def language_of(self, path: str) -> Optional[str]:
+        """Return the language of a path from its extension, or None."""
+        return self._extensions.get(os.path.splitext(path)[1].lower())
+
+    def walk(self) -> Dict[str, Tuple[int, int]]:
+        """Stat the project tree; return ``{relative path: (size, mtime_ns)}``."""
+        return walk_tree(self.root)
+
+    def update(self, paths: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """Bring the index up to date with the files on disk.
+
+        With ``paths`` (relative files or directories, e.g. from a file
+        watcher), only those are re-examined; missing paths are removed
+        along with everything below them. Returns counts of ``added``,
+        ``changed`` and ``removed`` files, how many were ``read``, the time
+        taken, plus the ``(path, hash, language)`` of the files whose content
+        changed (``updated``) and the ``deleted`` paths.
+        """
+        with self._update_lock:
+            start = time.perf_counter()
+            if paths is None:
+                on_disk = self.walk()
+                with self._lock:
+                    rows = self._conn.execute("SELECT path, size, mtime_ns, hash FROM files").fetchall()
+            else:
+                on_disk, rows = self._examine(paths)
+            known = {path: (size, mtime_ns, digest) for path, size, mtime_ns, digest in rows}
+
+            removed = [path for path in known if path not in on_disk]
+            todo = []
+            for path, stamp in on_disk.items():
+                old = known.get(path)
+                if old is None or old[:2] != stamp:
+                    todo.append((path, self.language_of(path), old[2] if old else None))
+
+            results = self._scan(todo)
+
+            added = changed = 0
+            file_rows = []
+            symbol_rows = []
+            updated = []
+            for (path, language, known_hash), (_, digest, symbols) in zip(todo, results):
+                if digest is None:
+                    # Deleted between the walk and the read
+                    if known_hash is not None:
+                        removed.append(path)
+                    continue
+                size, mtime_ns = on_disk[path]
+                file_rows.append((path, os.path.basename(path), size, mtime_ns, digest, language))
+                if symbols is not None:
+                    updated.append((path, digest, language))
+                    symbol_rows.extend((name, kind, path, line) for name, kind, line in symbols)
+                    if known_hash is None:
+                        added += 1
+                    else:
+                        changed += 1
+
+            with self._lock, self._conn:
+                self._conn.executemany("DELETE FROM files WHERE path = ?", [(p,) for p in removed])
+                self._conn.executemany("DELETE FROM symbols WHERE path = ?",
+                                       [(p,) for p in removed] + [(u[0],) for u in updated])
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO files (path, name, size, mtime_ns, hash, language) "
+                    "VALUES (?, ?, ?, ?, ?, ?)", file_rows)
+                self._conn.executemany(
+                    "INSERT INTO symbols (name, kind, path, line) VALUES (?, ?, ?, ?)", symbol_rows)
+
+            examined = len(on_disk) - (len(todo) - len(file_rows))
+            self.last_update = {
+                "files": len(self),
+                "added": added,
+                "changed": changed,
+                "removed": len(removed),
+                "unchanged": examined - added - changed,
+                "read": len(todo),
+                "seconds": round(time.perf_counter() - start, 3),
+            }
+            return dict(self.last_update, updated=updated, deleted=removed)
+
+    def _examine(self, paths: Iterable[str]) -> Tuple[Dict[str, Tuple[int, int]], List[Tuple]]:
+        """Stat the given paths; return what is on disk and the matching index rows."""
+        on_disk: Dict[str, Tuple[int, int]] = {}
+        rows: List[Tuple] = []
+        for path in set(paths):
+            path = path.replace(os.sep, "/").strip("/")
+            if not path or IGNORED_DIRS.intersection(path.split("/")):
+                continue
+            full = os.path.join(self.root, path)
+            if os.path.isdir(full) and not os.path.islink(full):
+                on_disk.update(walk_tree(self.root, path))
+            else:
+                try:
+                    st = os.stat(full, follow_symlinks=False)
+                    if stat.S_ISREG(st.st_mode):
+                        on_disk[path] = (st.st_size, st.st_mtime_ns)
+                except OSError:
+                    pass
+            with self._lock:
+                # The path itself and, if it was a directory, everything below it
+                rows += self._conn.execute(
+                    "SELECT path, size, mtime_ns, hash FROM files "
+                    "WHERE path = ? OR (path > ? AND path < ?)",
+                    (path, path + "/", path + "0")).fetchall()
+        return on_disk, rows
+
+    def _scan(self, todo: List[Tuple[str, Optional[str], Optional[str]]]) -> List[Tuple]:
+        """Run ``_scan_batch`` over ``todo``, in parallel when it is large."""
+        if len(todo) < _PROCESS_POOL_THRESHOLD or self.workers < 2:
+            return _scan_batch(self.root, todo)
+
+        batches = list(_batches(todo, _BATCH_SIZE))
+        try:
+            # Spawned, not forked: the watcher, job and completer threads are running
+            with concurrent.futures.ProcessPoolExecutor(
+                    self.workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+                parts = list(pool.map(_scan_batch, [self.root] * len(batches), batches))
+        except (OSError, NotImplementedError, ValueError, concurrent.futures.BrokenExecutor):
+            # No usable process pool here; hashing still releases the GIL
+            with concurrent.futures.ThreadPoolExecutor(self.workers) as pool:
+                parts = list(pool.map(_scan_batch, [self.root] * len(batches), batches))
+        return [result for part in parts for result in part]
+
+    def files(self) -> List[Tuple[str, str, Optional[str]]]:
+        """Return ``(path, hash, language)`` for every indexed file."""
+        with self._lock:
+            return self._conn.execute("SELECT path, hash, language FROM files").fetchall()
+
+    def file(self, path: str) -> Optional[Dict[str, Any]]:
+        """Return the index entry for a relative path, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT path, size, mtime_ns, hash, language FROM files WHERE path = ?",
+                (path,)).fetchone()
+        if row is None:
+            return None
+        return dict(zip(("path", "size", "mtime_ns", "hash", "language"), row))
+
+    def find_files(self, query: str, limit: int = 20) -> List[str]:
+        """Return project paths matching a file name, name prefix or path suffix."""
+        query = query.strip().replace(os.sep, "/")
+        with self._lock:
+            if "/" in query:
+                name = query.rsplit("/", 1)[1]
+                rows = self._conn.execute(
+                    "SELECT path FROM files WHERE name = ? AND (path = ? OR path LIKE ?) "
+                    "ORDER BY path LIMIT ?",
+                    (name, query, "%/" + query.lstrip("/"), limit)).fetchall()
+            else:
+                rows = self._conn.execute(
+                    "SELECT path FROM files WHERE name = ? ORDER BY path LIMIT ?",
+                    (query, limit)).fetchall()
+                if len(rows) < limit:
+                    rows += self._conn.execute(
+                        "SELECT path FROM files WHERE name > ? AND name < ? "
+                        "ORDER BY name, path LIMIT ?",
+                        (query, query + "\U0010ffff", limit - len(rows))).fetchall()
+        return [row[0] for row in rows]
+
+    def find_symbols(self, name: str, limit: int = 20,
+                     prefix: bool = True) -> List[Tuple[str, str, str, int]]:
+        """Return ``(name, kind, path, line)`` for symbols named ``name``.
+
+        Exact (case-insensitive) matches come first, then, unless ``prefix``
+        is False, prefix matches.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT name, kind, path, line FROM symbols WHERE name = ? "
+                "ORDER BY path, line LIMIT ?", (name, limit)).fetchall()
+            if prefix and len(rows) < limit:
+                rows += self._conn.execute(
+                    "SELECT name, kind, path, line FROM symbols WHERE name > ? AND name < ? "
+                    "ORDER BY name, path, line LIMIT ?",
+                    (name, name + "\U0010ffff", limit - len(rows))).fetchall()
+        return rows
+
+    def symbols_in(self, path: str) -> List[Tuple[str, str, int]]:
+        """Return ``(name, kind, line)`` for the symbols of one file, in line order."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT name, kind, line FROM symbols WHERE path = ? ORDER BY line",
+                (path,)).fetchall()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return file and symbol counts and per-language file counts."""
+        with self._lock:
+            languages = dict(self._conn.execute(
+                "SELECT COALESCE(language, 'other'), COUNT(*) FROM files GROUP BY language"))
+            symbols = self._conn.execute("SELECT COUNT(*) FROM symbols").fetchone()[0]
+        return {"files": sum(languages.values()), "symbols": symbols, "languages": languages}
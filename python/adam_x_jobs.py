@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Adam-X background jobs
+----------------------
+Runs model requests on one asyncio event loop in a daemon thread, so the
+REPL can keep reading commands while several requests are in flight.
+Foreground requests use the same loop; the REPL thread only waits for
+them, which lets Ctrl-C cancel the current request without touching the
+jobs running in the background.
+"""
+
+import asyncio
+import concurrent.futures
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+# Job states
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+
+class Job:
+    """A model request running in the background."""
+
+    def __init__(self, job_id: int, command: str):
+        self.id = job_id
+        self.command = command
+        self.chunks: List[str] = []
+        self.started = time.monotonic()
+        self.finished: Optional[float] = None
+        self.reported = False
+        self.future: Optional[concurrent.futures.Future] = None
+
+    @property
+    def status(self) -> str:
+        """One of "running", "done", "failed" or "cancelled"."""
+        future = self.future
+        if future is None or not future.done():
+            return RUNNING
+        if future.cancelled():
+            return CANCELLED
+        return FAILED if future.exception() is not None else DONE
+
+    @property
+    def error(self) -> Optional[BaseException]:
+        """The exception a failed job raised."""
+        return self.future.exception() if self.status == FAILED else None
+
+    @property
+    def output(self) -> str:
+        """The response text received so far."""
+        return "".join(self.chunks)
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds the job has been running, or ran for."""
+        return (self.finished or time.monotonic()) - self.started
+
+
+class JobManager:
+    """Numbered background jobs sharing one event loop thread.
+
+    The loop thread is started on first use. ``submit`` schedules a
+    coroutine built by ``factory(job)``; the coroutine appends response
+    text to ``job.chunks`` as it arrives.
+    """
+
+    def __init__(self):
+        self._jobs: Dict[int, Job] = {}
+        self._next_id = 1
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+
+                def run() -> None:
+                    asyncio.set_event_loop(loop)
+                    loop.call_soon(ready.set)
+                    loop.run_forever()
+
+                self._thread = threading.Thread(target=run, name="adam-x-jobs", daemon=True)
+                self._thread.start()
+                ready.wait()
+                self._loop = loop
+            return self._loop
+
+    def run_coroutine(self, coro: Awaitable[Any]) -> concurrent.futures.Future:
+        """Schedule a coroutine on the job loop and return its future.
+
+        Cancelling the returned future cancels the coroutine.
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+
+    def submit(self, command: str, factory: Callable[[Job], Awaitable[Any]]) -> Job:
+        """Start a background job for ``command``."""
+        with self._lock:
+            job = Job(self._next_id, command)
+            self._next_id += 1
+            self._jobs[job.id] = job
+        job.future = self.run_coroutine(factory(job))
+        job.future.add_done_callback(lambda _: setattr(job, "finished", time.monotonic()))
+        return job
+
+    def get(self, job_id: int) -> Optional[Job]:
+        """Return a job by number."""
+        return self._jobs.get(job_id)
+
+    def jobs(self) -> List[Job]:
+        """Return all jobs that have not been discarded, oldest first."""
+        with self._lock:
+            return list(self._jobs.values())
+
+    def running(self) -> List[Job]:
+        """Return the jobs that have not finished."""
+        return [job for job in self.jobs() if job.status == RUNNING]
+
+    def wait(self, job: Job, timeout: Optional[float] = None) -> bool:
+        """Block until a job finishes; return False on timeout."""
+        try:
+            job.future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            return False
+        except (concurrent.futures.CancelledError, Exception):
+            pass
+        return True
+
+    def cancel(self, job_id: int) -> bool:
+        """Cancel a running job; return False if it is unknown or finished."""
+        job = self._jobs.get(job_id)
+        if job is None or job.status != RUNNING:
+            return False
+        return job.future.cancel()
+
+    def discard(self, job: Job) -> None:
+        """Forget a finished job."""
+        with self._lock:
+            self._jobs.pop(job.id, None)
+
+    def unreported(self) -> List[Job]:
+        """Return finished jobs whose completion has not been announced yet."""
+        finished = [job for job in self.jobs() if job.status != RUNNING and not job.reported]
+        for job in finished:
+            job.reported = True
+        return finished
+
+    def close(self) -> None:
+        """Cancel all running jobs and stop the loop thread."""
+        for job in self.running():
+            job.future.cancel()
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout=1.0)
+            if not thread.is_alive():
+                loop.close()
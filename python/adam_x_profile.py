@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Adam-X profiler
+---------------
+Runs a Python script under ``cProfile`` (and optionally ``tracemalloc``) in
+a subprocess with a timeout, and summarizes where it spent its time: the
+functions with the most cumulative time, the source lines most often on the
+stack (sampled), and the lines that had allocated the most memory at peak.
+
+This file is also the child-side runner: ``run_profile`` executes it as a
+script, so the target runs in a fresh interpreter.
+"""
+
+import json
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Sequence
+
+# Lines of script output kept for the summary
+OUTPUT_TAIL_LINES = 20
+
+# Seconds a timed-out script gets to write its profile before it is killed
+_GRACE_SECONDS = 5.0
+
+
+class ProfileResult:
+    """What one profiling run measured."""
+
+    def __init__(self, script: str, args: Sequence[str]):
+        self.script = script
+        self.args = list(args)
+        self.root = os.path.dirname(script)
+        self.status: Optional[int] = None
+        self.timed_out = False
+        self.seconds = 0.0
+        self.output = ""
+        # {"location", "calls", "tottime", "cumtime"}, most cumulative time first
+        self.functions: List[Dict[str, Any]] = []
+        # (path, line, share of samples), hottest first
+        self.lines: List[Any] = []
+        self.samples = 0
+        # {"location", "size", "count"} at peak traced memory, largest first
+        self.allocations: List[Dict[str, Any]] = []
+        self.peak_bytes: Optional[int] = None
+
+    def _display(self, path: str) -> str:
+        if path.startswith(self.root + os.sep):
+            return os.path.relpath(path, self.root)
+        return os.path.basename(path) if os.path.isabs(path) else path
+
+    def hot_lines(self, path: Optional[str] = None) -> Dict[int, float]:
+        """Return ``{line: share of samples}`` for one file (default: the script)."""
+        path = path or self.script
+        return {line: share for file, line, share in self.lines if file == path}
+
+    def summary(self, limit: int = 10) -> str:
+        """Return a text summary of the run."""
+        import linecache
+        from adam_x_stats import format_size
+
+        name = os.path.basename(self.script)
+        if self.timed_out:
+            outcome = "stopped at the timeout"
+        else:
+            outcome = f"exit status {self.status}"
+        lines = [f"Profile of {name} ({self.seconds:.2f}s wall, {outcome})"]
+
+        if self.functions:
+            lines += ["", "Top functions by cumulative time:",
+                      f"  {'cumtime':>8} {'tottime':>8} {'calls':>8}  function"]
+            for entry in self.functions[:limit]:
+                lines.append(f"  {entry['cumtime']:8.3f} {entry['tottime']:8.3f} "
+                             f"{entry['calls']:>8}  {entry['location']}")
+
+        if self.lines:
+            lines += ["", f"Line hot spots ({self.samples} samples):"]
+            for path, line, share in self.lines[:limit]:
+                source = linecache.getline(path, line).strip()
+                lines.append(f"  {share:6.1%}  {self._display(path)}:{line}  {source[:60]}")
+
+        if self.allocations:
+            lines += ["", f"Top allocation sites at peak memory ({format_size(self.peak_bytes or 0)} peak):"]
+            for entry in self.allocations[:limit]:
+                lines.append(f"  {format_size(entry['size']):>10} {entry['count']:>8} blocks  "
+                             f"{entry['location']}")
+
+        if self.status not in (0, None) and self.output:
+            lines += ["", "Script output (last lines):"]
+            lines += [f"  {line}" for line in self.output.splitlines()[-OUTPUT_TAIL_LINES:]]
+        return "\n".join(lines)
+
+
+def run_profile(script: str, args: Sequence[str] = (), memory: bool = False,
+                timeout: float = 60.0, interval: float = 0.001) -> ProfileResult:
+    """Profile ``script args`` in a subprocess and return what it measured.
+
+    A script still running after ``timeout`` seconds is interrupted (and
+    killed if it does not stop), and whatever was profiled so far is kept.
+    """
+    import pstats
+
+    script = os.path.abspath(script)
+    result = ProfileResult(script, args)
+    out_dir = tempfile.mkdtemp(prefix="adam-x-profile-")
+    command = [sys.executable, os.path.abspath(__file__), "--out", out_dir,
+               "--interval", str(interval)]
+    if memory:
+        command.append("--memory")
+    command += ["--", script] + list(args)
+
+    start = time.monotonic()
+    try:
+        proc = subprocess.Popen(command, cwd=os.getcwd(), stdin=subprocess.DEVNULL,
+                                stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+        try:
+            output, _ = proc.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            result.timed_out = True
+            if os.name != "nt":
+                # Let the runner write out what it has profiled so far
+                proc.send_signal(signal.SIGINT)
+            try:
+                output, _ = proc.communicate(timeout=_GRACE_SECONDS)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                output, _ = proc.communicate()
+        result.seconds = time.monotonic() - start
+        result.output = output.decode("utf-8", errors="replace")
+
+        try:
+            with open(os.path.join(out_dir, "result.json")) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        result.status = data.get("status", proc.returncode)
+        result.samples = data.get("samples", 0)
+        result.lines = [(path, line, count / result.samples)
+                        for path, line, count in data.get("lines", [])] if result.samples else []
+        result.allocations = data.get("allocations", [])
+        result.peak_bytes = data.get("peak_bytes")
+
+        stats_path = os.path.join(out_dir, "profile.pstats")
+        if os.path.exists(stats_path):
+            result.functions = _functions(pstats.Stats(stats_path), result)
+    finally:
+        shutil.rmtree(out_dir, ignore_errors=True)
+    return result
+
+
+def _functions(stats: Any, result: ProfileResult) -> List[Dict[str, Any]]:
+    """Return the profiled functions by cumulative time, minus the runner's own frames."""
+    runner = os.path.abspath(__file__)
+    entries = []
+    for (path, line, name), (_, calls, tottime, cumtime, _) in stats.stats.items():
+        if path == runner or "runpy" in path or name == "<built-in method builtins.exec>":
+            continue
+        if path == "~":
+            location = name
+        else:
+            location = f"{result._display(path)}:{line}({name})"
+        entries.append({"location": location, "calls": calls,
+                        "tottime": tottime, "cumtime": cumtime})
+    entries.sort(key=lambda entry: (-entry["cumtime"], -entry["tottime"]))
+    return entries
+
+
+class _Sampler(threading.Thread):
+    """Samples the innermost line of the script's own code on the main thread.
+
+    Lines of library code are attributed to the script line that called
+    them. The main thread only hands over the GIL at calls and backward
+    jumps, so a sample lands on the next such line after pure C work.
+    With ``memory``, also keeps the tracemalloc snapshot nearest to the
+    peak.
+    """
+
+    def __init__(self, root: str, interval: float, memory: bool):
+        super().__init__(name="adam-x-sampler", daemon=True)
+        self.root = root + os.sep
+        self.interval = interval
+        self.memory = memory
+        self.target = threading.main_thread().ident
+        self.counts: Counter = Counter()
+        self.samples = 0
+        self.snapshot: Any = None
+        self._snapshot_size = 0
+        self._done = threading.Event()
+
+    def run(self) -> None:
+        import tracemalloc
+        while not self._done.wait(self.interval):
+            frame = sys._current_frames().get(self.target)
+            while frame is not None and not frame.f_code.co_filename.startswith(self.root):
+                frame = frame.f_back
+            # f_lineno is None while a frame is between lines
+            if frame is not None and frame.f_lineno is not None:
+                self.counts[(frame.f_code.co_filename, frame.f_lineno)] += 1
+                self.samples += 1
+            if self.memory:
+                current, _ = tracemalloc.get_traced_memory()
+                # Re-snapshot whenever memory grows by a tenth past the last one
+                if current > self._snapshot_size * 1.1:
+                    self.snapshot = tracemalloc.take_snapshot()
+                    self._snapshot_size = current
+
+    def stop(self) -> None:
+        self._done.set()
+        self.join()
+
+
+def _child_main(argv: List[str]) -> int:
+    """Run a script under the profilers and write the results to ``--out``."""
+    import argparse
+    import cProfile
+    import pkgutil  # noqa: F401 (imported by runpy; keep it out of the allocations)
+    import runpy
+    import traceback
+    import tracemalloc
+
+    parser = argparse.ArgumentParser(prog="adam_x_profile")
+    parser.add_argument("--out", required=True)
+    parser.add_argument("--interval", type=float, default=0.001)
+    parser.add_argument("--memory", action="store_true")
+    parser.add_argument("script")
+    parser.add_argument("args", nargs=argparse.REMAINDER)
+    options = parser.parse_args(argv)
+
+    script = os.path.abspath(options.script)
+    sys.argv = [script] + options.args
+    sys.path[0] = os.path.dirname(script)
+    # Let the sampler in more often than every 5 ms
+    sys.setswitchinterval(max(options.interval, 0.0005))
+    if options.memory:
+        tracemalloc.start()
+    sampler = _Sampler(os.path.dirname(script), options.interval, options.memory)
+    profiler = cProfile.Profile()
+
+    status = 0
+    sampler.start()
+    profiler.enable()
+    try:
+        runpy.run_path(script, run_name="__main__")
+    except SystemExit as e:
+        status = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    except KeyboardInterrupt:
+        status = 130
+    except BaseException:
+        traceback.print_exc()
+        status = 1
+    finally:
+        profiler.disable()
+        sampler.stop()
+
+    data: Dict[str, Any] = {
+        "status": status,
+        "samples": sampler.samples,
+        "lines": [[path, line, count] for (path, line), count in sampler.counts.most_common(50)],
+    }
+    if options.memory:
+        _, data["peak_bytes"] = tracemalloc.get_traced_memory()
+        snapshot = sampler.snapshot or tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        snapshot = snapshot.filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, threading.__file__),
+            tracemalloc.Filter(False, "<frozen *>"),
+        ])
+        root = os.path.dirname(script) + os.sep
+        data["allocations"] = [
+            {"location": _location(stat.traceback[0], root), "size": stat.size, "count": stat.count}
+            for stat in snapshot.statistics("lineno")[:50]
+        ]
+
+    profiler.dump_stats(os.path.join(options.out, "profile.pstats"))
+    with open(os.path.join(options.out, "result.json"), 'w') as f:
+        json.dump(data, f)
+    return status
+
+
+def _location(frame: Any, root: str) -> str:
+    path = frame.filename
+    path = path[len(root):] if path.startswith(root) else os.path.basename(path)
+    return f"{path}:{frame.lineno}"
+
+
+if __name__ == "__main__":
+    sys.exit(_child_main(sys.argv[1:]))
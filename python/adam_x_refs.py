@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Adam-X file references
+----------------------
+Lets ``explain``, ``optimize`` and ``debug`` take ``@path[:start-end]``
+instead of inline code. Files are read through ``mmap`` and cut into chunks
+at top-level definitions, so a multi-megabyte source is analyzed one chunk
+at a time without ever being held in memory as a whole.
+"""
+
+import mmap
+import os
+import re
+from typing import Dict, Iterator, Optional, Tuple
+
+_REFERENCE = re.compile(r"@(?P<path>[^\s:]+(?::[^\s:\d][^\s:]*)*)(?::(?P<start>\d+)(?:-(?P<end>\d+))?)?")
+
+# Chunks are cut at the first definition boundary after this many bytes,
+# and at any line before they grow past twice that
+CHUNK_BYTES = 8 * 1024
+
+# Lines that start a new top-level definition, for each language in
+# adam_x.LANGUAGES (callers pass the language, found from their own table).
+# Only the first 32 bytes of a line are matched.
+_BOUNDARY_PATTERNS = {
+    "python": rb"(?:async[ \t]+def|def|class)[ \t(]|@\w",
+    "javascript": rb"(?:export[ \t]+)?(?:default[ \t]+)?(?:async[ \t]+)?(?:function|class|const|let|var)\b",
+    "typescript": rb"(?:export[ \t]+)?(?:default[ \t]+)?(?:abstract[ \t]+)?(?:async[ \t]+)?"
+                  rb"(?:function|class|interface|type|enum|const|let)\b",
+    "java": rb"(?:public|protected|private|abstract|final|class|interface|enum|@)",
+    # A type keyword, or "Type name" / "Type *name"; not #include, braces or comments
+    "c": rb"(?:typedef|struct|union|enum|static|extern|inline|const|volatile|unsigned|signed|"
+         rb"void|char|short|int|long|float|double|_Bool|bool)\b|"
+         rb"[A-Za-z_]\w*(?:[ \t]+\**|\*+[ \t]*)[A-Za-z_]",
+    "cpp": rb"(?:template|namespace|class|struct|union|enum|typedef|using|static|extern|inline|"
+           rb"constexpr|const|unsigned|signed|void|char|short|int|long|float|double|bool|auto)\b|"
+           rb"[A-Za-z_][\w:<>,]*(?:[ \t]+[&*]*|[&*]+[ \t]*)[~A-Za-z_]",
+    "rust": rb"(?:pub(?:\([^)]*\))?[ \t]+)?(?:fn|struct|enum|trait|impl|mod|const|static)\b|#\[",
+    "go": rb"(?:func|type|var|const)\b",
+    "ruby": rb"(?:def|class|module)\b",
+    "php": rb"(?:(?:abstract|final)[ \t]+)?(?:function|class|interface|trait)\b",
+    # "name() {" or "function name"
+    "shell": rb"function[ \t]+[\w:.-]+|[\w:.-]+[ \t]*\([ \t]*\)",
+}
+_BOUNDARY_RES = {language: re.compile(pattern) for language, pattern in _BOUNDARY_PATTERNS.items()}
+
+# Prefixes that attach to the definition on the next line
+_ATTACHED = (b"@", b"#[")
+
+
+class FileReference:
+    """A ``@path[:start-end]`` reference to (part of) a file."""
+
+    def __init__(self, path: str, start: Optional[int] = None, end: Optional[int] = None):
+        self.path = path
+        self.start = start
+        self.end = end
+
+    def __repr__(self) -> str:
+        return f"FileReference({self.path!r}, {self.start!r}, {self.end!r})"
+
+    def __str__(self) -> str:
+        if self.start is None:
+            return self.path
+        if self.end is None:
+            return f"{self.path}:{self.start}"
+        return f"{self.path}:{self.start}-{self.end}"
+
+
+def is_reference(text: str) -> bool:
+    """Return True if ``text`` is a single ``@path[:start-end]`` reference."""
+    return _REFERENCE.fullmatch(text.strip()) is not None
+
+
+def parse_reference(text: str) -> Optional[FileReference]:
+    """Return the reference if ``text`` is exactly one ``@path[:start-end]``, else None.
+
+    ``:N`` alone selects a single line. Inline code such as a decorated
+    function spans several words and is never taken for a reference.
+    """
+    match = _REFERENCE.fullmatch(text.strip())
+    if match is None:
+        return None
+    start = int(match.group("start")) if match.group("start") else None
+    end = int(match.group("end")) if match.group("end") else start
+    if start is not None and (start < 1 or end < start):
+        raise ValueError(f"Invalid line range: {start}-{end}")
+    return FileReference(match.group("path"), start, end)
+
+
+def resolve_path(reference: FileReference, base: str) -> str:
+    """Return the absolute path a reference points to, relative to ``base``."""
+    return os.path.normpath(os.path.join(base, os.path.expanduser(reference.path)))
+
+
+def iter_chunks(path: str, start: Optional[int] = None, end: Optional[int] = None,
+                language: Optional[str] = None,
+                chunk_bytes: Optional[int] = None) -> Iterator[Tuple[int, int, str]]:
+    """Yield ``(first line, last line, text)`` chunks of lines ``start``-``end`` of a file.
+
+    A chunk is cut before the first top-level definition once it holds
+    ``chunk_bytes`` (default ``CHUNK_BYTES``), and before any line that
+    would take it past twice that. Only the current chunk is ever copied
+    out of the memory map.
+    """
+    chunk_bytes = chunk_bytes or CHUNK_BYTES
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield from _chunks(mm, start or 1, end, _BOUNDARY_RES.get(language), chunk_bytes)
+
+
+def _chunks(mm: mmap.mmap, start: int, end: Optional[int], boundary: Optional["re.Pattern"],
+            chunk_bytes: int) -> Iterator[Tuple[int, int, str]]:
+    size = len(mm)
+    pos = 0
+    line = 1
+    while line < start and pos < size:
+        newline = mm.find(b"\n", pos)
+        pos = size if newline < 0 else newline + 1
+        line += 1
+    if pos >= size:
+        return
+
+    chunk_start, chunk_line = pos, line
+    # Last definition boundary seen in the current chunk
+    cut, cut_line = -1, 0
+    attached = False
+    while pos < size and (end is None or line <= end):
+        newline = mm.find(b"\n", pos)
+        next_pos = size if newline < 0 else newline + 1
+        head = mm[pos:min(pos + 32, next_pos)]
+        is_boundary = _is_boundary(head, boundary)
+        # A decorator and the definition under it stay together
+        starts_definition = is_boundary and not attached and pos > chunk_start
+        attached = is_boundary and head.startswith(_ATTACHED)
+
+        length = pos - chunk_start
+        if starts_definition and length >= chunk_bytes:
+            yield chunk_line, line - 1, _decode(mm[chunk_start:pos])
+            chunk_start, chunk_line = pos, line
+            cut = -1
+        elif starts_definition:
+            cut, cut_line = pos, line
+        elif next_pos - chunk_start > 2 * chunk_bytes and length:
+            # No boundary in sight; fall back to the last one, or this line
+            if cut <= chunk_start:
+                cut, cut_line = pos, line
+            yield chunk_line, cut_line - 1, _decode(mm[chunk_start:cut])
+            chunk_start, chunk_line = cut, cut_line
+            cut = -1
+        pos = next_pos
+        line += 1
+
+    if pos > chunk_start:
+        yield chunk_line, line - 1, _decode(mm[chunk_start:pos])
+
+
+def _is_boundary(head: bytes, boundary: Optional["re.Pattern"]) -> bool:
+    """Return True if a line (its first bytes) starts a top-level definition."""
+    if not head or head[:1] in b" \t\r\n}])":
+        return False
+    if boundary is None:
+        # Unknown language: any line starting at column 0
+        return True
+    return boundary.match(head) is not None
+
+
+def _decode(data: bytes) -> str:
+    return data.decode("utf-8", errors="replace")
+
+
+def language_for(path: str, extensions: Dict[str, str]) -> Optional[str]:
+    """Return the language of a file from its extension, or None."""
+    return extensions.get(os.path.splitext(path)[1].lower())
@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+"""
+Adam-X session record and replay
+--------------------------------
+``adam-x-py --record FILE`` appends every REPL command to a trace: when it
+was entered, how long it took, a hash of what it printed and the answers
+given to any prompts. ``adam-x-replay FILE`` drives ``AdamX.process_command``
+from such traces on many concurrent simulated sessions against the local
+stand-in backend, at the recorded pace, N times faster or as fast as
+possible, and reports throughput, latency percentiles and memory growth.
+"""
+
+import builtins
+import contextlib
+import contextvars
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from typing import Any, Dict, Iterator, List, Optional
+
+from adam_x_stats import Histogram
+
+TRACE_VERSION = 1
+
+# Where the current replayed command's output and prompt answers go
+_output: contextvars.ContextVar = contextvars.ContextVar("adam_x_replay_output", default=None)
+_answers: contextvars.ContextVar = contextvars.ContextVar("adam_x_replay_answers", default=None)
+
+
+class _HashingWriter:
+    """Text stream that hashes what is written, passing it on to ``target`` if given."""
+
+    def __init__(self, target: Any = None):
+        self._target = target
+        self._hash = hashlib.sha256()
+        self.bytes = 0
+
+    def write(self, text: str) -> int:
+        data = text.encode("utf-8", errors="replace")
+        self._hash.update(data)
+        self.bytes += len(data)
+        if self._target is not None:
+            self._target.write(text)
+        return len(text)
+
+    def flush(self) -> None:
+        if self._target is not None:
+            self._target.flush()
+
+    def hexdigest(self) -> str:
+        return self._hash.hexdigest()[:16]
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._target or sys.__stdout__, name)
+
+
+class SessionRecorder:
+    """Appends the commands of one REPL session to a trace file."""
+
+    def __init__(self, path: str):
+        self.path = os.path.expanduser(path)
+        self._file = open(self.path, 'a', encoding="utf-8")
+        self._start = time.monotonic()
+        self._write({"session": uuid.uuid4().hex, "started": time.time(),
+                     "version": TRACE_VERSION})
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        self._file.write(json.dumps(record) + "\n")
+        self._file.flush()
+
+    @contextlib.contextmanager
+    def capture(self, cmd: str) -> Iterator[None]:
+        """Record the command run inside the ``with`` block."""
+        out = _HashingWriter(sys.stdout)
+        answers: List[str] = []
+        read = builtins.input
+
+        def recording_input(prompt: str = "") -> str:
+            answer = read(prompt)
+            answers.append(answer)
+            return answer
+
+        offset = time.monotonic() - self._start
+        start = time.perf_counter()
+        sys.stdout, builtins.input = out, recording_input
+        try:
+            yield
+        finally:
+            sys.stdout, builtins.input = out._target, read
+            record = {"t": round(offset, 3), "command": cmd,
+                      "latency_ms": round((time.perf_counter() - start) * 1000, 3),
+                      "result": out.hexdigest(), "bytes": out.bytes}
+            if answers:
+                record["input"] = answers
+            self._write(record)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def load_traces(path: str) -> List[List[Dict[str, Any]]]:
+    """Return the sessions in a trace file, each a list of command records.
+
+    Raises ValueError for lines that are not trace records.
+    """
+    sessions: List[List[Dict[str, Any]]] = []
+    with open(os.path.expanduser(path), encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                raise ValueError(f"{path}:{number}: not JSON") from None
+            if "session" in record:
+                sessions.append([])
+            elif "command" in record and "t" in record:
+                if not sessions:
+                    sessions.append([])
+                sessions[-1].append(record)
+            else:
+                raise ValueError(f"{path}:{number}: not a trace record")
+    return [session for session in sessions if session]
+
+
+class _Router:
+    """Stands in for sys.stdout, sending each replayed session's output to its own writer."""
+
+    def __init__(self, target: Any):
+        self._target = target
+
+    def write(self, text: str) -> int:
+        return (_output.get() or self._target).write(text)
+
+    def flush(self) -> None:
+        (_output.get() or self._target).flush()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._target, name)
+
+
+def _replay_input(prompt: str = "") -> str:
+    """Answer a prompt with the next recorded answer (or nothing)."""
+    sys.stdout.write(prompt)
+    answers = _answers.get()
+    return answers.pop(0) if answers else ""
+
+
+def rss_bytes() -> Optional[int]:
+    """Return the resident set size of this process, or None if unknown."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    # Peak rather than current, where /proc is not available
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class ReplayReport:
+    """What one replay measured."""
+
+    def __init__(self, sessions: int, speed: Optional[float]):
+        self.sessions = sessions
+        self.speed = speed
+        self.seconds = 0.0
+        self.latency = Histogram()
+        self.commands: Dict[str, Histogram] = {}
+        self.matched = 0
+        self.differed = 0
+        self.failed = 0
+        self.max_lag = 0.0
+        self.rss_start: Optional[int] = None
+        self.rss_peak: Optional[int] = None
+        self.rss_end: Optional[int] = None
+
+    @property
+    def count(self) -> int:
+        return self.latency.count
+
+    @property
+    def throughput(self) -> float:
+        return self.count / self.seconds if self.seconds else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the report as a JSON-serializable dict, latencies in ms."""
+        return {
+            "sessions": self.sessions,
+            "speed": self.speed,
+            "commands": self.count,
+            "seconds": round(self.seconds, 3),
+            "throughput": round(self.throughput, 3),
+            "latency_ms": {f"p{round(q * 100)}": round(self.latency.quantile(q) * 1000, 3)
+                           for q in (0.5, 0.95, 0.99)},
+            "max_latency_ms": round(self.latency.max * 1000, 3) if self.count else 0.0,
+            "max_lag_ms": round(self.max_lag * 1000, 3),
+            "matched": self.matched,
+            "differed": self.differed,
+            "failed": self.failed,
+            "rss_start": self.rss_start,
+            "rss_peak": self.rss_peak,
+            "rss_end": self.rss_end,
+        }
+
+    def summary(self) -> str:
+        """Return the report as text."""
+        pace = "max speed" if self.speed is None else f"{self.speed:g}x"
+        lines = [f"Replayed {self.count} commands on {self.sessions} sessions at {pace} "
+                 f"in {self.seconds:.2f}s ({self.throughput:.1f} commands/s)"]
+        lines.append(f"  Latency:  p50 {self.latency.quantile(0.5) * 1000:.2f} ms, "
+                     f"p95 {self.latency.quantile(0.95) * 1000:.2f} ms, "
+                     f"p99 {self.latency.quantile(0.99) * 1000:.2f} ms")
+        if self.speed is not None:
+            lines.append(f"  Behind schedule by up to {self.max_lag * 1000:.1f} ms")
+        if self.rss_start is not None:
+            growth = (self.rss_end or 0) - self.rss_start
+            lines.append(f"  Memory:   {_mib(self.rss_start)} at start, {_mib(self.rss_peak)} peak, "
+                         f"{_mib(self.rss_end)} at end ({'+' if growth >= 0 else '-'}"
+                         f"{_mib(abs(growth))})")
+        lines.append(f"  Results:  {self.matched} matched the recording, {self.differed} differed, "
+                     f"{self.failed} failed")
+        if self.commands:
+            lines += ["", f"  {'command':<10} {'count':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"]
+            for name, histogram in sorted(self.commands.items()):
+                lines.append(f"  {name:<10} {histogram.count:>7} "
+                             f"{histogram.quantile(0.5) * 1000:>9.2f} "
+                             f"{histogram.quantile(0.95) * 1000:>9.2f} "
+                             f"{histogram.quantile(0.99) * 1000:>9.2f}")
+        return "\n".join(lines)
+
+
+def _mib(size: Optional[int]) -> str:
+    return "?" if size is None else f"{size / (1024 * 1024):.1f} MiB"
+
+
+def replay(traces: List[List[Dict[str, Any]]], sessions: int = 1, speed: Optional[float] = 1.0,
+           token_delay: float = 0.0) -> ReplayReport:
+    """Replay traces on ``sessions`` concurrent sessions and return what was measured.
+
+    Session ``i`` replays trace ``i % len(traces)`` with its own config
+    directory, against one shared stand-in backend. Commands run at the
+    recorded pace divided by ``speed``, or back to back if ``speed`` is
+    None. The working directory is a temporary one for the duration.
+    """
+    import shutil
+    import tempfile
+    from adam_x_standin import StandInServer
+
+    if not traces:
+        raise ValueError("No commands to replay.")
+    report = ReplayReport(sessions, speed)
+    lock = threading.Lock()
+    root = tempfile.mkdtemp(prefix="adam-x-replay-")
+    work_dir = os.path.join(root, "work")
+    os.makedirs(work_dir)
+    cwd = os.getcwd()
+    path = list(sys.path)
+    stdout, read = sys.stdout, builtins.input
+    done = threading.Event()
+
+    def sample_memory() -> None:
+        while not done.wait(0.05):
+            rss = rss_bytes()
+            if rss is not None:
+                with lock:
+                    report.rss_peak = max(report.rss_peak or 0, rss)
+
+    def run_session(number: int, server_url: str) -> None:
+        from adam_x import AdamX
+        from adam_x_commands import COMMANDS
+
+        # A fresh default config per session, pointed at the stand-in backend
+        adam_x = AdamX(os.path.join(root, f"session-{number}", "config.json"), show_welcome=False)
+        adam_x.config["backend"] = {"type": "http", "url": server_url}
+        adam_x.config["watch"] = {"enabled": False}
+        start = time.monotonic()
+        try:
+            for record in traces[number % len(traces)]:
+                if speed is not None:
+                    delay = start + record["t"] / speed - time.monotonic()
+                    if delay > 0:
+                        time.sleep(delay)
+                    lag = -delay
+                else:
+                    lag = 0.0
+                out = _HashingWriter()
+                output_token = _output.set(out)
+                answers_token = _answers.set(list(record.get("input", [])))
+                # process_command prints backend errors; the stats record them
+                errors = adam_x.stats.errors()
+                failed = False
+                began = time.perf_counter()
+                try:
+                    adam_x.process_command(record["command"])
+                    failed = adam_x.stats.errors() > errors
+                except Exception:
+                    failed = True
+                finally:
+                    seconds = time.perf_counter() - began
+                    _output.reset(output_token)
+                    _answers.reset(answers_token)
+
+                command, _ = COMMANDS.resolve(record["command"])
+                name = command.name if command else "generate"
+                with lock:
+                    report.latency.add(seconds)
+                    report.commands.setdefault(name, Histogram()).add(seconds)
+                    report.max_lag = max(report.max_lag, lag)
+                    if failed:
+                        report.failed += 1
+                    elif out.hexdigest() == record.get("result"):
+                        report.matched += 1
+                    else:
+                        report.differed += 1
+        finally:
+            adam_x.close_jobs()
+            adam_x.stop_watching()
+
+    try:
+        with StandInServer(token_delay=token_delay) as server:
+            # Keep lazy imports working from the temporary working directory
+            sys.path[:] = [os.path.abspath(entry) for entry in path]
+            os.chdir(work_dir)
+            sys.stdout, builtins.input = _Router(stdout), _replay_input
+            report.rss_start = report.rss_peak = rss_bytes()
+            sampler = threading.Thread(target=sample_memory, name="adam-x-replay-memory",
+                                       daemon=True)
+            sampler.start()
+            threads = [threading.Thread(target=run_session, args=(number, server.url),
+                                        name=f"adam-x-replay-{number}")
+                       for number in range(sessions)]
+            started = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            report.seconds = time.perf_counter() - started
+            done.set()
+            sampler.join()
+            report.rss_end = rss_bytes()
+            if report.rss_end is not None:
+                report.rss_peak = max(report.rss_peak or 0, report.rss_end)
+    finally:
+        done.set()
+        sys.stdout, builtins.input = stdout, read
+        os.chdir(cwd)
+        sys.path[:] = path
+        shutil.rmtree(root, ignore_errors=True)
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Entry point for ``adam-x-replay``."""
+    import argparse
+    parser = argparse.ArgumentParser(
+        prog="adam-x-replay",
+        description="Replay recorded Adam-X sessions as load against the local stand-in backend")
+    parser.add_argument("trace", nargs="+", help="Trace files written by 'adam-x-py --record'")
+    parser.add_argument("--sessions", type=int, default=1,
+                        help="Number of concurrent sessions (default: 1)")
+    parser.add_argument("--speed", default="1",
+                        help="Replay at N times the recorded pace, or 'max' (default: 1)")
+    parser.add_argument("--token-delay", type=float, default=0.0,
+                        help="Seconds the stand-in backend waits between tokens")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    parser.add_argument("--fail-on-mismatch", action="store_true",
+                        help="Exit with status 1 if any result differs from the recording")
+    args = parser.parse_args(argv)
+
+    if args.speed == "max":
+        speed = None
+    else:
+        try:
+            speed = float(args.speed)
+        except ValueError:
+            speed = 0.0
+        if speed <= 0:
+            parser.error("--speed must be a positive number or 'max'")
+
+    try:
+        traces = [session for path in args.trace for session in load_traces(path)]
+        report = replay(traces, sessions=max(1, args.sessions), speed=speed,
+                        token_delay=args.token_delay)
+    except (OSError, ValueError) as e:
+        print(f"Error: {str(e)}", file=sys.stderr)
+        return 2
+
+    print(json.dumps(report.to_dict()) if args.json else report.summary())
+    if report.failed or (args.fail_on_mismatch and report.differed):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Adam-X scaffolding
+------------------
+Generates a tree of files from a spec in one step. A spec is a JSON (or,
+with PyYAML, YAML) object::
+
+    {
+      "variables": {"service": "billing"},
+      "instances": [{"service": "billing"}, {"service": "search"}],
+      "files": {
+        "services/${service}/": {
+          "app.py": null,
+          "main.go": {"template": "go"},
+          "README.md": "# ${service}\\n",
+          "tests/": {"__init__.py": ""}
+        }
+      }
+    }
+
+Keys ending in ``/`` are directories. A file is ``null`` for the template
+of the language its extension maps to, a string for literal content, or an
+object with ``content`` or a language ``template``. Paths and content may
+use ``${name}`` variables (``$${name}`` for a literal one); a bare ``$``, as
+in shell scripts, is left alone. The tree is generated once per entry of
+``instances`` (or once without it).
+
+Every language has a template, compiled once, and extensions map to
+languages through a dict, so rendering a file costs one lookup and one
+substitution. Files are written on a thread pool, each to a temporary file
+renamed over the target, so a reader never sees a half-written file.
+"""
+
+import concurrent.futures
+import contextlib
+import difflib
+import functools
+import json
+import os
+import string
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+# Language template bodies; ${header} is where the header comment goes
+BODIES = {
+    "python": ('${header}"""Main module."""\n\n'
+               'def main():\n    """Main function."""\n    print("Hello, World!")\n\n'
+               'if __name__ == "__main__":\n    main()\n'),
+    "javascript": ('${header}/**\n * Main module\n */\n\n'
+                   'function main() {\n    console.log("Hello, World!");\n}\n\nmain();\n'),
+    "typescript": ('${header}/**\n * Main module\n */\n\n'
+                   'function main() {\n    console.log("Hello, World!");\n}\n\nmain();\n'),
+    "java": ('${header}public class ${class_name} {\n'
+             '    public static void main(String[] args) {\n'
+             '        System.out.println("Hello, World!");\n    }\n}\n'),
+    "c": ('${header}#include <stdio.h>\n\n'
+          'int main(void) {\n    printf("Hello, World!\\n");\n    return 0;\n}\n'),
+    "cpp": ('${header}#include <iostream>\n\n'
+            'int main() {\n    std::cout << "Hello, World!" << std::endl;\n    return 0;\n}\n'),
+    "rust": '${header}fn main() {\n    println!("Hello, World!");\n}\n',
+    "go": ('${header}package main\n\nimport "fmt"\n\n'
+           'func main() {\n    fmt.Println("Hello, World!")\n}\n'),
+    "ruby": '${header}def main\n  puts "Hello, World!"\nend\n\nmain if __FILE__ == $$0\n',
+    # The header has to follow the opening tag and the shebang
+    "php": '<?php\n${header}function main() {\n    echo "Hello, World!\\n";\n}\n\nmain();\n',
+    "shell": ('#!/usr/bin/env bash\n${header}main() {\n    echo "Hello, World!"\n}\n\n'
+              'main "$$@"\n'),
+}
+
+# For languages without a body above
+HEADER_ONLY = "${header}"
+
+DEFAULT_COMMENT = "# "
+
+
+@functools.lru_cache(maxsize=4096)
+def compile_template(text: str) -> string.Template:
+    """Return the compiled template for ``text``, compiling each distinct text once."""
+    return string.Template(text)
+
+
+class LiteralTemplate(string.Template):
+    """Template that substitutes only ``${name}``, for spec paths and content.
+
+    ``$name`` and ``$$`` are left as written; ``$${name}`` gives ``${name}``.
+    """
+
+    pattern = r"""
+    \$(?:
+      (?P<escaped>\$(?=\{)) |
+      (?P<named>(?!)) |
+      \{(?P<braced>[_a-z][_a-z0-9]*)\} |
+      (?P<invalid>)
+    )
+    """
+
+
+@functools.lru_cache(maxsize=4096)
+def compile_literal(text: str) -> LiteralTemplate:
+    """Return the compiled literal template for ``text``, compiling each distinct text once."""
+    return LiteralTemplate(text)
+
+
+def load_spec(path: str) -> Dict[str, Any]:
+    """Read a spec from a ``.json``, ``.yaml`` or ``.yml`` file."""
+    path = os.path.expanduser(path)
+    with open(path, encoding="utf-8") as f:
+        if os.path.splitext(path)[1].lower() in (".yaml", ".yml"):
+            try:
+                import yaml
+            except ImportError:
+                raise ValueError("YAML specs need PyYAML (pip install pyyaml)")
+            try:
+                spec = yaml.safe_load(f)
+            except yaml.YAMLError as e:
+                raise ValueError(f"Invalid spec {path}: {str(e)}")
+        else:
+            try:
+                spec = json.load(f)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid spec {path}: {str(e)}")
+    if not isinstance(spec, dict) or not isinstance(spec.get("files"), dict):
+        raise ValueError(f"Spec {path} needs a 'files' object")
+    return spec
+
+
+def _class_name(stem: str) -> str:
+    """``user_service`` or ``user-service`` -> ``UserService``."""
+    parts = stem.replace("-", "_").replace(".", "_").split("_")
+    return "".join(part[:1].upper() + part[1:] for part in parts) or "Main"
+
+
+class Scaffolder:
+    """Renders language templates and spec trees for a ``LANGUAGES`` table."""
+
+    def __init__(self, languages: Mapping[str, Dict[str, str]]):
+        self.languages = languages
+        self.extensions: Dict[str, str] = {}
+        for language, info in languages.items():
+            # The first language listed for an extension wins, as create_file did
+            self.extensions.setdefault(info["ext"], language)
+        self.templates = {language: compile_template(BODIES.get(language, HEADER_ONLY))
+                          for language in languages}
+
+    def language_for(self, path: str) -> Optional[str]:
+        """Return the language of a file from its extension, or None."""
+        return self.extensions.get(os.path.splitext(path)[1])
+
+    def _variables(self, path: str, language: Optional[str],
+                   values: Mapping[str, Any]) -> Dict[str, Any]:
+        comment = self.languages.get(language, {}).get("comment", DEFAULT_COMMENT)
+        stem = os.path.splitext(os.path.basename(path))[0]
+        variables = {"name": stem, "class_name": _class_name(stem), "path": path,
+                     "language": language or ""}
+        variables.update(values)
+        variables["header"] = (f"{comment}Created by Adam-X on {variables.get('date', '')}\n"
+                               f"{comment}Author: {variables.get('author', '')}\n\n")
+        return variables
+
+    def render(self, path: str, language: Optional[str],
+               values: Mapping[str, Any]) -> str:
+        """Return the template of ``language`` rendered for the file ``path``.
+
+        ``values`` supplies ``author`` and ``date`` for the header. A
+        language not in the table gets a header only.
+        """
+        template = self.templates.get(language) or compile_template(HEADER_ONLY)
+        return template.safe_substitute(self._variables(path, language, values))
+
+    def plan(self, spec: Mapping[str, Any],
+             values: Optional[Mapping[str, Any]] = None) -> List[Tuple[str, str]]:
+        """Return ``(relative path, content)`` for every file of a spec.
+
+        ``values`` override the spec's ``variables``; each entry of
+        ``instances`` overrides both. Raises ValueError for malformed
+        entries, paths outside the target directory and files generated
+        twice.
+        """
+        files = spec.get("files")
+        if not isinstance(files, dict):
+            raise ValueError("Spec needs a 'files' object")
+        base = dict(spec.get("variables") or {})
+        base.update(values or {})
+        instances = spec.get("instances") or [{}]
+
+        planned: Dict[str, str] = {}
+        for instance in instances:
+            if not isinstance(instance, dict):
+                raise ValueError("Each entry of 'instances' must be an object")
+            variables = dict(base)
+            variables.update(instance)
+            self._walk(files, "", variables, planned)
+        return list(planned.items())
+
+    def _walk(self, tree: Mapping[str, Any], prefix: str, variables: Dict[str, Any],
+              planned: Dict[str, str]) -> None:
+        for key, value in tree.items():
+            name = compile_literal(str(key)).safe_substitute(variables)
+            if name.endswith("/"):
+                if not isinstance(value, dict):
+                    raise ValueError(f"Directory '{key}' must map to an object")
+                self._walk(value, prefix + name, variables, planned)
+                continue
+
+            path = os.path.normpath(prefix + name).replace(os.sep, "/")
+            if os.path.isabs(path) or path == ".." or path.startswith("../"):
+                raise ValueError(f"Path '{prefix + name}' is outside the target directory")
+            if path in planned:
+                raise ValueError(f"File '{path}' is generated twice")
+            planned[path] = self._content(path, key, value, variables)
+
+    def _content(self, path: str, key: str, value: Any, variables: Dict[str, Any]) -> str:
+        language = self.language_for(path)
+        if value is None:
+            return self.render(path, language, variables) if language else ""
+        if isinstance(value, dict):
+            if "content" in value:
+                value = value["content"]
+            elif "template" in value:
+                if value["template"] not in self.templates:
+                    raise ValueError(f"Unknown template '{value['template']}' for '{key}'")
+                return self.render(path, value["template"], variables)
+            else:
+                raise ValueError(f"File '{key}' needs 'content' or 'template'")
+        if not isinstance(value, str):
+            raise ValueError(f"File '{key}' must be null, a string or an object")
+        return compile_literal(value).safe_substitute(self._variables(path, language, variables))
+
+
+def _read(path: str) -> Optional[str]:
+    try:
+        with open(path, encoding="utf-8", newline="") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+    except (OSError, UnicodeDecodeError):
+        # Unreadable or binary; treat as different from anything generated
+        return "\0"
+
+
+def atomic_write(path: str, content: str) -> None:
+    """Write ``content`` to ``path`` through a temporary file renamed over it."""
+    directory = os.path.dirname(path) or "."
+    tmp_path = os.path.join(directory, f".{os.path.basename(path)}.{os.getpid()}."
+                                       f"{threading.get_ident()}.tmp")
+    try:
+        with open(tmp_path, 'w', encoding="utf-8", newline="") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_path)
+        raise
+
+
+def diff(root: str, files: Iterable[Tuple[str, str]]) -> List[Tuple[str, str, str]]:
+    """Return ``(path, status, unified diff)`` for planned files against ``root``.
+
+    The status is ``new``, ``changed`` or ``unchanged`` (with an empty diff).
+    """
+    results = []
+    for path, content in files:
+        existing = _read(os.path.join(root, path))
+        if existing == content:
+            results.append((path, "unchanged", ""))
+            continue
+        lines = difflib.unified_diff(
+            (existing or "").splitlines(True), content.splitlines(True),
+            fromfile="/dev/null" if existing is None else f"a/{path}", tofile=f"b/{path}")
+        text = "".join(line if line.endswith("\n") else line + "\n\\ No newline at end of file\n"
+                       for line in lines)
+        results.append((path, "new" if existing is None else "changed", text))
+    return results
+
+
+def write(root: str, files: List[Tuple[str, str]], overwrite: bool = False,
+          workers: Optional[int] = None) -> Dict[str, Any]:
+    """Write planned files under ``root`` concurrently.
+
+    Files whose content is already current are left alone, and existing
+    files with other content are skipped unless ``overwrite``. Returns the
+    paths that were ``created``, ``updated``, ``unchanged`` and ``skipped``,
+    ``(path, error)`` for each ``failed`` file, and the time taken.
+    """
+    start = time.perf_counter()
+    root = os.path.abspath(os.path.expanduser(root))
+    result: Dict[str, Any] = {"created": [], "updated": [], "unchanged": [],
+                              "skipped": [], "failed": []}
+    failed_dirs: Dict[str, str] = {}
+    for directory in sorted({os.path.dirname(os.path.join(root, path)) for path, _ in files}):
+        try:
+            os.makedirs(directory, exist_ok=True)
+        except OSError as e:
+            failed_dirs[directory] = str(e)
+
+    def write_one(item: Tuple[str, str]) -> Tuple[str, str, Optional[str]]:
+        path, content = item
+        target = os.path.join(root, path)
+        if os.path.dirname(target) in failed_dirs:
+            return path, "failed", failed_dirs[os.path.dirname(target)]
+        existing = _read(target)
+        if existing == content:
+            return path, "unchanged", None
+        if existing is not None and not overwrite:
+            return path, "skipped", None
+        try:
+            atomic_write(target, content)
+        except OSError as e:
+            return path, "failed", str(e)
+        return path, "created" if existing is None else "updated", None
+
+    if files:
+        workers = workers or min(32, len(files))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+            for path, status, error in pool.map(write_one, files):
+                result[status].append((path, error) if status == "failed" else path)
+    result["seconds"] = time.perf_counter() - start
+    return result
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Adam-X local search
+-------------------
+Offline full-text search over a project's source and documentation, ranked
+with Okapi BM25. The inverted index lives in SQLite as segments: each
+update writes one new segment holding, per term, a packed array of document
+ids and term frequencies. Replaced and deleted documents are dropped from
+the ``docs`` table and skipped at query time until segments are merged, so
+an update only re-tokenizes files whose content hash changed.
+"""
+
+import heapq
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from array import array
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    path TEXT UNIQUE NOT NULL,
+    hash TEXT NOT NULL,
+    length INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS segments (
+    id INTEGER PRIMARY KEY,
+    docs INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS postings (
+    term TEXT NOT NULL,
+    segment INTEGER NOT NULL,
+    doc_ids BLOB NOT NULL,
+    tfs BLOB NOT NULL,
+    PRIMARY KEY (term, segment)
+) WITHOUT ROWID;
+"""
+
+# Documentation formats indexed alongside source files
+DOC_EXTENSIONS = frozenset({".md", ".rst", ".txt", ".adoc"})
+
+# Files larger than this are not indexed
+MAX_DOC_BYTES = 1024 * 1024
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Small segments are merged once there are more than this many
+MAX_SEGMENTS = 8
+
+_WORD = re.compile(r"[A-Za-z0-9_]+")
+_CAMEL = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|[0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lower-case terms.
+
+    Identifiers are indexed whole and by their snake_case/camelCase parts,
+    so ``parseConfigFile`` is found by ``parse``, ``config`` or the full name.
+    """
+    terms = []
+    for word in _WORD.findall(text):
+        if len(word) > 1:
+            terms.append(word.lower())
+        if "_" in word or not (word.islower() or word.isupper()):
+            parts = [piece for part in word.split("_") for piece in _CAMEL.findall(part)]
+            if len(parts) > 1:
+                terms.extend(piece.lower() for piece in parts if len(piece) > 1)
+    return terms
+
+
+class SearchIndex:
+    """BM25-ranked inverted index over the text files of one project."""
+
+    def __init__(self, root: str, path: str):
+        self.root = os.path.abspath(root)
+        self.path = path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+        # Lengths and paths of the live documents, loaded once per update
+        self._lengths: Optional[Dict[int, int]] = None
+        self._paths: Dict[int, str] = {}
+        self._avgdl = 0.0
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+
+    @staticmethod
+    def wants(path: str, language: Optional[str]) -> bool:
+        """Return True for source files and documentation."""
+        return language is not None or os.path.splitext(path)[1].lower() in DOC_EXTENSIONS
+
+    def update(self, files: Iterable[Tuple[str, str]]) -> Dict[str, Any]:
+        """Re-index changed files.
+
+        ``files`` lists the ``(relative path, content hash)`` of every file
+        that should be searchable, e.g. from a ``ProjectIndex``; documents
+        not listed are dropped and those whose hash changed are re-read.
+        """
+        files = dict(files)
+        with self._lock:
+            known = dict(self._conn.execute("SELECT path, hash FROM docs"))
+        stale = [path for path in known if path not in files]
+        changed = {path: digest for path, digest in files.items() if known.get(path) != digest}
+        stats = self.update_files(changed.items(), stale)
+        stats["documents"] = len(self)
+        return stats
+
+    def update_files(self, changed: Iterable[Tuple[str, str]],
+                     removed: Iterable[str] = ()) -> Dict[str, Any]:
+        """Re-index just the given ``(path, hash)`` files and drop ``removed`` ones."""
+        start = time.perf_counter()
+        changed = dict(changed)
+        removed = [path for path in removed if path not in changed]
+
+        parsed = []
+        for path in changed:
+            try:
+                with open(os.path.join(self.root, path), 'rb') as f:
+                    data = f.read(MAX_DOC_BYTES + 1)
+            except OSError:
+                continue
+            if len(data) > MAX_DOC_BYTES or b"\0" in data[:8192]:
+                continue
+            parsed.append((path, Counter(tokenize(data.decode("utf-8", errors="replace")))))
+
+        if changed or removed:
+            with self._lock, self._conn:
+                self._conn.executemany("DELETE FROM docs WHERE path = ?",
+                                       [(path,) for path in list(changed) + removed])
+                if parsed:
+                    self._write_segment(parsed, changed)
+                self._lengths = None
+                self._maybe_merge()
+
+        return {
+            "indexed": len(parsed),
+            "removed": len(removed),
+            "seconds": round(time.perf_counter() - start, 3),
+        }
+
+    def _write_segment(self, parsed: List[Tuple[str, Counter]], files: Dict[str, str]) -> None:
+        segment = self._conn.execute("INSERT INTO segments (docs) VALUES (?)",
+                                     (len(parsed),)).lastrowid
+        doc_ids: Dict[str, array] = defaultdict(lambda: array("I"))
+        tfs: Dict[str, array] = defaultdict(lambda: array("I"))
+        for path, counts in parsed:
+            doc_id = self._conn.execute(
+                "INSERT INTO docs (path, hash, length) VALUES (?, ?, ?)",
+                (path, files[path], sum(counts.values()))).lastrowid
+            for term, tf in counts.items():
+                doc_ids[term].append(doc_id)
+                tfs[term].append(tf)
+        self._conn.executemany(
+            "INSERT INTO postings (term, segment, doc_ids, tfs) VALUES (?, ?, ?, ?)",
+            [(term, segment, ids.tobytes(), tfs[term].tobytes()) for term, ids in doc_ids.items()])
+
+    def _maybe_merge(self) -> None:
+        """Merge segments when there are too many or they hold many dead documents."""
+        segments = self._conn.execute("SELECT id, docs FROM segments ORDER BY docs DESC").fetchall()
+        referenced = sum(docs for _, docs in segments)
+        live = self._conn.execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+        if referenced - live > max(live, 1000):
+            self.merge([segment for segment, _ in segments])
+        elif len(segments) > MAX_SEGMENTS:
+            # Fold the small segments together and leave the largest alone
+            self.merge([segment for segment, _ in segments[1:]])
+
+    def merge(self, segments: Optional[List[int]] = None) -> None:
+        """Merge segments (default: all) into one, dropping dead documents."""
+        with self._lock, self._conn:
+            if segments is None:
+                segments = [row[0] for row in self._conn.execute("SELECT id FROM segments")]
+            if not segments:
+                return
+            live = {row[0] for row in self._conn.execute("SELECT id FROM docs")}
+            placeholders = ",".join("?" * len(segments))
+            rows = self._conn.execute(
+                f"SELECT term, doc_ids, tfs FROM postings WHERE segment IN ({placeholders}) "
+                f"ORDER BY term", segments).fetchall()
+            self._conn.execute(f"DELETE FROM postings WHERE segment IN ({placeholders})", segments)
+            self._conn.execute(f"DELETE FROM segments WHERE id IN ({placeholders})", segments)
+
+            merged: Dict[str, Tuple[array, array]] = {}
+            docs = set()
+            for term, id_bytes, tf_bytes in rows:
+                ids = array("I")
+                ids.frombytes(id_bytes)
+                counts = array("I")
+                counts.frombytes(tf_bytes)
+                target = merged.setdefault(term, (array("I"), array("I")))
+                for doc_id, tf in zip(ids, counts):
+                    if doc_id in live:
+                        target[0].append(doc_id)
+                        target[1].append(tf)
+                        docs.add(doc_id)
+            segment = self._conn.execute("INSERT INTO segments (docs) VALUES (?)",
+                                         (len(docs),)).lastrowid
+            self._conn.executemany(
+                "INSERT INTO postings (term, segment, doc_ids, tfs) VALUES (?, ?, ?, ?)",
+                [(term, segment, ids.tobytes(), counts.tobytes())
+                 for term, (ids, counts) in merged.items() if ids])
+
+    def segment_count(self) -> int:
+        """Return the number of index segments."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM segments").fetchone()[0]
+
+    def _load_lengths(self) -> Dict[int, int]:
+        if self._lengths is None:
+            rows = self._conn.execute("SELECT id, path, length FROM docs").fetchall()
+            self._lengths = {doc_id: length for doc_id, _, length in rows}
+            self._paths = {doc_id: path for doc_id, path, _ in rows}
+            self._avgdl = (sum(self._lengths.values()) / len(rows)) if rows else 0.0
+        return self._lengths
+
+    def search(self, query: str, limit: int = 10) -> List[Tuple[str, float]]:
+        """Return the ``limit`` best ``(path, score)`` matches for a query."""
+        terms = set(tokenize(query))
+        if not terms:
+            return []
+
+        with self._lock:
+            lengths = self._load_lengths()
+            n_docs = len(lengths)
+            if not n_docs:
+                return []
+            # Length normalization: K1 * (1 - B + B * length / avgdl)
+            base = K1 * (1 - B)
+            scale = K1 * B / self._avgdl if self._avgdl else 0.0
+            scores: Dict[int, float] = {}
+            for term in terms:
+                postings = []
+                for id_bytes, tf_bytes in self._conn.execute(
+                        "SELECT doc_ids, tfs FROM postings WHERE term = ?", (term,)):
+                    ids = array("I")
+                    ids.frombytes(id_bytes)
+                    counts = array("I")
+                    counts.frombytes(tf_bytes)
+                    postings.extend((doc_id, tf) for doc_id, tf in zip(ids, counts)
+                                    if doc_id in lengths)
+                if not postings:
+                    continue
+                df = len(postings)
+                idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+                for doc_id, tf in postings:
+                    score = idf * tf * (K1 + 1) / (tf + base + scale * lengths[doc_id])
+                    scores[doc_id] = scores.get(doc_id, 0.0) + score
+            best = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+            return [(self._paths[doc_id], score) for doc_id, score in best]
+
+    def snippet(self, path: str, query: str, width: int = 100) -> Tuple[int, str]:
+        """Return ``(line number, text)`` of the line best matching the query."""
+        terms = set(tokenize(query))
+        best = (0, 0, "")
+        try:
+            with open(os.path.join(self.root, path), 'r', errors="replace") as f:
+                for number, line in enumerate(f, 1):
+                    hits = len(terms.intersection(tokenize(line)))
+                    if hits > best[0]:
+                        best = (hits, number, line.strip())
+                        if hits == len(terms):
+                            break
+        except OSError:
+            pass
+        _, number, text = best
+        if len(text) > width:
+            text = text[:width - 3] + "..."
+        return number, text
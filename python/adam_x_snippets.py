@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Adam-X snippet library
+----------------------
+SQLite-backed snippet store with exact, prefix and fuzzy name lookup and
+full-text search over snippet bodies. Only names and matches are read for
+lookups; bodies are fetched when a snippet is actually used.
+"""
+
+import difflib
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS snippets (
+    id INTEGER PRIMARY KEY,
+    name TEXT UNIQUE NOT NULL,
+    body TEXT NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS snippet_trigrams (
+    trigram TEXT NOT NULL,
+    snippet_id INTEGER NOT NULL,
+    PRIMARY KEY (trigram, snippet_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS trigram_counts (
+    trigram TEXT PRIMARY KEY,
+    n INTEGER NOT NULL
+) WITHOUT ROWID;
+"""
+
+# Trigrams shared by more names than this are too common to narrow a
+# fuzzy lookup down and are skipped when rarer ones are available
+_COMMON_TRIGRAM = 2000
+
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS snippets_fts
+    USING fts5(name, body, content='snippets', content_rowid='id');
+CREATE TRIGGER IF NOT EXISTS snippets_ai AFTER INSERT ON snippets BEGIN
+    INSERT INTO snippets_fts(rowid, name, body) VALUES (new.id, new.name, new.body);
+END;
+CREATE TRIGGER IF NOT EXISTS snippets_ad AFTER DELETE ON snippets BEGIN
+    INSERT INTO snippets_fts(snippets_fts, rowid, name, body)
+        VALUES ('delete', old.id, old.name, old.body);
+END;
+CREATE TRIGGER IF NOT EXISTS snippets_au AFTER UPDATE ON snippets BEGIN
+    INSERT INTO snippets_fts(snippets_fts, rowid, name, body)
+        VALUES ('delete', old.id, old.name, old.body);
+    INSERT INTO snippets_fts(rowid, name, body) VALUES (new.id, new.name, new.body);
+END;
+"""
+
+_WORD = re.compile(r"\w+")
+
+
+def trigrams(name: str) -> List[str]:
+    """Return the distinct trigrams of a padded, lower-cased name."""
+    padded = f"  {name.lower()} "
+    return sorted({padded[i:i + 3] for i in range(len(padded) - 2)})
+
+
+class SnippetStore:
+    """Thread-safe snippet library stored in a SQLite database."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        try:
+            self._conn.executescript(_FTS_SCHEMA)
+            self.has_fts = True
+        except sqlite3.OperationalError:
+            # SQLite built without FTS5; fall back to LIKE scans
+            self.has_fts = False
+        self._conn.commit()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM snippets").fetchone()[0]
+
+    def __contains__(self, name: str) -> bool:
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM snippets WHERE name = ?", (name,)).fetchone()
+        return row is not None
+
+    def get(self, name: str) -> Optional[str]:
+        """Return the body of a snippet, or None."""
+        with self._lock:
+            row = self._conn.execute("SELECT body FROM snippets WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def put(self, name: str, body: str) -> None:
+        """Create or replace a snippet."""
+        self.put_many([(name, body)])
+
+    def put_many(self, items: Iterable[Tuple[str, str]]) -> None:
+        """Create or replace several snippets in one transaction."""
+        now = time.time()
+        with self._lock, self._conn:
+            for name, body in items:
+                row = self._conn.execute(
+                    "SELECT id FROM snippets WHERE name = ?", (name,)).fetchone()
+                if row:
+                    self._conn.execute(
+                        "UPDATE snippets SET body = ?, updated = ? WHERE id = ?",
+                        (body, now, row[0]))
+                    continue
+                cur = self._conn.execute(
+                    "INSERT INTO snippets (name, body, updated) VALUES (?, ?, ?)",
+                    (name, body, now))
+                grams = trigrams(name)
+                self._conn.executemany(
+                    "INSERT INTO snippet_trigrams (trigram, snippet_id) VALUES (?, ?)",
+                    [(t, cur.lastrowid) for t in grams])
+                self._conn.executemany(
+                    "INSERT INTO trigram_counts (trigram, n) VALUES (?, 1) "
+                    "ON CONFLICT(trigram) DO UPDATE SET n = n + 1",
+                    [(t,) for t in grams])
+
+    def delete(self, name: str) -> bool:
+        """Remove a snippet; return True if it existed."""
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT id FROM snippets WHERE name = ?", (name,)).fetchone()
+            if not row:
+                return False
+            self._conn.executemany(
+                "UPDATE trigram_counts SET n = n - 1 WHERE trigram = ?",
+                [(t,) for t in trigrams(name)])
+            self._conn.execute("DELETE FROM snippet_trigrams WHERE snippet_id = ?", (row[0],))
+            self._conn.execute("DELETE FROM snippets WHERE id = ?", (row[0],))
+            return True
+
+    def names(self, prefix: str = "", limit: Optional[int] = None) -> List[str]:
+        """Return snippet names starting with ``prefix``, in sorted order."""
+        sql = "SELECT name FROM snippets WHERE name >= ? AND name < ? ORDER BY name"
+        params: tuple = (prefix, prefix + "\U0010ffff")
+        if limit is not None:
+            sql += " LIMIT ?"
+            params += (limit,)
+        with self._lock:
+            return [row[0] for row in self._conn.execute(sql, params)]
+
+    def fuzzy(self, query: str, limit: int = 5, cutoff: float = 0.5) -> List[str]:
+        """Return names similar to ``query``, best match first.
+
+        Candidates are the names sharing the most (reasonably rare) trigrams
+        with the query, which are then ranked by edit similarity.
+        """
+        grams = trigrams(query)
+        with self._lock:
+            placeholders = ",".join("?" * len(grams))
+            counts = dict(self._conn.execute(
+                f"SELECT trigram, n FROM trigram_counts WHERE trigram IN ({placeholders})",
+                grams).fetchall())
+            grams = [t for t in grams if counts.get(t, 0) > 0]
+            if not grams:
+                return []
+            rare = [t for t in grams if counts[t] <= _COMMON_TRIGRAM]
+            if not rare:
+                # Only very common fragments; ranking them all would scan the
+                # whole library, so fall back to a prefix lookup
+                return self.names(prefix=query, limit=limit)
+            grams = rare
+            placeholders = ",".join("?" * len(grams))
+            rows = self._conn.execute(
+                f"SELECT s.name FROM snippet_trigrams t JOIN snippets s ON s.id = t.snippet_id "
+                f"WHERE t.trigram IN ({placeholders}) "
+                f"GROUP BY t.snippet_id ORDER BY COUNT(*) DESC LIMIT ?",
+                (*grams, max(limit * 10, 50))).fetchall()
+
+        query_lower = query.lower()
+        scored = []
+        for (name,) in rows:
+            ratio = difflib.SequenceMatcher(None, query_lower, name.lower()).ratio()
+            if ratio >= cutoff:
+                scored.append((-ratio, name))
+        return [name for _, name in sorted(scored)[:limit]]
+
+    def search(self, text: str, limit: int = 10) -> List[Tuple[str, str]]:
+        """Full-text search over names and bodies.
+
+        Returns ``(name, excerpt)`` pairs, best match first.
+        """
+        words = _WORD.findall(text)
+        if not words:
+            return []
+
+        with self._lock:
+            if self.has_fts:
+                match = " ".join('"{}"*'.format(word.replace('"', '""')) for word in words)
+                rows = self._conn.execute(
+                    "SELECT name, snippet(snippets_fts, 1, '[', ']', '...', 8) "
+                    "FROM snippets_fts WHERE snippets_fts MATCH ? ORDER BY rank LIMIT ?",
+                    (match, limit)).fetchall()
+            else:
+                clauses = " AND ".join("(name LIKE ? OR body LIKE ?)" for _ in words)
+                params = [p for word in words for p in (f"%{word}%", f"%{word}%")]
+                rows = self._conn.execute(
+                    f"SELECT name, substr(body, 1, 80) FROM snippets WHERE {clauses} "
+                    f"ORDER BY name LIMIT ?", (*params, limit)).fetchall()
+        return [(name, excerpt) for name, excerpt in rows]
+
+    def import_dict(self, snippets: Dict[str, str]) -> None:
+        """Import a ``{name: body}`` mapping, e.g. from an old config file."""
+        self.put_many(snippets.items())
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Adam-X stand-in model server
+----------------------------
+Local HTTP server speaking the streaming protocol of ``HTTPBackend``, for
+tests, benchmarks and offline development. Kept out of ``adam_x_backend``
+so that http.server is not imported on the normal request path.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+from adam_x_backend import SimulatedBackend, split_tokens
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    """Request handler streaming simulated responses as HTTP chunks."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            request = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError:
+            self.send_error(400, "Invalid JSON")
+            return
+
+        server = self.server
+        server.requests.append(request)
+        text = server.backend.respond(
+            request.get("action", ""),
+            request.get("input", ""),
+            request.get("language", "python"),
+        )
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.send_header("Connection", "close")
+        self.end_headers()
+
+        if server.first_token_delay:
+            time.sleep(server.first_token_delay)
+        for token in split_tokens(text):
+            data = token.encode("utf-8")
+            self.wfile.write(f"{len(data):x}\r\n".encode("latin-1") + data + b"\r\n")
+            self.wfile.flush()
+            if server.token_delay:
+                time.sleep(server.token_delay)
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+        self.close_connection = True
+
+    def log_message(self, format: str, *args: Any) -> None:
+        """Keep the stand-in server quiet."""
+
+
+class _StandInHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Many concurrent clients connect at once under load (see adam_x_replay)
+    request_queue_size = 128
+
+
+class StandInServer:
+    """Local HTTP server that mimics a streaming model endpoint.
+
+    Intended for tests and benchmarks; use it as a context manager::
+
+        with StandInServer(token_delay=0.01) as server:
+            backend = HTTPBackend(server.url)
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0,
+                 token_delay: float = 0.0, first_token_delay: float = 0.0):
+        self._httpd = _StandInHTTPServer((host, port), _StandInHandler)
+        self._httpd.backend = SimulatedBackend()
+        self._httpd.requests = []
+        self._httpd.token_delay = token_delay
+        self._httpd.first_token_delay = first_token_delay
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        """Base URL of the running server."""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1/stream"
+
+    @property
+    def requests(self):
+        """Request bodies received so far."""
+        return self._httpd.requests
+
+    def start(self) -> "StandInServer":
+        """Start serving on a background thread."""
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the server and release the socket."""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "StandInServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Adam-X request statistics
+-------------------------
+Per-command latency histograms (p50/p95/p99), time spent waiting on the
+model backend versus local overhead, response cache hit rates and bytes
+sent to and received from the backend. Shown by the ``stats`` command and
+optionally written as a Prometheus textfile.
+"""
+
+import contextlib
+import contextvars
+import math
+import os
+import threading
+import time
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+# Histogram buckets grow by 2**(1/8) (~9%) from 10 microseconds, so
+# quantiles are exact to within about 5%
+_BUCKET_BASE = 1e-5
+_BUCKETS_PER_DOUBLING = 8
+
+# Quantiles reported by 'stats' and exported to Prometheus
+QUANTILES = (0.5, 0.95, 0.99)
+
+# The request being measured in this thread or task
+_current: contextvars.ContextVar = contextvars.ContextVar("adam_x_request", default=None)
+
+
+class Histogram:
+    """Log-bucketed histogram of durations in seconds.
+
+    Takes constant memory per distinct order of magnitude recorded, however
+    many values are added.
+    """
+
+    def __init__(self):
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def add(self, seconds: float) -> None:
+        """Record one duration."""
+        seconds = max(seconds, 0.0)
+        if seconds <= _BUCKET_BASE:
+            bucket = 0
+        else:
+            bucket = int(math.log2(seconds / _BUCKET_BASE) * _BUCKETS_PER_DOUBLING) + 1
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.count += 1
+        self.sum += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q: float) -> float:
+        """Return the ``q`` quantile (0 if empty), interpolated within its bucket."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bucket in sorted(self.counts):
+            count = self.counts[bucket]
+            if seen + count >= rank:
+                low = _bucket_bound(bucket - 1) if bucket else 0.0
+                high = _bucket_bound(bucket)
+                value = low + (high - low) * (rank - seen) / count
+                return min(max(value, self.min), self.max)
+            seen += count
+        return self.max
+
+
+def _bucket_bound(bucket: int) -> float:
+    """Return the upper bound of a bucket."""
+    return _BUCKET_BASE * 2 ** (bucket / _BUCKETS_PER_DOUBLING)
+
+
+class Request:
+    """Measurements of one command while it runs."""
+
+    __slots__ = ("command", "start", "backend_seconds", "cache_hits", "cache_misses",
+                 "sent_bytes", "received_bytes", "failed")
+
+    def __init__(self, command: str):
+        self.command = command
+        self.start = time.perf_counter()
+        self.backend_seconds = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.sent_bytes = 0
+        self.received_bytes = 0
+        self.failed = False
+
+
+def current_request() -> Optional[Request]:
+    """Return the request being measured, or None."""
+    return _current.get()
+
+
+def note_cache(hit: bool) -> None:
+    """Count a response cache lookup for the current request."""
+    request = _current.get()
+    if request is not None:
+        if hit:
+            request.cache_hits += 1
+        else:
+            request.cache_misses += 1
+
+
+async def timed_stream(chunks: AsyncIterator[str], sent: str = "") -> AsyncIterator[str]:
+    """Yield a backend's response chunks, charging the wait for each to the current request.
+
+    ``sent`` is the text sent to the backend for this response.
+    """
+    request = _current.get()
+    if request is None:
+        async for chunk in chunks:
+            yield chunk
+        return
+
+    request.sent_bytes += len(sent.encode("utf-8"))
+    iterator = chunks.__aiter__()
+    while True:
+        start = time.perf_counter()
+        try:
+            chunk = await iterator.__anext__()
+        except StopAsyncIteration:
+            return
+        finally:
+            request.backend_seconds += time.perf_counter() - start
+        request.received_bytes += len(chunk.encode("utf-8"))
+        yield chunk
+
+
+class _CommandStats:
+    """Totals for one command name."""
+
+    def __init__(self):
+        self.total = Histogram()
+        self.backend = Histogram()
+        self.local = Histogram()
+        self.errors = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.sent_bytes = 0
+        self.received_bytes = 0
+
+
+class Stats:
+    """Thread-safe request statistics, grouped by command name."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._commands: Dict[str, _CommandStats] = {}
+        self.since = time.time()
+
+    @contextlib.contextmanager
+    def measure(self, command: str) -> Iterator[Request]:
+        """Measure the command run inside the ``with`` block."""
+        request = Request(command)
+        token = _current.set(request)
+        try:
+            yield request
+        except BaseException:
+            request.failed = True
+            raise
+        finally:
+            try:
+                _current.reset(token)
+            except ValueError:
+                # Finished in another context (an abandoned async generator)
+                pass
+            self.record(request)
+
+    def record(self, request: Request) -> None:
+        """Add a finished request to the totals."""
+        seconds = time.perf_counter() - request.start
+        with self._lock:
+            stats = self._commands.get(request.command)
+            if stats is None:
+                stats = self._commands[request.command] = _CommandStats()
+            stats.total.add(seconds)
+            stats.backend.add(request.backend_seconds)
+            stats.local.add(seconds - request.backend_seconds)
+            stats.errors += request.failed
+            stats.cache_hits += request.cache_hits
+            stats.cache_misses += request.cache_misses
+            stats.sent_bytes += request.sent_bytes
+            stats.received_bytes += request.received_bytes
+
+    def errors(self) -> int:
+        """Return the number of failed commands recorded so far."""
+        with self._lock:
+            return sum(stats.errors for stats in self._commands.values())
+
+    def reset(self) -> None:
+        """Forget everything recorded so far."""
+        with self._lock:
+            self._commands.clear()
+            self.since = time.time()
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Return the totals per command, latencies in seconds."""
+        with self._lock:
+            result = {}
+            for name, stats in sorted(self._commands.items()):
+                lookups = stats.cache_hits + stats.cache_misses
+                result[name] = {
+                    "count": stats.total.count,
+                    "errors": stats.errors,
+                    "latency": {q: stats.total.quantile(q) for q in QUANTILES},
+                    "backend": {q: stats.backend.quantile(q) for q in QUANTILES},
+                    "local": {q: stats.local.quantile(q) for q in QUANTILES},
+                    "seconds": stats.total.sum,
+                    "backend_seconds": stats.backend.sum,
+                    "cache_hits": stats.cache_hits,
+                    "cache_misses": stats.cache_misses,
+                    "cache_hit_rate": stats.cache_hits / lookups if lookups else None,
+                    "sent_bytes": stats.sent_bytes,
+                    "received_bytes": stats.received_bytes,
+                }
+            return result
+
+    def format(self) -> str:
+        """Return the totals as a table."""
+        snapshot = self.snapshot()
+        count = sum(entry["count"] for entry in snapshot.values())
+        started = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.since))
+        noun = "command" if count == 1 else "commands"
+        lines = [f"Command statistics since {started} ({count} {noun}):"]
+        if not snapshot:
+            return lines[0] + "\n  No commands run yet."
+
+        lines += ["", f"  {'command':<10} {'count':>6} {'errors':>6} {'p50 ms':>9} {'p95 ms':>9} "
+                      f"{'p99 ms':>9} {'backend':>8} {'local':>8} {'cache hits':>12} "
+                      f"{'sent':>10} {'received':>10}"]
+        for name, entry in snapshot.items():
+            latency = entry["latency"]
+            if entry["cache_hit_rate"] is None:
+                cache = "-"
+            else:
+                cache = f"{entry['cache_hits']}/{entry['cache_hits'] + entry['cache_misses']}"
+            # Share of the command's time spent waiting on the backend
+            share = entry["backend_seconds"] / entry["seconds"] if entry["seconds"] else 0.0
+            lines.append(
+                f"  {name:<10} {entry['count']:>6} {entry['errors']:>6} "
+                f"{latency[0.5] * 1000:>9.2f} {latency[0.95] * 1000:>9.2f} "
+                f"{latency[0.99] * 1000:>9.2f} {share:>8.0%} {1 - share:>8.0%} {cache:>12} "
+                f"{format_size(entry['sent_bytes']):>10} {format_size(entry['received_bytes']):>10}")
+        lines += ["", "  backend/local: share of time spent waiting on the model backend "
+                      "versus in Adam-X itself."]
+        return "\n".join(lines)
+
+    def prometheus(self) -> str:
+        """Return the totals in the Prometheus text exposition format."""
+        snapshot = self.snapshot()
+        lines: List[str] = []
+
+        def family(name: str, kind: str, text: str) -> None:
+            lines.append(f"# HELP adam_x_{name} {text}")
+            lines.append(f"# TYPE adam_x_{name} {kind}")
+
+        for name, key, text in (("command_duration_seconds", "latency", "Command latency."),
+                                ("backend_duration_seconds", "backend",
+                                 "Time per command spent waiting on the model backend."),
+                                ("local_duration_seconds", "local",
+                                 "Time per command spent outside the model backend.")):
+            family(name, "summary", text)
+            for command, entry in snapshot.items():
+                label = _label(command)
+                for q, value in entry[key].items():
+                    lines.append(f'adam_x_{name}{{command="{label}",quantile="{q}"}} {value:.6g}')
+                total = {"latency": entry["seconds"], "backend": entry["backend_seconds"],
+                         "local": entry["seconds"] - entry["backend_seconds"]}[key]
+                lines.append(f'adam_x_{name}_sum{{command="{label}"}} {total:.6g}')
+                lines.append(f'adam_x_{name}_count{{command="{label}"}} {entry["count"]}')
+
+        for name, key, text in (("command_errors_total", "errors", "Commands that raised an error."),
+                                ("cache_hits_total", "cache_hits", "Response cache hits."),
+                                ("cache_misses_total", "cache_misses", "Response cache misses."),
+                                ("backend_sent_bytes_total", "sent_bytes",
+                                 "Bytes sent to the model backend."),
+                                ("backend_received_bytes_total", "received_bytes",
+                                 "Bytes received from the model backend.")):
+            family(name, "counter", text)
+            for command, entry in snapshot.items():
+                lines.append(f'adam_x_{name}{{command="{_label(command)}"}} {entry[key]}')
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: str) -> None:
+        """Write the Prometheus export to ``path`` atomically, for node_exporter's textfile collector."""
+        import tempfile
+        path = os.path.expanduser(path)
+        directory = os.path.dirname(path) or "."
+        fd, tmp = tempfile.mkstemp(prefix=".adam-x-stats-", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(self.prometheus())
+            os.replace(tmp, path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp)
+            raise
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_size(size: float) -> str:
+    """Return a byte count as text in B, KiB, MiB or GiB."""
+    for unit in ("B", "KiB", "MiB"):
+        if abs(size) < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Adam-X config store
+-------------------
+Journaled storage for ``config.json``. Changes are appended to a journal
+next to the config file instead of rewriting the whole file; the journal is
+replayed on load and periodically compacted into a new snapshot that is
+written atomically. The journal's first line names the snapshot it
+applies to, so a journal left behind by an interrupted compaction is
+recognised as stale and ignored.
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import threading
+import weakref
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+_open_stores = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_open_stores() -> None:
+    for store in list(_open_stores):
+        try:
+            store.flush()
+        except OSError:
+            pass
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def _parse_line(line: str) -> Optional[Dict[str, Any]]:
+    """Decode one journal line; None for a torn or empty line."""
+    if not line.endswith("\n"):
+        return None
+    try:
+        return json.loads(line)
+    except json.JSONDecodeError:
+        return None
+
+
+def _apply(data: Dict[str, Any], op: str, path: Sequence[str], value: Any = None) -> None:
+    """Apply one journal operation to a config dict in place."""
+    target = data
+    for key in path[:-1]:
+        child = target.get(key)
+        if not isinstance(child, dict):
+            child = target[key] = {}
+        target = child
+    if op == "set":
+        target[path[-1]] = value
+    elif op == "delete":
+        target.pop(path[-1], None)
+
+
+class ConfigStore:
+    """Snapshot plus append-only journal for a JSON config file.
+
+    ``set`` and ``delete`` update the in-memory dict immediately and queue a
+    journal entry. Queued entries are written together once
+    ``flush_interval`` seconds have passed (``0`` writes them right away),
+    on ``flush``/``close`` and at interpreter exit. When the journal grows
+    past ``compact_entries`` entries or the size of the snapshot, it is
+    folded into a fresh snapshot.
+    """
+
+    def __init__(self, path: str, flush_interval: float = 0.2,
+                 compact_entries: int = 1000):
+        self.path = path
+        self.journal_path = path + ".journal"
+        self.flush_interval = flush_interval
+        self.compact_entries = compact_entries
+        self.data: Dict[str, Any] = {}
+        self._pending: List[str] = []
+        self._journal_entries = 0
+        self._journal_bytes = 0
+        self._snapshot_bytes = 0
+        self._base = ""
+        self._stamp: Optional[Tuple] = None
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.RLock()
+        _open_stores.add(self)
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """Read the snapshot and replay the journal.
+
+        Returns None if there is no snapshot. Raises ``json.JSONDecodeError``
+        if the snapshot is corrupt; a torn final journal line is ignored.
+        """
+        with self._lock:
+            self.flush()
+            if not os.path.exists(self.path):
+                return None
+
+            with open(self.path, 'r') as f:
+                text = f.read()
+            data = json.loads(text)
+            self._snapshot_bytes = len(text)
+            self._base = _digest(text)
+
+            self._journal_entries = 0
+            self._journal_bytes = 0
+            try:
+                with open(self.journal_path, 'r') as f:
+                    header = f.readline()
+                    if _parse_line(header) == {"base": self._base}:
+                        self._journal_bytes = len(header)
+                        for line in f:
+                            entry = _parse_line(line)
+                            if entry is None:
+                                break
+                            _apply(data, entry["op"], entry["path"], entry.get("value"))
+                            self._journal_bytes += len(line)
+                            self._journal_entries += 1
+            except FileNotFoundError:
+                pass
+
+            self.data = data
+            self._stamp = self._stat()
+            return data
+
+    def set(self, path: Sequence[str], value: Any) -> None:
+        """Set a nested key, e.g. ``set(["snippets", name], code)``."""
+        with self._lock:
+            _apply(self.data, "set", path, value)
+            self._queue({"op": "set", "path": list(path), "value": value})
+
+    def delete(self, path: Sequence[str]) -> None:
+        """Remove a nested key if it exists."""
+        with self._lock:
+            _apply(self.data, "delete", path)
+            self._queue({"op": "delete", "path": list(path)})
+
+    def replace(self, data: Dict[str, Any]) -> None:
+        """Replace the whole config and write a new snapshot."""
+        with self._lock:
+            self._cancel_timer()
+            self._pending = []
+            self.data = data
+            self._write_snapshot()
+
+    def flush(self) -> None:
+        """Append queued journal entries to disk."""
+        with self._lock:
+            self._cancel_timer()
+            if not self._pending:
+                return
+            payload = "".join(self._pending)
+            if not self._journal_bytes:
+                # Start a new journal (truncating any stale one) with a header
+                payload = json.dumps({"base": self._base}) + "\n" + payload
+                mode = 'w'
+            else:
+                mode = 'a'
+            with open(self.journal_path, mode) as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            self._journal_entries += len(self._pending)
+            self._journal_bytes += len(payload)
+            self._pending = []
+
+            if (self._journal_entries >= self.compact_entries
+                    or self._journal_bytes > max(self._snapshot_bytes, 64 * 1024)):
+                self._write_snapshot()
+            else:
+                self._stamp = self._stat()
+
+    def compact(self) -> None:
+        """Fold the journal into a new snapshot."""
+        with self._lock:
+            self._cancel_timer()
+            self._pending = []
+            self._write_snapshot()
+
+    def close(self) -> None:
+        """Flush queued entries and stop the write-behind timer."""
+        self.flush()
+        _open_stores.discard(self)
+
+    def changed_on_disk(self) -> bool:
+        """Return True if another process modified the files since our last read/write."""
+        return self._stat() != self._stamp
+
+    def _queue(self, entry: Dict[str, Any]) -> None:
+        self._pending.append(json.dumps(entry) + "\n")
+        if self.flush_interval <= 0:
+            self.flush()
+        elif self._timer is None:
+            self._timer = threading.Timer(self.flush_interval, self._flush_in_background)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _flush_in_background(self) -> None:
+        try:
+            self.flush()
+        except OSError as e:
+            print(f"Error saving config: {str(e)}")
+
+    def _cancel_timer(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _write_snapshot(self) -> None:
+        """Atomically write the snapshot, then drop the journal."""
+        text = json.dumps(self.data, indent=2)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        # A crash before the journal is removed leaves a journal whose header
+        # no longer matches the snapshot, so it is ignored on the next load.
+        try:
+            os.remove(self.journal_path)
+        except FileNotFoundError:
+            pass
+        self._snapshot_bytes = len(text)
+        self._base = _digest(text)
+        self._journal_entries = 0
+        self._journal_bytes = 0
+        self._stamp = self._stat()
+
+    def _stat(self) -> Tuple:
+        stamps = []
+        for path in (self.path, self.journal_path):
+            try:
+                st = os.stat(path)
+                stamps.append((st.st_mtime_ns, st.st_size))
+            except OSError:
+                stamps.append(None)
+        return tuple(stamps)
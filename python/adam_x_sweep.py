@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Adam-X project sweeps
+---------------------
+Runs ``debug`` or ``optimize`` over every source file of a project on a
+process pool and collects the results into one report. Results are cached
+by file content hash, so a rerun only analyzes files that changed since the
+last sweep.
+"""
+
+import asyncio
+import concurrent.futures
+import multiprocessing
+import os
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from adam_x_cache import make_key
+from adam_x_refs import iter_chunks
+
+# The backend used by analyze_file in this process, set by _init_worker
+_backend: Any = None
+_analyzer: Any = None
+
+
+def _init_worker(backend: Any) -> None:
+    global _backend, _analyzer
+    from adam_x_analyzer import Analyzer
+    _backend = backend
+    _analyzer = Analyzer()
+
+
+def result_key(action: str, digest: str, language: Optional[str], model_id: str) -> str:
+    """Return the cache key of one file's sweep result."""
+    return make_key(f"{action}:file", digest, language or "", model_id)
+
+
+def analyze_file(root: str, path: str, action: str, language: Optional[str]) -> str:
+    """Run an action over one file, chunk by chunk, and return the combined result.
+
+    Runs in a pool worker, using the backend passed to ``_init_worker``;
+    when optimizing Python, the local analyzer's findings go to the backend
+    as context and follow its answer.
+    """
+    async def collect() -> List[Tuple[int, int, str]]:
+        parts = []
+        for start, end, text in iter_chunks(os.path.join(root, path), language=language):
+            findings = None
+            if action == "optimize" and language == "python":
+                findings = _analyzer.report(text, first_line=start)
+            context = f"Static analysis:\n{findings}" if findings is not None else ""
+            result = await _backend.complete(action, text, language or "", context)
+            if findings is not None:
+                result = f"{result}\n\n{findings}"
+            parts.append((start, end, result))
+        return parts
+
+    parts = asyncio.run(collect())
+    if not parts:
+        return "Empty file."
+    if len(parts) == 1:
+        return parts[0][2]
+    return "\n\n".join(f"Lines {start}-{end}:\n{result}" for start, end, result in parts)
+
+
+class Sweep:
+    """One ``debug``/``optimize`` pass over a list of project files."""
+
+    def __init__(self, root: str, files: List[Tuple[str, str, Optional[str]]], action: str,
+                 backend: Any, cache: Any = None, workers: Optional[int] = None):
+        self.root = root
+        self.files = sorted(files)
+        self.action = action
+        self.backend = backend
+        self.cache = cache
+        self.workers = workers or os.cpu_count() or 1
+        self.results: Dict[str, str] = {}
+        self.errors: Dict[str, str] = {}
+        self.cached = 0
+        self.analyzed = 0
+        self.seconds = 0.0
+
+    async def run(self) -> AsyncIterator[Tuple[str, str]]:
+        """Yield ``(path, result)`` per file: cached ones first, then as they complete."""
+        start = time.perf_counter()
+        todo = []
+        for path, digest, language in self.files:
+            cached = None
+            if self.cache is not None:
+                cached = self.cache.get(result_key(self.action, digest, language,
+                                                   self.backend.model_id))
+            if cached is None:
+                todo.append((path, digest, language))
+            else:
+                self.cached += 1
+                self.results[path] = cached
+                yield path, cached
+
+        try:
+            async for path, result in self._analyze(todo):
+                yield path, result
+        finally:
+            self.seconds = time.perf_counter() - start
+
+    async def _analyze(self, todo: List[Tuple[str, str, Optional[str]]]) -> AsyncIterator[Tuple[str, str]]:
+        if not todo:
+            return
+        pool = self._pool(len(todo), processes=True)
+        try:
+            while True:
+                try:
+                    async for path, result in self._run_on(pool, todo):
+                        yield path, result
+                    return
+                except concurrent.futures.BrokenExecutor:
+                    if isinstance(pool, concurrent.futures.ThreadPoolExecutor):
+                        raise
+                    # A worker died; finish the remaining files on threads
+                    pool.shutdown(wait=False)
+                    todo = [entry for entry in todo
+                            if entry[0] not in self.results and entry[0] not in self.errors]
+                    pool = self._pool(len(todo), processes=False)
+        finally:
+            pool.shutdown(wait=False)
+
+    def _pool(self, count: int, processes: bool) -> concurrent.futures.Executor:
+        workers = max(1, min(self.workers, count))
+        if processes:
+            try:
+                # Forking would copy the engine's threads and held locks into the
+                # workers; spawned ones start clean
+                return concurrent.futures.ProcessPoolExecutor(
+                    workers, mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker, initargs=(self.backend,))
+            except (OSError, NotImplementedError, ValueError):
+                pass
+        # No usable process pool here; backend requests mostly wait on I/O anyway
+        return concurrent.futures.ThreadPoolExecutor(
+            workers, initializer=_init_worker, initargs=(self.backend,))
+
+    async def _run_on(self, pool: concurrent.futures.Executor,
+                      todo: List[Tuple[str, str, Optional[str]]]) -> AsyncIterator[Tuple[str, str]]:
+        loop = asyncio.get_running_loop()
+        futures = {}
+        for path, digest, language in todo:
+            future = loop.run_in_executor(pool, analyze_file, self.root, path, self.action, language)
+            futures[future] = (path, digest, language)
+
+        pending = set(futures)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in sorted(done, key=lambda f: futures[f][0]):
+                    path, digest, language = futures[future]
+                    try:
+                        result = future.result()
+                    except concurrent.futures.BrokenExecutor:
+                        raise
+                    except Exception as e:
+                        self.errors[path] = str(e) or type(e).__name__
+                        yield path, f"Error: {self.errors[path]}"
+                        continue
+                    self.analyzed += 1
+                    self.results[path] = result
+                    if self.cache is not None:
+                        self.cache.put(result_key(self.action, digest, language,
+                                                  self.backend.model_id), result)
+                    yield path, result
+        finally:
+            # Files not yet started are dropped when the sweep stops early
+            for future in pending:
+                future.cancel()
+
+    def summary(self) -> str:
+        """Return a one-line summary of the sweep."""
+        return (f"{len(self.files)} files: {self.analyzed} analyzed, {self.cached} unchanged "
+                f"since the last sweep, {len(self.errors)} failed ({self.seconds:.1f}s)")
+
+    def report(self, title: str) -> str:
+        """Return the aggregated report, one section per file in path order."""
+        lines = [f"# {title}", "", self.summary(), ""]
+        for path, _, _ in self.files:
+            if path in self.results:
+                lines += [f"## {path}", "", self.results[path].rstrip(), ""]
+            elif path in self.errors:
+                lines += [f"## {path}", "", f"Error: {self.errors[path]}", ""]
+        return "\n".join(lines)
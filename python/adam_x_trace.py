@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Adam-X tracing
+--------------
+Lightweight spans around the stages of a request: parsing the command,
+dispatching it, building the project context, the cache lookup, the backend
+call and rendering the response. Finished spans go to an exporter: one JSON
+object per line in a file, a list in memory, or anything with an
+``export(span)`` method. Without an exporter, spans cost one attribute check.
+"""
+
+import contextvars
+import json
+import os
+import random
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+# The innermost open span in this thread or task
+_current: contextvars.ContextVar = contextvars.ContextVar("adam_x_span", default=None)
+
+
+class Span:
+    """One timed stage of a request, nested under the span open when it started."""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "start", "duration",
+                 "attributes", "error", "_exporter", "_token", "_started")
+
+    def __init__(self, name: str, exporter: Any, attributes: Dict[str, Any]):
+        parent = _current.get()
+        self.name = name
+        self.trace_id = parent.trace_id if parent is not None else f"{random.getrandbits(128):032x}"
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent.span_id if parent is not None else None
+        self.start = 0.0
+        self.duration = 0.0
+        self.attributes = attributes
+        self.error: Optional[str] = None
+        self._exporter = exporter
+        self._token: Any = None
+        self._started = 0.0
+
+    def set(self, key: str, value: Any) -> None:
+        """Set an attribute of the span."""
+        self.attributes[key] = value
+
+    def __enter__(self) -> "Span":
+        self.start = time.time()
+        self._started = time.perf_counter()
+        self._token = _current.set(self)
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        self.duration = time.perf_counter() - self._started
+        if exc_type is not None:
+            self.error = exc_type.__name__
+        try:
+            _current.reset(self._token)
+        except ValueError:
+            # Closed in another context (an abandoned async generator)
+            pass
+        self._exporter.export(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the span as a JSON-serializable dict."""
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": self.start,
+            "duration_ms": round(self.duration * 1000, 3),
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+    def __repr__(self) -> str:
+        return f"Span({self.name!r}, {self.duration * 1000:.3f} ms)"
+
+
+class _NoopSpan:
+    """Stands in for a span when tracing is off."""
+
+    __slots__ = ()
+
+    def set(self, key: str, value: Any) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class SpanExporter:
+    """Receives each span when it ends."""
+
+    def export(self, span: Span) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Release any resources held by the exporter."""
+
+
+class MemoryExporter(SpanExporter):
+    """Keeps finished spans in a list, for tests and interactive inspection."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.spans: List[Span] = []
+
+    def export(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.spans.clear()
+
+
+class JsonlExporter(SpanExporter):
+    """Appends each span to a file as one line of JSON."""
+
+    def __init__(self, path: str):
+        self.path = os.path.expanduser(path)
+        self._lock = threading.Lock()
+        self._file: Any = None
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(span.to_dict(), default=str) + "\n"
+        with self._lock:
+            if self._file is None:
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                self._file = open(self.path, 'a', encoding="utf-8")
+            self._file.write(line)
+            self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class Tracer:
+    """Creates spans and hands them to its exporter when they end.
+
+    With no exporter (the default), ``span`` returns a shared no-op span.
+    """
+
+    def __init__(self, exporter: Optional[Any] = None):
+        self.exporter = exporter
+
+    def span(self, name: str, **attributes: Any) -> Any:
+        """Return a context manager timing the stage ``name``."""
+        if self.exporter is None:
+            return _NOOP_SPAN
+        return Span(name, self.exporter, attributes)
+
+    def close(self) -> None:
+        if self.exporter is not None:
+            self.exporter.close()
+
+
+def current_span() -> Any:
+    """Return the innermost open span, or a no-op span if there is none."""
+    span = _current.get()
+    return _NOOP_SPAN if span is None else span
+
+
+def create_exporter(settings: Optional[Dict[str, Any]] = None,
+                    base: str = ".") -> Optional[SpanExporter]:
+    """Build a span exporter from the ``trace`` section of the config (None if tracing is off).
+
+    A relative ``path`` is relative to ``base``.
+    """
+    settings = settings or {}
+    kind = settings.get("exporter", "none")
+
+    if kind == "none":
+        return None
+    elif kind == "memory":
+        return MemoryExporter()
+    elif kind == "jsonl":
+        path = os.path.expanduser(settings.get("path", "traces.jsonl"))
+        return JsonlExporter(os.path.join(base, path))
+    raise ValueError(f"Unknown trace exporter: {kind}")
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Local search benchmark
+----------------------
+Builds a ``SearchIndex`` over a synthetic corpus and reports the initial
+build time, the time to re-index a handful of changed files, and query
+latency percentiles. Runs offline and touches nothing outside a temporary
+directory.
+
+    python benchmarks/bench_search.py --files 20000 --queries 200
+"""
+
+import argparse
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from adam_x_search import SearchIndex
+
+
+def make_corpus(root, files, words_per_file, vocabulary, rng):
+    """Write synthetic source files; return ``{path: hash}``."""
+    words = [f"term{i}" for i in range(vocabulary)]
+    corpus = {}
+    for i in range(files):
+        path = f"pkg{i // 1000}/module_{i}.py"
+        os.makedirs(os.path.join(root, os.path.dirname(path)), exist_ok=True)
+        body = " ".join(rng.choices(words, k=words_per_file))
+        with open(os.path.join(root, path), 'w') as f:
+            f.write(f"def handler_{i}(request):\n    # {body}\n    return request\n")
+        corpus[path] = f"v0-{i}"
+    return corpus
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the local BM25 search index")
+    parser.add_argument("--files", type=int, default=10000)
+    parser.add_argument("--words", type=int, default=200, help="Words per file")
+    parser.add_argument("--vocabulary", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    temp_dir = tempfile.mkdtemp()
+    try:
+        root = os.path.join(temp_dir, "project")
+        corpus = make_corpus(root, args.files, args.words, args.vocabulary, rng)
+        index = SearchIndex(root, os.path.join(temp_dir, "search.db"))
+
+        start = time.perf_counter()
+        index.update(corpus.items())
+        build = time.perf_counter() - start
+
+        for path in rng.sample(sorted(corpus), 10):
+            with open(os.path.join(root, path), 'a') as f:
+                f.write("# edited\n")
+            corpus[path] = "v1"
+        start = time.perf_counter()
+        index.update(corpus.items())
+        incremental = time.perf_counter() - start
+
+        latencies = []
+        for _ in range(args.queries):
+            query = " ".join(f"term{rng.randrange(args.vocabulary)}" for _ in range(rng.randint(1, 3)))
+            start = time.perf_counter()
+            index.search(query, 10)
+            latencies.append((time.perf_counter() - start) * 1000)
+        index.close()
+        size = os.path.getsize(os.path.join(temp_dir, "search.db"))
+    finally:
+        shutil.rmtree(temp_dir)
+
+    print(f"files:            {args.files}")
+    print(f"index size:       {size / 1e6:.1f} MB")
+    print(f"build:            {build:.2f} s")
+    print(f"update 10 files:  {incremental * 1000:.1f} ms")
+    print(f"query p50:        {statistics.median(latencies):.2f} ms")
+    print(f"query p95:        {percentile(latencies, 95):.2f} ms")
+    print(f"query p99:        {percentile(latencies, 99):.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark for the Adam-X Python interface
+-------------------------------------------------
+Times fresh interpreter runs of ``import adam_x``, ``adam_x.py --help`` and
+a one-shot ``--batch`` command, and optionally compares the medians with a
+saved baseline so that startup regressions fail loudly.
+
+    python benchmarks/bench_startup.py --save baseline.json
+    python benchmarks/bench_startup.py --compare baseline.json
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+PYTHON_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ADAM_X = os.path.join(PYTHON_DIR, "adam_x.py")
+
+
+def scenarios(config_path):
+    """Return ``{name: (argv, stdin)}`` for each measured scenario."""
+    return {
+        "python -c pass": ([sys.executable, "-c", "pass"], None),
+        "import adam_x": ([sys.executable, "-c", "import adam_x"], None),
+        "adam_x.py --help": ([sys.executable, ADAM_X, "--help"], None),
+        "one-shot --batch": (
+            [sys.executable, ADAM_X, "--config", config_path, "--batch", "-"],
+            b"explain x = 1\n",
+        ),
+    }
+
+
+def measure(argv, stdin, runs):
+    """Return wall-clock times in milliseconds for ``runs`` executions."""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(argv, input=stdin, cwd=PYTHON_DIR, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Adam-X startup time")
+    parser.add_argument("--runs", type=int, default=10, help="Runs per scenario")
+    parser.add_argument("--save", metavar="FILE", help="Write the medians to FILE")
+    parser.add_argument("--compare", metavar="FILE", help="Compare the medians with FILE")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed slowdown relative to the baseline (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    temp_dir = tempfile.mkdtemp()
+    try:
+        results = {}
+        for name, (argv, stdin) in scenarios(os.path.join(temp_dir, "config.json")).items():
+            measure(argv, stdin, 1)  # warm up the page cache and __pycache__
+            times = measure(argv, stdin, args.runs)
+            results[name] = statistics.median(times)
+    finally:
+        shutil.rmtree(temp_dir)
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    regressions = []
+    print(f"{'scenario':<20} {'median ms':>10} {'baseline':>10}")
+    for name, median in results.items():
+        base = baseline.get(name)
+        line = f"{name:<20} {median:>10.1f}"
+        if base is not None:
+            line += f" {base:>10.1f}"
+            if median > base * (1 + args.tolerance):
+                line += "  REGRESSION"
+                regressions.append(name)
+        print(line)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
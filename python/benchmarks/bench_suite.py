@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite
+---------------
+Times the in-process hot paths of Adam-X (constructing ``AdamX``, loading
+and saving small and huge configs, dispatching commands, ``create_file``, scaffolding)
+and the stages of ``examples/prompt-analyzer/template/cluster_prompts.py``
+(embedding cache load, K-Means, DBSCAN, plots, Markdown report) on
+synthetic embedding matrices. Runs offline: the embedding cache holds every
+prompt, and the suite fails rather than call the embeddings API.
+
+Medians are saved as ``{case: milliseconds}`` like ``bench_startup.py``, and
+a run or a saved results file can be compared with a baseline:
+
+    python benchmarks/bench_suite.py --save benchmarks/baseline.json
+    python benchmarks/bench_suite.py --compare benchmarks/baseline.json
+    python benchmarks/bench_suite.py --compare old.json --results new.json
+
+The cluster_prompts.py stages need numpy, pandas, scikit-learn and
+matplotlib; without them those cases are reported as skipped. K-Means
+(silhouette scores) and t-SNE are quadratic, so at 100k rows a single run
+takes minutes; use ``--rows`` and ``--filter`` to pick cases.
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import json
+import os
+import re
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+PYTHON_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CLUSTER_PROMPTS = os.path.join(os.path.dirname(PYTHON_DIR), "examples", "prompt-analyzer",
+                               "template", "cluster_prompts.py")
+
+sys.path.insert(0, PYTHON_DIR)
+
+# Projects in the "huge" config
+HUGE_PROJECTS = 50000
+# Clusters in the synthetic embedding matrices
+CLUSTERS = 8
+
+
+def write_config(path, projects):
+    """Write a config with ``projects`` projects and return its path."""
+    from adam_x_store import ConfigStore
+    ConfigStore(path).replace({
+        "user_name": "bench",
+        "theme": "dark",
+        "projects": {f"project-{i}": f"/srv/work/project-{i}" for i in range(projects)},
+        "last_project": None,
+        "preferences": {"indent": 4, "max_line_length": 88, "preferred_language": "python"},
+    })
+    return path
+
+
+def adam_x_cases(temp_dir):
+    """Yield ``(name, setup)``; ``setup()`` returns the callable to time."""
+    from adam_x import AdamX
+
+    paths = {}
+
+    def loaded(size):
+        if size not in paths:
+            directory = os.path.join(temp_dir, size)
+            os.makedirs(directory)
+            projects = HUGE_PROJECTS if size == "huge" else 1
+            paths[size] = write_config(os.path.join(directory, "config.json"), projects)
+        adam_x = AdamX(paths[size], show_welcome=False)
+        adam_x.config  # noqa: B018 - load it now
+        return adam_x
+
+    def construct():
+        path = loaded("small").config_path
+        return lambda: AdamX(path, show_welcome=False)
+
+    def dispatch(command):
+        def setup():
+            adam_x = loaded("small")
+            adam_x.process_command(command)  # fill the response cache
+            return lambda: adam_x.process_command(command)
+        return setup
+
+    def create_file():
+        adam_x = loaded("small")
+        path = os.path.join(temp_dir, "hello.py")
+        return lambda: adam_x.create_file(path)
+
+    def scaffold():
+        adam_x = loaded("small")
+        spec = {"instances": [{"service": f"service{i}"} for i in range(50)],
+                "files": {"${service}/": {"main.py": None, "main.go": None, "lib.rs": None,
+                                          "App.java": None, "README.md": "# ${service}\n",
+                                          "tests/": {"test_main.py": None}}}}
+        root = os.path.join(temp_dir, "scaffold")
+
+        def run():
+            from adam_x_scaffold import write
+            write(root, adam_x.scaffolder.plan(spec, adam_x._template_values()), overwrite=True)
+        return run
+
+    yield "AdamX()", construct
+    for size in ("small", "huge"):
+        yield f"_load_config {size}", lambda size=size: loaded(size)._load_config
+        yield f"save_config {size}", lambda size=size: loaded(size).save_config
+    yield "process_command help", dispatch("help")
+    yield "process_command explain (cached)", dispatch("explain x = 1")
+    yield "create_file", create_file
+    yield "scaffold 300 files", scaffold
+
+
+def load_cluster_prompts():
+    """Import cluster_prompts.py from the example template, without network access."""
+    spec = importlib.util.spec_from_file_location("cluster_prompts", CLUSTER_PROMPTS)
+    stages = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(stages)
+
+    def offline(texts, model, batch_size=100):
+        raise RuntimeError(f"benchmark tried to embed {len(texts)} prompt(s) online")
+
+    stages.embed_texts = offline
+    return stages
+
+
+def cluster_cases(temp_dir, rows, dim, seed):
+    """Yield ``(name, setup)`` for each cluster_prompts.py stage at ``rows`` rows."""
+    data = {}
+
+    def synthetic():
+        # Gaussian blobs around CLUSTERS centres, plus an embedding cache
+        # holding every prompt
+        if not data:
+            os.environ.setdefault("MPLBACKEND", "Agg")
+            stages = load_cluster_prompts()
+            np, pd = stages.np, stages.pd
+            rng = np.random.default_rng(seed)
+            centers = rng.normal(scale=4.0, size=(CLUSTERS, dim))
+            labels = rng.integers(CLUSTERS, size=rows)
+            matrix = (centers[labels] + rng.normal(size=(rows, dim))).astype(np.float32)
+            df = pd.DataFrame({
+                "prompt": [f"synthetic prompt {i} about topic {label}"
+                           for i, label in enumerate(labels)],
+                "for_devs": rng.random(rows) < 0.1,
+            })
+            cache_path = os.path.join(temp_dir, f"embeddings-{rows}.json")
+            with open(cache_path, 'w') as f:
+                json.dump(dict(zip(df["prompt"], matrix.tolist())), f)
+            data.update(stages=stages, matrix=matrix, labels=labels, df=df,
+                        cache_path=stages.Path(cache_path))
+        return data
+
+    def embeddings():
+        d = synthetic()
+        return lambda: d["stages"].load_or_create_embeddings(
+            d["df"]["prompt"], cache_path=d["cache_path"], model="text-embedding-3-small")
+
+    def kmeans():
+        d = synthetic()
+        return lambda: d["stages"].cluster_kmeans(d["matrix"], k_max=10)
+
+    def dbscan():
+        d = synthetic()
+        return lambda: d["stages"].cluster_dbscan(d["matrix"], min_samples=3)
+
+    def plots():
+        d = synthetic()
+        plots_dir = d["stages"].Path(temp_dir, f"plots-{rows}")
+        return lambda: d["stages"].create_plots(d["matrix"], d["labels"], d["df"]["for_devs"],
+                                                plots_dir)
+
+    def report():
+        d = synthetic()
+        meta = {label: {"name": f"Topic {label}", "description": f"Prompts about topic {label}."}
+                for label in range(CLUSTERS)}
+        outputs = {"method": "kmeans", "k": CLUSTERS, "silhouette": 0.5,
+                   "ambiguous": d["df"]["prompt"].head(20).tolist()}
+        path_md = d["stages"].Path(temp_dir, f"analysis-{rows}.md")
+        return lambda: d["stages"].generate_markdown_report(d["df"], d["labels"], meta, outputs,
+                                                            path_md)
+
+    for stage, setup in (("load_or_create_embeddings", embeddings),
+                         ("cluster_kmeans", kmeans),
+                         ("cluster_dbscan", dbscan),
+                         ("create_plots", plots),
+                         ("generate_markdown_report", report)):
+        yield f"{stage} {rows // 1000}k", setup
+
+
+def measure(func, repeat, min_time, budget):
+    """Return per-call times in milliseconds, one per sample.
+
+    Fast callables are run in loops of at least ``min_time`` seconds per
+    sample. Sampling stops after ``repeat`` samples or once ``budget``
+    seconds have been spent, whichever comes first.
+    """
+    start = time.perf_counter()
+    func()
+    first = time.perf_counter() - start
+    number = 1
+    if first < min_time:
+        # The first call was a warm-up; loop enough calls to fill min_time
+        number = max(1, int(min_time / max(first, 1e-7)))
+        samples = []
+    else:
+        samples = [first * 1000]
+
+    spent = first
+    while len(samples) < repeat and (not samples or spent < budget):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        samples.append(elapsed / number * 1000)
+        spent += elapsed
+    return samples
+
+
+def run(args):
+    """Run the selected cases and return ``{name: median ms}``."""
+    pattern = re.compile(args.filter) if args.filter else None
+    results = {}
+    temp_dir = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    try:
+        os.chdir(temp_dir)
+        cases = list(adam_x_cases(temp_dir))
+        for rows in args.rows:
+            cases.extend(cluster_cases(temp_dir, rows, args.dim, args.seed))
+
+        for name, setup in cases:
+            if pattern and not pattern.search(name):
+                continue
+            if args.list:
+                print(name)
+                continue
+            try:
+                with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                    samples = measure(setup(), args.repeat, args.min_time, args.budget)
+            except ImportError as e:
+                print(f"{name:<36} skipped ({e})", flush=True)
+                continue
+            results[name] = statistics.median(samples)
+            print(f"{name:<36} {results[name]:>12.3f} ms  ({len(samples)} samples)", flush=True)
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(temp_dir)
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Print results next to the baseline; return the names of regressed cases."""
+    regressions = []
+    print(f"\n{'case':<36} {'median ms':>12} {'baseline':>12} {'change':>8}")
+    for name, median in results.items():
+        base = baseline.get(name)
+        line = f"{name:<36} {median:>12.3f}"
+        if base is not None:
+            line += f" {base:>12.3f} {(median - base) / base:>+8.0%}" if base else f" {base:>12.3f}"
+            if median > base * (1 + tolerance):
+                line += "  REGRESSION"
+                regressions.append(name)
+        print(line)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark Adam-X and the prompt-analyzer stages")
+    parser.add_argument("--rows", default="1000,10000,100000",
+                        help="Comma-separated row counts of the embedding matrices")
+    parser.add_argument("--dim", type=int, default=64, help="Embedding dimensions")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5, help="Samples per case")
+    parser.add_argument("--min-time", type=float, default=0.2,
+                        help="Minimum seconds per sample of a fast case")
+    parser.add_argument("--budget", type=float, default=30.0,
+                        help="Stop sampling a slow case after this many seconds")
+    parser.add_argument("--filter", metavar="REGEX", help="Only run cases whose name matches")
+    parser.add_argument("--list", action="store_true", help="List the cases and exit")
+    parser.add_argument("--results", metavar="FILE",
+                        help="Compare saved results from FILE instead of running the suite")
+    parser.add_argument("--save", metavar="FILE", help="Write the medians to FILE")
+    parser.add_argument("--compare", metavar="FILE", help="Compare the medians with FILE")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed slowdown relative to the baseline (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+    args.rows = [int(rows) for rows in args.rows.split(",") if rows]
+
+    if args.results:
+        with open(args.results) as f:
+            results = json.load(f)
+    else:
+        results = run(args)
+        if args.list:
+            return 0
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    regressions = compare(results, baseline, args.tolerance)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -12,16 +12,47 @@ setup(
     author="Adam-X Team",
     author_email="info@adam-x.com",
     url="https://github.com/adam/adam-x",
-    py_modules=["adam_x"],
+    py_modules=[
+        "adam_x",
+        "adam_x_analyzer",
+        "adam_x_backend",
+        "adam_x_batch",
+        "adam_x_cache",
+        "adam_x_client",
+        "adam_x_commands",
+        "adam_x_complete",
+        "adam_x_context",
+        "adam_x_daemon",
+        "adam_x_history",
+        "adam_x_index",
+        "adam_x_jobs",
+        "adam_x_profile",
+        "adam_x_refs",
+        "adam_x_replay",
+        "adam_x_scaffold",
+        "adam_x_search",
+        "adam_x_snippets",
+        "adam_x_standin",
+        "adam_x_stats",
+        "adam_x_store",
+        "adam_x_sweep",
+        "adam_x_trace",
+        "adam_x_watch",
+    ],
     entry_points={
         "console_scripts": [
             "adam-x-py=adam_x:main",
+            "adam-x-client=adam_x_client:main",
+            "adam-x-replay=adam_x_replay:main",
         ],
     },
     install_requires=[
         "readline;platform_system!='Windows'",
         "pyreadline3;platform_system=='Windows'",
     ],
+    extras_require={
+        "yaml": ["pyyaml"],
+    },
     classifiers=[
         "Development Status :: 4 - Beta",
         "Environment :: Console",
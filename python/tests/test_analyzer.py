@@ -0,0 +1,155 @@
+"""
+Tests for the Adam-X Python performance analyzer
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from io import StringIO
+from unittest.mock import patch
+
+# Add the parent directory to the path so we can import the adam_x module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from adam_x import AdamX
+from adam_x_analyzer import Analyzer
+
+FACTORIAL = "def factorial(n):\n    if n == 0:\n        return 1\n    else:\n        return n * factorial(n-1)"
+
+
+class TestAnalyzer(unittest.TestCase):
+    """Test cases for Analyzer"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.analyzer = Analyzer()
+
+    def _kinds(self, source):
+        return [(finding.line, finding.kind) for finding in self.analyzer.analyze(source)]
+
+    def test_membership_in_loop(self):
+        """Test that `in list` inside a loop is flagged, `in set` is not"""
+        source = ("def keep(items):\n    wanted = ['a', 'b']\n    out = []\n    for item in items:\n"
+                  "        if item in wanted:\n            out.append(item)\n")
+        self.assertEqual(self._kinds(source), [(5, "membership-in-loop")])
+        self.assertEqual(self._kinds(source.replace("wanted = ['a', 'b']", "wanted = {'a', 'b'}")), [])
+        # Not when the loop changes the list: a set built before it would go stale
+        for change in ("wanted.append(item)", "wanted[0] = item", "wanted += [item]",
+                       "del wanted[0]", "wanted = []", "for x in y: wanted.remove(x)"):
+            self.assertEqual(self._kinds(source + f"        {change}\n"), [], change)
+        dedupe = ("def dedupe(items):\n    seen = []\n    for item in items:\n"
+                  "        if item not in seen:\n            seen.append(item)\n")
+        self.assertEqual(self._kinds(dedupe), [])
+        self.assertEqual(self._kinds("def f(a, b):\n    return [x for x in a if x in b]\n"), [])
+        self.assertEqual(self._kinds("b = list(range(9))\nc = [x for x in a if x in b]\n"),
+                         [(2, "membership-in-loop")])
+
+    def test_string_concatenation_in_loop(self):
+        """Test that building a string with += in a loop is flagged once"""
+        source = "out = ''\nfor row in rows:\n    out += row\n    out = out + ','\n"
+        self.assertEqual(self._kinds(source), [(3, "string-concat-in-loop")])
+        self.assertEqual(self._kinds("total = 0\nfor n in nums:\n    total += n\n"), [])
+
+    def test_repeated_attribute_lookups(self):
+        """Test that attribute chains looked up repeatedly in a loop are flagged"""
+        source = ("def f(self, rows):\n    for r in rows:\n"
+                  "        self.out.append(r * self.scale.x + self.scale.x - self.scale.x)\n")
+        findings = self.analyzer.analyze(source)
+        self.assertEqual([(f.line, f.kind) for f in findings], [(2, "attribute-lookup-in-loop")])
+        self.assertIn("`self.scale.x` (3x)", findings[0].message)
+        self.assertIn("x = self.scale.x", findings[0].suggestion)
+        # Not when the loop changes the attribute
+        self.assertEqual(self._kinds("for r in rows:\n    a.n = a.n + a.n + a.n\n"), [])
+
+    def test_pop_front(self):
+        """Test that list.pop(0) and insert(0, x) are flagged"""
+        source = "while queue:\n    job = queue.pop(0)\n    done.insert(0, job)\n    queue.pop()\n"
+        findings = self.analyzer.analyze(source)
+        self.assertEqual([(f.line, f.kind) for f in findings],
+                         [(2, "list-pop-front"), (3, "list-insert-front")])
+        self.assertIn("queue.popleft()", findings[0].suggestion)
+
+    def test_recursion(self):
+        """Test that linear and exponential recursion are flagged"""
+        findings = self.analyzer.analyze(FACTORIAL)
+        self.assertEqual([(f.line, f.kind) for f in findings], [(1, "unbounded-recursion")])
+        self.assertIn("math.factorial", findings[0].suggestion)
+        fib = "def fib(n):\n    return n if n < 2 else fib(n - 1) + fib(n - 2)\n"
+        self.assertEqual(self._kinds(fib), [(1, "exponential-recursion")])
+        self.assertEqual(self._kinds("@functools.lru_cache(None)\n" + fib), [(2, "unbounded-recursion")])
+        self.assertEqual(self._kinds("def walk(node):\n    for c in node.children:\n"
+                                     "        walk(c)\n"), [])
+
+    def test_numpy_loops(self):
+        """Test that element-wise loops over NumPy arrays get a vectorized rewrite"""
+        source = ("import numpy as np\n\ndef f(a, b):\n    out = np.empty_like(a)\n    total = 0\n"
+                  "    for i in range(len(a)):\n        out[i] = a[i] * 2 + b[i]\n"
+                  "    for i in range(len(a)):\n        total += a[i] * b[i]\n"
+                  "    for i in range(1, len(a)):\n        out[i] = out[i - 1] + a[i]\n"
+                  "    return out, total\n")
+        findings = self.analyzer.analyze(source)
+        self.assertEqual([(f.line, f.kind) for f in findings],
+                         [(6, "numpy-loop"), (8, "numpy-loop"), (10, "numpy-loop")])
+        if hasattr(__import__("ast"), "unparse"):
+            self.assertIn("`out[:] = a * 2 + b`", findings[0].suggestion)
+            self.assertIn("`total += np.sum(a * b)`", findings[1].suggestion)
+        self.assertIn("np.cumsum", findings[2].suggestion)
+        # Without NumPy, index loops are left alone
+        self.assertEqual(self._kinds("for i in range(len(a)):\n    out[i] = a[i] * 2\n"), [])
+
+    def test_cache_by_source_hash(self):
+        """Test that analyzing the same source again does not re-parse it"""
+        self.analyzer.analyze(FACTORIAL)
+        self.analyzer.analyze(FACTORIAL)
+        self.assertEqual((self.analyzer.parses, self.analyzer.hits), (1, 1))
+
+    def test_invalid_source(self):
+        """Test that non-Python input is not analyzed"""
+        self.assertIsNone(self.analyzer.report("function f() { return 1; }"))
+        self.assertEqual(self.analyzer.report("x = 1"), "No performance anti-patterns found.")
+
+
+class TestAdamXOptimize(unittest.TestCase):
+    """Test cases for optimize with the analyzer"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.test_dir = tempfile.mkdtemp()
+        self.config_path = os.path.join(self.test_dir, "config.json")
+
+    def tearDown(self):
+        """Tear down test fixtures"""
+        shutil.rmtree(self.test_dir)
+
+    def test_optimize_reports_findings(self):
+        """Test that optimize shows line numbers and rewrites for Python code"""
+        adam_x = AdamX(self.config_path, show_welcome=False)
+        with patch('sys.stdout', new_callable=StringIO) as mock_stdout:
+            adam_x.optimize_code(FACTORIAL)
+        output = mock_stdout.getvalue()
+        self.assertIn("Found 1 potential performance issue:", output)
+        self.assertIn("1. Line 1: `factorial` recurses", output)
+        self.assertIn("Suggested rewrite: Use `math.factorial(n)`", output)
+
+    def test_optimize_still_asks_the_backend(self):
+        """Test that Python code reaches the backend with the findings as context"""
+        adam_x = AdamX(self.config_path, show_welcome=False)
+        stream = adam_x.backend.stream
+        with patch.object(adam_x.backend, "stream", side_effect=stream) as mock_stream:
+            result = adam_x._simulate_ai_response("optimize", FACTORIAL)
+        context = mock_stream.call_args[0][3]
+        self.assertIn("Static analysis:\nFound 1 potential performance issue:", context)
+        self.assertTrue(result.startswith("1. Consider using list comprehension"))
+        self.assertIn("\n\nFound 1 potential performance issue:", result)
+
+    def test_optimize_falls_back_to_backend(self):
+        """Test that code that is not Python still goes to the backend"""
+        adam_x = AdamX(self.config_path, show_welcome=False)
+        result = adam_x._simulate_ai_response("optimize", "function f() { return 1; }")
+        self.assertIn("list comprehension", result)
+
+
+if __name__ == '__main__':
+    unittest.main()
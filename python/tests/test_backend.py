@@ -0,0 +1,126 @@
+"""
+Tests for the Adam-X model backends
+"""
+
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from io import StringIO
+from unittest.mock import patch
+
+# Add the parent directory to the path so we can import the adam_x module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from adam_x import AdamX
+from adam_x_backend import (
+    BackendError,
+    HTTPBackend,
+    SimulatedBackend,
+    create_backend,
+    split_tokens,
+)
+from adam_x_standin import StandInServer
+
+
+class TestBackends(unittest.TestCase):
+    """Test cases for the streaming backends"""
+
+    def test_split_tokens_round_trip(self):
+        """Test that tokens keep their whitespace"""
+        text = "def f():\n    return 1  \n"
+        tokens = list(split_tokens(text))
+        self.assertEqual("".join(tokens), text)
+        self.assertEqual(tokens[0], "def ")
+
+    def test_simulated_backend_streams_tokens(self):
+        """Test that the simulated backend yields more than one chunk"""
+        backend = SimulatedBackend()
+
+        async def collect():
+            return [chunk async for chunk in backend.stream("debug", "x = 1")]
+
+        chunks = asyncio.run(collect())
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual("".join(chunks), backend.respond("debug", "x = 1"))
+
+    def test_http_backend_against_stand_in_server(self):
+        """Test the HTTP client against the local stand-in server"""
+        with StandInServer() as server:
+            backend = HTTPBackend(server.url, model="stand-in")
+            text = asyncio.run(backend.complete("explain", "print(1)", "python"))
+            self.assertEqual(text, SimulatedBackend().respond("explain", "print(1)"))
+            self.assertEqual(server.requests[0]["action"], "explain")
+            self.assertEqual(server.requests[0]["model"], "stand-in")
+
+    def test_http_backend_connection_refused(self):
+        """Test that an unreachable backend raises"""
+        with StandInServer() as server:
+            url = server.url
+        backend = HTTPBackend(url, timeout=1.0)
+        with self.assertRaises((OSError, BackendError)):
+            asyncio.run(backend.complete("explain", "x"))
+
+    def _serve_raw(self, response):
+        """Run ``complete`` against a server that sends ``response`` verbatim."""
+        async def main():
+            async def handle(reader, writer):
+                await reader.readuntil(b"\r\n\r\n")
+                writer.write(response)
+                await writer.drain()
+                writer.close()
+
+            server = await asyncio.start_server(handle, "127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            try:
+                return await HTTPBackend(f"http://127.0.0.1:{port}/", timeout=5.0).complete("x", "y")
+            finally:
+                server.close()
+
+        return asyncio.run(main())
+
+    def test_http_backend_chunk_boundaries(self):
+        """Test that characters split across chunks decode and bad framing raises BackendError"""
+        head = b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n"
+        text = "caf\u00e9 \u2192 ok"
+        data = text.encode("utf-8")
+        split = data.index(b"\xa9")
+        body = b"".join(b"%x\r\n%s\r\n" % (len(part), part)
+                        for part in (data[:split], data[split:])) + b"0\r\n\r\n"
+        self.assertEqual(self._serve_raw(head + body), text)
+
+        with self.assertRaises(BackendError):
+            self._serve_raw(head + b"zz\r\nab\r\n0\r\n\r\n")
+        with self.assertRaises(BackendError):
+            self._serve_raw(head + b"2\r\n\xff\xfe\r\n0\r\n\r\n")
+        with self.assertRaises(BackendError):
+            self._serve_raw(head + b"10\r\nshort")
+
+    def test_create_backend(self):
+        """Test backend construction from config"""
+        self.assertIsInstance(create_backend(None), SimulatedBackend)
+        backend = create_backend({"type": "http", "url": "http://localhost:9/x"})
+        self.assertIsInstance(backend, HTTPBackend)
+        with self.assertRaises(BackendError):
+            create_backend({"type": "http"})
+        with self.assertRaises(BackendError):
+            create_backend({"type": "carrier-pigeon"})
+
+    def test_adam_x_streams_to_stdout(self):
+        """Test that AdamX prints the streamed response"""
+        test_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, test_dir)
+        adam_x = AdamX(os.path.join(test_dir, "config.json"), show_welcome=False)
+        with StandInServer() as server:
+            adam_x.backend = HTTPBackend(server.url)
+            with patch('sys.stdout', new_callable=StringIO) as mock_stdout:
+                adam_x.debug_code("x = 1")
+                output = mock_stdout.getvalue()
+        self.assertIn("Debugging Results:", output)
+        self.assertIn("I found a few potential issues:", output)
+
+
+if __name__ == '__main__':
+    unittest.main()
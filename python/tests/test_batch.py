@@ -0,0 +1,138 @@
+"""
+Tests for the Adam-X batch mode
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from io import StringIO
+from unittest.mock import patch
+
+# Add the parent directory to the path so we can import the adam_x module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from adam_x import AdamX, AdamXEngine
+from adam_x_batch import iter_commands, run_batch, run_batch_file
+
+
+class TestBatchMode(unittest.TestCase):
+    """Test cases for --batch processing"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.test_dir = tempfile.mkdtemp()
+        self.engine = AdamXEngine(os.path.join(self.test_dir, "config.json"))
+
+    def tearDown(self):
+        """Tear down test fixtures"""
+        shutil.rmtree(self.test_dir)
+
+    def _run(self, commands, workers=4):
+        out = StringIO()
+        failures = run_batch(self.engine, commands, out, workers=workers)
+        return failures, [json.loads(line) for line in out.getvalue().splitlines()]
+
+    def test_iter_commands(self):
+        """Test that blank lines and comments are skipped"""
+        lines = ["explain x\n", "\n", "# comment\n", "  debug y  \n"]
+        self.assertEqual(list(iter_commands(lines)), ["explain x", "debug y"])
+
+    def test_records_follow_input_order(self):
+        """Test ordering and record fields"""
+        commands = [f"explain x = {i}" for i in range(30)] + ["explain x = 0", "help"]
+        failures, records = self._run(commands)
+        self.assertEqual(failures, 0)
+        self.assertEqual([r["command"] for r in records], commands)
+        self.assertEqual(records[0]["cache"], "miss")
+        self.assertEqual(records[30]["cache"], "hit")
+        self.assertEqual(records[31]["cache"], "bypass")
+        self.assertIn("Adam-X Commands:", records[31]["result"])
+        self.assertTrue(all(r["latency_ms"] >= 0 for r in records))
+
+    def test_commands_run_concurrently(self):
+        """Test that slow requests overlap on the worker pool"""
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        def slow(adam_x, action, text):
+            with lock:
+                active.append(1)
+                peak.append(len(active))
+            time.sleep(0.05)
+            with lock:
+                active.pop()
+            return text
+
+        with patch.object(AdamX, '_simulate_ai_response', slow):
+            failures, records = self._run([f"debug {i}" for i in range(8)], workers=4)
+        self.assertEqual(failures, 0)
+        self.assertEqual([r["result"] for r in records], [str(i) for i in range(8)])
+        self.assertGreater(max(peak), 1)
+
+    def test_errors_are_reported_per_command(self):
+        """Test that a failing command does not stop the batch"""
+        def flaky(adam_x, action, text):
+            if text == "bad":
+                raise RuntimeError("backend down")
+            return text
+
+        with patch.object(AdamX, '_simulate_ai_response', flaky):
+            failures, records = self._run(["debug ok", "debug bad", "debug fine"])
+        self.assertEqual(failures, 1)
+        self.assertEqual(records[1], {"command": "debug bad", "error": "backend down"})
+        self.assertEqual(records[2]["result"], "fine")
+
+    def test_interactive_commands_do_not_prompt(self):
+        """Test that a command needing an answer fails instead of reading stdin"""
+        with patch('builtins.input', side_effect=AssertionError("prompted")):
+            failures, records = self._run(["project newproj", "help"])
+        self.assertEqual(failures, 1)
+        self.assertIn("Enter path for new project 'newproj'", records[0]["error"])
+        self.assertIn("Adam-X Commands:", records[1]["result"])
+        self.assertNotIn("newproj", self.engine.adam_x.config.get("projects", {}))
+
+    def test_output_stays_with_its_command(self):
+        """Test that prints from concurrent commands are not captured by a local one"""
+        started = threading.Event()
+
+        def slow_projects(adam_x):
+            print("projects output")
+            started.set()
+            time.sleep(0.1)
+
+        def noisy(adam_x, action, text):
+            started.wait(5)
+            print(f"backend noise {text}")
+            return text
+
+        with patch.object(AdamX, 'list_projects', slow_projects), \
+                patch.object(AdamX, '_simulate_ai_response', noisy), \
+                patch('sys.stdout', new_callable=StringIO) as mock_stdout:
+            failures, records = self._run(["projects"] + [f"debug {i}" for i in range(4)])
+            self.assertIs(sys.stdout, mock_stdout)
+        self.assertEqual(failures, 0)
+        self.assertEqual(records[0]["result"], "projects output\n")
+        self.assertEqual(mock_stdout.getvalue().count("backend noise"), 4)
+
+    def test_run_batch_file(self):
+        """Test reading commands from a file"""
+        path = os.path.join(self.test_dir, "commands.txt")
+        with open(path, 'w') as f:
+            f.write("optimize x\ndebug y\n")
+        out = StringIO()
+        self.assertEqual(run_batch_file(self.engine, path, out=out), 0)
+        self.assertEqual(len(out.getvalue().splitlines()), 2)
+
+        with patch('sys.stderr', new_callable=StringIO):
+            missing = os.path.join(self.test_dir, "missing.txt")
+            self.assertEqual(run_batch_file(self.engine, missing, out=out), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
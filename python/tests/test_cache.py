@@ -0,0 +1,123 @@
+"""
+Tests for the Adam-X response cache
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from io import StringIO
+from unittest.mock import patch
+
+# Add the parent directory to the path so we can import the adam_x module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from adam_x import AdamX
+from adam_x_cache import ResponseCache, make_key, normalize_input
+
+
+class TestResponseCache(unittest.TestCase):
+    """Test cases for the two-tier response cache"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Tear down test fixtures"""
+        shutil.rmtree(self.test_dir)
+
+    def test_normalized_keys(self):
+        """Test that whitespace-only differences share a key"""
+        self.assertEqual(normalize_input("x = 1  \r\ny = 2\n\n"), "x = 1\ny = 2")
+        self.assertEqual(
+            make_key("explain", "x = 1\n", "python", "simulated"),
+            make_key("explain", "x = 1", "python", "simulated"),
+        )
+        self.assertNotEqual(
+            make_key("explain", "x = 1", "python", "simulated"),
+            make_key("debug", "x = 1", "python", "simulated"),
+        )
+        self.assertNotEqual(
+            make_key("explain", "x = 1", "python", "simulated"),
+            make_key("explain", "x = 1", "python", "http:default"),
+        )
+
+    def test_memory_lru_eviction(self):
+        """Test that the memory tier drops the least recently used entry"""
+        cache = ResponseCache(memory_entries=2)
+        cache.put("a", "1")
+        cache.put("b", "2")
+        self.assertEqual(cache.get("a"), "1")
+        cache.put("c", "3")
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), "1")
+        self.assertEqual(cache.get("c"), "3")
+
+        stats = cache.stats()
+        self.assertEqual(stats["memory_hits"], 3)
+        self.assertEqual(stats["misses"], 1)
+
+    def test_disk_tier_persists(self):
+        """Test that a new cache instance reads entries from disk"""
+        ResponseCache(self.test_dir).put("key", "value")
+        cache = ResponseCache(self.test_dir)
+        self.assertEqual(cache.get("key"), "value")
+        self.assertEqual(cache.stats()["disk_hits"], 1)
+        self.assertEqual(cache.get("key"), "value")
+        self.assertEqual(cache.stats()["memory_hits"], 1)
+
+    def test_ttl_expiry(self):
+        """Test that expired entries are treated as misses"""
+        ResponseCache(self.test_dir).put("key", "value")
+        cache = ResponseCache(self.test_dir, ttl=60)
+        with patch('adam_x_cache.time.time', return_value=time.time() + 120):
+            self.assertIsNone(cache.get("key"))
+        self.assertEqual(cache.stats()["disk_entries"], 0)
+
+    def test_malformed_disk_entries_are_misses(self):
+        """Test that valid JSON without the expected fields counts as a miss"""
+        writer = ResponseCache(self.test_dir)
+        entries = ['{"value": "x"}', '{"created": 1}', '[1, 2]', '"value"',
+                   '{"created": "yesterday", "value": "x"}']
+        for i, text in enumerate(entries):
+            writer.put(f"key{i}", "value")
+            with open(writer._path(f"key{i}"), 'w') as f:
+                f.write(text)
+        cache = ResponseCache(self.test_dir)
+        for i, text in enumerate(entries):
+            self.assertIsNone(cache.get(f"key{i}"), text)
+        self.assertEqual(cache.stats()["disk_entries"], 0)
+
+    def test_disk_size_eviction(self):
+        """Test that the disk tier stays within its byte budget"""
+        cache = ResponseCache(self.test_dir, memory_entries=1, max_disk_bytes=2000)
+        for i in range(50):
+            cache.put(f"key{i:02d}", "x" * 100)
+        self.assertLessEqual(cache.stats()["disk_bytes"], 2000)
+        self.assertIsNone(ResponseCache(self.test_dir).get("key00"))
+        self.assertEqual(ResponseCache(self.test_dir).get("key49"), "x" * 100)
+
+    def test_adam_x_uses_cache(self):
+        """Test that repeated AdamX requests only reach the backend once"""
+        adam_x = AdamX(os.path.join(self.test_dir, "config.json"), show_welcome=False)
+        with patch.object(adam_x.backend, 'respond', wraps=adam_x.backend.respond) as respond:
+            first = adam_x._simulate_ai_response("explain", "x = 1")
+            second = adam_x._simulate_ai_response("explain", "x = 1\n")
+            with patch('sys.stdout', new_callable=StringIO):
+                adam_x.explain_code("x = 1")
+        self.assertEqual(first, second)
+        self.assertEqual(respond.call_count, 1)
+        self.assertEqual(adam_x.cache.stats()["memory_hits"], 2)
+
+    def test_search_is_not_cached(self):
+        """Test that search requests bypass the cache"""
+        adam_x = AdamX(os.path.join(self.test_dir, "config.json"), show_welcome=False)
+        adam_x._simulate_ai_response("search", "asyncio")
+        self.assertEqual(adam_x.cache.stats()["misses"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
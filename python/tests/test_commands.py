@@ -0,0 +1,130 @@
+"""
+Tests for the Adam-X command registry
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from io import StringIO
+from unittest.mock import MagicMock, patch
+
+# Add the parent directory to the path so we can import the adam_x module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from adam_x import AdamX, AdamXEngine
+from adam_x_commands import (
+    COMMANDS,
+    NO_ARGUMENT,
+    OPTIONAL_ARGUMENT,
+    REQUIRED_ARGUMENT,
+    Command,
+    CommandRegistry,
+)
+
+
+class TestCommandRegistry(unittest.TestCase):
+    """Test cases for CommandRegistry"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.registry = CommandRegistry(plugin_group=None)
+        self.registry.register(Command("help", "show_help", args=NO_ARGUMENT))
+        self.registry.register(Command("create", "create_file"))
+        self.registry.register(Command("cache", "cache_command", args=OPTIONAL_ARGUMENT))
+
+    def test_resolve(self):
+        """Test splitting command lines"""
+        command, argument = self.registry.resolve("CREATE  app.py ")
+        self.assertEqual((command.name, argument), ("create", "app.py"))
+        command, argument = self.registry.resolve("cache")
+        self.assertEqual((command.name, argument), ("cache", ""))
+
+    def test_argument_modes_fall_back_to_generation(self):
+        """Test that commands with the wrong arguments become generation requests"""
+        self.assertEqual(self.registry.resolve("help me write a parser"),
+                         (None, "help me write a parser"))
+        self.assertEqual(self.registry.resolve("create"), (None, "create"))
+        self.assertEqual(self.registry.resolve("write a parser"), (None, "write a parser"))
+
+    def test_decorator_registration(self):
+        """Test registering a function handler"""
+        @self.registry.command("shout", args=REQUIRED_ARGUMENT)
+        def shout(adam_x, argument):
+            return argument.upper()
+
+        command, argument = self.registry.resolve("shout hi")
+        self.assertEqual(command.run(None, argument), "HI")
+
+    def test_plugins_are_loaded_lazily(self):
+        """Test that plugin entry points are only read and imported on demand"""
+        handler = MagicMock()
+        entry_point = MagicMock()
+        entry_point.name = "lint"
+        entry_point.load.return_value = handler
+        installed = MagicMock()
+        installed.select.return_value = [entry_point]
+        registry = CommandRegistry()
+
+        with patch('importlib.metadata.entry_points', return_value=installed) as eps:
+            registry.register(Command("help", "show_help", args=NO_ARGUMENT))
+            registry.resolve("help")
+            eps.assert_not_called()
+
+            command, argument = registry.resolve("lint src/")
+            eps.assert_called_once()
+            entry_point.load.assert_called_once()
+            command.run("adam", argument)
+            handler.assert_called_once_with("adam", "src/")
+
+            registry.resolve("lint again")
+            registry.resolve("unknown words")
+            eps.assert_called_once()
+            entry_point.load.assert_called_once()
+
+
+class TestSharedDispatch(unittest.TestCase):
+    """Test that the REPL and the module API share one registry"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.test_dir = tempfile.mkdtemp()
+        self.config_path = os.path.join(self.test_dir, "config.json")
+        COMMANDS.register(Command("greet", lambda adam_x, name: print(f"Hello, {name}!"),
+                                  "greet <name>", "Say hello"))
+
+    def tearDown(self):
+        """Tear down test fixtures"""
+        COMMANDS._commands.pop("greet", None)
+        shutil.rmtree(self.test_dir)
+
+    def test_custom_command_in_both_paths(self):
+        """Test a registered command from the REPL and the engine"""
+        adam_x = AdamX(self.config_path, show_welcome=False)
+        with patch('sys.stdout', new_callable=StringIO) as mock_stdout:
+            adam_x.process_command("greet Ada")
+            adam_x.process_command("help")
+        self.assertIn("Hello, Ada!", mock_stdout.getvalue())
+        self.assertIn("greet <name>", mock_stdout.getvalue())
+
+        engine = AdamXEngine(self.config_path)
+        self.assertEqual(engine.process_command("greet Ada"), "Hello, Ada!\n")
+
+    def test_help_columns_line_up(self):
+        """Test that descriptions start in one column however long the usages are"""
+        adam_x = AdamX(self.config_path, show_welcome=False)
+        with patch('sys.stdout', new_callable=StringIO) as mock_stdout:
+            adam_x.show_help()
+        lines = [line for line in mock_stdout.getvalue().splitlines() if line.startswith("  ")]
+        self.assertGreater(len(lines), 10)
+        self.assertEqual(len({line.index(" - ") for line in lines}), 1)
+
+    def test_engine_handles_search(self):
+        """Test that the module API now answers search like the REPL"""
+        engine = AdamXEngine(self.config_path)
+        self.assertIn("documentation pages", engine.process_command("search asyncio"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,152 @@
+"""
+Tests for Adam-X tab completion
+"""
+
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from io import StringIO
+from unittest.mock import patch
+
+# Add the parent directory to the path so we can import the adam_x module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from adam_x import AdamX
+from adam_x_complete import Completer, Trie
+from adam_x_store import ConfigStore
+
+
+class TestTrie(unittest.TestCase):
+    """Test cases for Trie"""
+
+    def test_matches_sorted_prefix_scan(self):
+        """Test adds, removals and completion against a plain sorted list"""
+        rng = random.Random(7)
+        words = set()
+        trie = Trie()
+        for _ in range(2000):
+            word = "".join(rng.choice("ab/c") for _ in range(rng.randint(1, 6)))
+            if rng.random() < 0.6:
+                self.assertEqual(trie.add(word), word not in words)
+                words.add(word)
+            else:
+                self.assertEqual(trie.discard(word), word in words)
+                words.discard(word)
+            prefix = word[:rng.randint(0, len(word))]
+            self.assertEqual(trie.complete(prefix),
+                             sorted(w for w in words if w.startswith(prefix)))
+        self.assertEqual(len(trie), len(words))
+        for word in words:
+            self.assertIn(word, trie)
+
+    def test_stop(self):
+        """Test completing paths one directory at a time"""
+        trie = Trie(["src/app.py", "src/lib/util.py", "setup.py", "README.md"])
+        self.assertEqual(trie.complete("s", stop="/"), ["setup.py", "src/"])
+        self.assertEqual(trie.complete("src/", stop="/"), ["src/app.py", "src/lib/"])
+        self.assertEqual(trie.complete("src/l", stop="/"), ["src/lib/"])
+        self.assertEqual(trie.complete("x", stop="/"), [])
+
+    def test_limit_and_speed(self):
+        """Test that completion cost does not grow with the number of words"""
+        trie = Trie(f"snippet-{i:06d}" for i in range(200000))
+        start = time.perf_counter()
+        for i in range(100):
+            matches = trie.complete(f"snippet-{i:03d}", limit=50)
+        elapsed = (time.perf_counter() - start) / 100
+        self.assertEqual(matches, [f"snippet-099{i:03d}" for i in range(50)])
+        self.assertLess(elapsed, 0.005)
+
+
+class TestCompleter(unittest.TestCase):
+    """Test cases for completing REPL input"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.test_dir = tempfile.mkdtemp()
+        self.config_path = os.path.join(self.test_dir, "config.json")
+        self.project = os.path.join(self.test_dir, "demo")
+        os.makedirs(os.path.join(self.project, "src"))
+        for path in ("src/server.py", "src/client.py", "setup.py"):
+            with open(os.path.join(self.project, path), 'w') as f:
+                f.write("x = 1\n")
+        ConfigStore(self.config_path).replace({
+            "projects": {"demo": self.project, "docs": self.test_dir}, "last_project": None,
+            "preferences": {"preferred_language": "python"},
+        })
+        self.adam_x = AdamX(self.config_path, show_welcome=False)
+        self.completer = self.adam_x.completer = Completer(self.adam_x)
+
+    def tearDown(self):
+        """Tear down test fixtures"""
+        self.adam_x.stop_watching()
+        shutil.rmtree(self.test_dir)
+
+    def test_commands_and_subcommands(self):
+        """Test completing command words and fixed arguments"""
+        self.assertEqual(self.completer.candidates("sn"), ["snippet", "snippets"])
+        self.assertEqual(self.completer.candidates("E"), ["exit", "explain"])
+        self.assertEqual(self.completer.candidates("cache c"), ["clear"])
+        self.assertEqual(self.completer.candidates("stats "), ["export", "reset"])
+        self.assertEqual(self.completer.candidates("explain x = "), [])
+
+    def test_snippets_and_projects(self):
+        """Test that the tries follow new snippets and projects"""
+        self.adam_x.snippets.put("sort-list", "sorted(x)")
+        self.assertEqual(self.completer.candidates("use so"), ["sort-list"])
+        self.assertEqual(self.completer.candidates("project d"), ["demo", "docs"])
+
+        with patch('sys.stdout', new_callable=StringIO), \
+                patch('builtins.input', return_value=os.path.join(self.test_dir, "dev")):
+            self.adam_x.save_snippet("sort-dict", "sorted(d.items())")
+            self.adam_x.switch_project("dev")
+        self.assertEqual(self.completer.candidates("use sort-"), ["sort-dict", "sort-list"])
+        self.assertEqual(self.completer.candidates("project de"), ["demo", "dev"])
+
+    def test_files(self):
+        """Test completing project paths and @file references"""
+        self.assertEqual(self.completer.candidates("find s"), [])
+        with patch('sys.stdout', new_callable=StringIO):
+            self.adam_x.switch_project("demo")
+            self.adam_x._ready_index()
+        self.assertEqual(self.completer.candidates("find s"), ["setup.py", "src/"])
+        self.assertEqual(self.completer.candidates("explain @src/"),
+                         ["@src/client.py", "@src/server.py"])
+        self.assertEqual(self.completer.candidates("profile --memory src/s"), ["src/server.py"])
+
+        os.remove(os.path.join(self.project, "src", "client.py"))
+        with open(os.path.join(self.project, "src", "cache.py"), 'w') as f:
+            f.write("y = 2\n")
+        self.adam_x._apply_changes("demo", ["src"])
+        self.assertEqual(self.completer.candidates("create src/c"), ["src/cache.py"])
+
+    def test_readline_completer(self):
+        """Test the readline callback"""
+        class FakeReadline:
+            def set_completer(self, func):
+                self.func = func
+
+            def set_completer_delims(self, delims):
+                pass
+
+            def parse_and_bind(self, binding):
+                pass
+
+            def get_line_buffer(self):
+                return "cancel a"
+
+            def get_endidx(self):
+                return 8
+
+        readline = FakeReadline()
+        self.completer.install(readline)
+        self.assertEqual(readline.func("a", 0), "all")
+        self.assertIsNone(readline.func("a", 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,170 @@
+"""
+Tests for the Adam-X request context builder
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from io import StringIO
+from unittest.mock import patch
+
+# Add the parent directory to the path so we can import the adam_x module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from adam_x import AdamX, LANGUAGES
+from adam_x_backend import HTTPBackend
+from adam_x_cache import make_key
+from adam_x_context import ContextBuilder, estimate_tokens, find_imports
+from adam_x_index import ProjectIndex
+from adam_x_search import SearchIndex
+from adam_x_standin import StandInServer
+from adam_x_store import ConfigStore
+
+
+class TestContextBuilder(unittest.TestCase):
+    """Test cases for ContextBuilder"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.test_dir = tempfile.mkdtemp()
+        self.root = os.path.join(self.test_dir, "project")
+        self._write("shop/cart.py", "from .pricing import apply_discount\n\n\n"
+                                    "class Cart:\n    def total(self):\n"
+                                    "        return apply_discount(self.items)\n\n\n"
+                                    "def empty_cart():\n    return Cart()\n")
+        self._write("shop/pricing.py", "def apply_discount(items):\n    return sum(items) * 0.9\n")
+        self._write("shop/__init__.py", "")
+        self._write("report.py", "def monthly_report():\n    return 'sales'\n")
+        self._write("notes.md", "# Notes\n\nThe cart total includes the discount.\n")
+        self.index = ProjectIndex(self.root, os.path.join(self.test_dir, "index.db"), LANGUAGES)
+        self.search = SearchIndex(self.root, os.path.join(self.test_dir, "search.db"))
+        self._refresh()
+        self.builder = ContextBuilder(self.index, self.search)
+
+    def tearDown(self):
+        """Tear down test fixtures"""
+        self.index.close()
+        self.search.close()
+        shutil.rmtree(self.test_dir)
+
+    def _write(self, path, text):
+        full = os.path.join(self.root, path)
+        os.makedirs(os.path.dirname(full), exist_ok=True)
+        with open(full, 'w') as f:
+            f.write(text)
+
+    def _refresh(self):
+        self.index.update()
+        self.search.update((path, digest) for path, digest, language in self.index.files()
+                           if self.search.wants(path, language))
+
+    def test_estimate_tokens(self):
+        """Test the token estimate for words and punctuation"""
+        self.assertEqual(estimate_tokens(""), 0)
+        self.assertEqual(estimate_tokens("x = f(y)"), 6)
+        self.assertEqual(estimate_tokens("configuration"), 4)
+
+    def test_find_imports(self):
+        """Test import extraction per language"""
+        self.assertEqual(find_imports("import os.path\nfrom .util import x\n", "python"),
+                         ["os.path", ".util"])
+        self.assertEqual(find_imports("import a from './a';\nconst b = require(\"b\");", "javascript"),
+                         ["./a", "b"])
+        self.assertEqual(find_imports('#include "util.h"\n#include <stdio.h>\n', "c"), ["util.h"])
+        self.assertEqual(find_imports("import os", None), [])
+
+    def test_rank_by_symbols_and_imports(self):
+        """Test that defining files rank first and their imports follow"""
+        ranked = [path for path, _, _ in self.builder.rank("why is Cart.total wrong?")]
+        self.assertEqual(ranked[0], "shop/cart.py")
+        self.assertIn("shop/pricing.py", ranked)
+        self.assertNotIn("report.py", ranked)
+
+    def test_chunks_follow_definitions(self):
+        """Test that a named symbol is sent as its definition, not the whole file"""
+        chunks = self.builder.build("fix empty_cart")
+        self.assertEqual((chunks[0].path, chunks[0].start, chunks[0].end), ("shop/cart.py", 9, 10))
+        self.assertIn("def empty_cart", self.builder.render("fix empty_cart"))
+
+    def test_budget_is_respected(self):
+        """Test that the packed context stays within the token and byte budget"""
+        self._write("big.py", "".join(f"def cart_helper_{i}(cart):\n    return cart + {i}\n"
+                                      for i in range(500)))
+        self._refresh()
+        builder = ContextBuilder(self.index, self.search, max_tokens=200, max_bytes=600)
+        chunks = builder.build("cart helper Cart")
+        self.assertTrue(chunks)
+        self.assertLessEqual(sum(chunk.tokens for chunk in chunks), 200)
+        self.assertLessEqual(sum(len(chunk.text.encode()) for chunk in chunks), 600)
+        self.assertEqual(builder.last_stats["chunks"], len(chunks))
+
+    def test_only_changed_files_are_measured(self):
+        """Test that token estimates are cached by content hash"""
+        self.builder.build("Cart apply_discount")
+        measured = self.builder.measured
+        self.assertGreater(measured, 0)
+        self.builder.build("Cart apply_discount")
+        self.assertEqual(self.builder.measured, measured)
+        self._write("shop/pricing.py", "def apply_discount(items):\n    return sum(items) * 0.8\n")
+        self._refresh()
+        self.builder.build("Cart apply_discount")
+        self.assertEqual(self.builder.measured, measured + 1)
+
+
+class TestAdamXContext(unittest.TestCase):
+    """Test cases for context sent with backend requests"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.test_dir = tempfile.mkdtemp()
+        self.config_path = os.path.join(self.test_dir, "config.json")
+        project = os.path.join(self.test_dir, "demo")
+        os.makedirs(project)
+        with open(os.path.join(project, "geometry.py"), 'w') as f:
+            f.write("def area(radius):\n    return 3.14 * radius ** 2\n")
+        ConfigStore(self.config_path).replace({
+            "projects": {"demo": project}, "last_project": "demo",
+            "preferences": {"preferred_language": "python"},
+            "watch": {"enabled": False},
+        })
+        self.adam_x = AdamX(self.config_path, show_welcome=False)
+        self.adam_x._update_index("demo")
+
+    def tearDown(self):
+        """Tear down test fixtures"""
+        self.adam_x.store.flush()
+        shutil.rmtree(self.test_dir)
+
+    def test_backend_receives_context(self):
+        """Test that the HTTP backend is sent the related project code"""
+        with StandInServer() as server:
+            self.adam_x.backend = HTTPBackend(server.url)
+            with patch('sys.stdout', new_callable=StringIO):
+                self.adam_x.explain_code("print(area(2))")
+            self.assertIn("### geometry.py:1-2", server.requests[0]["context"])
+            self.assertIn("def area(radius)", server.requests[0]["context"])
+
+    def test_context_can_be_disabled(self):
+        """Test that the context section of the config turns context off"""
+        self.adam_x.config["context"] = {"enabled": False}
+        self.assertEqual(self.adam_x._request_context("explain", "area(2)"), "")
+        self.assertIsNone(self.adam_x.context_builder())
+
+    def test_context_command(self):
+        """Test the context preview command"""
+        with patch('sys.stdout', new_callable=StringIO) as mock_stdout:
+            self.adam_x.process_command("context area")
+        self.assertIn("geometry.py:1-2", mock_stdout.getvalue())
+
+    def test_cache_key_includes_context(self):
+        """Test that a change in project context misses the response cache"""
+        self.assertEqual(make_key("explain", "x", "python", "m"),
+                         make_key("explain", "x", "python", "m", ""))
+        self.assertNotEqual(make_key("explain", "x", "python", "m", "a"),
+                            make_key("explain", "x", "python", "m", "b"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+"""
+Tests for the Adam-X daemon and thin client
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+from io import StringIO
+from unittest.mock import patch
+
+# Add the parent directory to the path so we can import the adam_x module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import adam_x_client
+from adam_x import AdamX, AdamXEngine
+from adam_x_daemon import AdamXDaemon
+
+
+class TestAdamXDaemon(unittest.TestCase):
+    """Test cases for the Unix socket daemon"""
+
+    def setUp(self):
+        """Start a daemon on a temporary socket"""
+        self.test_dir = tempfile.mkdtemp()
+        self.socket_path = os.path.join(self.test_dir, "daemon.sock")
+        self.engine = AdamXEngine(os.path.join(self.test_dir, "config.json"))
+        self.daemon = AdamXDaemon(self.engine, self.socket_path)
+        self.thread = threading.Thread(target=self.daemon.run, daemon=True)
+        self.thread.start()
+        self.assertTrue(self.daemon.ready.wait(5))
+
+    def tearDown(self):
+        """Stop the daemon"""
+        self.daemon.stop()
+        self.thread.join(5)
+        shutil.rmtree(self.test_dir)
+
+    def test_ping(self):
+        """Test that the client can reach the daemon"""
+        self.assertTrue(adam_x_client.ping(self.socket_path))
+        self.assertFalse(adam_x_client.ping(os.path.join(self.test_dir, "missing.sock")))
+
+    def test_command_streams_chunks(self):
+        """Test that backend responses arrive in several chunks"""
+        chunks = list(adam_x_client.stream_command("debug x = 1", self.socket_path))
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual("".join(chunks), self.engine.debug_code("x = 1"))
+
+    def test_warm_cache_survives_calls(self):
+        """Test that state is shared between client invocations"""
+        adam_x_client.send_command("explain x = 1", self.socket_path)
+        adam_x_client.send_command("explain x = 1", self.socket_path)
+        self.assertEqual(self.engine.adam_x.cache.stats()["memory_hits"], 1)
+
+    def test_help_output_is_forwarded(self):
+        """Test that printed output of local commands goes to the client"""
+        output = adam_x_client.send_command("help", self.socket_path)
+        self.assertIn("Adam-X Commands:", output)
+
+    def test_local_commands_do_not_block_others(self):
+        """Test that a slow local command leaves the daemon answering other clients"""
+        started, release = threading.Event(), threading.Event()
+
+        def slow(adam_x):
+            started.set()
+            release.wait(5)
+            print("done")
+
+        with patch.object(AdamX, 'list_projects', slow):
+            results = []
+            client = threading.Thread(target=lambda: results.append(
+                adam_x_client.send_command("projects", self.socket_path)))
+            client.start()
+            self.assertTrue(started.wait(5))
+            self.assertTrue(adam_x_client.ping(self.socket_path))
+            self.assertEqual(adam_x_client.send_command("debug x = 1", self.socket_path),
+                             self.engine.debug_code("x = 1"))
+            release.set()
+            client.join(5)
+        self.assertEqual(results, ["done\n"])
+
+    def test_client_main(self):
+        """Test the adam-x-client entry point"""
+        with patch('sys.stdout', new_callable=StringIO) as mock_stdout:
+            code = adam_x_client.main(["--socket", self.socket_path, "optimize", "x"])
+        self.assertEqual(code, 0)
+        self.assertIn("No performance anti-patterns found.", mock_stdout.getvalue())
+
+        with patch('sys.stderr', new_callable=StringIO):
+            missing = os.path.join(self.test_dir, "missing.sock")
+            self.assertEqual(adam_x_client.main(["--socket", missing, "help"]), 2)
+
+    def test_shutdown(self):
+        """Test that a shutdown request stops the daemon"""
+        adam_x_client.shutdown(self.socket_path)
+        self.thread.join(5)
+        self.assertFalse(self.thread.is_alive())
+        self.assertFalse(os.path.exists(self.socket_path))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+"""
+Tests for the shared Adam-X engine
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+# Add the parent directory to the path so we can import the adam_x module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import adam_x
+from adam_x import AdamX, AdamXEngine, get_engine, process_commands
+
+
+class TestAdamXEngine(unittest.TestCase):
+    """Test cases for AdamXEngine and the module-level API"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.test_dir = tempfile.mkdtemp()
+        self.config_path = os.path.join(self.test_dir, "config.json")
+
+    def tearDown(self):
+        """Tear down test fixtures"""
+        shutil.rmtree(self.test_dir)
+
+    def test_config_loaded_once(self):
+        """Test that repeated calls do not re-read an unchanged config"""
+        engine = AdamXEngine(self.config_path)
+        with patch.object(AdamX, '_load_config', wraps=engine.adam_x._load_config) as load:
+            for _ in range(20):
+                engine.explain_code("x = 1")
+            load.assert_not_called()
+
+    def test_config_reloaded_when_changed(self):
+        """Test that edits to the config file are picked up"""
+        engine = AdamXEngine(self.config_path)
+        backend = engine.adam_x.backend
+
+        with open(self.config_path) as f:
+            config = json.load(f)
+        config["preferences"]["preferred_language"] = "javascript"
+        config["user_name"] = "someone-else"
+        with open(self.config_path, 'w') as f:
+            json.dump(config, f)
+
+        result = engine.generate_code("a function")
+        self.assertIn("```javascript", result)
+        self.assertEqual(engine.adam_x.config["user_name"], "someone-else")
+        self.assertIs(engine.adam_x.backend, backend)
+
+    def test_process_commands_keeps_order(self):
+        """Test the batch entry point"""
+        engine = AdamXEngine(self.config_path)
+        results = engine.process_commands(["explain x", "debug y", "optimize z"])
+        self.assertEqual(len(results), 3)
+        self.assertTrue(results[0].startswith("processes data"))
+        self.assertTrue(results[1].startswith("I found a few potential issues"))
+        # The backend answers optimize, followed by the analyzer's findings
+        self.assertTrue(results[2].startswith("1. Consider using list comprehension"))
+        self.assertTrue(results[2].endswith("\n\nNo performance anti-patterns found."))
+
+    def test_concurrent_use(self):
+        """Test that one engine can serve many threads"""
+        engine = AdamXEngine(self.config_path)
+        commands = [f"explain x = {i}" for i in range(50)]
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(engine.process_command, commands))
+        self.assertEqual(len(set(results)), 1)
+
+    def test_call_from_event_loop(self):
+        """Test that the synchronous API also works inside a running event loop"""
+        import asyncio
+        engine = AdamXEngine(self.config_path)
+
+        async def main():
+            return engine.explain_code("x = 1")
+
+        self.assertEqual(asyncio.run(main()), engine.explain_code("x = 1"))
+        engine.adam_x.close_jobs()
+
+    def test_module_functions_share_engine(self):
+        """Test that the module-level API reuses one engine"""
+        with patch.object(adam_x, '_default_engine', None):
+            engine = get_engine()
+            self.assertIs(get_engine(), engine)
+            with patch.object(AdamXEngine, 'process_commands', return_value=["ok"]) as batch:
+                self.assertEqual(process_commands(["help"]), ["ok"])
+                batch.assert_called_once_with(["help"])
+
+
+if __name__ == '__main__':
+    unittest.main()
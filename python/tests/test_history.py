@@ -0,0 +1,186 @@
+"""
+Tests for Adam-X command history
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from io import StringIO
+from unittest.mock import patch
+
+# Add the parent directory to the path so we can import the adam_x module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from adam_x import AdamX
+from adam_x_history import HEADER_SIZE, HistoryStore
+
+
+class TestHistoryStore(unittest.TestCase):
+    """Test cases for HistoryStore"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.test_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.test_dir, "history.bin")
+
+    def tearDown(self):
+        """Tear down test fixtures"""
+        shutil.rmtree(self.test_dir)
+
+    def test_ring_buffer(self):
+        """Test that the oldest commands are overwritten and the file size stays fixed"""
+        history = HistoryStore(self.path, max_bytes=2048)
+        commands = [f"explain code number {i} " + "x" * (i % 40) for i in range(500)]
+        for i, command in enumerate(commands):
+            history.append(command, when=1000 + i)
+        kept = [entry.command for entry in history.entries()]
+        self.assertEqual(kept, commands[::-1][:len(kept)])
+        self.assertGreater(len(kept), 20)
+        self.assertEqual(len(history), len(kept))
+        self.assertEqual(os.path.getsize(self.path), HEADER_SIZE + 2048)
+        history.close()
+
+        # Reopened with the same settings, and resized keeping the newest
+        history = HistoryStore(self.path, max_bytes=2048)
+        self.assertEqual([entry.command for entry in history.entries()], kept)
+        self.assertEqual(next(history.entries()).time, 1499)
+        history.close()
+        history = HistoryStore(self.path, max_bytes=1024)
+        smaller = [entry.command for entry in history.entries()]
+        self.assertEqual(smaller, kept[:len(smaller)])
+        self.assertLess(len(smaller), len(kept))
+        history.close()
+
+    def test_max_entries(self):
+        """Test the entry cap"""
+        history = HistoryStore(None, max_entries=3)
+        for command in ("a", "b", "", "c", "d"):
+            history.append(command)
+        self.assertEqual(history.recent(10), ["d", "c", "b"])
+
+    def test_ranked_forgets_evicted_long_commands(self):
+        """Test that commands cut to max_command_bytes leave the ranking when evicted"""
+        history = HistoryStore(None, max_bytes=1024, max_entries=3)
+        history.ranked()
+        commands = [f"explain {i} " + "x" * 196 for i in range(10)]
+        for i, command in enumerate(commands):
+            history.append(command, when=1000 + i)
+        kept = history.recent(10)
+        self.assertEqual(len(kept), 3)
+        self.assertEqual(sorted(command for command, _, _ in history.ranked()), sorted(kept))
+        self.assertLessEqual(len(history._frequency), 3)
+
+    def test_search(self):
+        """Test that search goes newest first and never matches timestamps"""
+        history = HistoryStore(None)
+        for i, command in enumerate(["explain a", "help", "explain b", "explain a", "héllo 1"]):
+            history.append(command, when=1111111 + i)
+        self.assertEqual([entry.command for entry in history.search("explain")],
+                         ["explain a", "explain b", "explain a"])
+        self.assertEqual([entry.command for entry in history.search("1")], ["héllo 1"])
+        self.assertEqual([entry.command for entry in history.search("é")], ["héllo 1"])
+        self.assertEqual(list(history.search("missing")), [])
+        self.assertEqual(history.recent(2, unique=False), ["héllo 1", "explain a"])
+        self.assertEqual(history.recent(10), ["héllo 1", "explain a", "explain b", "help"])
+
+    def test_ranked(self):
+        """Test ranking by frequency weighted by recency"""
+        history = HistoryStore(None, max_entries=6)
+        now = 10 * 24 * 3600
+        for command, age in (("old", 9 * 24 * 3600), ("old", 9 * 24 * 3600),
+                             ("old", 9 * 24 * 3600), ("new", 60)):
+            history.append(command, when=now - age)
+        self.assertEqual([command for command, _, _ in history.ranked(now=now)], ["new", "old"])
+        self.assertEqual(history.ranked("ol", now=now), [("old", 3, now - 9 * 24 * 3600)])
+
+        # Counts follow appends and evictions
+        for _ in range(3):
+            history.append("new", when=now)
+        self.assertEqual(history.ranked(now=now), [("new", 4, now), ("old", 2, now - 9 * 24 * 3600)])
+        history.clear()
+        self.assertEqual((len(history), history.ranked()), (0, []))
+
+
+class TestAdamXHistory(unittest.TestCase):
+    """Test cases for the REPL history"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.test_dir = tempfile.mkdtemp()
+        self.config_path = os.path.join(self.test_dir, "config.json")
+
+    def tearDown(self):
+        """Tear down test fixtures"""
+        shutil.rmtree(self.test_dir)
+
+    def _run(self, commands, readline=None):
+        adam_x = AdamX(self.config_path, show_welcome=False)
+        lines = iter(commands + ["exit"])
+
+        def read(prompt=""):
+            # Like input() with readline, which adds each line to its history
+            line = next(lines)
+            if readline is not None:
+                readline.add_history(line)
+            return line
+
+        with patch('adam_x._init_readline', return_value=readline), \
+                patch('builtins.input', read), \
+                patch('sys.stdout', new_callable=StringIO) as mock_stdout:
+            adam_x.run()
+        return mock_stdout.getvalue()
+
+    def test_persisted_between_sessions(self):
+        """Test that commands survive a restart and can be searched"""
+        self._run(["help", "", "explain x = 1", "explain y = 2", "explain x = 1"])
+        output = self._run(["history", "history explain x"])
+        self.assertIn("Recent commands (6 in history):", output)
+        self.assertRegex(output, r"\d{4}-\d\d-\d\d \d\d:\d\d  explain y = 2")
+        self.assertRegex(output, r"by frequency and recency:\n\s+2  explain x = 1\n")
+
+        output = self._run(["history clear", "history"])
+        self.assertIn("History cleared.", output)
+        self.assertIn("Recent commands (1 in history):", output)
+
+    def test_readline(self):
+        """Test that readline gets the newest distinct commands and stays bounded"""
+        with open(self.config_path, 'w') as f:
+            json.dump({"history": {"readline_entries": 2}}, f)
+        self._run(["help", "projects", "help"])
+
+        class FakeReadline:
+            def __init__(self):
+                self.items = ["stale"]
+
+            def clear_history(self):
+                self.items = []
+
+            def add_history(self, line):
+                self.items.append(line)
+
+            def get_current_history_length(self):
+                return len(self.items)
+
+            def remove_history_item(self, index):
+                del self.items[index]
+
+        readline = FakeReadline()
+        AdamX(self.config_path, show_welcome=False)._load_readline_history(readline)
+        self.assertEqual(readline.items, ["help", "exit"])
+
+        self._run(["snippets"], readline=readline)
+        self.assertEqual(readline.items, ["snippets", "exit"])
+
+    def test_disabled(self):
+        """Test that a disabled history is kept in memory only"""
+        with open(self.config_path, 'w') as f:
+            json.dump({"history": {"enabled": False}}, f)
+        self._run(["help"])
+        self.assertFalse(os.path.exists(os.path.join(self.test_dir, "history.bin")))
+
+
+if __name__ == '__main__':
+    unittest.main()
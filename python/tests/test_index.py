@@ -0,0 +1,151 @@
+"""
+Tests for the Adam-X project file index
+"""
+
+import concurrent.futures
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from io import StringIO
+from unittest.mock import patch
+
+# Add the parent directory to the path so we can import the adam_x module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import adam_x_index
+from adam_x import AdamX, LANGUAGES
+from adam_x_index import ProjectIndex, extract_symbols
+from adam_x_store import ConfigStore
+
+
+class TestProjectIndex(unittest.TestCase):
+    """Test cases for ProjectIndex"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.test_dir = tempfile.mkdtemp()
+        self.root = os.path.join(self.test_dir, "project")
+        self._write("app/main.py", "import os\n\nclass App:\n    def run(self):\n        pass\n")
+        self._write("app/util.js", "export function formatDate(d) {}\nconst MAX = 3;\n")
+        self._write("README.md", "# Project\n")
+        self._write("node_modules/dep/index.js", "function ignored() {}\n")
+        self.index = ProjectIndex(self.root, os.path.join(self.test_dir, "index.db"), LANGUAGES)
+
+    def tearDown(self):
+        """Tear down test fixtures"""
+        self.index.close()
+        shutil.rmtree(self.test_dir)
+
+    def _write(self, path, text):
+        full = os.path.join(self.root, path)
+        os.makedirs(os.path.dirname(full), exist_ok=True)
+        with open(full, 'w') as f:
+            f.write(text)
+
+    def test_build(self):
+        """Test the first build records files, languages and symbols"""
+        stats = self.index.update()
+        self.assertEqual((stats["files"], stats["added"]), (3, 3))
+        self.assertEqual(self.index.file("app/main.py")["language"], "python")
+        self.assertIsNone(self.index.file("README.md")["language"])
+        self.assertIsNone(self.index.file("node_modules/dep/index.js"))
+        self.assertEqual(self.index.find_symbols("app"), [("App", "class", "app/main.py", 3)])
+        self.assertEqual(self.index.find_symbols("formatDate")[0][2:], ("app/util.js", 1))
+
+    def test_incremental_update(self):
+        """Test that only changed files are read and re-parsed"""
+        self.index.update()
+        self._write("app/main.py", "def start():\n    pass\n")
+        os.remove(os.path.join(self.root, "README.md"))
+        self._write("app/new.py", "class New:\n    pass\n")
+        # Touch without changing the content
+        os.utime(os.path.join(self.root, "app/util.js"), ns=(1, 1))
+
+        stats = self.index.update()
+        self.assertEqual((stats["added"], stats["changed"], stats["removed"]), (1, 1, 1))
+        self.assertEqual(stats["read"], 3)
+        self.assertEqual(stats["unchanged"], 1)
+        self.assertEqual(self.index.find_symbols("App"), [])
+        self.assertEqual(self.index.find_symbols("start")[0][2], "app/main.py")
+        self.assertEqual(self.index.find_symbols("MAX")[0][2], "app/util.js")
+
+        stats = self.index.update()
+        self.assertEqual(stats["read"], 0)
+
+    def test_parallel_build(self):
+        """Test that the pooled build gives the same result as the serial one"""
+        for i in range(20):
+            self._write(f"pkg/mod{i}.py", f"def func{i}():\n    return {i}\n")
+        index = ProjectIndex(self.root, os.path.join(self.test_dir, "pooled.db"), LANGUAGES, workers=2)
+        contexts = []
+        process_pool = concurrent.futures.ProcessPoolExecutor
+
+        def spy(*args, **kwargs):
+            contexts.append(kwargs.get("mp_context"))
+            return process_pool(*args, **kwargs)
+
+        with patch.object(adam_x_index, "_PROCESS_POOL_THRESHOLD", 1), \
+                patch.object(adam_x_index, "_BATCH_SIZE", 4), \
+                patch("concurrent.futures.ProcessPoolExecutor", spy):
+            self.assertEqual(index.update()["added"], 23)
+        self.assertEqual(len(index.find_symbols("func")), 20)
+        # Workers are spawned, never forked from the threaded REPL
+        self.assertEqual([context.get_start_method() for context in contexts], ["spawn"])
+        index.close()
+
+    def test_find_files(self):
+        """Test lookup by file name, name prefix and path suffix"""
+        self.index.update()
+        self.assertEqual(self.index.find_files("main.py"), ["app/main.py"])
+        self.assertEqual(self.index.find_files("MAIN"), ["app/main.py"])
+        self.assertEqual(self.index.find_files("app/util.js"), ["app/util.js"])
+        self.assertEqual(self.index.find_files("other/util.js"), [])
+
+    def test_extract_symbols(self):
+        """Test the per-language definition patterns"""
+        self.assertEqual(extract_symbols("pub fn parse() {}\nstruct Token;\n", "rust"),
+                         [("parse", "fn", 1), ("Token", "struct", 2)])
+        self.assertEqual(extract_symbols("func (s *Server) Serve() {}\n", "go"),
+                         [("Serve", "func", 1)])
+        self.assertEqual(extract_symbols("build() {\n}\n", "shell"), [("build", "function", 1)])
+        self.assertEqual(extract_symbols("def f(): pass\n", None), [])
+
+
+class TestAdamXFind(unittest.TestCase):
+    """Test cases for the find command"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.test_dir = tempfile.mkdtemp()
+        self.config_path = os.path.join(self.test_dir, "config.json")
+        project = os.path.join(self.test_dir, "demo")
+        os.makedirs(project)
+        with open(os.path.join(project, "server.py"), 'w') as f:
+            f.write("class Server:\n    pass\n")
+        ConfigStore(self.config_path).replace({
+            "projects": {"demo": project}, "last_project": None,
+            "preferences": {"preferred_language": "python"},
+        })
+
+    def tearDown(self):
+        """Tear down test fixtures"""
+        shutil.rmtree(self.test_dir)
+
+    def test_find_after_switch(self):
+        """Test that switching projects indexes them for find"""
+        adam_x = AdamX(self.config_path, show_welcome=False)
+        with patch('sys.stdout', new_callable=StringIO) as mock_stdout:
+            adam_x.process_command("find server")
+            adam_x.switch_project("demo")
+            adam_x.process_command("find server")
+        output = mock_stdout.getvalue()
+        self.assertIn("No current project.", output)
+        self.assertIn("server.py", output)
+        self.assertIn("Server (class) server.py:1", output)
+        self.assertTrue(os.listdir(os.path.join(self.test_dir, "indexes")))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+"""
+Tests for Adam-X background jobs and request cancellation
+"""
+
+import os
+import shutil
+import signal
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from io import StringIO
+from unittest.mock import patch
+
+# Add the parent directory to the path so we can import the adam_x module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from adam_x import AdamX
+from adam_x_backend import SimulatedBackend
+
+
+class TestJobs(unittest.TestCase):
+    """Test cases for background jobs"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.test_dir = tempfile.mkdtemp()
+        self.adam_x = AdamX(os.path.join(self.test_dir, "config.json"), show_welcome=False)
+        self.adam_x.cache = None
+
+    def tearDown(self):
+        """Tear down test fixtures"""
+        self.adam_x.jobs.close()
+        shutil.rmtree(self.test_dir)
+
+    def _run(self, cmd):
+        with patch('sys.stdout', new_callable=StringIO) as mock_stdout:
+            self.adam_x.process_command(cmd)
+        return mock_stdout.getvalue()
+
+    def test_background_job_and_wait(self):
+        """Test that '&' starts a job and 'wait' shows its result"""
+        self.adam_x.backend = SimulatedBackend(token_delay=0.005)
+        self.assertEqual(self._run("debug x = 1 &"), "[1] debug x = 1\n")
+        self.assertIn("running", self._run("jobs"))
+
+        output = self._run("wait 1")
+        self.assertIn("[1] debug x = 1", output)
+        self.assertIn("I found a few potential issues:", output)
+        self.assertIn("No background jobs.", self._run("jobs"))
+
+    def test_jobs_run_concurrently(self):
+        """Test that several jobs overlap instead of running one after another"""
+        self.adam_x.backend = SimulatedBackend(token_delay=0.01)
+        start = time.perf_counter()
+        for i in range(4):
+            self._run(f"explain x = {i} &")
+        output = self._run("wait")
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(output.count("processes data"), 4)
+        single = len(SimulatedBackend().respond("explain", "").split()) * 0.01
+        self.assertLess(elapsed, single * 3)
+
+    def test_cancel_job(self):
+        """Test cancelling a running job"""
+        self.adam_x.backend = SimulatedBackend(token_delay=0.5)
+        self._run("generate a parser &")
+        self.assertIn("Cancelled job [1].", self._run("cancel 1"))
+        self.adam_x.jobs.wait(self.adam_x.jobs.get(1))
+        self.assertEqual(self.adam_x.jobs.get(1).status, "cancelled")
+        self.assertIn("No job '7'", self._run("cancel 7"))
+
+        with patch('sys.stdout', new_callable=StringIO) as mock_stdout:
+            self.adam_x.report_finished_jobs()
+        self.assertIn("[1] Cancelled: generate a parser", mock_stdout.getvalue())
+        self.assertIsNone(self.adam_x.jobs.get(1))
+
+    def test_local_commands_stay_in_foreground(self):
+        """Test that only model requests can be backgrounded"""
+        self.assertIn("Only model requests", self._run("projects &"))
+
+    def test_other_lines_keep_their_ampersand(self):
+        """Test that '&' is only special after a model request with an argument"""
+        self.assertIn("Saved snippet: bg", self._run("snippet bg sleep 10 &"))
+        self.assertEqual(self.adam_x.snippets.get("bg"), "sleep 10 &")
+        with patch.object(self.adam_x, "start_job") as start_job:
+            self._run("explain &")
+            self._run("print a&")
+            self._run("join the words with &&")
+        start_job.assert_not_called()
+        self.assertEqual(self._run("generate a parser &"), "[1] generate a parser\n")
+        self._run("wait")
+
+        for cmd, usage in (("explain", "Usage: explain <code|@file[:start-end]> &"), ("", "Usage: <request> &")):
+            with patch('sys.stdout', new_callable=StringIO) as mock_stdout:
+                self.adam_x.start_job(cmd)
+            self.assertIn(usage, mock_stdout.getvalue())
+        self.assertEqual(self.adam_x.jobs.jobs(), [])
+
+    @unittest.skipIf(sys.platform == "win32", "needs POSIX signals")
+    def test_ctrl_c_cancels_only_current_request(self):
+        """Test that an interrupt aborts the foreground request but not jobs"""
+        self.adam_x.backend = SimulatedBackend(token_delay=0.02)
+        self._run("debug y = 2 &")
+        threading.Timer(0.1, os.kill, (os.getpid(), signal.SIGINT)).start()
+        output = self._run("explain x = 1")
+
+        self.assertIn("Request cancelled.", output)
+        self.assertNotIn("edge cases appropriately", output)
+        self.assertIn("I found a few potential issues:", self._run("wait 1"))
+
+
+if __name__ == '__main__':
+    unittest.main()
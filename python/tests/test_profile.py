@@ -0,0 +1,123 @@
+"""
+Tests for the Adam-X profiler
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from io import StringIO
+from unittest.mock import patch
+
+# Add the parent directory to the path so we can import the adam_x module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from adam_x import AdamX
+from adam_x_analyzer import Analyzer
+from adam_x_profile import run_profile
+
+# A script that spends most of its time on line 6 and allocates on line 9
+SCRIPT = """\
+import time
+
+def slow(items):
+    wanted = list(range(0, 600, 2))
+    for item in items:
+        if item in wanted: items.count(item)
+    return wanted
+
+blocks = [bytearray(1024) for _ in range(2000)]
+deadline = time.monotonic() + 0.3
+while time.monotonic() < deadline:
+    slow(list(range(300)))
+"""
+
+
+class TestProfile(unittest.TestCase):
+    """Test cases for run_profile"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.test_dir = tempfile.mkdtemp()
+        self.script = os.path.join(self.test_dir, "work.py")
+        with open(self.script, 'w') as f:
+            f.write(SCRIPT)
+
+    def tearDown(self):
+        """Tear down test fixtures"""
+        shutil.rmtree(self.test_dir)
+
+    def test_summary(self):
+        """Test that functions, hot lines and allocations are reported"""
+        result = run_profile(self.script, memory=True, timeout=30)
+        self.assertEqual((result.status, result.timed_out), (0, False))
+        self.assertEqual(result.functions[0]["location"], "work.py:1(<module>)")
+        self.assertIn("work.py:3(slow)", [entry["location"] for entry in result.functions])
+        hot = result.hot_lines()
+        self.assertEqual(max(hot, key=hot.get), 6)
+        self.assertEqual(result.allocations[0]["location"], "work.py:9")
+
+        summary = result.summary()
+        self.assertIn("Top functions by cumulative time:", summary)
+        self.assertIn("work.py:6  if item in wanted: items.count(item)", summary)
+        self.assertIn("Top allocation sites at peak memory", summary)
+
+    def test_timeout(self):
+        """Test that a script still running at the timeout is stopped and still profiled"""
+        with open(self.script, 'w') as f:
+            f.write("while True:\n    sum(range(1000))\n")
+        result = run_profile(self.script, timeout=0.5)
+        self.assertTrue(result.timed_out)
+        self.assertIn("stopped at the timeout", result.summary())
+        self.assertIn(2, result.hot_lines())
+
+    def test_failing_script(self):
+        """Test that the output of a failing script is shown"""
+        with open(self.script, 'w') as f:
+            f.write("raise ValueError('bad input')\n")
+        result = run_profile(self.script, timeout=30)
+        self.assertEqual(result.status, 1)
+        self.assertIn("ValueError: bad input", result.summary())
+
+
+class TestHotSpotRanking(unittest.TestCase):
+    """Test cases for ranking findings by profile data"""
+
+    def test_hot_findings_first(self):
+        """Test that findings covering hot lines are listed first with their share"""
+        source = ("def f(queue, items):\n    while queue:\n        queue.pop(0)\n"
+                  "    seen = []\n    for item in items:\n        if item in seen:\n            pass\n")
+        analyzer = Analyzer()
+        self.assertLess(analyzer.report(source).index("Line 3"),
+                        analyzer.report(source).index("Line 6"))
+        report = analyzer.report(source, {6: 0.75, 3: 0.05})
+        self.assertLess(report.index("Line 6"), report.index("Line 3"))
+        self.assertIn("Line 6 (75% of profiled time):", report)
+
+
+class TestAdamXProfile(unittest.TestCase):
+    """Test cases for the profile command"""
+
+    def test_profile_command(self):
+        """Test that profile shows the profile and then optimizations"""
+        test_dir = tempfile.mkdtemp()
+        try:
+            script = os.path.join(test_dir, "work.py")
+            with open(script, 'w') as f:
+                f.write(SCRIPT)
+            adam_x = AdamX(os.path.join(test_dir, "config.json"), show_welcome=False)
+            with patch('sys.stdout', new_callable=StringIO) as mock_stdout:
+                adam_x.process_command(f"profile --timeout 30 {script}")
+                adam_x.process_command("profile missing.py")
+            output = mock_stdout.getvalue()
+        finally:
+            shutil.rmtree(test_dir)
+        self.assertIn("Profile of work.py", output)
+        self.assertIn("Optimization Suggestions:", output)
+        self.assertRegex(output, r"Line 6 \(\d+% of profiled time\): `in wanted` scans")
+        self.assertIn("Script not found: missing.py", output)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,174 @@
+"""
+Tests for Adam-X @file references
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+import unittest
+from io import StringIO
+from unittest.mock import patch
+
+# Add the parent directory to the path so we can import the adam_x module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from adam_x import LANGUAGES, AdamX, AdamXEngine
+import adam_x_refs
+from adam_x_refs import _BOUNDARY_RES, is_reference, iter_chunks, parse_reference
+from adam_x_store import ConfigStore
+
+
+class TestFileReferences(unittest.TestCase):
+    """Test cases for reference parsing and chunking"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.test_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.test_dir, "module.py")
+
+    def tearDown(self):
+        """Tear down test fixtures"""
+        shutil.rmtree(self.test_dir)
+
+    def _write(self, text):
+        with open(self.path, 'w') as f:
+            f.write(text)
+
+    def test_parse_reference(self):
+        """Test paths with and without line ranges"""
+        ref = parse_reference("@src/app.py:10-20")
+        self.assertEqual((ref.path, ref.start, ref.end), ("src/app.py", 10, 20))
+        ref = parse_reference("@app.py:7")
+        self.assertEqual((ref.start, ref.end), (7, 7))
+        ref = parse_reference("@app.py")
+        self.assertEqual((ref.path, ref.start, ref.end), ("app.py", None, None))
+        self.assertIsNone(parse_reference("@property def x(self): pass"))
+        self.assertIsNone(parse_reference("x = 1"))
+        self.assertFalse(is_reference("@staticmethod\ndef f(): pass"))
+        with self.assertRaises(ValueError):
+            parse_reference("@app.py:9-3")
+
+    def test_chunks_split_at_definitions(self):
+        """Test that chunks end before a top-level definition and cover every line"""
+        functions = [f"@cached\ndef function_{i}(x):\n    y = x + {i}\n\n    return y\n\n"
+                     for i in range(60)]
+        self._write("import os\n\n" + "".join(functions))
+        chunks = list(iter_chunks(self.path, language="python", chunk_bytes=256))
+        self.assertGreater(len(chunks), 5)
+        self.assertEqual(chunks[0][0], 1)
+        for (_, end, _), (start, _, text) in zip(chunks, chunks[1:]):
+            self.assertEqual(start, end + 1)
+            self.assertTrue(text.startswith("@cached\ndef function_"))
+        with open(self.path) as f:
+            self.assertEqual("".join(text for _, _, text in chunks), f.read())
+
+    def test_every_language_has_boundaries(self):
+        """Test that C, C++ and shell files split at definitions, not at includes or braces"""
+        self.assertEqual(set(_BOUNDARY_RES), set(LANGUAGES))
+        # Chunking a file does not load the CLI module (sweep workers import this one)
+        code = ("import sys, adam_x_refs; list(adam_x_refs.iter_chunks(sys.argv[1], language='c')); "
+                "print('adam_x' in sys.modules)")
+        self._write("int x;\n")
+        output = subprocess.run([sys.executable, "-c", code, self.path], capture_output=True,
+                                text=True, cwd=os.path.dirname(adam_x_refs.__file__)).stdout
+        self.assertEqual(output, "False\n")
+        sources = {
+            "c": ("#include <stdio.h>\n#define N 3\n\n",
+                  "/* Function {i} */\nstatic unsigned int *function_{i}(int x)\n{{\n"
+                  "    return x + {i};\n}}\n\n",
+                  "static unsigned int *function_"),
+            "cpp": ("#include <vector>\n\n",
+                    "// Method {i}\nint Widget::method_{i}(int x) const\n{{\n"
+                    "    return x * {i};\n}}\n\n",
+                    "int Widget::method_"),
+            "shell": ("#!/usr/bin/env bash\nset -e\n\n",
+                      "# Task {i}\ntask_{i}() {{\n    echo {i}\n}}\n\n",
+                      "task_"),
+        }
+        for language, (head, function, signature) in sources.items():
+            self._write(head + "".join(function.format(i=i) for i in range(40)))
+            chunks = list(iter_chunks(self.path, language=language, chunk_bytes=200))
+            self.assertGreater(len(chunks), 5, language)
+            for _, _, text in chunks[1:]:
+                self.assertTrue(text.startswith(signature), (language, text[:40]))
+
+    def test_line_range(self):
+        """Test that only the referenced lines are read"""
+        self._write("".join(f"line {i}\n" for i in range(1, 101)))
+        chunks = list(iter_chunks(self.path, 10, 12))
+        self.assertEqual(chunks, [(10, 12, "line 10\nline 11\nline 12\n")])
+        self.assertEqual(list(iter_chunks(self.path, 200, 210)), [])
+
+    def test_oversized_definition_is_split(self):
+        """Test that a definition far larger than a chunk is split at lines"""
+        self._write("def big():\n" + "    x = 1\n" * 1000)
+        chunks = list(iter_chunks(self.path, language="python", chunk_bytes=512))
+        self.assertGreater(len(chunks), 5)
+        self.assertTrue(all(len(text) <= 1024 for _, _, text in chunks))
+
+    def test_peak_memory_is_flat(self):
+        """Test that chunking a multi-megabyte file never holds it in memory"""
+        with open(self.path, 'w') as f:
+            for i in range(40000):
+                f.write(f"def generated_{i}(value):\n    return value * {i} + {i}\n\n")
+        size = os.path.getsize(self.path)
+        self.assertGreater(size, 2 * 1024 * 1024)
+
+        tracemalloc.start()
+        try:
+            count = sum(1 for _ in iter_chunks(self.path, language="python"))
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.assertGreater(count, 200)
+        self.assertLess(peak, 256 * 1024)
+
+
+class TestAdamXReferences(unittest.TestCase):
+    """Test cases for @file references in commands"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.test_dir = tempfile.mkdtemp()
+        self.config_path = os.path.join(self.test_dir, "config.json")
+        self.project = os.path.join(self.test_dir, "demo")
+        os.makedirs(self.project)
+        with open(os.path.join(self.project, "shapes.py"), 'w') as f:
+            f.write("class Square:\n    pass\n\n\ndef area(side):\n    return side * side\n")
+        ConfigStore(self.config_path).replace({
+            "projects": {"demo": self.project}, "last_project": "demo",
+            "preferences": {"preferred_language": "python"},
+            "watch": {"enabled": False},
+        })
+
+    def tearDown(self):
+        """Tear down test fixtures"""
+        shutil.rmtree(self.test_dir)
+
+    def test_explain_reference_streams_per_chunk(self):
+        """Test that a referenced file is explained chunk by chunk"""
+        adam_x = AdamX(self.config_path, show_welcome=False)
+        with patch('adam_x_refs.CHUNK_BYTES', 24), \
+                patch('sys.stdout', new_callable=StringIO) as mock_stdout:
+            adam_x.process_command("explain @shapes.py")
+        output = mock_stdout.getvalue()
+        self.assertIn("--- shapes.py:1-4 ---", output)
+        self.assertIn("--- shapes.py:5-6 ---", output)
+        self.assertEqual(output.count("processes data by iterating"), 2)
+        self.assertNotIn("This code appears to", output)
+
+    def test_reference_line_range_and_errors(self):
+        """Test line ranges and unreadable references through the module API"""
+        engine = AdamXEngine(self.config_path)
+        result = engine.process_command("debug @shapes.py:5-6")
+        self.assertTrue(result.startswith("--- shapes.py:5-6 ---\n"))
+        self.assertIn("Cannot read missing.py", engine.process_command("optimize @missing.py"))
+        self.assertEqual(engine.process_command("debug @shapes.py:9-3"), "Invalid line range: 9-3")
+        self.assertIn("No lines to analyze", engine.process_command("debug @shapes.py:50"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+"""
+Tests for Adam-X session record and replay
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from io import StringIO
+from unittest.mock import PropertyMock, patch
+
+# Add the parent directory to the path so we can import the adam_x module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from adam_x import AdamX
+from adam_x_replay import SessionRecorder, load_traces, main, replay
+
+
+class TestReplay(unittest.TestCase):
+    """Test cases for recording and replaying sessions"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.test_dir = tempfile.mkdtemp()
+        self.trace = os.path.join(self.test_dir, "trace.jsonl")
+        self.cwd = os.getcwd()
+        os.chdir(self.test_dir)
+
+    def tearDown(self):
+        """Tear down test fixtures"""
+        os.chdir(self.cwd)
+        shutil.rmtree(self.test_dir)
+
+    def _record(self, commands):
+        """Run a REPL session on the given input lines with recording on."""
+        adam_x = AdamX(os.path.join(self.test_dir, "config", "config.json"), show_welcome=False)
+        adam_x.recorder = SessionRecorder(self.trace)
+        lines = iter(commands + ["exit"])
+
+        def read(prompt=""):
+            # Like input(), show the prompt
+            sys.stdout.write(prompt)
+            return next(lines)
+
+        with patch('builtins.input', read), \
+                patch('sys.stdout', new_callable=StringIO) as mock_stdout:
+            adam_x.run()
+        return mock_stdout.getvalue()
+
+    def test_record(self):
+        """Test that commands, prompt answers and output hashes are recorded"""
+        output = self._record(["help", "project demo", "", "explain x = 1"])
+        self.assertIn("Created and switched to project: demo", output)
+        (session,) = load_traces(self.trace)
+        self.assertEqual([record["command"] for record in session],
+                         ["help", "project demo", "explain x = 1"])
+        self.assertEqual(session[1]["input"], [""])
+        self.assertNotIn("input", session[0])
+        self.assertLessEqual(session[0]["t"], session[2]["t"])
+        self.assertEqual(len(session[2]["result"]), 16)
+
+    def test_replay(self):
+        """Test that replayed sessions reproduce the recorded output"""
+        self._record(["help", "project demo", "", "explain x = 1", "create hello.py"])
+        self._record(["snippets"])
+        os.remove(os.path.join(self.test_dir, "hello.py"))
+        traces = load_traces(self.trace)
+        self.assertEqual(len(traces), 2)
+
+        report = replay(traces, sessions=3, speed=None)
+        self.assertEqual(report.count, 4 + 1 + 4)
+        self.assertEqual((report.matched, report.differed, report.failed), (9, 0, 0))
+        self.assertEqual(report.commands["explain"].count, 2)
+        self.assertGreater(report.throughput, 0)
+        # Files were created in a temporary working directory
+        self.assertEqual(os.getcwd(), self.test_dir)
+        self.assertFalse(os.path.exists(os.path.join(self.test_dir, "hello.py")))
+
+        summary = report.summary()
+        self.assertIn("on 3 sessions at max speed", summary)
+        self.assertIn("9 matched the recording, 0 differed, 0 failed", summary)
+        if report.rss_start is not None:
+            self.assertIn("Memory:", summary)
+
+    def test_pace(self):
+        """Test that commands are replayed at the recorded pace divided by the speed"""
+        with open(self.trace, 'w') as f:
+            f.write(json.dumps({"session": "a", "started": 0, "version": 1}) + "\n")
+            for t in (0.0, 0.4):
+                f.write(json.dumps({"t": t, "command": "help", "result": "0"}) + "\n")
+        report = replay(load_traces(self.trace), sessions=2, speed=2)
+        self.assertGreaterEqual(report.seconds, 0.2)
+        self.assertEqual((report.matched, report.differed), (0, 4))
+
+        with patch('sys.stdout', new_callable=StringIO) as mock_stdout:
+            status = main([self.trace, "--speed", "max", "--json", "--fail-on-mismatch"])
+        self.assertEqual(status, 1)
+        self.assertEqual(json.loads(mock_stdout.getvalue())["commands"], 2)
+
+    def test_backend_errors_count_as_failures(self):
+        """Test that commands whose backend request fails are counted as failed"""
+        with open(self.trace, 'w') as f:
+            f.write(json.dumps({"session": "a", "started": 0, "version": 1}) + "\n")
+            for command in ("help", "explain x = 1", "debug y = 2"):
+                f.write(json.dumps({"t": 0, "command": command, "result": "0"}) + "\n")
+        # Nothing listens on port 1, so every backend request fails
+        with patch("adam_x_standin.StandInServer.url", new_callable=PropertyMock,
+                   return_value="http://127.0.0.1:1/v1/stream"):
+            report = replay(load_traces(self.trace), sessions=2, speed=None)
+        self.assertEqual((report.failed, report.differed), (4, 2))
+
+    def test_invalid_trace(self):
+        """Test that a file that is not a trace is rejected"""
+        with open(self.trace, 'w') as f:
+            f.write('{"name": "command"}\n')
+        with self.assertRaises(ValueError):
+            load_traces(self.trace)
+        with patch('sys.stderr', new_callable=StringIO) as mock_stderr:
+            self.assertEqual(main([self.trace]), 2)
+        self.assertIn("not a trace record", mock_stderr.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
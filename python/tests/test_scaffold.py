@@ -0,0 +1,184 @@
+"""
+Tests for Adam-X scaffolding
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from io import StringIO
+from unittest.mock import patch
+
+# Add the parent directory to the path so we can import the adam_x module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from adam_x import LANGUAGES, AdamX
+from adam_x_scaffold import Scaffolder, diff, load_spec, write
+
+VALUES = {"author": "Ada", "date": "2026-01-02 03:04:05"}
+
+
+class TestScaffolder(unittest.TestCase):
+    """Test cases for Scaffolder"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.test_dir = tempfile.mkdtemp()
+        self.scaffolder = Scaffolder(LANGUAGES)
+
+    def tearDown(self):
+        """Tear down test fixtures"""
+        shutil.rmtree(self.test_dir)
+
+    def test_templates(self):
+        """Test that every language has a template with its header"""
+        self.assertEqual(self.scaffolder.language_for("src/app.rs"), "rust")
+        self.assertIsNone(self.scaffolder.language_for("notes.txt"))
+        for language, info in LANGUAGES.items():
+            content = self.scaffolder.render("user_service" + info["ext"], language, VALUES)
+            self.assertIn(f"{info['comment']}Author: Ada\n", content)
+            self.assertIn("Hello, World!", content)
+            self.assertNotIn("${", content)
+        self.assertTrue(self.scaffolder.render("x.php", "php", VALUES).startswith("<?php\n// Created"))
+        self.assertIn("public class UserService {",
+                      self.scaffolder.render("user_service.java", "java", VALUES))
+        self.assertIn('main "$@"', self.scaffolder.render("run.sh", "shell", VALUES))
+
+    def test_plan(self):
+        """Test expanding directories, variables and instances"""
+        spec = {
+            "variables": {"owner": "core"},
+            "instances": [{"service": "billing"}, {"service": "search"}],
+            "files": {
+                "services/${service}/": {
+                    "main.go": None,
+                    "README.md": "# ${service} (${owner})\n",
+                    "handlers/": {"health.txt": {"template": "go"}, "empty.txt": None},
+                },
+            },
+        }
+        files = dict(self.scaffolder.plan(spec, dict(VALUES, owner="infra")))
+        self.assertEqual(sorted(files), [
+            "services/billing/README.md", "services/billing/handlers/empty.txt",
+            "services/billing/handlers/health.txt", "services/billing/main.go",
+            "services/search/README.md", "services/search/handlers/empty.txt",
+            "services/search/handlers/health.txt", "services/search/main.go",
+        ])
+        self.assertEqual(files["services/search/README.md"], "# search (infra)\n")
+        self.assertIn("package main", files["services/billing/handlers/health.txt"])
+        self.assertEqual(files["services/billing/handlers/empty.txt"], "")
+
+        script = "#!/bin/sh\necho \"$name $path $1 $$ ${HOME}\" > ${service}.log $${service}\n"
+        files = dict(self.scaffolder.plan({"files": {"${service}/$run.sh": script}},
+                                          {"service": "billing"}))
+        self.assertEqual(files["billing/$run.sh"],
+                         "#!/bin/sh\necho \"$name $path $1 $$ ${HOME}\" > billing.log ${service}\n")
+
+        for bad in ({"../x.py": None}, {"a/": "not a dict"}, {"x.py": {"template": "cobol"}},
+                    {"x.py": 1}, {"x.py": None, "./x.py": None}):
+            with self.assertRaises(ValueError):
+                self.scaffolder.plan({"files": bad})
+
+    def test_write_and_diff(self):
+        """Test concurrent writes, skipping existing files and the dry-run diff"""
+        files = [(f"pkg{i % 10}/mod{i}.py", f"x = {i}\n") for i in range(300)]
+        result = write(self.test_dir, files)
+        self.assertEqual(len(result["created"]), 300)
+        with open(os.path.join(self.test_dir, "pkg7", "mod17.py")) as f:
+            self.assertEqual(f.read(), "x = 17\n")
+
+        changed = [("pkg0/mod0.py", "x = -1\n"), ("pkg1/mod1.py", "x = 1\n"), ("new.py", "y\n")]
+        report = {path: (status, text) for path, status, text in diff(self.test_dir, changed)}
+        self.assertEqual(report["pkg1/mod1.py"], ("unchanged", ""))
+        self.assertEqual(report["pkg0/mod0.py"][0], "changed")
+        self.assertIn("-x = 0\n+x = -1\n", report["pkg0/mod0.py"][1])
+        self.assertIn("--- /dev/null\n+++ b/new.py\n", report["new.py"][1])
+
+        result = write(self.test_dir, changed)
+        self.assertEqual((result["created"], result["unchanged"], result["skipped"]),
+                         (["new.py"], ["pkg1/mod1.py"], ["pkg0/mod0.py"]))
+        result = write(self.test_dir, changed, overwrite=True)
+        self.assertEqual(result["updated"], ["pkg0/mod0.py"])
+        self.assertEqual([name for name in os.listdir(os.path.join(self.test_dir, "pkg0"))
+                          if name.endswith(".tmp")], [])
+
+    def test_load_spec(self):
+        """Test reading JSON specs and rejecting invalid ones"""
+        path = os.path.join(self.test_dir, "spec.json")
+        with open(path, 'w') as f:
+            json.dump({"files": {"a.py": None}}, f)
+        self.assertEqual(load_spec(path), {"files": {"a.py": None}})
+        with open(path, 'w') as f:
+            f.write("{\"files\": [")
+        with self.assertRaises(ValueError):
+            load_spec(path)
+
+
+class TestAdamXScaffold(unittest.TestCase):
+    """Test cases for the create and scaffold commands"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.test_dir = tempfile.mkdtemp()
+        self.adam_x = AdamX(os.path.join(self.test_dir, "config.json"), show_welcome=False)
+        self.spec = os.path.join(self.test_dir, "service.json")
+        with open(self.spec, 'w') as f:
+            json.dump({"files": {"${service}/": {"app.py": None, "Main.java": None}}}, f)
+        self.out = os.path.join(self.test_dir, "out")
+
+    def tearDown(self):
+        """Tear down test fixtures"""
+        shutil.rmtree(self.test_dir)
+
+    def _run(self, cmd):
+        with patch('sys.stdout', new_callable=StringIO) as mock_stdout:
+            self.adam_x.process_command(cmd)
+        return mock_stdout.getvalue()
+
+    def test_create_file(self):
+        """Test that create keeps its Python template and now covers every language"""
+        path = os.path.join(self.test_dir, "hello.py")
+        self.assertIn("Created file:", self._run(f"create {path}"))
+        with open(path) as f:
+            lines = f.read().split("\n")
+        self.assertTrue(lines[0].startswith("# Created by Adam-X on "))
+        self.assertEqual(lines[3:6], ['"""Main module."""', '', 'def main():'])
+
+        path = os.path.join(self.test_dir, "main.rs")
+        self._run(f"create {path}")
+        with open(path) as f:
+            self.assertIn("fn main()", f.read())
+
+    def test_scaffold(self):
+        """Test dry runs, writes and --force"""
+        output = self._run(f"scaffold --dry-run --into {self.out} {self.spec} service=billing")
+        self.assertIn("+++ b/billing/Main.java", output)
+        self.assertIn("Would create 2 file(s), skip 0 changed, leave 0 unchanged.", output)
+        self.assertFalse(os.path.exists(self.out))
+
+        output = self._run(f"scaffold --into {self.out} {self.spec} service=billing")
+        self.assertIn("Created 2 file(s), updated 0, 0 unchanged", output)
+        with open(os.path.join(self.out, "billing", "Main.java")) as f:
+            self.assertIn("public class Main {", f.read())
+
+        with open(os.path.join(self.out, "billing", "app.py"), 'w') as f:
+            f.write("edited\n")
+        output = self._run(f"scaffold --into {self.out} {self.spec} service=billing")
+        self.assertIn("Skipped 1 existing file(s)", output)
+        self.assertIn("billing/app.py", output)
+        output = self._run(f"scaffold --force --into {self.out} {self.spec} service=billing")
+        self.assertIn("updated 1", output)
+
+    def test_scaffold_errors(self):
+        """Test usage and spec errors"""
+        self.assertIn("Usage: scaffold", self._run(f"scaffold {self.spec} service"))
+        self.assertIn("Usage: scaffold [--dry-run] [--force] [--into DIR] <spec> [name=value ...]",
+                      self._run("scaffold --into"))
+        self.assertIn("scaffold [--dry-run] [--force] [--into DIR] <spec>", self._run("help"))
+        self.assertIn("Error reading spec", self._run("scaffold missing.json"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+"""
+Tests for the Adam-X local BM25 search
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from io import StringIO
+from unittest.mock import patch
+
+# Add the parent directory to the path so we can import the adam_x module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import adam_x_search
+from adam_x import AdamX, AdamXEngine
+from adam_x_search import SearchIndex, tokenize
+from adam_x_store import ConfigStore
+
+
+class TestSearchIndex(unittest.TestCase):
+    """Test cases for SearchIndex"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.test_dir = tempfile.mkdtemp()
+        self.root = os.path.join(self.test_dir, "project")
+        os.makedirs(self.root)
+        self.files = {}
+        self._write("retry.py", "def retry_request(session):\n    # retry with backoff\n"
+                                "    backoff = 2\n    return session.retry(backoff)\n")
+        self._write("client.py", "class HttpClient:\n    def request(self):\n        pass\n")
+        self._write("docs.md", "# Usage\n\nThe client supports retry and backoff settings.\n")
+        self.index = SearchIndex(self.root, os.path.join(self.test_dir, "search.db"))
+        self.index.update(self.files.items())
+
+    def tearDown(self):
+        """Tear down test fixtures"""
+        self.index.close()
+        shutil.rmtree(self.test_dir)
+
+    def _write(self, path, text):
+        with open(os.path.join(self.root, path), 'w') as f:
+            f.write(text)
+        self.files[path] = str(hash(text))
+
+    def test_tokenize_splits_identifiers(self):
+        """Test that identifiers are indexed whole and by their parts"""
+        self.assertEqual(tokenize("parseConfig snake_case x"),
+                         ["parseconfig", "parse", "config", "snake_case", "snake", "case"])
+
+    def test_bm25_ranking(self):
+        """Test that documents with more occurrences of rarer terms rank first"""
+        results = self.index.search("retry backoff")
+        self.assertEqual([path for path, _ in results], ["retry.py", "docs.md"])
+        self.assertGreater(results[0][1], results[1][1])
+        self.assertEqual(self.index.search("HttpClient")[0][0], "client.py")
+        self.assertEqual(self.index.search("http")[0][0], "client.py")
+        self.assertEqual(self.index.search("nonexistent"), [])
+
+    def test_incremental_update(self):
+        """Test that only changed files are re-indexed"""
+        self._write("client.py", "class HttpClient:\n    def retry(self):\n        pass\n")
+        del self.files["docs.md"]
+        stats = self.index.update(self.files.items())
+        self.assertEqual((stats["indexed"], stats["removed"]), (1, 1))
+        self.assertEqual(self.index.update(self.files.items())["indexed"], 0)
+        self.assertEqual({path for path, _ in self.index.search("retry")}, {"retry.py", "client.py"})
+        self.assertEqual(self.index.search("usage"), [])
+
+    def test_reindexed_last_document_drops_old_postings(self):
+        """Test that a rewritten highest-id document does not inherit its old postings"""
+        self._write("docs.md", "Nothing relevant here.\n")
+        self.index.update(self.files.items())
+        self.assertEqual(self.index.search("settings"), [])
+        results = self.index.search("retry backoff client")
+        self.assertNotIn("docs.md", [path for path, _ in results])
+        self.assertTrue(all(score > 0 for _, score in results))
+
+    def test_segments_are_merged(self):
+        """Test that many small updates are folded into fewer segments"""
+        with patch.object(adam_x_search, "MAX_SEGMENTS", 3):
+            for i in range(6):
+                self._write(f"mod{i}.py", f"def handler_{i}():\n    return {i}\n")
+                self.index.update(self.files.items())
+                self.assertLessEqual(self.index.segment_count(), 3)
+        before = self.index.search("handler retry")
+        self.index.merge()
+        self.assertEqual(self.index.segment_count(), 1)
+        self.assertEqual(self.index.search("handler retry"), before)
+        self.assertEqual(len(self.index), 9)
+
+    def test_snippet(self):
+        """Test that the snippet is the line matching most query terms"""
+        self.assertEqual(self.index.snippet("retry.py", "retry backoff"),
+                         (2, "# retry with backoff"))
+
+
+class TestAdamXSearch(unittest.TestCase):
+    """Test cases for search_documentation with a current project"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.test_dir = tempfile.mkdtemp()
+        self.config_path = os.path.join(self.test_dir, "config.json")
+        project = os.path.join(self.test_dir, "demo")
+        os.makedirs(project)
+        with open(os.path.join(project, "README.md"), 'w') as f:
+            f.write("# Demo\n\nInstall the package with pip.\n")
+        ConfigStore(self.config_path).replace({
+            "projects": {"demo": project}, "last_project": "demo",
+            "preferences": {"preferred_language": "python"},
+        })
+
+    def tearDown(self):
+        """Tear down test fixtures"""
+        shutil.rmtree(self.test_dir)
+
+    def test_search_uses_project_index(self):
+        """Test that search answers from the project instead of the backend"""
+        adam_x = AdamX(self.config_path, show_welcome=False)
+        with patch('sys.stdout', new_callable=StringIO) as mock_stdout:
+            adam_x.search_documentation("install pip")
+        output = mock_stdout.getvalue()
+        self.assertIn("README.md:3", output)
+        self.assertIn("Install the package with pip.", output)
+        self.assertNotIn("documentation pages", output)
+
+    def test_engine_search_is_local(self):
+        """Test that the module API also searches the project"""
+        engine = AdamXEngine(self.config_path)
+        self.assertIn("README.md", engine.process_command("search install"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+"""
+Tests for the Adam-X snippet library
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from io import StringIO
+from unittest.mock import patch
+
+# Add the parent directory to the path so we can import the adam_x module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from adam_x import AdamX
+from adam_x_snippets import SnippetStore, trigrams
+
+
+class TestSnippetStore(unittest.TestCase):
+    """Test cases for SnippetStore"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.test_dir = tempfile.mkdtemp()
+        self.store = SnippetStore(os.path.join(self.test_dir, "snippets.db"))
+        self.store.put_many([
+            ("sort-list", "def sort_list(items): return sorted(items)"),
+            ("sort-dict", "def sort_dict(d): return dict(sorted(d.items()))"),
+            ("read-csv", "import csv\nrows = list(csv.reader(open(path)))"),
+            ("http-get", "import urllib.request\nurllib.request.urlopen(url).read()"),
+        ])
+
+    def tearDown(self):
+        """Tear down test fixtures"""
+        self.store.close()
+        shutil.rmtree(self.test_dir)
+
+    def test_trigrams(self):
+        """Test trigram extraction"""
+        self.assertIn("  a", trigrams("ab"))
+        self.assertIn("ab ", trigrams("AB"))
+
+    def test_exact_lookup_and_update(self):
+        """Test get, replace and delete"""
+        self.assertIn("sort-list", self.store)
+        self.store.put("sort-list", "sorted(items)")
+        self.assertEqual(self.store.get("sort-list"), "sorted(items)")
+        self.assertEqual(len(self.store), 4)
+        self.assertTrue(self.store.delete("sort-list"))
+        self.assertIsNone(self.store.get("sort-list"))
+        self.assertFalse(self.store.delete("sort-list"))
+
+    def test_prefix_lookup(self):
+        """Test name prefix lookup"""
+        self.assertEqual(self.store.names("sort"), ["sort-dict", "sort-list"])
+        self.assertEqual(self.store.names("sort", limit=1), ["sort-dict"])
+        self.assertEqual(self.store.names("zzz"), [])
+
+    def test_fuzzy_lookup(self):
+        """Test misspelled names"""
+        self.assertEqual(self.store.fuzzy("sortlist")[0], "sort-list")
+        self.assertEqual(self.store.fuzzy("raed-csv")[0], "read-csv")
+        self.assertEqual(self.store.fuzzy("qqqqqq"), [])
+
+    def test_full_text_search(self):
+        """Test searching snippet bodies"""
+        names = [name for name, _ in self.store.search("urlopen")]
+        self.assertEqual(names, ["http-get"])
+        names = [name for name, _ in self.store.search("sorted items")]
+        self.assertIn("sort-list", names)
+        self.assertEqual(self.store.search("!!!"), [])
+
+    def test_search_sees_updates(self):
+        """Test that the text index follows replaced bodies"""
+        self.store.put("read-csv", "import json")
+        self.assertEqual(self.store.search("csv reader"), [])
+        self.assertEqual([n for n, _ in self.store.search("json")], ["read-csv"])
+
+
+class TestAdamXSnippets(unittest.TestCase):
+    """Test cases for the snippet commands"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.test_dir = tempfile.mkdtemp()
+        self.config_path = os.path.join(self.test_dir, "config.json")
+
+    def tearDown(self):
+        """Tear down test fixtures"""
+        shutil.rmtree(self.test_dir)
+
+    def _run(self, adam_x, cmd):
+        with patch('sys.stdout', new_callable=StringIO) as mock_stdout:
+            adam_x.process_command(cmd)
+        return mock_stdout.getvalue()
+
+    def test_legacy_snippets_are_migrated(self):
+        """Test that snippets stored in config.json move to the library"""
+        with open(self.config_path, 'w') as f:
+            json.dump({"snippets": {"hello": "print('hi')"}, "projects": {},
+                       "preferences": {"preferred_language": "python"}}, f)
+        adam_x = AdamX(self.config_path, show_welcome=False)
+        self.assertEqual(adam_x.snippets.get("hello"), "print('hi')")
+        adam_x.store.flush()
+        self.assertNotIn("snippets", AdamX(self.config_path, show_welcome=False).config)
+
+    def test_snippet_commands(self):
+        """Test saving, using, listing and searching snippets"""
+        adam_x = AdamX(self.config_path, show_welcome=False)
+        self._run(adam_x, "snippet greet print('hello world')")
+        self.assertIn("print('hello world')", self._run(adam_x, "use greet"))
+        self.assertIn("Did you mean: greet?", self._run(adam_x, "use gret"))
+        self.assertIn("- greet", self._run(adam_x, "snippets"))
+        self.assertIn("greet:", self._run(adam_x, "snippets hello"))
+        self.assertIn("No snippets match", self._run(adam_x, "snippets nothing"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+"""
+Tests for Adam-X startup and lazy initialization
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+PYTHON_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, PYTHON_DIR)
+
+from adam_x import AdamX, _UNSET
+
+
+class TestStartup(unittest.TestCase):
+    """Test cases for startup cost"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.test_dir = tempfile.mkdtemp()
+        self.config_path = os.path.join(self.test_dir, "config.json")
+
+    def tearDown(self):
+        """Tear down test fixtures"""
+        shutil.rmtree(self.test_dir)
+
+    def _run(self, *args):
+        return subprocess.run([sys.executable, *args], cwd=PYTHON_DIR,
+                              capture_output=True, text=True, timeout=60)
+
+    def test_import_does_not_load_heavy_modules(self):
+        """Test that importing adam_x leaves the heavy modules unloaded"""
+        result = self._run("-c", (
+            "import sys, adam_x; "
+            "print([m for m in ('asyncio', 'sqlite3', 'readline', 'argparse', 'http.server') "
+            "if m in sys.modules])"))
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip(), "[]")
+
+    def test_construction_is_lazy(self):
+        """Test that AdamX() defers the config, backend, cache and snippets"""
+        adam_x = AdamX(self.config_path, show_welcome=False)
+        self.assertIsNone(adam_x._config)
+        self.assertIs(adam_x._backend, _UNSET)
+        self.assertIs(adam_x._cache, _UNSET)
+        self.assertIs(adam_x._snippets, _UNSET)
+        self.assertFalse(os.path.exists(self.config_path))
+
+        self.assertEqual(adam_x.config["preferences"]["preferred_language"], "python")
+        self.assertTrue(os.path.exists(self.config_path))
+        self.assertIs(adam_x._snippets, _UNSET)
+
+    def test_profile_startup(self):
+        """Test the --profile-startup report"""
+        result = self._run("adam_x.py", "--config", self.config_path, "--profile-startup")
+        self.assertEqual(result.returncode, 0, result.stderr)
+        for phase in ("import adam_x", "AdamX.__init__", "backend (lazy)", "snippet library (lazy)"):
+            self.assertIn(phase, result.stdout)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+"""
+Tests for Adam-X request statistics
+"""
+
+import os
+import random
+import shutil
+import sys
+import tempfile
+import unittest
+from io import StringIO
+from unittest.mock import patch
+
+# Add the parent directory to the path so we can import the adam_x module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from adam_x import AdamX, AdamXEngine
+from adam_x_backend import SimulatedBackend
+from adam_x_stats import Histogram, Stats
+from adam_x_store import ConfigStore
+
+
+class TestHistogram(unittest.TestCase):
+    """Test cases for Histogram"""
+
+    def test_quantiles(self):
+        """Test that quantiles are within the bucket resolution"""
+        values = [i / 1000 for i in range(1, 1001)]
+        random.Random(4).shuffle(values)
+        histogram = Histogram()
+        for value in values:
+            histogram.add(value)
+        for q, expected in ((0.5, 0.5), (0.95, 0.95), (0.99, 0.99)):
+            self.assertAlmostEqual(histogram.quantile(q), expected, delta=expected * 0.05)
+        self.assertEqual(histogram.quantile(1.0), 1.0)
+        self.assertLess(len(histogram.counts), 90)
+
+    def test_empty_and_constant(self):
+        """Test edge cases"""
+        histogram = Histogram()
+        self.assertEqual(histogram.quantile(0.5), 0.0)
+        for _ in range(10):
+            histogram.add(0.02)
+        self.assertEqual(histogram.quantile(0.99), 0.02)
+
+
+class TestStats(unittest.TestCase):
+    """Test cases for Stats"""
+
+    def test_measure(self):
+        """Test that commands are counted, including ones that fail"""
+        stats = Stats()
+        with stats.measure("explain") as request:
+            request.backend_seconds = 0.0
+        with self.assertRaises(ValueError):
+            with stats.measure("explain"):
+                raise ValueError("bad")
+        entry = stats.snapshot()["explain"]
+        self.assertEqual((entry["count"], entry["errors"]), (2, 1))
+        self.assertIsNone(entry["cache_hit_rate"])
+
+    def test_prometheus(self):
+        """Test the Prometheus text format"""
+        stats = Stats()
+        with stats.measure('say "hi"'):
+            pass
+        text = stats.prometheus()
+        self.assertIn("# TYPE adam_x_command_duration_seconds summary", text)
+        self.assertIn('adam_x_command_duration_seconds_count{command="say \\"hi\\""} 1', text)
+        self.assertIn('adam_x_command_duration_seconds{command="say \\"hi\\"",quantile="0.99"}', text)
+        self.assertIn('adam_x_cache_hits_total{command="say \\"hi\\""} 0', text)
+
+
+class TestAdamXStats(unittest.TestCase):
+    """Test cases for statistics of AdamX commands"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.test_dir = tempfile.mkdtemp()
+        self.config_path = os.path.join(self.test_dir, "config.json")
+        self.textfile = os.path.join(self.test_dir, "adam_x.prom")
+        ConfigStore(self.config_path).replace({
+            "preferences": {"preferred_language": "javascript"},
+            "stats": {"textfile": self.textfile},
+        })
+
+    def tearDown(self):
+        """Tear down test fixtures"""
+        shutil.rmtree(self.test_dir)
+
+    def test_backend_time_cache_and_bytes(self):
+        """Test that backend time, cache lookups and traffic are recorded per command"""
+        engine = AdamXEngine(self.config_path)
+        engine.adam_x.backend = SimulatedBackend(token_delay=0.002)
+        engine.process_command("explain x = 1")
+        engine.process_command("explain x = 1")
+        with patch('sys.stdout', new_callable=StringIO):
+            engine.process_command("help")
+
+        snapshot = engine.adam_x.stats.snapshot()
+        explain = snapshot["explain"]
+        self.assertEqual(explain["count"], 2)
+        self.assertEqual((explain["cache_hits"], explain["cache_misses"]), (1, 1))
+        self.assertEqual(explain["sent_bytes"], len("x = 1"))
+        self.assertGreater(explain["received_bytes"], 100)
+        self.assertGreater(explain["backend_seconds"], 0.02)
+        self.assertLess(explain["backend_seconds"], explain["seconds"])
+        self.assertEqual((snapshot["help"]["count"], snapshot["help"]["backend_seconds"]), (1, 0.0))
+
+    def test_stats_command(self):
+        """Test that the REPL shows, exports and resets the statistics"""
+        adam_x = AdamX(self.config_path, show_welcome=False)
+        with patch('sys.stdout', new_callable=StringIO) as mock_stdout:
+            adam_x.process_command("explain x = 1")
+            adam_x.process_command("stats")
+            output = mock_stdout.getvalue()
+        self.assertRegex(output, r"explain\s+1\s+0\s+[\d.]+")
+        self.assertIn("0/1", output)
+
+        # The configured textfile was written after the first command
+        with open(self.textfile) as f:
+            self.assertIn('adam_x_command_duration_seconds_count{command="explain"} 1', f.read())
+        exported = os.path.join(self.test_dir, "now.prom")
+        with patch('sys.stdout', new_callable=StringIO) as mock_stdout:
+            adam_x.process_command(f"stats export {exported}")
+            adam_x.process_command("stats reset")
+            adam_x.process_command("stats")
+            output = mock_stdout.getvalue()
+        with open(exported) as f:
+            self.assertIn('command="stats"', f.read())
+        self.assertIn("Statistics reset.", output)
+        # Only 'stats reset' itself is left
+        self.assertIn("(1 command):", output.split("Statistics reset.")[1])
+        self.assertNotIn("explain", output.split("Statistics reset.")[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+"""
+Tests for the Adam-X journaled config store
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from io import StringIO
+from unittest.mock import patch
+
+# Add the parent directory to the path so we can import the adam_x module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from adam_x import AdamX
+from adam_x_store import ConfigStore
+
+
+class TestConfigStore(unittest.TestCase):
+    """Test cases for ConfigStore"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.test_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.test_dir, "config.json")
+        ConfigStore(self.path).replace({"snippets": {}, "theme": "dark"})
+
+    def tearDown(self):
+        """Tear down test fixtures"""
+        shutil.rmtree(self.test_dir)
+
+    def _snapshot(self):
+        with open(self.path) as f:
+            return json.load(f)
+
+    def test_set_appends_to_journal(self):
+        """Test that changes go to the journal, not the snapshot"""
+        store = ConfigStore(self.path, flush_interval=0)
+        store.load()
+        store.set(["snippets", "a"], "print(1)")
+        store.delete(["theme"])
+
+        self.assertEqual(self._snapshot(), {"snippets": {}, "theme": "dark"})
+        with open(store.journal_path) as f:
+            self.assertEqual(len(f.readlines()), 3)
+        self.assertEqual(ConfigStore(self.path).load(), {"snippets": {"a": "print(1)"}})
+
+    def test_write_behind_batches_entries(self):
+        """Test that entries are written together after the flush interval"""
+        store = ConfigStore(self.path, flush_interval=0.05)
+        store.load()
+        for i in range(10):
+            store.set(["snippets", f"s{i}"], str(i))
+        self.assertFalse(os.path.exists(store.journal_path))
+
+        time.sleep(0.2)
+        self.assertEqual(len(ConfigStore(self.path).load()["snippets"]), 10)
+
+    def test_compaction(self):
+        """Test that a long journal is folded into the snapshot"""
+        store = ConfigStore(self.path, flush_interval=0, compact_entries=5)
+        store.load()
+        for i in range(5):
+            store.set(["snippets", f"s{i}"], str(i))
+        self.assertFalse(os.path.exists(store.journal_path))
+        self.assertEqual(len(self._snapshot()["snippets"]), 5)
+
+    def test_torn_journal_line_is_ignored(self):
+        """Test recovery from a write interrupted mid-line"""
+        store = ConfigStore(self.path, flush_interval=0)
+        store.load()
+        store.set(["snippets", "good"], "1")
+        with open(store.journal_path, 'a') as f:
+            f.write('{"op": "set", "path": ["snippets", "bad"], "val')
+        self.assertEqual(ConfigStore(self.path).load()["snippets"], {"good": "1"})
+
+    def test_stale_journal_is_ignored(self):
+        """Test that a journal from before the last compaction is not replayed"""
+        store = ConfigStore(self.path, flush_interval=0)
+        store.load()
+        store.set(["theme"], "light")
+        with open(store.journal_path) as f:
+            journal = f.read()
+
+        store.data["theme"] = "solarized"
+        store.compact()
+        # Simulate a crash between the snapshot rename and the journal removal
+        with open(store.journal_path, 'w') as f:
+            f.write(journal)
+        self.assertEqual(ConfigStore(self.path).load()["theme"], "solarized")
+
+    def test_changed_on_disk(self):
+        """Test detection of writes by other processes"""
+        store = ConfigStore(self.path, flush_interval=0)
+        store.load()
+        store.set(["theme"], "light")
+        self.assertFalse(store.changed_on_disk())
+
+        other = ConfigStore(self.path, flush_interval=0)
+        other.load()
+        other.set(["theme"], "dark")
+        self.assertTrue(store.changed_on_disk())
+
+    def test_adam_x_project_switch_uses_journal(self):
+        """Test that switching projects does not rewrite config.json"""
+        ConfigStore(self.path).replace({"projects": {"demo": self.test_dir}, "last_project": None})
+        adam_x = AdamX(self.path, show_welcome=False)
+        with patch('sys.stdout', new_callable=StringIO):
+            adam_x.switch_project("demo")
+        adam_x._index_threads["demo"].join()
+        adam_x.stop_watching()
+        adam_x.store.flush()
+
+        self.assertIsNone(self._snapshot()["last_project"])
+        reloaded = AdamX(self.path, show_welcome=False)
+        self.assertEqual(reloaded.current_project, "demo")
+
+
+if __name__ == '__main__':
+    unittest.main()
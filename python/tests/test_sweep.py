@@ -0,0 +1,162 @@
+"""
+Tests for Adam-X project sweeps
+"""
+
+import asyncio
+import concurrent.futures
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+# Add the parent directory to the path so we can import the adam_x module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from adam_x import AdamXEngine
+from adam_x_backend import SimulatedBackend
+from adam_x_cache import ResponseCache
+from adam_x_store import ConfigStore
+from adam_x_sweep import Sweep
+
+
+class FailingBackend(SimulatedBackend):
+    """Backend that fails on inputs mentioning "boom"."""
+
+    async def stream(self, action, input_text, language="python", context=""):
+        if "boom" in input_text:
+            raise ValueError("backend exploded")
+        async for chunk in super().stream(action, input_text, language, context):
+            yield chunk
+
+
+class TestSweep(unittest.TestCase):
+    """Test cases for Sweep"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.test_dir = tempfile.mkdtemp()
+        self.files = {}
+        for i in range(4):
+            self._write(f"mod{i}.py", f"def handler_{i}():\n    return {i}\n")
+        self.cache = ResponseCache(os.path.join(self.test_dir, "cache"))
+
+    def tearDown(self):
+        """Tear down test fixtures"""
+        shutil.rmtree(self.test_dir)
+
+    def _write(self, path, text):
+        with open(os.path.join(self.test_dir, path), 'w') as f:
+            f.write(text)
+        self.files[path] = (path, str(hash(text)), "python")
+
+    def _run(self, backend=None, workers=2, action="debug"):
+        sweep = Sweep(self.test_dir, list(self.files.values()), action,
+                      backend or SimulatedBackend(), self.cache, workers=workers)
+
+        async def collect():
+            return [path async for path, _ in sweep.run()]
+
+        return sweep, asyncio.run(collect())
+
+    def test_rerun_only_analyzes_changed_files(self):
+        """Test that results are cached by content hash"""
+        sweep, paths = self._run()
+        self.assertEqual(sorted(paths), sorted(self.files))
+        self.assertEqual((sweep.analyzed, sweep.cached), (4, 0))
+
+        self._write("mod2.py", "def handler_2():\n    return -2\n")
+        sweep, paths = self._run()
+        self.assertEqual((sweep.analyzed, sweep.cached), (1, 3))
+        self.assertEqual(paths[-1], "mod2.py")
+
+    def test_report(self):
+        """Test that the report has one section per file in path order"""
+        sweep, _ = self._run()
+        report = sweep.report("Debug report: demo")
+        self.assertTrue(report.startswith("# Debug report: demo\n\n4 files: 4 analyzed"))
+        sections = [line[3:] for line in report.splitlines() if line.startswith("## ")]
+        self.assertEqual(sections, sorted(self.files))
+        self.assertIn("off-by-one", report)
+
+    def test_optimize_report_has_analyzer_findings(self):
+        """Test that Python findings keep their file line numbers and rewrites"""
+        filler = "".join(f"def handler_{i}(x):\n    return x + {i}\n\n\n" for i in range(400))
+        keep = ("def keep(items):\n    wanted = ['a', 'b']\n    for item in items:\n"
+                  "        if item in wanted:\n            yield item\n")
+        self._write("big.py", filler + keep)
+        self._write("small.py", keep)
+        sweep, _ = self._run(action="optimize")
+        line = filler.count("\n") + 4
+        self.assertIn(f"Line {line}: `in wanted` scans", sweep.results["big.py"])
+        self.assertIn("Lines 1-", sweep.results["big.py"])
+        self.assertIn("Line 4: `in wanted` scans", sweep.results["small.py"])
+
+        report = sweep.report("Optimize report")
+        section = report.split("## small.py\n\n")[1]
+        # The backend's answer comes first, then the findings
+        self.assertTrue(section.startswith("1. Consider using list comprehension"))
+        self.assertIn("\n\nFound 1 potential performance issue:\n\n1. Line 4:", section)
+        self.assertIn("Suggested rewrite: Build a set once before the loop (`wanted_set = set(wanted)`)",
+                      section.split("## ")[0])
+
+    def test_failures_are_reported_not_cached(self):
+        """Test that a failing file is reported and retried on the next sweep"""
+        self._write("bad.py", "boom = 1\n")
+        sweep, _ = self._run(FailingBackend(), workers=1)
+        self.assertEqual(sweep.errors, {"bad.py": "backend exploded"})
+        self.assertIn("## bad.py\n\nError: backend exploded", sweep.report("Report"))
+        sweep, _ = self._run(FailingBackend(), workers=1)
+        self.assertEqual((sweep.cached, len(sweep.errors)), (4, 1))
+
+    def test_workers_are_spawned(self):
+        """Test that workers start fresh instead of forking the engine's threads"""
+        sweep = Sweep(self.test_dir, [], "debug", SimulatedBackend())
+        pool = sweep._pool(2, processes=True)
+        try:
+            if isinstance(pool, concurrent.futures.ProcessPoolExecutor):
+                self.assertEqual(pool._mp_context.get_start_method(), "spawn")
+        finally:
+            pool.shutdown()
+
+
+class TestAdamXSweep(unittest.TestCase):
+    """Test cases for the debug/optimize project commands"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.test_dir = tempfile.mkdtemp()
+        self.config_path = os.path.join(self.test_dir, "config.json")
+        self.project = os.path.join(self.test_dir, "demo")
+        os.makedirs(self.project)
+        for name in ("a.py", "b.js", "notes.md"):
+            with open(os.path.join(self.project, name), 'w') as f:
+                f.write("x = 1\n")
+        ConfigStore(self.config_path).replace({
+            "projects": {"demo": self.project}, "last_project": "demo",
+            "preferences": {"preferred_language": "python"},
+            "watch": {"enabled": False},
+        })
+
+    def tearDown(self):
+        """Tear down test fixtures"""
+        shutil.rmtree(self.test_dir)
+
+    def test_debug_project(self):
+        """Test that a sweep covers source files and saves the report"""
+        engine = AdamXEngine(self.config_path)
+        result = engine.process_command("debug project")
+        self.assertIn("## a.py\n", result)
+        self.assertIn("## b.js\n", result)
+        self.assertNotIn("notes.md", result)
+        self.assertIn("2 files: 2 analyzed, 0 unchanged", result)
+        with open(os.path.join(self.test_dir, "reports", "demo-debug.md")) as f:
+            self.assertTrue(f.read().startswith("# Debug report: demo"))
+
+        with open(os.path.join(self.project, "a.py"), 'w') as f:
+            f.write("x = 2\n")
+        self.assertIn("2 files: 1 analyzed, 1 unchanged", engine.process_command("debug project"))
+
+
+if __name__ == '__main__':
+    unittest.main()
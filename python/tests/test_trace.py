@@ -0,0 +1,129 @@
+"""
+Tests for Adam-X tracing
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from io import StringIO
+from unittest.mock import patch
+
+# Add the parent directory to the path so we can import the adam_x module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from adam_x import AdamX, AdamXEngine
+from adam_x_store import ConfigStore
+from adam_x_trace import JsonlExporter, MemoryExporter, Tracer, create_exporter, current_span
+
+
+class TestTracer(unittest.TestCase):
+    """Test cases for Tracer"""
+
+    def test_nesting(self):
+        """Test that spans nest under the open span and share its trace"""
+        exporter = MemoryExporter()
+        tracer = Tracer(exporter)
+        with tracer.span("outer", a=1) as outer:
+            with tracer.span("inner"):
+                current_span().set("b", 2)
+        with self.assertRaises(KeyError):
+            with tracer.span("failing"):
+                raise KeyError("x")
+
+        inner, outer_span, failing = exporter.spans
+        self.assertIs(outer_span, outer)
+        self.assertEqual((inner.parent_id, inner.trace_id), (outer.span_id, outer.trace_id))
+        self.assertIsNone(outer.parent_id)
+        self.assertEqual((outer.attributes, inner.attributes), ({"a": 1}, {"b": 2}))
+        self.assertNotEqual(failing.trace_id, outer.trace_id)
+        self.assertEqual(failing.error, "KeyError")
+
+    def test_noop_default(self):
+        """Test that without an exporter no spans are created"""
+        tracer = Tracer()
+        span = tracer.span("anything", a=1)
+        with span:
+            current_span().set("b", 2)
+        self.assertIs(tracer.span("other"), span)
+
+    def test_jsonl_exporter(self):
+        """Test that spans are appended as JSON lines"""
+        test_dir = tempfile.mkdtemp()
+        try:
+            exporter = create_exporter({"exporter": "jsonl", "path": "traces/spans.jsonl"}, test_dir)
+            self.assertIsInstance(exporter, JsonlExporter)
+            tracer = Tracer(exporter)
+            for _ in range(2):
+                with tracer.span("step", n=1):
+                    pass
+            tracer.close()
+            with open(os.path.join(test_dir, "traces", "spans.jsonl")) as f:
+                records = [json.loads(line) for line in f]
+        finally:
+            shutil.rmtree(test_dir)
+        self.assertEqual([record["name"] for record in records], ["step", "step"])
+        self.assertEqual(records[0]["attributes"], {"n": 1})
+        self.assertGreaterEqual(records[0]["duration_ms"], 0)
+        with self.assertRaises(ValueError):
+            create_exporter({"exporter": "zipkin"})
+
+
+class TestAdamXTracing(unittest.TestCase):
+    """Test cases for spans around AdamX requests"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.test_dir = tempfile.mkdtemp()
+        self.config_path = os.path.join(self.test_dir, "config.json")
+        ConfigStore(self.config_path).replace({
+            "preferences": {"preferred_language": "javascript"},
+            "trace": {"exporter": "memory"},
+        })
+
+    def tearDown(self):
+        """Tear down test fixtures"""
+        shutil.rmtree(self.test_dir)
+
+    def _tree(self, spans):
+        children = {}
+        for span in spans:
+            children.setdefault(span.parent_id, []).append(span)
+
+        def build(span):
+            return (span.name, [build(child) for child in children.get(span.span_id, [])])
+
+        return [build(span) for span in children[None]]
+
+    def test_engine_spans(self):
+        """Test the spans of a request made through the engine"""
+        engine = AdamXEngine(self.config_path)
+        engine.process_command("explain x = 1")
+        engine.process_command("explain x = 1")
+        spans = engine.adam_x.tracer.exporter.spans
+        first = [span for span in spans if span.trace_id == spans[0].trace_id]
+        miss, hit = self._tree(first), self._tree(spans[len(first):])
+        self.assertEqual(miss, [("command", [("parse", []), ("dispatch", [
+            ("request", [("cache", []), ("backend", [])])])])])
+        self.assertEqual(hit, [("command", [("parse", []), ("dispatch", [
+            ("request", [("cache", [])])])])])
+        root = spans[-1]
+        self.assertEqual(root.attributes, {"command": "explain"})
+        backend = next(span for span in spans if span.name == "backend")
+        self.assertEqual(backend.attributes["model"], "simulated")
+        self.assertGreater(backend.attributes["chunks"], 1)
+
+    def test_repl_spans(self):
+        """Test that the streamed response is rendered inside the command's trace"""
+        adam_x = AdamX(self.config_path, show_welcome=False)
+        with patch('sys.stdout', new_callable=StringIO):
+            adam_x.process_command("debug x = 1")
+        self.assertEqual(self._tree(adam_x.tracer.exporter.spans),
+                         [("command", [("parse", []), ("dispatch", [
+                             ("render", [("cache", []), ("backend", [])])])])])
+
+
+if __name__ == '__main__':
+    unittest.main()
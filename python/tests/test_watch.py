@@ -0,0 +1,144 @@
+"""
+Tests for the Adam-X file watcher and update queue
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from io import StringIO
+from unittest.mock import patch
+
+# Add the parent directory to the path so we can import the adam_x module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from adam_x import AdamX
+from adam_x_store import ConfigStore
+from adam_x_watch import InotifyWatcher, PollingWatcher, UpdateQueue
+
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.02)
+    return True
+
+
+class TestWatcher(unittest.TestCase):
+    """Test cases for watchers and the update queue"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.test_dir = tempfile.mkdtemp()
+        self.batches = []
+        self.queue = UpdateQueue(self.batches.append, debounce=0.05)
+
+    def tearDown(self):
+        """Tear down test fixtures"""
+        self.queue.stop()
+        shutil.rmtree(self.test_dir)
+
+    def _write(self, path, text="x = 1\n"):
+        full = os.path.join(self.test_dir, path)
+        os.makedirs(os.path.dirname(full), exist_ok=True)
+        with open(full, 'w') as f:
+            f.write(text)
+
+    def _changed(self):
+        return {path for batch in self.batches for path in batch or ()}
+
+    def test_queue_debounces_into_one_batch(self):
+        """Test that a burst of changes is applied as one batch"""
+        for i in range(20):
+            self.queue.put([f"f{i % 5}.py"])
+        self.assertTrue(self.queue.flush())
+        self.assertEqual(len(self.batches), 1)
+        self.assertEqual(sorted(self.batches[0]), [f"f{i}.py" for i in range(5)])
+        self.assertEqual(self.queue.events, 20)
+        self.assertGreaterEqual(self.queue.last_lag, 0.05)
+
+    def test_queue_rescan(self):
+        """Test that a rescan request is passed on as None"""
+        self.queue.rescan()
+        self.assertTrue(self.queue.flush())
+        self.assertEqual(self.batches, [None])
+
+    def test_polling_watcher(self):
+        """Test that the polling watcher reports created, modified and deleted files"""
+        self._write("keep.py")
+        self._write("gone.py")
+        watcher = PollingWatcher(self.test_dir, self.queue, interval=0.05).start()
+        try:
+            self._write("pkg/new.py")
+            os.remove(os.path.join(self.test_dir, "gone.py"))
+            self.assertTrue(wait_for(lambda: self._changed() >= {"pkg/new.py", "gone.py"}))
+            self.assertNotIn("keep.py", self._changed())
+        finally:
+            watcher.stop()
+
+    @unittest.skipUnless(sys.platform.startswith("linux"), "inotify is Linux-only")
+    def test_inotify_watcher(self):
+        """Test that inotify reports files in directories created after it started"""
+        try:
+            watcher = InotifyWatcher(self.test_dir, self.queue).start()
+        except OSError as e:
+            self.skipTest(f"inotify unavailable: {e}")
+        try:
+            self._write("a.py")
+            self.assertTrue(wait_for(lambda: "a.py" in self._changed()))
+            os.makedirs(os.path.join(self.test_dir, "sub"))
+            self.assertTrue(wait_for(lambda: watcher.watched_dirs == 2))
+            self._write("sub/b.py")
+            self.assertTrue(wait_for(lambda: "sub/b.py" in self._changed()))
+            self.assertEqual(watcher.stats()["kind"], "inotify")
+        finally:
+            watcher.stop()
+
+
+class TestAdamXWatching(unittest.TestCase):
+    """Test cases for watcher-driven index updates in AdamX"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.test_dir = tempfile.mkdtemp()
+        self.config_path = os.path.join(self.test_dir, "config.json")
+        self.project = os.path.join(self.test_dir, "demo")
+        os.makedirs(self.project)
+        ConfigStore(self.config_path).replace({
+            "projects": {"demo": self.project}, "last_project": None,
+            "preferences": {"preferred_language": "python"},
+            "watch": {"backend": "polling", "poll_interval": 0.05, "debounce": 0.02},
+        })
+        self.adam_x = AdamX(self.config_path, show_welcome=False)
+
+    def tearDown(self):
+        """Tear down test fixtures"""
+        self.adam_x.stop_watching()
+        self.adam_x.store.flush()
+        shutil.rmtree(self.test_dir)
+
+    def test_changes_reach_the_indexes(self):
+        """Test that a new file becomes findable and searchable without a rebuild"""
+        with patch('sys.stdout', new_callable=StringIO) as mock_stdout:
+            self.adam_x.switch_project("demo")
+            self.adam_x._index_threads["demo"].join()
+            with open(os.path.join(self.project, "late.py"), 'w') as f:
+                f.write("def late_arrival():\n    return 'watched'\n")
+            index = self.adam_x.project_index()
+            self.assertTrue(wait_for(lambda: index.find_symbols("late_arrival")))
+            self.assertTrue(self.adam_x._watcher.queue.flush())
+            self.adam_x.process_command("search watched")
+            self.adam_x.process_command("status")
+        output = mock_stdout.getvalue()
+        self.assertIn("late.py:2", output)
+        self.assertIn("Watcher:        polling", output)
+        self.assertIn("Event lag:", output)
+        self.assertEqual(index.last_update["read"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()